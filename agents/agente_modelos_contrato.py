@@ -40,11 +40,9 @@ def registrar_log(mensagem: str):
 
 def ler_modelos_existentes():
     """Lê todos os modelos da pasta knowledge/contrato_models/"""
-    modelos = {}
-    if MODELOS_PATH.exists():
-        for arq in MODELOS_PATH.glob("*.txt"):
-            modelos[arq.name] = arq.read_text(encoding="utf-8")
-    return modelos
+    from utils.knowledge_registry import obter_registry
+
+    return obter_registry().listar_textos(MODELOS_PATH, "*.txt")
 
 
 def ler_manual_contratos():
@@ -6,8 +6,10 @@
 from __future__ import annotations
 
 import json
+import re
 from datetime import datetime
 from utils.ai_client import AIClient
+from utils.pre_extracao import bloco_fatos, fixos, pre_extrair, remover_campos_json, substituir_cnpj
 
 
 # 20 campos padronizados do Contrato (Lei 14.133/2021)
@@ -51,13 +53,15 @@ class ContratoAgent:
     # ==========================================================
     # Processamento principal
     # ==========================================================
-    def generate(self, conteudo_base: str, contexto_previo: dict = None) -> dict:
+    def generate(self, conteudo_base: str, contexto_previo: dict = None, modelo_manual: str = None) -> dict:
         """
         Processa o texto do Contrato e retorna estrutura completa com 20 campos.
         
         Args:
             conteudo_base: texto bruto extraído do PDF/DOCX
             contexto_previo: dados de DFD/ETP/TR/Edital para enriquecer (opcional)
+            modelo_manual: modelo contratual escolhido pelo usuário (opcional);
+                sem ele, o modelo é selecionado pelo objeto
         """
         
         # Verificar se AIClient foi inicializado
@@ -67,7 +71,11 @@ class ContratoAgent:
                 "CONTRATO": self._get_template_vazio()
             }
 
-        prompt = self._montar_prompt(contexto_previo)
+        modelo_texto, modelo = self._selecionar_modelo(conteudo_base, contexto_previo, modelo_manual)
+        # Número, data, valor, vigência e CNPJ literais no insumo não são gerados pelo modelo;
+        # valores achados fora da frase da âncora vão só como indício
+        fatos = pre_extrair("CONTRATO", conteudo_base)
+        prompt = self._montar_prompt(contexto_previo, modelo_texto, modelo, fatos)
 
         resposta = self.ai.ask(
             prompt=prompt,
@@ -89,23 +97,65 @@ class ContratoAgent:
             print(f"[ContratoAgent] ERRO: tipo de resposta inesperado: {type(resposta)}")
             dados = {}
 
+        # Fatos pré-extraídos de alta confiança prevalecem sobre a resposta do modelo
+        fatos = fixos(fatos)
+        for campo, fato in fatos.items():
+            if campo in CAMPOS_CONTRATO:
+                dados[campo] = fato.valor
+
         # Estrutura final do Contrato
         contrato_estruturado = self._extrair_campos(dados, contexto_previo)
+        if "cnpj_contratada" in fatos:
+            contrato_estruturado["partes_contratada"] = substituir_cnpj(
+                contrato_estruturado.get("partes_contratada", ""), fatos["cnpj_contratada"].valor
+            )
         
         return {
             "artefato": "CONTRATO",
             "timestamp": datetime.now().isoformat(),
             "CONTRATO": contrato_estruturado,
+            "modelo_referencia": modelo,
+            "pre_extracao": {campo: fato.evidencia for campo, fato in fatos.items()},
         }
 
+    # ==========================================================
+    # Seleção do modelo contratual (knowledge/contrato_models)
+    # ==========================================================
+    def _selecionar_modelo(self, conteudo_base: str, contexto: dict = None, modelo_manual: str = None):
+        """
+        Escolhe o modelo contratual mais aderente ao objeto (DFD/ETP/TR,
+        ou o próprio insumo). Retorna (texto_do_modelo, selecao).
+        """
+        ctx = contexto or {}
+        objeto = " ".join(
+            str(ctx.get(chave, {}).get("objeto", ""))
+            for chave in ("dfd_campos_ai", "etp_campos_ai", "tr_campos_ai")
+        ).strip() or (conteudo_base or "")[:2000]
+        try:
+            from utils.seletor_modelos import contexto_modelo
+            return contexto_modelo(objeto, "CONTRATO", modelo_manual=modelo_manual)
+        except Exception as e:
+            print(f"[ContratoAgent] ⚠️ Seleção de modelo indisponível: {e}")
+            return "", None
+
     # ==========================================================
     # Prompt otimizado para Contrato (20 campos) - VERSÃO ROBUSTA
     # ==========================================================
-    def _montar_prompt(self, contexto: dict = None) -> str:
+    def _montar_prompt(self, contexto: dict = None, modelo_texto: str = "", modelo: dict = None,
+                       fatos: dict = None) -> str:
+        fatos = fatos or {}
         # Preparar contexto enriquecido
         contexto_detalhado = self._preparar_contexto_enriquecido(contexto)
+        if fatos:
+            contexto_detalhado += "\n\n" + bloco_fatos(fatos)
+        if modelo_texto and modelo:
+            contexto_detalhado += (
+                f"\n\n**MODELO INSTITUCIONAL DE REFERÊNCIA ({modelo['nome']}):**\n"
+                f"Siga a estrutura de cláusulas e a redação deste modelo SAAB/TJSP.\n"
+                f"\"\"\"{modelo_texto}\"\"\""
+            )
         
-        return f"""
+        prompt = f"""
 Você é um REDATOR SÊNIOR de Contratos Administrativos do Tribunal de Justiça de São Paulo, especialista em Lei Federal nº 14.133/2021.
 
 **MISSÃO CRÍTICA**: ELABORE um Contrato Administrativo COMPLETO, DETALHADO e PROFISSIONAL, consolidando TODAS as informações do documento fornecido E do contexto DFD/ETP/TR/Edital.
@@ -302,6 +352,15 @@ Retorne APENAS o JSON abaixo, sem comentários, sem markdown, sem explicações:
   "disposicoes_gerais": ""
 }}
 """
+        campos_fixos = [campo for campo in fixos(fatos) if campo in CAMPOS_CONTRATO]
+        return self._sem_campos_fixos(prompt, campos_fixos) if campos_fixos else prompt
+
+    @staticmethod
+    def _sem_campos_fixos(prompt: str, campos: list) -> str:
+        """Retira as instruções e as chaves JSON dos campos já preenchidos."""
+        nomes = "|".join(map(re.escape, campos))
+        prompt = re.sub(rf"\*\*\d+\. (?:{nomes})\*\*.*?(?=\n\*\*\d+\. |\n═)\n?", "", prompt, flags=re.DOTALL)
+        return remover_campos_json(prompt, campos)
     
     def _preparar_contexto_enriquecido(self, contexto: dict = None) -> str:
         """Prepara resumo estruturado do contexto DFD/ETP/TR/Edital."""
@@ -480,7 +539,7 @@ Retorne APENAS o JSON abaixo, sem comentários, sem markdown, sem explicações:
 # ==========================================================
 # Função wrapper para integração (compatível com UI)
 # ==========================================================
-def processar_contrato_com_ia(conteudo_textual: str, contexto_previo: dict = None) -> dict:
+def processar_contrato_com_ia(conteudo_textual: str, contexto_previo: dict = None, modelo_manual: str = None) -> dict:
     """
     Wrapper para processar Contrato com IA.
     Compatível com utils/integration_contrato.py
@@ -488,13 +547,14 @@ def processar_contrato_com_ia(conteudo_textual: str, contexto_previo: dict = Non
     Args:
         conteudo_textual: texto bruto extraído do PDF
         contexto_previo: dict com dados de DFD/ETP/TR/Edital (opcional)
+        modelo_manual: modelo contratual forçado pelo usuário (opcional)
     
     Returns:
         dict com estrutura: {"artefato": "CONTRATO", "CONTRATO": {...20 campos...}}
     """
     try:
         agent = ContratoAgent()
-        resultado = agent.generate(conteudo_textual, contexto_previo)
+        resultado = agent.generate(conteudo_textual, contexto_previo, modelo_manual)
         
         # ✅ NOVO: Registrar evento de auditoria
         if conteudo_textual:
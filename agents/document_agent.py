@@ -8,6 +8,7 @@ from __future__ import annotations
 import json
 from datetime import datetime
 from utils.ai_client import AIClient
+from utils.pre_extracao import bloco_fatos, fixos, pre_extrair, remover_campos_json
 
 
 SECOES = [
@@ -25,6 +26,82 @@ SECOES = [
 ]
 
 
+# Nomes dos tipos reconhecidos por utils.classificador_documentos
+NOMES_TIPO = {
+    "DFD": "DFD (Documento de Formalização da Demanda)",
+    "ETP": "ETP (Estudo Técnico Preliminar)",
+    "TR": "TR (Termo de Referência)",
+    "EDITAL": "EDITAL DE LICITAÇÃO",
+    "CONTRATO": "CONTRATO",
+    "PCA": "PCA (Plano de Contratações Anual)",
+    "PESQUISA_PRECOS": "RELATÓRIO DE PESQUISA DE PREÇOS",
+}
+
+# Regras de extração específicas por tipo de documento de origem
+REGRAS_POR_TIPO = {
+    "EDITAL": (
+        "   - Unidade demandante: extraia do cabeçalho (UNIDADE GESTORA/UASG ou Secretaria)\n"
+        "   - Objeto: extraia da seção OBJETO (descrição completa)\n"
+        "   - Valor estimado: procure por valores de orçamento (se não houver, coloque 'Valor não divulgado')\n"
+        "   - Justificativa: extraia de seções como JUSTIFICATIVA ou contexto\n"
+        "   - Escopo: detalhamento técnico do OBJETO\n"
+        "   - Fundamentação legal: todas as leis citadas (Lei 14.133/2021, etc.)\n"
+    ),
+    "ETP": (
+        "   - Unidade demandante: seção EQUIPE DE PLANEJAMENTO\n"
+        "   - Responsável/Gestor: seção EQUIPE DE PLANEJAMENTO\n"
+        "   - Valor estimado: seção ESTIMATIVA DE VALOR\n"
+        "   - Descrição: seções OBJETO + NECESSIDADE\n"
+        "   - Motivação: seção PLANEJAMENTO ESTRATÉGICO\n"
+    ),
+}
+
+MAPEAMENTO_EDITAL = (
+    "MAPEAMENTO PARA EDITAIS:\n"
+    "- Contexto Institucional → Cabeçalho + Unidade gestora\n"
+    "- Diagnóstico da Situação Atual → Justificativa do edital (inferir necessidade)\n"
+    "- Fundamentação da Necessidade → Por que esta licitação é necessária (contextualizar)\n"
+    "- Objetivos da Contratação → Finalidade da contratação\n"
+    "- Escopo Inicial da Demanda → Descrição completa do OBJETO\n"
+    "- Resultados Esperados → Benefícios esperados da contratação (inferir)\n"
+    "- Benefícios Institucionais → Melhorias que a contratação trará\n"
+    "- Justificativa Legal → Todas as leis, decretos, resoluções citadas\n"
+    "- Riscos da Não Contratação → Consequências de não contratar (inferir)\n"
+    "- Requisitos Mínimos → Especificações técnicas/qualificações exigidas\n"
+    "- Critérios de Sucesso → Indicadores de sucesso (inferir do escopo)\n\n"
+)
+
+FORMATO_RESPOSTA = (
+    "Responda SOMENTE com JSON no formato:\n\n"
+    "{\n"
+    "  \"DFD\": {\n"
+    "    \"unidade_demandante\": \"[extrair do documento - NUNCA deixe vazio]\",\n"
+    "    \"responsavel\": \"[extrair se disponível, senão: 'A definir']\",\n"
+    "    \"prazo_estimado\": \"[extrair se disponível, senão inferir do cronograma]\",\n"
+    "    \"valor_estimado\": \"[extrair - se não houver: 'Valor não divulgado']\",\n"
+    "    \"descricao_necessidade\": \"[descrição COMPLETA e detalhada do objeto]\",\n"
+    "    \"motivacao\": \"[justificativa COMPLETA - contextualizar necessidade institucional]\",\n"
+    "    \"texto_narrativo\": \"[consolidação DETALHADA de todo o documento]\",\n"
+    "    \"secoes\": {\n"
+    "      \"Contexto Institucional\": \"[PREENCHA com dados do documento]\",\n"
+    "      \"Diagnóstico da Situação Atual\": \"[PREENCHA - descreva situação atual]\",\n"
+    "      \"Fundamentação da Necessidade\": \"[PREENCHA - por que é necessário]\",\n"
+    "      \"Objetivos da Contratação\": \"[PREENCHA com objetivos claros]\",\n"
+    "      \"Escopo Inicial da Demanda\": \"[PREENCHA com descrição técnica completa]\",\n"
+    "      \"Resultados Esperados\": \"[PREENCHA com resultados mensuráveis]\",\n"
+    "      \"Benefícios Institucionais\": \"[PREENCHA com benefícios concretos]\",\n"
+    "      \"Justificativa Legal\": \"[PREENCHA com TODAS as bases legais citadas]\",\n"
+    "      \"Riscos da Não Contratação\": \"[PREENCHA com riscos identificados]\",\n"
+    "      \"Requisitos Mínimos\": \"[PREENCHA com requisitos técnicos]\",\n"
+    "      \"Critérios de Sucesso\": \"[PREENCHA com indicadores]\"\n"
+    "    },\n"
+    "    \"lacunas\": [\"liste APENAS campos que realmente não existem no documento\"]\n"
+    "  }\n"
+    "}\n\n"
+    "IMPORTANTE: Seja DETALHADO e COMPLETO. Não resuma demais. Extraia TODO o conteúdo relevante."
+)
+
+
 class DocumentAgent:
 
     def __init__(self, artefato="DFD"):
@@ -38,7 +115,12 @@ class DocumentAgent:
     # ==========================================================
     # Processamento principal
     # ==========================================================
-    def generate(self, conteudo_base: str) -> dict:
+    def generate(self, conteudo_base: str, tipo_documento: str = None) -> dict:
+        """
+        tipo_documento: tipo do insumo de origem (DFD, ETP, TR, EDITAL...).
+        Se omitido, é detectado localmente; com baixa confiança, o prompt
+        genérico (com identificação pelo modelo) é mantido.
+        """
         
         # Verificar se AIClient foi inicializado
         if self.ai is None:
@@ -47,7 +129,12 @@ class DocumentAgent:
                 "DFD": self._get_template_vazio()
             }
 
-        prompt = self._montar_prompt()
+        if tipo_documento is None:
+            tipo_documento = self._detectar_tipo(conteudo_base)
+
+        # Valor e prazo literais no insumo não são gerados pelo modelo
+        fatos = pre_extrair("DFD", conteudo_base)
+        prompt = self._montar_prompt(tipo_documento, fatos)
 
         resposta = self.ai.ask(
             prompt=prompt,
@@ -75,6 +162,11 @@ class DocumentAgent:
         d.setdefault("responsavel", "")
         d.setdefault("prazo_estimado", "")
         d.setdefault("valor_estimado", "0,00")
+        fatos = fixos(fatos)
+        for campo, fato in fatos.items():
+            d[campo] = fato.valor
+        if fatos:
+            d["pre_extracao"] = {campo: fato.evidencia for campo, fato in fatos.items()}
 
         # Garantir 11 seções
         secoes = d.get("secoes", {})
@@ -87,6 +179,18 @@ class DocumentAgent:
 
         return d
     
+    # ==========================================================
+    # Detecção local do tipo de documento (sem chamada à IA)
+    # ==========================================================
+    def _detectar_tipo(self, conteudo_base: str):
+        try:
+            from utils.classificador_documentos import classificar_documento
+            resultado = classificar_documento(conteudo_base)
+        except Exception as e:
+            print(f"[DocumentAgent] ⚠️ Classificador indisponível: {e}")
+            return None
+        return resultado["tipo"] if resultado["confiavel"] else None
+
     # ==========================================================
     # Template vazio para fallback
     # ==========================================================
@@ -113,80 +217,61 @@ class DocumentAgent:
     # ==========================================================
     # Prompt institucional
     # ==========================================================
-    def _montar_prompt(self) -> str:
+    def _montar_prompt(self, tipo_documento: str = None, fatos: dict = None) -> str:
+        """
+        Monta o prompt de extração. Com tipo_documento conhecido (detectado
+        localmente por utils.classificador_documentos), omite a etapa de
+        identificação e as regras dos demais tipos. Campos pré-extraídos
+        (utils.pre_extracao) vão como dados fixos e saem do formato de resposta;
+        os indícios (fato.fixo False) ficam no formato, para o modelo confirmar.
+        """
+        fatos = fatos or {}
+        formato = bloco_fatos(fatos) + "\n" + remover_campos_json(FORMATO_RESPOSTA, fixos(fatos)) if fatos else FORMATO_RESPOSTA
+        tipo = (tipo_documento or "").upper()
+        if tipo not in NOMES_TIPO:
+            return (
+                "Você é o agente institucional do TJSP responsável por extrair informações "
+                "de documentos (ETP, TR, DFD, Editais, Contratos) e estruturá-las no formato DFD completo.\n\n"
+                
+                "INSTRUÇÕES CRÍTICAS:\n"
+                "1. IDENTIFIQUE o tipo de documento (ETP, TR, Edital, Contrato, Licitação)\n"
+                "2. EXTRAIA todas as informações disponíveis, não deixe campos com 'Não especificado'\n"
+                "3. Se o documento for um EDITAL DE LICITAÇÃO:\n"
+                + REGRAS_POR_TIPO["EDITAL"] +
+                "4. Se o documento for um ETP:\n"
+                + REGRAS_POR_TIPO["ETP"] +
+                "5. Para CADA SEÇÃO do DFD, extraia o máximo de informação possível do documento\n"
+                "6. Se uma informação não estiver explícita mas puder ser INFERIDA logicamente, faça isso\n"
+                "7. NUNCA deixe campos vazios ou com 'Não especificado' se houver dados no documento\n\n"
+                + MAPEAMENTO_EDITAL + formato
+            )
+
+        instrucoes = ["EXTRAIA todas as informações disponíveis, não deixe campos com 'Não especificado'"]
+        if tipo in REGRAS_POR_TIPO:
+            instrucoes.append(f"Regras para {NOMES_TIPO[tipo]}:\n" + REGRAS_POR_TIPO[tipo].rstrip("\n"))
+        instrucoes += [
+            "Para CADA SEÇÃO do DFD, extraia o máximo de informação possível do documento",
+            "Se uma informação não estiver explícita mas puder ser INFERIDA logicamente, faça isso",
+            "NUNCA deixe campos vazios ou com 'Não especificado' se houver dados no documento",
+        ]
         return (
             "Você é o agente institucional do TJSP responsável por extrair informações "
-            "de documentos (ETP, TR, DFD, Editais, Contratos) e estruturá-las no formato DFD completo.\n\n"
-            
+            f"de um documento do tipo {NOMES_TIPO[tipo]} e estruturá-las no formato DFD completo.\n\n"
             "INSTRUÇÕES CRÍTICAS:\n"
-            "1. IDENTIFIQUE o tipo de documento (ETP, TR, Edital, Contrato, Licitação)\n"
-            "2. EXTRAIA todas as informações disponíveis, não deixe campos com 'Não especificado'\n"
-            "3. Se o documento for um EDITAL DE LICITAÇÃO:\n"
-            "   - Unidade demandante: extraia do cabeçalho (UNIDADE GESTORA/UASG ou Secretaria)\n"
-            "   - Objeto: extraia da seção OBJETO (descrição completa)\n"
-            "   - Valor estimado: procure por valores de orçamento (se não houver, coloque 'Valor não divulgado')\n"
-            "   - Justificativa: extraia de seções como JUSTIFICATIVA ou contexto\n"
-            "   - Escopo: detalhamento técnico do OBJETO\n"
-            "   - Fundamentação legal: todas as leis citadas (Lei 14.133/2021, etc.)\n"
-            "4. Se o documento for um ETP:\n"
-            "   - Unidade demandante: seção EQUIPE DE PLANEJAMENTO\n"
-            "   - Responsável/Gestor: seção EQUIPE DE PLANEJAMENTO\n"
-            "   - Valor estimado: seção ESTIMATIVA DE VALOR\n"
-            "   - Descrição: seções OBJETO + NECESSIDADE\n"
-            "   - Motivação: seção PLANEJAMENTO ESTRATÉGICO\n"
-            "5. Para CADA SEÇÃO do DFD, extraia o máximo de informação possível do documento\n"
-            "6. Se uma informação não estiver explícita mas puder ser INFERIDA logicamente, faça isso\n"
-            "7. NUNCA deixe campos vazios ou com 'Não especificado' se houver dados no documento\n\n"
-            
-            "MAPEAMENTO PARA EDITAIS:\n"
-            "- Contexto Institucional → Cabeçalho + Unidade gestora\n"
-            "- Diagnóstico da Situação Atual → Justificativa do edital (inferir necessidade)\n"
-            "- Fundamentação da Necessidade → Por que esta licitação é necessária (contextualizar)\n"
-            "- Objetivos da Contratação → Finalidade da contratação\n"
-            "- Escopo Inicial da Demanda → Descrição completa do OBJETO\n"
-            "- Resultados Esperados → Benefícios esperados da contratação (inferir)\n"
-            "- Benefícios Institucionais → Melhorias que a contratação trará\n"
-            "- Justificativa Legal → Todas as leis, decretos, resoluções citadas\n"
-            "- Riscos da Não Contratação → Consequências de não contratar (inferir)\n"
-            "- Requisitos Mínimos → Especificações técnicas/qualificações exigidas\n"
-            "- Critérios de Sucesso → Indicadores de sucesso (inferir do escopo)\n\n"
-            
-            "Responda SOMENTE com JSON no formato:\n\n"
-            "{\n"
-            "  \"DFD\": {\n"
-            "    \"unidade_demandante\": \"[extrair do documento - NUNCA deixe vazio]\",\n"
-            "    \"responsavel\": \"[extrair se disponível, senão: 'A definir']\",\n"
-            "    \"prazo_estimado\": \"[extrair se disponível, senão inferir do cronograma]\",\n"
-            "    \"valor_estimado\": \"[extrair - se não houver: 'Valor não divulgado']\",\n"
-            "    \"descricao_necessidade\": \"[descrição COMPLETA e detalhada do objeto]\",\n"
-            "    \"motivacao\": \"[justificativa COMPLETA - contextualizar necessidade institucional]\",\n"
-            "    \"texto_narrativo\": \"[consolidação DETALHADA de todo o documento]\",\n"
-            "    \"secoes\": {\n"
-            "      \"Contexto Institucional\": \"[PREENCHA com dados do documento]\",\n"
-            "      \"Diagnóstico da Situação Atual\": \"[PREENCHA - descreva situação atual]\",\n"
-            "      \"Fundamentação da Necessidade\": \"[PREENCHA - por que é necessário]\",\n"
-            "      \"Objetivos da Contratação\": \"[PREENCHA com objetivos claros]\",\n"
-            "      \"Escopo Inicial da Demanda\": \"[PREENCHA com descrição técnica completa]\",\n"
-            "      \"Resultados Esperados\": \"[PREENCHA com resultados mensuráveis]\",\n"
-            "      \"Benefícios Institucionais\": \"[PREENCHA com benefícios concretos]\",\n"
-            "      \"Justificativa Legal\": \"[PREENCHA com TODAS as bases legais citadas]\",\n"
-            "      \"Riscos da Não Contratação\": \"[PREENCHA com riscos identificados]\",\n"
-            "      \"Requisitos Mínimos\": \"[PREENCHA com requisitos técnicos]\",\n"
-            "      \"Critérios de Sucesso\": \"[PREENCHA com indicadores]\"\n"
-            "    },\n"
-            "    \"lacunas\": [\"liste APENAS campos que realmente não existem no documento\"]\n"
-            "  }\n"
-            "}\n\n"
-            "IMPORTANTE: Seja DETALHADO e COMPLETO. Não resuma demais. Extraia TODO o conteúdo relevante."
+            + "".join(f"{n}. {linha}\n" for n, linha in enumerate(instrucoes, 1))
+            + "\n"
+            + (MAPEAMENTO_EDITAL if tipo == "EDITAL" else "")
+            + formato
         )
 
 # ==========================================================
 # Função universal — chamada pelo integration_dfd
 # ==========================================================
-def processar_dfd_com_ia(conteudo_textual: str = "") -> dict:
+def processar_dfd_com_ia(conteudo_textual: str = "", tipo_documento: str = None) -> dict:
     """
     Wrapper universal utilizado pelo integration_dfd.
-    Recebe texto puro e retorna:
+    Recebe texto puro (e, opcionalmente, o tipo do documento de origem
+    já detectado no upload) e retorna:
         { "timestamp": "...", "resultado_ia": { ...DFD... } }
     """
     
@@ -204,7 +289,7 @@ def processar_dfd_com_ia(conteudo_textual: str = "") -> dict:
         agente = DocumentAgent("DFD")
         
         print("[processar_dfd_com_ia] Chamando agente.generate()...")
-        resultado = agente.generate(conteudo_textual)
+        resultado = agente.generate(conteudo_textual, tipo_documento)
         
         print(f"[processar_dfd_com_ia] Resultado obtido: {type(resultado)}")
 
@@ -6,18 +6,8 @@ from typing import List, Dict
 from pathlib import Path
 import yaml
 
-# Importa validadores semânticos específicos
-from knowledge.validators.etp_semantic_validator import semantic_validate_etp
-from knowledge.validators.tr_semantic_validator import semantic_validate_tr
-from knowledge.validators.contrato_semantic_validator import semantic_validate_contrato
-from knowledge.validators.obras_semantic_validator import semantic_validate_obras
-from knowledge.validators.dfd_semantic_validator import semantic_validate_dfd
-from knowledge.validators.pca_semantic_validator import semantic_validate_pca
-from knowledge.validators.pesquisa_precos_semantic_validator import semantic_validate_pesquisa_precos
-from knowledge.validators.edital_semantic_validator import semantic_validate_edital
-from knowledge.validators.fiscalizacao_semantic_validator import semantic_validate_fiscalizacao
-from knowledge.validators.itf_semantic_validator import semantic_validate_itf
-from knowledge.validators.mapa_riscos_semantic_validator import semantic_validate_mapa_riscos
+# Validadores semânticos específicos: importados sob demanda pelo registro
+from knowledge.validators.registry import carregar_semantico, normalizar_artefato
 
 # Mapear artefatos suportados → arquivos checklist
 SUPPORTED_ARTEFACTS = {
@@ -86,33 +76,11 @@ def run_semantic(artefato: str, doc_text: str, client) -> (float, List[Dict]):
     """
     Seleciona e executa a validação semântica apropriada.
     """
-    artefato = artefato.upper()
-
-    if artefato == "ETP":
-        return semantic_validate_etp(doc_text, client)
-    elif artefato == "TR":
-        return semantic_validate_tr(doc_text, client)
-    elif artefato == "CONTRATO":
-        return semantic_validate_contrato(doc_text, client)
-    elif artefato == "CONTRATO_TECNICO":
-        # pode usar o mesmo validador de contrato até criar um específico
-        return semantic_validate_contrato(doc_text, client)
-    elif artefato == "OBRAS":
-        return semantic_validate_obras(doc_text, client)
-    elif artefato == "DFD":
-        return semantic_validate_dfd(doc_text, client)
-    elif artefato == "PCA":
-        return semantic_validate_pca(doc_text, client)
-    elif artefato == "PESQUISA_PRECOS":
-        return semantic_validate_pesquisa_precos(doc_text, client)
-    elif artefato == "EDITAL":
-        return semantic_validate_edital(doc_text, client)
-    elif artefato == "FISCALIZACAO":
-        return semantic_validate_fiscalizacao(doc_text, client)
-    elif artefato == "ITF":
-        return semantic_validate_itf(doc_text, client)
-    elif artefato == "MAPA_RISCOS":
-        return semantic_validate_mapa_riscos(doc_text, client)
+    artefato = normalizar_artefato(artefato)
+
+    validador = carregar_semantico(artefato)
+    if validador is not None:
+        return validador(doc_text, client)
 
     return 0.0, [{"id": "info", "descricao": f"Validação semântica para {artefato} ainda não implementada."}]
 
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+# =============================================================================
+# Synapse.IA – Checklist Matcher (validação rígida compilada)
+#
+# Compila os itens de um checklist YAML uma única vez (por versão do arquivo)
+# e os procura no documento com uma única preparação do texto:
+# - O texto é "dobrado" uma vez só – sem acentos e em minúsculas, 1 caractere
+#   → 1 caractere (tabela de bytes latin-1), de modo que os offsets valem
+#   também para o texto normalizado.
+# - Os padrões são dobrados da mesma forma na compilação e dispensam
+#   IGNORECASE, o que mantém as otimizações de prefixo literal do módulo re
+#   (buscas sem acerto ficam 3–7x mais rápidas).
+# - Cada item para no primeiro acerto e devolve offsets e trecho.
+#
+# Observação: uma alternância única com todos os padrões foi medida e é
+# mais lenta no re do Python (perde as otimizações de prefixo); por isso
+# cada item mantém seu próprio padrão compilado.
+#
+# Semântica preservada em relação ao rigid_validate original:
+# - padrões tolerantes (build_tolerant_pattern), sem distinção de caixa/acentos;
+# - regex malformada → busca literal do texto do padrão;
+# - item sem padrão → primeiras 3 palavras (> 4 letras) da descrição.
+# =============================================================================
+from __future__ import annotations
+
+import re
+import unicodedata
+from typing import Any, Callable, Dict, List, Optional, Pattern
+
+FLAGS = re.DOTALL
+
+# Caracteres de contexto devolvidos em cada lado do trecho encontrado
+CONTEXTO_TRECHO = 60
+
+
+def _dobrar_caractere(c: str) -> str:
+    base = "".join(ch for ch in unicodedata.normalize("NFKD", c) if not unicodedata.combining(ch))
+    base = base.lower()
+    return base if len(base) == 1 else (c.lower() if len(c.lower()) == 1 else c)
+
+
+def _tabela_bytes() -> bytes:
+    """Latin-1 → minúscula sem acento (para bytes.translate, 1:1)."""
+    tabela = []
+    for i in range(256):
+        dobrado = ord(_dobrar_caractere(chr(i)))
+        tabela.append(dobrado if dobrado < 256 else i)
+    return bytes(tabela)
+
+
+_TABELA_BYTES = _tabela_bytes()
+_FORA_LATIN1 = re.compile(r"[^\x00-\xff]+")
+
+
+def dobrar(texto: str) -> str:
+    """Minúsculas sem acentos, preservando o comprimento (offsets 1:1)."""
+    if not texto:
+        return ""
+    dobrado = texto.encode("latin-1", "replace").translate(_TABELA_BYTES).decode("latin-1")
+    if texto.isascii() or not _FORA_LATIN1.search(texto):
+        return dobrado
+    partes, ultimo = [], 0
+    for m in _FORA_LATIN1.finditer(texto):
+        partes.append(dobrado[ultimo:m.start()])
+        partes.append("".join(_dobrar_caractere(c) for c in m.group()))
+        ultimo = m.end()
+    partes.append(dobrado[ultimo:])
+    return "".join(partes)
+
+
+# Flags globais no início do padrão (ex.: "(?i)"): i é implícita após a
+# dobra e s já é aplicada a todos; m/x viram flags locais.
+_FLAGS_GLOBAIS = re.compile(r"^\(\?([aiLmsux]+)\)")
+
+
+def dobrar_padrao(rx: str) -> str:
+    """Dobra os literais da regex, sem tocar em escapes (\\S, \\W...) nem flags."""
+    m = _FLAGS_GLOBAIS.match(rx)
+    if m:
+        locais = "".join(f for f in m.group(1) if f in "mx")
+        rx = f"(?{locais}:{rx[m.end():]})" if locais else rx[m.end():]
+
+    saida, i = [], 0
+    while i < len(rx):
+        c = rx[i]
+        if c == "\\":
+            saida.append(rx[i:i + 2])
+            i += 2
+            continue
+        if rx.startswith("(?", i):
+            # (?: (?= (?P<nome> (?-i: ... → copiados sem alteração até o delimitador
+            fim = i + 2
+            while fim < len(rx) and rx[fim] not in ":)<>=!":
+                fim += 1
+            saida.append(rx[i:fim])
+            i = fim
+            continue
+        saida.append(dobrar(c))
+        i += 1
+    return "".join(saida)
+
+
+class ChecklistMatcher:
+    """
+    Checklist compilado. Uso:
+        matcher = ChecklistMatcher(itens, build_tolerant_pattern)
+        resultados = matcher.buscar(texto_normalizado)
+    """
+
+    def __init__(
+        self,
+        itens: List[Dict[str, Any]],
+        construir_padrao: Optional[Callable[[str], str]] = None,
+    ):
+        self.itens: List[Dict[str, Any]] = []
+        self._padroes: List[Optional[Pattern]] = []
+
+        for item in itens or []:
+            desc = str(item.get("descricao", "")).strip()
+            self.itens.append({
+                "id": item.get("id") or "",
+                "descricao": desc,
+                "obrigatorio": bool(item.get("obrigatorio", False)),
+            })
+            self._padroes.append(self._compilar_item(item, desc, construir_padrao))
+
+    @staticmethod
+    def _compilar_item(
+        item: Dict[str, Any],
+        desc: str,
+        construir_padrao: Optional[Callable[[str], str]],
+    ) -> Optional[Pattern]:
+        """Regex dobrada que representa o item, ou None se não há o que procurar."""
+        padrao = str(item.get("padrao") or item.get("pattern") or "").strip()
+        if padrao:
+            rx = construir_padrao(padrao) if construir_padrao else padrao
+            try:
+                return re.compile(dobrar_padrao(rx), FLAGS)
+            except re.error:
+                # regex malformada no YAML → busca literal
+                return re.compile(re.escape(dobrar(rx)), FLAGS)
+
+        # fallback heurístico mínimo: primeiras palavras significativas da descrição
+        # (comparadas literalmente, como no rigid_validate original: palavras
+        # acentuadas nunca aparecem no texto dobrado e são descartadas aqui,
+        # evitando uma varredura inútil do documento inteiro)
+        tokens = [w for w in re.split(r"\W+", desc.lower()) if len(w) > 4][:3]
+        tokens = [t for t in tokens if dobrar(t) == t]
+        if not tokens:
+            return None
+        return re.compile("|".join(re.escape(t) for t in tokens), FLAGS)
+
+    def __len__(self) -> int:
+        return len(self.itens)
+
+    def buscar(self, texto: str) -> List[Dict[str, Any]]:
+        """
+        Procura todos os itens em `texto` (já normalizado) e devolve, na ordem
+        do checklist: {id, descricao, obrigatorio, presente, inicio, fim, trecho}.
+        Offsets referem-se a `texto`; inicio/fim/trecho são None se ausente.
+        """
+        texto = texto or ""
+        dobrado = dobrar(texto)
+        resultados = []
+        for item, padrao in zip(self.itens, self._padroes):
+            m = padrao.search(dobrado) if padrao is not None else None
+            res = dict(item, presente=m is not None, inicio=None, fim=None, trecho=None)
+            if m is not None:
+                ini, fim = m.start(), m.end()
+                res["inicio"], res["fim"] = ini, fim
+                res["trecho"] = texto[max(0, ini - CONTEXTO_TRECHO):fim + CONTEXTO_TRECHO].strip()
+            resultados.append(res)
+        return resultados
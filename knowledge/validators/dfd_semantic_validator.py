@@ -4,32 +4,10 @@
 from __future__ import annotations
 from typing import List, Dict, Tuple
 from openai import OpenAI
-import json
-import re
-
-def _extract_json(s: str) -> list:
-    """
-    Extrai JSON válido da resposta do modelo.
-    Retorna sempre uma lista de dicionários.
-    """
-    s = s.strip().strip("`").replace("```json", "").replace("```", "").strip()
-
-    try:
-        data = json.loads(s)
-        if isinstance(data, list):
-            return data
-        if isinstance(data, dict) and "itens" in data:
-            return data["itens"]
-    except Exception:
-        pass
-
-    # fallback regex
-    m = re.search(r"(\[.*\])", s, flags=re.S)
-    if m:
-        return json.loads(m.group(1))
-
-    raise ValueError("❌ Não foi possível extrair JSON válido da resposta do modelo.")
+from knowledge.validators.resposta_llm import extrair_json
+from knowledge.validators.result_cache import cache_semantico
 
+@cache_semantico("dfd", None, __file__, "gpt-4o-mini")
 def semantic_validate_dfd(doc_text: str, client: OpenAI) -> Tuple[float, List[Dict]]:
     """
     Retorna (score, results), onde:
@@ -74,7 +52,7 @@ def semantic_validate_dfd(doc_text: str, client: OpenAI) -> Tuple[float, List[Di
         )
 
         raw = resp.choices[0].message.content
-        parsed = _extract_json(raw)
+        parsed = extrair_json(raw).get("itens", [])
 
         results: List[Dict] = []
         notas = []
@@ -9,11 +9,13 @@
 from typing import Tuple, List, Dict
 import re
 import json
+from knowledge.validators.result_cache import cache_semantico
 
 # ==========================================================
 # 🧠 Função principal de validação semântica
 # ==========================================================
 
+@cache_semantico("edital", None, __file__, "gpt-4o-mini")
 def semantic_validate_edital(doc_input: str, client) -> Tuple[float, List[Dict]]:
     """
     Executa validação semântica de um texto de Edital.
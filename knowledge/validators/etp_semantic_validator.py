@@ -5,8 +5,9 @@ from __future__ import annotations
 from typing import List, Dict, Tuple
 from pathlib import Path
 import json
-import re
 import yaml
+from knowledge.validators.resposta_llm import truncar as _truncate, extrair_json as _extract_json
+from knowledge.validators.result_cache import cache_semantico
 
 # Caminho para checklist de ETP
 CHECKLIST_PATH = Path("knowledge/etp_checklist.yml")
@@ -15,44 +16,7 @@ def load_checklist_items() -> List[Dict]:
     data = yaml.safe_load(CHECKLIST_PATH.read_text(encoding="utf-8"))
     return data.get("itens", [])
 
-def _truncate(text: str, max_chars: int = 12000) -> str:
-    if len(text) <= max_chars:
-        return text
-    head = text[: max_chars // 2]
-    tail = text[-max_chars // 2 :]
-    return head + "\n\n[[...texto truncado...]]\n\n" + tail
-
-def _extract_json(s: str) -> dict:
-    """
-    Extrai JSON de uma string que pode vir com blocos ```json ou texto extra.
-    Retorna sempre um dict com a chave "itens".
-    """
-    # Limpa blocos markdown e crases extras
-    s = s.strip().strip("`").replace("```json", "").replace("```", "").strip()
-
-    try:
-        data = json.loads(s)
-        # Se o modelo devolver diretamente {"itens": [...]} → ok
-        if isinstance(data, dict) and "itens" in data:
-            return data
-        # Se devolver lista pura → envelopa
-        if isinstance(data, list):
-            return {"itens": data}
-    except Exception:
-        pass
-
-    # Procurar primeiro objeto JSON válido
-    m = re.search(r"(\{.*\})", s, flags=re.S)
-    if m:
-        return json.loads(m.group(1))
-
-    # Procurar lista JSON
-    m2 = re.search(r"(\[.*\])", s, flags=re.S)
-    if m2:
-        return {"itens": json.loads(m2.group(1))}
-
-    raise ValueError("❌ Não foi possível extrair JSON válido da resposta do modelo.")
-
+@cache_semantico("etp", CHECKLIST_PATH, __file__, "gpt-4o-mini")
 def semantic_validate_etp(doc_text: str, client) -> Tuple[float, List[Dict]]:
     """
     Retorna (score, results), onde:
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+# =============================================================================
+# Synapse.IA – Roteamento de modelos (cascata rápido → preciso)
+#
+# A política de cada artefato vem de roteamento_modelos.yml (relido quando o
+# arquivo muda). O validator_engine avalia os itens primeiro com o modelo
+# rápido e usa avaliar_confianca() para decidir, item a item, o que sobe
+# para o modelo preciso:
+#   - esquema: id, adequacao_nota numérica 0..100, presente booleano;
+#   - nota dentro da faixa incerta;
+#   - presença incoerente com a nota;
+#   - autoconsistência: divergência de nota/presença entre amostras.
+# =============================================================================
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import yaml  # pyyaml
+except Exception:
+    yaml = None
+
+try:
+    from utils.knowledge_registry import obter_registry
+except Exception:
+    obter_registry = None
+
+ROTEAMENTO_PATH = Path(__file__).resolve().parent / "roteamento_modelos.yml"
+
+_PADRAO = {
+    "cascata": True,
+    "rapido": "gpt-4o-mini",
+    "preciso": "gpt-4o",
+    "amostras": 1,
+    "faixa_incerta": [35, 65],
+    "divergencia_max": 15,
+}
+
+
+@dataclass(frozen=True)
+class PoliticaModelos:
+    cascata: bool
+    rapido: str
+    preciso: str
+    amostras: int
+    faixa_incerta: Tuple[float, float]
+    divergencia_max: float
+
+    @property
+    def assinatura(self) -> str:
+        """Identifica a política nas chaves de cache (veredictos e resultados)."""
+        if not self.cascata:
+            return self.preciso
+        ini, fim = self.faixa_incerta
+        return f"{self.rapido}>{self.preciso}:a{self.amostras}:f{ini:g}-{fim:g}:d{self.divergencia_max:g}"
+
+
+def _ler_config() -> Dict[str, Any]:
+    if yaml is None or not ROTEAMENTO_PATH.exists():
+        return {}
+    if obter_registry is not None:
+        return obter_registry().ler_yaml(ROTEAMENTO_PATH) or {}
+    with ROTEAMENTO_PATH.open("r", encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
+
+
+def cascata_ativa() -> bool:
+    return os.getenv("SYNAPSE_CASCATA", "1").strip().lower() not in ("0", "false", "nao", "não")
+
+
+def politica_modelos(artefato: str) -> PoliticaModelos:
+    """Política do artefato: padrão do YAML + sobrescritas de "artefatos"."""
+    config = _ler_config()
+    campos = dict(_PADRAO)
+    campos.update(config.get("padrao") or {})
+    campos.update((config.get("artefatos") or {}).get((artefato or "").upper()) or {})
+    faixa = campos.get("faixa_incerta") or [0, -1]
+    return PoliticaModelos(
+        cascata=bool(campos["cascata"]) and cascata_ativa(),
+        rapido=str(campos["rapido"]),
+        preciso=str(campos["preciso"]),
+        amostras=max(1, int(campos["amostras"])),
+        faixa_incerta=(float(faixa[0]), float(faixa[1])),
+        divergencia_max=float(campos["divergencia_max"]),
+    )
+
+
+def _nota(item: Dict[str, Any]) -> Optional[float]:
+    try:
+        nota = float(item.get("adequacao_nota"))
+    except (TypeError, ValueError):
+        return None
+    return nota if 0 <= nota <= 100 else None
+
+
+def avaliar_confianca(
+    amostras: Sequence[Optional[Dict[str, Any]]],
+    politica: PoliticaModelos,
+) -> Tuple[bool, List[str]]:
+    """
+    Confiança do veredicto do modelo rápido para um item, dadas as respostas
+    de cada amostra (None = item ausente). Retorna (confiável, motivos).
+    """
+    motivos: List[str] = []
+    if not amostras or any(a is None for a in amostras):
+        return False, ["item ausente na resposta"]
+
+    notas = [_nota(a) for a in amostras]
+    if any(n is None for n in notas):
+        motivos.append("adequacao_nota fora do esquema")
+    if any("presente" in a and not isinstance(a["presente"], bool) for a in amostras):
+        motivos.append("presente fora do esquema")
+    if motivos:
+        return False, motivos
+
+    nota = notas[0]
+    ini, fim = politica.faixa_incerta
+    if ini <= nota <= fim:
+        motivos.append(f"nota {nota:g} na faixa incerta")
+    presente = amostras[0].get("presente")
+    if (presente is False and nota >= 50) or (presente is True and nota < 20):
+        motivos.append("presença incoerente com a nota")
+    if len(amostras) > 1:
+        if max(notas) - min(notas) > politica.divergencia_max:
+            motivos.append(f"amostras divergem ({min(notas):g}–{max(notas):g})")
+        if len({a.get("presente") for a in amostras}) > 1:
+            motivos.append("amostras divergem na presença")
+    return not motivos, motivos
+
+
+def custo_usd(modelo: str, tokens_entrada: int, tokens_saida: int) -> float:
+    """Custo estimado da chamada pela tabela custos_usd_por_milhao do YAML."""
+    tabela = (_ler_config().get("custos_usd_por_milhao") or {}).get(modelo) or {}
+    return (
+        tokens_entrada * float(tabela.get("entrada", 0.0))
+        + tokens_saida * float(tabela.get("saida", 0.0))
+    ) / 1_000_000
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+# =============================================================================
+# Synapse.IA – Registro de validadores (plugins carregados sob demanda)
+#
+# Cada artefato (DFD, ETP, TR, Edital, Contrato...) é um plugin com:
+#   - checklist YAML em knowledge/validators/{slug}_checklist*.yml, usado pelo
+#     validator_engine (validação rígida compilada + semântica em grupos, com
+#     os caches de resultado e de veredictos);
+#   - opcionalmente, o validador semântico específico legado
+#     ("modulo:funcao"), importado só na primeira vez que é pedido; o
+#     validator_engine recorre a ele quando o artefato não tem checklist.
+#
+# Antes, um engine paralelo importava os 11 módulos *_semantic_validator
+# (e, com eles, openai/pandas) só para escolher um no if/elif. Novos
+# artefatos entram com registrar(); nomes livres ("Pesquisa de Preços",
+# "Contrato Técnico") são resolvidos por normalizar_artefato().
+# =============================================================================
+from __future__ import annotations
+
+import importlib
+import threading
+import unicodedata
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+_PACOTE = "knowledge.validators"
+
+
+@dataclass(frozen=True)
+class PluginValidador:
+    artefato: str
+    rotulo: str
+    semantico: Optional[str] = None   # "modulo:funcao" relativo ao pacote
+    apelidos: tuple = ()
+
+    @property
+    def slug(self) -> str:
+        return self.artefato.lower()
+
+
+_PLUGINS: Dict[str, PluginValidador] = {}
+_APELIDOS: Dict[str, str] = {}
+_CARREGADOS: Dict[str, Callable[..., Any]] = {}
+_LOCK = threading.Lock()
+
+
+def _chave(nome: str) -> str:
+    base = unicodedata.normalize("NFKD", nome or "")
+    base = "".join(c for c in base if not unicodedata.combining(c))
+    return "_".join(base.upper().replace("-", " ").split())
+
+
+def registrar(
+    artefato: str,
+    rotulo: Optional[str] = None,
+    semantico: Optional[str] = None,
+    apelidos: tuple = (),
+) -> PluginValidador:
+    """Registra (ou substitui) o plugin do artefato."""
+    chave = _chave(artefato)
+    plugin = PluginValidador(chave, rotulo or artefato, semantico, tuple(apelidos))
+    with _LOCK:
+        _PLUGINS[chave] = plugin
+        _CARREGADOS.pop(chave, None)
+        for apelido in (chave, *plugin.apelidos):
+            _APELIDOS[_chave(apelido)] = chave
+    return plugin
+
+
+def normalizar_artefato(nome: str) -> str:
+    """Nome canônico do artefato ("Pesquisa de Preços" → "PESQUISA_PRECOS")."""
+    chave = _chave(nome)
+    return _APELIDOS.get(chave, chave)
+
+
+def obter_plugin(nome: str) -> Optional[PluginValidador]:
+    return _PLUGINS.get(normalizar_artefato(nome))
+
+
+def artefatos_suportados() -> List[str]:
+    return list(_PLUGINS)
+
+
+def carregar_semantico(nome: str) -> Optional[Callable[..., Any]]:
+    """
+    Validador semântico específico do artefato, importado na primeira chamada.
+    Retorna None se o artefato não tem validador específico.
+    """
+    plugin = obter_plugin(nome)
+    if plugin is None or not plugin.semantico:
+        return None
+    with _LOCK:
+        fn = _CARREGADOS.get(plugin.artefato)
+    if fn is not None:
+        return fn
+    modulo, funcao = plugin.semantico.split(":")
+    fn = getattr(importlib.import_module(f"{_PACOTE}.{modulo}"), funcao)
+    with _LOCK:
+        _CARREGADOS[plugin.artefato] = fn
+    return fn
+
+
+# -----------------------------------------------------------------------------
+# Artefatos do pacote
+# -----------------------------------------------------------------------------
+registrar("DFD", "Documento de Formalização da Demanda", "dfd_semantic_validator:semantic_validate_dfd")
+registrar("PCA", "Plano de Contratações Anual", "pca_semantic_validator:semantic_validate_pca")
+registrar("ETP", "Estudo Técnico Preliminar", "etp_semantic_validator:semantic_validate_etp")
+registrar("TR", "Termo de Referência", "tr_semantic_validator:semantic_validate_tr",
+          apelidos=("Termo de Referencia",))
+registrar("PESQUISA_PRECOS", "Pesquisa de Preços",
+          "pesquisa_precos_semantic_validator:semantic_validate_pesquisa_precos",
+          apelidos=("Pesquisa de Precos",))
+registrar("MAPA_RISCOS", "Mapa de Riscos", "mapa_riscos_semantic_validator:semantic_validate_mapa_riscos",
+          apelidos=("Mapa de Riscos", "Matriz de Riscos"))
+registrar("EDITAL", "Edital", "edital_semantic_validator:semantic_validate_edital")
+registrar("CONTRATO", "Contrato", "contrato_semantic_validator:semantic_validate_contrato")
+registrar("CONTRATO_TECNICO", "Contrato Técnico",
+          "contrato_tecnico_semantic_validator:semantic_validate_contrato_tecnico")
+registrar("OBRAS", "Obras e Serviços de Engenharia", "obras_semantic_validator:semantic_validate_obras")
+registrar("FISCALIZACAO", "Fiscalização", "fiscalizacao_semantic_validator:semantic_validate_fiscalizacao")
+registrar("ITF", "Instrumento de Planejamento (Justificativa Técnica e Finalística)",
+          "itf_semantic_validator:semantic_validate_itf")
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+# =============================================================================
+# Synapse.IA – Utilitários comuns dos validadores semânticos específicos
+#
+# Os módulos *_semantic_validator (plugins do registro) tinham, cada um, sua
+# cópia de _truncate e _extract_json. Ficam aqui, uma vez só.
+# =============================================================================
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Dict
+
+MAX_CHARS_DOCUMENTO = 12000
+
+
+def truncar(texto: str, max_chars: int = MAX_CHARS_DOCUMENTO) -> str:
+    """Mantém início e fim do documento quando ele passa de max_chars."""
+    if len(texto) <= max_chars:
+        return texto
+    return texto[: max_chars // 2] + "\n\n[[...texto truncado...]]\n\n" + texto[-max_chars // 2 :]
+
+
+def extrair_json(s: str) -> Dict[str, Any]:
+    """
+    Extrai JSON de uma resposta que pode vir com blocos ```json ou texto extra.
+    Lista pura é envelopada em {"itens": [...]}.
+    """
+    s = s.strip().strip("`").replace("```json", "").replace("```", "").strip()
+    try:
+        data = json.loads(s)
+        if isinstance(data, dict) and "itens" in data:
+            return data
+        if isinstance(data, list):
+            return {"itens": data}
+    except Exception:
+        pass
+
+    m = re.search(r"(\{.*\})", s, flags=re.S)
+    if m:
+        return json.loads(m.group(1))
+    m2 = re.search(r"(\[.*\])", s, flags=re.S)
+    if m2:
+        return {"itens": json.loads(m2.group(1))}
+    raise ValueError("❌ Não foi possível extrair JSON válido da resposta do modelo.")
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+# =============================================================================
+# Synapse.IA – Cache persistente de resultados de validação
+#
+# validate_document (validator_engine e validator_engine_vNext) e os
+# *_semantic_validator recalculavam tudo para entradas idênticas a cada
+# rerun do Streamlit. Aqui o resultado completo (inclusive improved_document
+# / guided_markdown) é gravado sob a chave:
+#
+#     sha256(namespace, texto normalizado, hash dos checklists YAML, versão)
+#
+# onde "versão" combina o modelo e o hash do código-fonte do validador
+# (prompt). Alterar um checklist, o prompt ou o modelo muda a chave e
+# invalida automaticamente os resultados antigos.
+#
+# Desative com a variável de ambiente SYNAPSE_CACHE_VALIDACAO=0.
+# =============================================================================
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+RESULTADOS_DIR = BASE_DIR / "exports" / "cache" / "resultados_validacao"
+
+_HASHES_ARQUIVO: Dict[str, Tuple[Tuple[int, int], str]] = {}
+_LOCK = threading.Lock()
+
+
+def cache_ativo() -> bool:
+    return os.getenv("SYNAPSE_CACHE_VALIDACAO", "1").strip().lower() not in ("0", "false", "nao", "não")
+
+
+def hash_arquivo(caminho: Path | str | None) -> str:
+    """Hash do conteúdo do arquivo (memorizado por mtime/tamanho); "" se ausente."""
+    if not caminho:
+        return ""
+    caminho = Path(caminho)
+    if not caminho.is_absolute():
+        caminho = BASE_DIR / caminho
+    try:
+        st = caminho.stat()
+    except OSError:
+        return ""
+    assinatura = (st.st_mtime_ns, st.st_size)
+    chave = str(caminho)
+    with _LOCK:
+        memo = _HASHES_ARQUIVO.get(chave)
+        if memo and memo[0] == assinatura:
+            return memo[1]
+    digest = hashlib.sha256(caminho.read_bytes()).hexdigest()
+    with _LOCK:
+        _HASHES_ARQUIVO[chave] = (assinatura, digest)
+    return digest
+
+
+def chave_resultado(
+    namespace: str,
+    texto: str,
+    checklists: Iterable[Path | str | None] = (),
+    versao: str = "",
+) -> str:
+    """Chave do resultado: texto normalizado + checklists + versão (modelo/prompt)."""
+    partes = [
+        namespace,
+        " ".join((texto or "").split()),
+        [hash_arquivo(c) for c in checklists],
+        versao,
+    ]
+    return hashlib.sha256(json.dumps(partes, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def _caminho(chave: str, destino: Optional[Path]) -> Path:
+    return Path(destino or RESULTADOS_DIR) / chave[:2] / f"{chave}.json"
+
+
+def ler_resultado(chave: str, destino: Optional[Path] = None) -> Optional[Any]:
+    try:
+        with _caminho(chave, destino).open("r", encoding="utf-8") as f:
+            return json.load(f)["resultado"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def gravar_resultado(chave: str, resultado: Any, destino: Optional[Path] = None) -> None:
+    caminho = _caminho(chave, destino)
+    try:
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        tmp = caminho.with_suffix(f".{threading.get_ident()}.tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump({"resultado": resultado}, f, ensure_ascii=False)
+        os.replace(tmp, caminho)
+    except (OSError, TypeError, ValueError) as e:
+        print(f"[result_cache] ⚠️ Não foi possível gravar o resultado: {e}")
+
+
+def obter_ou_calcular(
+    chave: str,
+    calcular: Callable[[], Any],
+    cacheavel: Callable[[Any], bool] = lambda r: True,
+    destino: Optional[Path] = None,
+) -> Tuple[Any, bool]:
+    """Retorna (resultado, veio_do_cache). Só grava resultados cacheáveis."""
+    if cache_ativo():
+        em_cache = ler_resultado(chave, destino)
+        if em_cache is not None:
+            return em_cache, True
+    resultado = calcular()
+    if cache_ativo() and cacheavel(resultado):
+        gravar_resultado(chave, resultado, destino)
+    return resultado, False
+
+
+def versao_modulo(arquivo: str, modelo: str = "") -> str:
+    """Versão do prompt = hash do código-fonte do validador (+ modelo)."""
+    return f"{modelo}:{hash_arquivo(arquivo)[:16]}"
+
+
+def _semantico_cacheavel(resultado: Any) -> bool:
+    if not isinstance(resultado, (tuple, list)) or len(resultado) != 2:
+        return False
+    itens = resultado[1] or []
+    return bool(itens) and not any(isinstance(i, dict) and i.get("id") == "erro" for i in itens)
+
+
+def cache_semantico(namespace: str, checklist: Path | str | None, arquivo: str, modelo: str) -> Callable:
+    """
+    Decorador para validadores semânticos fn(doc_text, client, ...) → (score, itens).
+    Respostas com item de erro ("id": "erro") ou vazias não são gravadas.
+    """
+    def decorador(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def envoltorio(doc_text: str, client: Any = None, *args, **kwargs):
+            if client is None or args or kwargs:
+                return fn(doc_text, client, *args, **kwargs)
+            chave = chave_resultado(namespace, doc_text, [checklist], versao_modulo(arquivo, modelo))
+            resultado, _ = obter_ou_calcular(
+                chave, lambda: fn(doc_text, client), cacheavel=_semantico_cacheavel
+            )
+            return tuple(resultado)
+        return envoltorio
+    return decorador
@@ -2,7 +2,9 @@
 from __future__ import annotations
 from typing import List, Dict, Tuple
 from pathlib import Path
-import json, re, yaml
+import json, yaml
+from knowledge.validators.resposta_llm import truncar as _truncate, extrair_json as _extract_json
+from knowledge.validators.result_cache import cache_semantico
 
 CHECKLIST_PATH = Path("knowledge/tr_checklist.yml")
 
@@ -10,21 +12,7 @@ def load_checklist_items() -> List[Dict]:
     data = yaml.safe_load(CHECKLIST_PATH.read_text(encoding="utf-8"))
     return data.get("itens", [])
 
-def _truncate(text: str, max_chars: int = 12000) -> str:
-    if len(text) <= max_chars: return text
-    return text[: max_chars // 2] + "\n\n[[...texto truncado...]]\n\n" + text[-max_chars // 2 :]
-
-def _extract_json(s: str) -> dict:
-    m = re.search(r"```json\s*(\{.*?\})\s*```", s, flags=re.S | re.I)
-    if m: return json.loads(m.group(1))
-    m2 = re.search(r"(\{.*\})", s, flags=re.S)
-    if m2:
-        try: return json.loads(m2.group(1))
-        except Exception: pass
-    m3 = re.search(r"(\[.*\])", s, flags=re.S)
-    if m3: return {"itens": json.loads(m3.group(1))}
-    raise ValueError("Não foi possível extrair JSON da resposta do modelo.")
-
+@cache_semantico("tr", CHECKLIST_PATH, __file__, "gpt-4o-mini")
 def semantic_validate_tr(doc_text: str, client) -> Tuple[float, List[Dict]]:
     itens = load_checklist_items()
     if not itens: return 0.0, []
@@ -6,18 +6,23 @@
 # O que há de novo:
 # - Normalização robusta de texto para reduzir falsos-negativos no rígido.
 # - Regex tolerantes para padrões frequentes (ex.: Lei 14.133/2021).
-# - Validação semântica com análise profunda (gpt-4o, temperature=0).
+# - Validação semântica com análise profunda (cascata gpt-4o-mini → gpt-4o,
+#   temperature=0; ver roteamento_modelos.yml).
 # - Geração de "Documento Orientado" (Markdown) sem duplicidades.
 # - Retorno estruturado compatível com synapse_chat.py:
 #     rigid_score, rigid_result, semantic_score, semantic_result, improved_document
 # =============================================================================
 from __future__ import annotations
 
+import bisect
 import os
 import re
 import glob
 import json
+import threading
+import time
 import unicodedata
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional, Tuple
 
 # YAML
@@ -26,6 +31,19 @@ try:
 except Exception:
     yaml = None  # mantemos o engine funcional mesmo sem pyyaml (mas recomendamos instalar)
 
+# Registro compartilhado de ativos (cache de YAML por processo)
+try:
+    from utils.knowledge_registry import obter_registry
+except Exception:
+    obter_registry = None
+
+from knowledge.validators import checklist_matcher
+from knowledge.validators.checklist_matcher import CONTEXTO_TRECHO, ChecklistMatcher
+from knowledge.validators.model_router import PoliticaModelos, avaliar_confianca, politica_modelos
+from knowledge.validators.registry import carregar_semantico, normalizar_artefato, obter_plugin
+from knowledge.validators.result_cache import chave_resultado, obter_ou_calcular, versao_modulo
+from knowledge.validators.verdict_cache import chave_item, hash_secao, obter_cache
+
 # OpenAI (SDK 2024+)
 try:
     from openai import OpenAI
@@ -36,27 +54,200 @@ except Exception:
 # =============================================================================
 # Utilitários de normalização e suporte
 # =============================================================================
+# Substituições comuns (Word/PDF)
+_REPLACEMENTS = {
+    "\u00A0": " ",   # non-breaking space
+    "\u200B": "",    # zero width space
+    "–": "-", "—": "-",  # dashes → hífen
+    "“": '"', "”": '"', "‘": "'", "’": "'",  # aspas curvas → retas
+}
+_MULTI_SPACES = re.compile(r"[ \t]{2,}|\t")
+
+
+def _normalize_line(line: str) -> str:
+    # NFKC e substituições só em linhas não-ASCII (a maioria é ASCII puro)
+    if not line.isascii():
+        line = unicodedata.normalize("NFKC", line)
+        for k, v in _REPLACEMENTS.items():
+            if k in line:
+                line = line.replace(k, v)
+    if "  " in line or "\t" in line:
+        line = _MULTI_SPACES.sub(" ", line)
+    return line
+
+
 def normalize_text(text: str) -> str:
-    """Normaliza texto para melhorar matching no rígido."""
+    """
+    Normaliza texto para melhorar matching no rígido.
+
+    Processa linha a linha (NFKC não combina caracteres através de quebras
+    de linha): colapsa espaços/tabs e reduz cada sequência de espaços em
+    branco que contenha quebra de linha a uma única quebra.
+    """
     if not text:
         return ""
-    t = unicodedata.normalize("NFKC", text)
-
-    # Substituições comuns (Word/PDF)
-    replacements = {
-        "\u00A0": " ",   # non-breaking space
-        "\u200B": "",    # zero width space
-        "–": "-", "—": "-",  # dashes → hífen
-        "“": '"', "”": '"', "‘": "'", "’": "'",  # aspas curvas → retas
-    }
-    for k, v in replacements.items():
-        t = t.replace(k, v)
+    lines = [_normalize_line(line) for line in text.split("\n")]
+    if len(lines) == 1:
+        return lines[0]
+    middle = [line.strip() for line in lines[1:-1]]
+    return "\n".join([lines[0].rstrip()] + [line for line in middle if line] + [lines[-1].lstrip()])
+
+
+class MapaOffsets:
+    """
+    Mapa posição no texto normalizado → posição no texto original.
+
+    Guarda só o início de cada linha mantida (custo ≈ normalize_text); o
+    mapa caractere a caractere de uma linha é calculado sob demanda, apenas
+    para as linhas onde houve acerto.
+    """
+
+    def __init__(self, linhas: List[str]):
+        self._linhas = linhas
+        self.tamanho_original = sum(len(l) for l in linhas) + max(0, len(linhas) - 1)
+        self._ini_norm: List[int] = []   # início da linha no texto normalizado
+        self._ini_orig: List[int] = []   # início da linha no texto original
+        self._idx: List[int] = []        # índice da linha original
+        self._corte: List[int] = []      # caracteres removidos do início (strip)
+        self._tam: List[int] = []        # tamanho da linha normalizada mantida
+        self._quebras: Dict[int, List[Tuple[int, int]]] = {}
+
+    def _adicionar_linha(self, ini_norm: int, ini_orig: int, idx: int, corte: int, tam: int) -> None:
+        self._ini_norm.append(ini_norm)
+        self._ini_orig.append(ini_orig)
+        self._idx.append(idx)
+        self._corte.append(corte)
+        self._tam.append(tam)
+
+    def original(self, pos: int) -> int:
+        """Posição no texto original do caractere `pos` do texto normalizado."""
+        k = bisect.bisect_right(self._ini_norm, pos) - 1
+        if k < 0:
+            return 0
+        linha = self._linhas[self._idx[k]]
+        rel = pos - self._ini_norm[k]
+        if rel >= self._tam[k]:
+            # "\n" de junção → quebra de linha que encerra a linha original
+            return min(self._ini_orig[k] + len(linha), self.tamanho_original)
+        if self._idx[k] not in self._quebras:
+            self._quebras[self._idx[k]] = _normalize_line_com_mapa(linha)[1]
+        quebras = self._quebras[self._idx[k]]
+        alvo = self._corte[k] + rel
+        q = bisect.bisect_right(quebras, (alvo, float("inf"))) - 1
+        q_saida, q_linha = quebras[max(q, 0)]
+        return min(self._ini_orig[k] + q_linha + (alvo - q_saida), self.tamanho_original)
+
+    def intervalo(self, inicio: int, fim: int) -> Tuple[int, int]:
+        """Converte o intervalo [inicio, fim) do normalizado para o original."""
+        if fim <= inicio:
+            pos = self.original(inicio)
+            return pos, pos
+        return self.original(inicio), self.original(fim - 1) + 1
+
+
+def _normalize_line_com_mapa(line: str) -> Tuple[str, List[Tuple[int, int]]]:
+    """
+    Mesmo resultado de _normalize_line, com os pontos de quebra
+    (posição na saída, posição na linha) do mapa de offsets.
+    """
+    if line.isascii() or (
+        unicodedata.is_normalized("NFKC", line) and not any(k in line for k in _REPLACEMENTS)
+    ):
+        # Só o colapso de espaços altera a linha
+        if "  " not in line and "\t" not in line:
+            return line, [(0, 0)]
+        partes: List[str] = []
+        quebras: List[Tuple[int, int]] = []
+        saida = ultimo = 0
+        for m in _MULTI_SPACES.finditer(line):
+            if m.start() > ultimo:
+                quebras.append((saida, ultimo))
+                partes.append(line[ultimo:m.start()])
+                saida += m.start() - ultimo
+            quebras.append((saida, m.start()))
+            partes.append(" ")
+            saida += 1
+            ultimo = m.end()
+        if ultimo < len(line):
+            quebras.append((saida, ultimo))
+            partes.append(line[ultimo:])
+        return "".join(partes), quebras
+
+    # NFKC por grupo (caractere base + marcas combinantes) e substituições
+    chars: List[str] = []
+    origens: List[int] = []
+    inicio = 0
+    for fim in range(1, len(line) + 1):
+        if fim < len(line) and unicodedata.combining(line[fim]):
+            continue
+        for c in unicodedata.normalize("NFKC", line[inicio:fim]):
+            for cc in _REPLACEMENTS.get(c, c):
+                chars.append(cc)
+                origens.append(inicio)
+        inicio = fim
+
+    # Colapso de espaços ([ \t]{2,} ou \t → " ")
+    saida_chars: List[str] = []
+    quebras = []
+    i = 0
+    while i < len(chars):
+        j = i
+        while j < len(chars) and chars[j] in " \t":
+            j += 1
+        if j - i >= 2 or (j > i and chars[i] == "\t"):
+            quebras.append((len(saida_chars), origens[i]))
+            saida_chars.append(" ")
+            i = j
+            continue
+        if j == i:
+            j = i + 1
+        for k in range(i, j):
+            quebras.append((len(saida_chars), origens[k]))
+            saida_chars.append(chars[k])
+        i = j
 
-    # Colapsa múltiplos espaços e arruma quebras
-    t = re.sub(r"[ \t]+", " ", t)
-    t = re.sub(r"\s+\n", "\n", t)
-    t = re.sub(r"\n\s+", "\n", t)
-    return t
+    saida = "".join(saida_chars)
+    if saida != _normalize_line(line):
+        # composição entre grupos (raro): mapa aproximado pelo início da linha
+        return _normalize_line(line), [(0, 0)]
+    return saida, quebras
+
+
+def normalize_text_with_map(text: str) -> Tuple[str, MapaOffsets]:
+    """
+    normalize_text + mapa de offsets para o texto original: permite devolver
+    o trecho exato do documento de cada acerto do checklist.
+    """
+    if not text:
+        return "", MapaOffsets([""])
+
+    linhas = text.split("\n")
+    mapa = MapaOffsets(linhas)
+    ultima = len(linhas) - 1
+    partes: List[str] = []
+    pos_norm = pos_orig = 0
+    for idx, linha in enumerate(linhas):
+        saida = _normalize_line(linha)
+        if ultima == 0:
+            mantida = saida
+        elif idx == 0:
+            mantida = saida.rstrip()
+        elif idx == ultima:
+            mantida = saida.lstrip()
+        else:
+            mantida = saida.strip()
+
+        if mantida or idx in (0, ultima):
+            if partes:
+                partes.append("\n")
+                pos_norm += 1
+            corte = len(saida) - len(saida.lstrip()) if idx > 0 else 0
+            mapa._adicionar_linha(pos_norm, pos_orig, idx, corte, len(mantida))
+            partes.append(mantida)
+            pos_norm += len(mantida)
+        pos_orig += len(linha) + 1
+
+    return "".join(partes), mapa
 
 
 def remove_accents(s: str) -> str:
@@ -78,10 +269,12 @@ def find_checklist_file(artefato: str) -> Optional[str]:
     """
     Procura o arquivo do checklist no padrão:
       knowledge/validators/{slug}_checklist*.yml
-    e prioriza o nome "simples" se houver múltiplos.
+    e prioriza o nome "simples" se houver múltiplos. O slug vem do plugin
+    do registro ("Pesquisa de Preços" → pesquisa_precos).
     """
-    base_dir = os.path.join("knowledge", "validators")
-    slug = slug_from_artefato(artefato)
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    plugin = obter_plugin(artefato)
+    slug = plugin.slug if plugin is not None else slug_from_artefato(artefato)
     candidates = glob.glob(os.path.join(base_dir, f"{slug}_checklist*.yml"))
     if candidates:
         candidates.sort(key=lambda p: (len(os.path.basename(p)), p))
@@ -97,8 +290,12 @@ def load_checklist(artefato: str) -> List[Dict[str, Any]]:
     path = find_checklist_file(artefato)
     if not path or not os.path.exists(path):
         return []
-    with open(path, "r", encoding="utf-8") as f:
-        data = yaml.safe_load(f) or {}
+    if obter_registry is not None:
+        # YAML interpretado uma vez por processo (invalidado se o arquivo mudar)
+        data = obter_registry().ler_yaml(path) or {}
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            data = yaml.safe_load(f) or {}
 
     # Aceita "items", "itens" ou lista raiz
     if isinstance(data, list):
@@ -147,56 +344,77 @@ def build_tolerant_pattern(padrao: str) -> str:
     return padrao
 
 
-def rigid_validate(document_text: str, artefato: str) -> Tuple[float, List[Dict[str, Any]]]:
+_MATCHERS: Dict[str, Tuple[Tuple[int, int], ChecklistMatcher]] = {}
+_MATCHERS_LOCK = threading.Lock()
+
+
+def get_checklist_matcher(artefato: str) -> Optional[ChecklistMatcher]:
     """
-    Validação rígida: utiliza regex (padrões no YAML) com normalização robusta.
+    ChecklistMatcher compilado do artefato, reaproveitado enquanto o YAML
+    não mudar (mtime/tamanho). Retorna None se não houver checklist.
     """
-    text = normalize_text(document_text or "")
-    text_no_accents = remove_accents(text).lower()
+    path = find_checklist_file(artefato)
+    if not path or not os.path.exists(path):
+        return None
+    st = os.stat(path)
+    assinatura = (st.st_mtime_ns, st.st_size)
+    chave = os.path.abspath(path)
+    with _MATCHERS_LOCK:
+        cache = _MATCHERS.get(chave)
+        if cache is not None and cache[0] == assinatura:
+            return cache[1]
+    matcher = ChecklistMatcher(load_checklist(artefato), build_tolerant_pattern)
+    with _MATCHERS_LOCK:
+        _MATCHERS[chave] = (assinatura, matcher)
+    return matcher
+
+
+def _rigid_scan(document_text: str, artefato: str) -> Optional[Tuple[str, MapaOffsets, List[Dict[str, Any]]]]:
+    """
+    Varredura do checklist no texto normalizado: (texto normalizado, mapa de
+    offsets, resultados com offsets no texto normalizado). None sem checklist.
+    """
+    matcher = get_checklist_matcher(artefato)
+    if matcher is None or len(matcher) == 0:
+        return None
+    text, mapa = normalize_text_with_map(document_text or "")
+    return text, mapa, matcher.buscar(text)
 
-    checklist = load_checklist(artefato)
-    results: List[Dict[str, Any]] = []
-    total = len(checklist) if checklist else 0
-    hits = 0
-
-    for item in (checklist or []):
-        desc = item.get("descricao", "").strip()
-        obrig = bool(item.get("obrigatorio", False))
-        padrao = (item.get("padrao") or item.get("pattern") or "").strip()
-        presente = False
-
-        if padrao:
-            # padrão tolerante
-            rx = build_tolerant_pattern(padrao)
-            try:
-                if re.search(rx, text, flags=re.IGNORECASE | re.DOTALL):
-                    presente = True
-                else:
-                    # fallback agressivo: remove acentos
-                    if re.search(remove_accents(rx), text_no_accents, flags=re.IGNORECASE | re.DOTALL):
-                        presente = True
-            except re.error:
-                # regex malformada no YAML → tenta contains simples (em textos normalizados)
-                if rx.lower() in text.lower() or remove_accents(rx).lower() in text_no_accents:
-                    presente = True
-        else:
-            # fallback heurístico mínimo: primeiras palavras significativas da descrição
-            tokens = [w for w in re.split(r"\W+", desc.lower()) if len(w) > 4]
-            presente = any(tok in text_no_accents for tok in tokens[:3])
-
-        if presente:
-            hits += 1
-
-        results.append(
-            {
-                "id": item.get("id") or "",
-                "descricao": desc,
-                "obrigatorio": obrig,
-                "presente": presente,
-            }
-        )
 
-    score = (hits / total * 100.0) if total > 0 else 0.0
+def rigid_evidence(varredura: Optional[Tuple[str, MapaOffsets, List[Dict[str, Any]]]]) -> Dict[str, Tuple[int, int]]:
+    """id → (inicio, fim) no texto normalizado dos itens presentes na varredura."""
+    if varredura is None:
+        return {}
+    return {str(r["id"]): (r["inicio"], r["fim"]) for r in varredura[2] if r["presente"]}
+
+
+def rigid_validate(
+    document_text: str,
+    artefato: str,
+    varredura: Optional[Tuple[str, MapaOffsets, List[Dict[str, Any]]]] = None,
+) -> Tuple[float, List[Dict[str, Any]]]:
+    """
+    Validação rígida: utiliza regex (padrões no YAML) com normalização robusta.
+    O texto é dobrado (sem acentos, minúsculas) uma única vez e cada item é
+    procurado com seu próprio padrão pré-compilado (ChecklistMatcher);
+    cada item presente traz inicio/fim/trecho no texto ORIGINAL (via mapa de
+    offsets da normalização), prontos para localizar a evidência no documento.
+    `varredura` (de _rigid_scan) evita repetir a busca já feita pelo chamador.
+    """
+    varredura = varredura if varredura is not None else _rigid_scan(document_text, artefato)
+    if varredura is None:
+        return 0.0, []
+
+    original = document_text or ""
+    _, mapa, encontrados = varredura
+    results = [dict(r) for r in encontrados]
+    for r in results:
+        if r["presente"]:
+            ini, fim = mapa.intervalo(r["inicio"], r["fim"])
+            r["inicio"], r["fim"] = ini, fim
+            r["trecho"] = original[max(0, ini - CONTEXTO_TRECHO):fim + CONTEXTO_TRECHO].strip()
+    hits = sum(1 for r in results if r["presente"])
+    score = hits / len(results) * 100.0
     return round(score, 1), results
 
 
@@ -209,18 +427,397 @@ SEMANTIC_SYSTEM = (
     "e Resoluções CNJ 651/2025 e 652/2025. Responda de forma objetiva e auditável."
 )
 
+SEMANTIC_INSTRUCTIONS = (
+    "Avalie cada item do CHECKLIST no DOCUMENTO. "
+    "Para cada item, devolva um objeto JSON com os campos: "
+    "id (string), descricao (string), presente (bool), adequacao_nota (0-100, número), "
+    "justificativa (string curta e específica) e faltantes (lista de strings objetivas, opcional). "
+    "Responda SOMENTE uma lista JSON (sem comentários ou texto fora do JSON)."
+)
+
+# Validação semântica fatiada: o checklist é dividido em grupos de itens,
+# cada grupo recebe só as seções do documento relevantes a ele e os grupos
+# rodam em paralelo (latência ≈ grupo mais lento, sem JSON truncado).
+SEMANTIC_MODEL = "gpt-4o"
+SEMANTIC_GROUP_SIZE = 8          # itens por chamada
+SEMANTIC_MAX_WORKERS = 6         # chamadas simultâneas
+SEMANTIC_RETRIES = 2             # novas tentativas por grupo
+SEMANTIC_CONTEXT_CHARS = 16000   # trecho do documento enviado por grupo
+SEMANTIC_TOKENS_PER_ITEM = 250   # orçamento de saída por item do grupo
+SEMANTIC_MAX_TOKENS = 4000
+SEMANTIC_EVIDENCE_WINDOW = 1500  # contexto em cada lado de uma evidência do rígido
+SEMANTIC_SUPPORT_SECTIONS = 3    # seções (no máximo) que sustentam o veredicto de um item
+SEMANTIC_SUPPORT_RATIO = 0.5     # pontuação mínima de apoio, relativa à melhor seção
+SEMANTIC_SAMPLE_TEMPERATURE = 0.7  # amostras extras da autoconsistência (cascata)
+# Versão do prompt/modelo: compõe a chave dos veredictos reaproveitados
+SEMANTIC_VERSION = f"{SEMANTIC_MODEL}/v2"
+
+
+# Pré-checagem determinística: itens de PRESENÇA cujo padrão do YAML achou
+# uma citação normativa (Lei 14.133/2021, Decreto 67.381/2022...) são
+# resolvidos localmente, sem IA; itens de qualidade/adequação e acertos
+# ambíguos sobem para o LLM. No YAML, "pre_check: sim|nao" força o nível.
+# A fração máxima resolvida localmente vem de SYNAPSE_PRECHECK_FRACAO
+# (0 desativa; padrão 1.0).
+PRECHECK_NOTA = 100.0
+_CITACAO_NORMATIVA = re.compile(
+    r"\b(lei|decreto|provimento|resolu[cç][aã]o|portaria|instru[cç][aã]o\s+normativa)\b\D{0,30}\d"
+    r"|\b\d{1,3}[\.\s]?\d{3}\s*/\s*\d{4}\b",
+    re.IGNORECASE,
+)
+_ITEM_QUALITATIVO = re.compile(
+    r"adequa|clar|suficien|coeren|consisten|detalha|objetiv|fundamenta|justific|proporciona|razoab|qualidade"
+)
+_SIM = ("sim", "true", "1")
+_NAO = ("nao", "não", "false", "0")
+
+
+def precheck_fraction() -> float:
+    """Fração máxima de itens resolvidos localmente (SYNAPSE_PRECHECK_FRACAO)."""
+    try:
+        return max(0.0, min(1.0, float(os.getenv("SYNAPSE_PRECHECK_FRACAO", "1.0"))))
+    except ValueError:
+        return 1.0
+
+
+def _pre_check(
+    checklist: List[Dict[str, Any]],
+    text: str,
+    evidencias: Dict[str, Tuple[int, int]],
+    max_fracao: Optional[float] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Veredictos locais (id → item semântico) dos itens com evidência de alta
+    confiança no rígido, limitados a max_fracao do checklist.
+    """
+    max_fracao = precheck_fraction() if max_fracao is None else max_fracao
+    limite = int(len(checklist) * max_fracao)
+    locais: Dict[str, Dict[str, Any]] = {}
+    for idx, it in enumerate(checklist):
+        if len(locais) >= limite:
+            break
+        iid = str(it.get("id", f"item_{idx}"))
+        span = evidencias.get(iid)
+        modo = str(it.get("pre_check", "auto")).strip().lower()
+        if span is None or modo in _NAO:
+            continue
+        descricao = it.get("descricao", "")
+        trecho = text[span[0]:span[1]]
+        if modo not in _SIM and (
+            not (it.get("padrao") or it.get("pattern"))
+            or _ITEM_QUALITATIVO.search(remove_accents(descricao).lower())
+            or not _CITACAO_NORMATIVA.search(trecho)
+        ):
+            continue
+        locais[iid] = {
+            "id": it.get("id", f"item_{idx}"),
+            "descricao": descricao,
+            "presente": True,
+            "adequacao_nota": PRECHECK_NOTA,
+            "justificativa": f"Verificado localmente (pré-checagem determinística): «{trecho.strip()}».",
+            "origem": "local",
+            "reavaliado": False,
+        }
+    return locais
+
+
+def _semantic_groups(itens: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """
+    Agrupa itens consecutivos (ou pelo campo opcional "grupo" do YAML)
+    em lotes de até SEMANTIC_GROUP_SIZE.
+    """
+    por_grupo: Dict[str, List[Dict[str, Any]]] = {}
+    for it in itens:
+        por_grupo.setdefault(str(it.get("grupo") or ""), []).append(it)
+    grupos: List[List[Dict[str, Any]]] = []
+    for membros in por_grupo.values():
+        for i in range(0, len(membros), SEMANTIC_GROUP_SIZE):
+            grupos.append(membros[i:i + SEMANTIC_GROUP_SIZE])
+    return grupos
+
+
+def _index_sections(text: str) -> List[Dict[str, Any]]:
+    """Seções do documento com os termos de título e corpo (calculados uma vez)."""
+    from utils.kb_resumos import dividir_secoes, termos
+
+    secoes = []
+    for titulo, corpo in dividir_secoes(text):
+        bloco = f"{titulo}\n{corpo}".strip()
+        secoes.append({
+            "bloco": bloco,
+            "hash": hash_secao(bloco),
+            "titulo": set(termos(titulo)),
+            "corpo": set(termos(corpo)),
+        })
+    return secoes
+
+
+def _section_score(consulta: set, sec: Dict[str, Any]) -> int:
+    """Termos da consulta no título (peso 2) e no corpo da seção."""
+    return 2 * len(consulta & sec["titulo"]) + len(consulta & sec["corpo"])
+
+
+def _supporting_sections(sections: List[Dict[str, Any]], item: Dict[str, Any]) -> List[str]:
+    """
+    Hashes das seções que sustentam o veredicto do item: as mais bem
+    pontuadas pela descrição (mesma medida de _relevant_context), até
+    SEMANTIC_SUPPORT_SECTIONS e com ao menos SEMANTIC_SUPPORT_RATIO da melhor.
+    Um termo comum solto (ex.: "processo") não amarra o item à seção.
+    Sem nenhuma seção pontuada, todas.
+    """
+    from utils.kb_resumos import termos
+
+    consulta = set(termos(item.get("descricao", "")))
+    ranking = sorted(((-_section_score(consulta, sec), idx) for idx, sec in enumerate(sections)))
+    if not ranking or ranking[0][0] == 0:
+        return [sec["hash"] for sec in sections]
+    minimo = SEMANTIC_SUPPORT_RATIO * -ranking[0][0]
+    apoio = sorted(idx for negativo, idx in ranking[:SEMANTIC_SUPPORT_SECTIONS] if -negativo >= minimo)
+    return [sections[idx]["hash"] for idx in apoio]
+
+
+def _relevant_context(
+    sections: List[Dict[str, Any]],
+    text: str,
+    grupo: List[Dict[str, Any]],
+    max_chars: int = SEMANTIC_CONTEXT_CHARS,
+) -> str:
+    """
+    Seções do documento mais relevantes para os itens do grupo, em ordem
+    original, até max_chars. Documentos curtos seguem inteiros.
+    """
+    if len(text) <= max_chars or len(sections) <= 1:
+        return text[:max_chars]
+
+    from utils.kb_resumos import termos
+
+    consulta = set(termos(" ".join(it.get("descricao", "") for it in grupo)))
+    ranking = sorted((-_section_score(consulta, sec), idx) for idx, sec in enumerate(sections))
+
+    escolhidas, usados = [], 0
+    for negativo, idx in ranking:
+        bloco = sections[idx]["bloco"][:max_chars]
+        if not escolhidas or (negativo < 0 and usados + len(bloco) <= max_chars):
+            escolhidas.append((idx, bloco))
+            usados += len(bloco)
+    escolhidas.sort()
+    return "\n\n[...]\n\n".join(bloco for _, bloco in escolhidas)
+
+
+def _evidence_context(
+    text: str,
+    spans: List[Tuple[int, int]],
+    window: int = SEMANTIC_EVIDENCE_WINDOW,
+) -> str:
+    """
+    Janelas do texto em torno das evidências do rígido (ampliadas até a
+    quebra de linha mais próxima e fundidas quando se sobrepõem).
+    """
+    janelas: List[List[int]] = []
+    for ini, fim in sorted(spans):
+        a = text.rfind("\n", 0, max(0, ini - window)) + 1
+        b = text.find("\n", min(len(text), fim + window))
+        b = len(text) if b < 0 else b
+        if janelas and a <= janelas[-1][1]:
+            janelas[-1][1] = max(janelas[-1][1], b)
+        else:
+            janelas.append([a, b])
+    return "\n\n[...]\n\n".join(text[a:b].strip() for a, b in janelas)
+
+
+def _group_context(
+    sections: List[Dict[str, Any]],
+    text: str,
+    grupo: List[Dict[str, Any]],
+    evidencias: Dict[str, Tuple[int, int]],
+) -> str:
+    """
+    Contexto do grupo: se o rígido localizou todos os itens, só as janelas em
+    torno das evidências (quando menores); senão, as seções relevantes.
+    """
+    contexto = _relevant_context(sections, text, grupo)
+    spans = [evidencias.get(str(it["id"])) for it in grupo]
+    if spans and all(spans):
+        focado = _evidence_context(text, spans)
+        if len(focado) < len(contexto):
+            return focado
+    return contexto
+
+
+def _semantic_group_call(
+    client: Any,
+    grupo: List[Dict[str, Any]],
+    contexto: str,
+    model: str = SEMANTIC_MODEL,
+    temperature: float = 0.0,
+) -> List[Dict[str, Any]]:
+    """
+    Avalia um grupo com novas tentativas (erro de API, JSON inválido ou
+    resposta truncada). Retorna [] se todas as tentativas falharem.
+    """
+    user_content = f"""
+DOCUMENTO:
+\"\"\"{contexto}\"\"\"
+
+CHECKLIST:
+{json.dumps(grupo, ensure_ascii=False, indent=2)}
+
+{SEMANTIC_INSTRUCTIONS}
+"""
+    max_tokens = min(SEMANTIC_MAX_TOKENS, 300 + SEMANTIC_TOKENS_PER_ITEM * len(grupo))
+    for tentativa in range(SEMANTIC_RETRIES + 1):
+        if tentativa:
+            time.sleep(0.5 * 2 ** (tentativa - 1))
+        try:
+            # temperature 0 para consistência e auditabilidade (amostras extras
+            # da autoconsistência usam SEMANTIC_SAMPLE_TEMPERATURE)
+            resp = client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": SEMANTIC_SYSTEM},
+                    {"role": "user", "content": user_content},
+                ],
+                temperature=temperature,
+                max_tokens=max_tokens,
+            )
+            choice = resp.choices[0]
+            if getattr(choice, "finish_reason", None) == "length":
+                max_tokens = min(SEMANTIC_MAX_TOKENS, max_tokens * 2)
+                raise ValueError("resposta truncada")
+            raw = choice.message.content or "[]"
+            # Extrai JSON (alguns modelos incluem rodeios)
+            m = re.search(r"\[.*\]", raw, flags=re.DOTALL)
+            data = json.loads(m.group(0) if m else raw)
+            if isinstance(data, list):
+                return [d for d in data if isinstance(d, dict)]
+            raise ValueError("resposta não é uma lista JSON")
+        except Exception as e:
+            ids = ", ".join(str(it["id"]) for it in grupo)
+            print(f"[validator_engine] ⚠️ Grupo [{ids}] tentativa {tentativa + 1}: {e}")
+    return []
+
+
+def _merge_group(grupo: List[Dict[str, Any]], data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Alinha a resposta aos itens do grupo (por id; na falta, por posição)."""
+    por_id = {str(d.get("id")): d for d in data}
+    merged = []
+    for pos, it in enumerate(grupo):
+        d = por_id.get(str(it["id"]))
+        if d is None and len(data) == len(grupo):
+            d = data[pos]
+        if d is not None:
+            merged.append({**d, "id": it["id"], "descricao": d.get("descricao") or it["descricao"]})
+    return merged
+
+
+def _run_groups(
+    client: Any,
+    itens: List[Dict[str, Any]],
+    contexto: Any,
+    model: str,
+    amostras: int = 1,
+) -> List[Tuple[List[Dict[str, Any]], List[List[Dict[str, Any]]]]]:
+    """Avalia os itens em grupos concorrentes: [(grupo, [resposta por amostra])]."""
+    grupos = _semantic_groups(itens)
+    temperaturas = [0.0] + [SEMANTIC_SAMPLE_TEMPERATURE] * (amostras - 1)
+    with ThreadPoolExecutor(max_workers=min(SEMANTIC_MAX_WORKERS, len(grupos) * len(temperaturas))) as pool:
+        futuros = []
+        for g in grupos:
+            ctx = contexto(g)
+            futuros.append([pool.submit(_semantic_group_call, client, g, ctx, model, t) for t in temperaturas])
+        return [(g, [_merge_group(g, f.result()) for f in fs]) for g, fs in zip(grupos, futuros)]
+
+
+def _evaluate_pending(
+    client: Any,
+    pendentes: List[Dict[str, Any]],
+    contexto: Any,
+    politica: PoliticaModelos,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Veredictos (id → item) dos itens pendentes segundo a política de modelos:
+    sem cascata, tudo no modelo preciso; com cascata, o modelo rápido avalia
+    todos e só os itens de baixa confiança (model_router.avaliar_confianca)
+    sobem para o preciso, com os motivos em "escalado".
+    """
+    if not politica.cascata:
+        return {
+            str(d["id"]): {**d, "modelo": politica.preciso}
+            for _, respostas in _run_groups(client, pendentes, contexto, politica.preciso)
+            for d in respostas[0]
+        }
+
+    veredictos: Dict[str, Dict[str, Any]] = {}
+    escalar: List[Dict[str, Any]] = []
+    motivos_por_id: Dict[str, List[str]] = {}
+    rapidos: Dict[str, Dict[str, Any]] = {}
+    for grupo, respostas in _run_groups(client, pendentes, contexto, politica.rapido, politica.amostras):
+        por_id = [{str(d["id"]): d for d in r} for r in respostas]
+        for it in grupo:
+            iid = str(it["id"])
+            versoes = [p.get(iid) for p in por_id]
+            confiavel, motivos = avaliar_confianca(versoes, politica)
+            if confiavel:
+                veredictos[iid] = {**versoes[0], "modelo": politica.rapido}
+                continue
+            escalar.append(it)
+            motivos_por_id[iid] = motivos
+            if versoes[0] is not None:
+                rapidos[iid] = versoes[0]
+
+    if escalar:
+        for _, respostas in _run_groups(client, escalar, contexto, politica.preciso):
+            for d in respostas[0]:
+                iid = str(d["id"])
+                veredictos[iid] = {**d, "modelo": politica.preciso, "escalado": motivos_por_id[iid]}
+        # falha do modelo preciso → mantém o veredicto do rápido, se houver
+        for iid, d in rapidos.items():
+            veredictos.setdefault(iid, {**d, "modelo": politica.rapido, "escalado": motivos_por_id[iid]})
+    return veredictos
+
+
 def semantic_validate(
     document_text: str,
     artefato: str,
     checklist: List[Dict[str, Any]],
     client: Optional[OpenAI],
+    incremental: bool = True,
+    pre_check: bool = True,
+    evidencias: Optional[Dict[str, Tuple[int, int]]] = None,
 ) -> Tuple[float, List[Dict[str, Any]]]:
     """
     Avaliação semântica item a item usando LLM.
     Retorna lista padronizada + score (média das notas de adequação).
+
+    O checklist é avaliado em grupos concorrentes (ver SEMANTIC_GROUP_SIZE);
+    itens de um grupo que falhou em todas as tentativas ficam de fora do
+    resultado e do score, como antes acontecia com a chamada única.
+
+    Com incremental=True, itens cujas seções de apoio não mudaram desde uma
+    validação anterior reaproveitam o veredicto gravado (verdict_cache);
+    cada item traz "reavaliado" (True se passou pela IA nesta execução).
+
+    Grupos cujos itens foram todos localizados pelo rígido recebem só as
+    janelas em torno das evidências (SEMANTIC_EVIDENCE_WINDOW). `evidencias`
+    (rigid_evidence da varredura do rígido) evita uma segunda busca no texto;
+    sem ela, o checklist é procurado aqui.
+
+    Com pre_check=True, itens de presença comprovados por citação normativa
+    no rígido são resolvidos sem IA ("origem": "local"; ver _pre_check).
+
+    Sem checklist YAML, usa o validador específico do plugin do artefato
+    (registry.carregar_semantico), importado só nesse momento.
+
+    Os demais seguem a política de modelos do artefato (model_router): em
+    cascata, o modelo rápido avalia e só itens de baixa confiança sobem para
+    o preciso; cada item traz "modelo" (e "escalado" com os motivos).
     """
     if client is None:
         return 0.0, []
+    artefato = normalizar_artefato(artefato)
+    if not checklist:
+        legado = carregar_semantico(artefato)
+        return legado(document_text or "", client) if legado is not None else (0.0, [])
 
     text = normalize_text(document_text or "")
 
@@ -229,49 +826,52 @@ def semantic_validate(
             "id": i.get("id", f"item_{idx}"),
             "descricao": i.get("descricao", ""),
             "obrigatorio": bool(i.get("obrigatorio", False)),
+            **({"grupo": i["grupo"]} if i.get("grupo") else {}),
         }
         for idx, i in enumerate(checklist or [])
     ]
     if not itens:
         return 0.0, []
 
-    instructions = (
-        "Avalie cada item do CHECKLIST no DOCUMENTO. "
-        "Para cada item, devolva um objeto JSON com os campos: "
-        "id (string), descricao (string), presente (bool), adequacao_nota (0-100, número), "
-        "justificativa (string curta e específica) e faltantes (lista de strings objetivas, opcional). "
-        "Responda SOMENTE uma lista JSON (sem comentários ou texto fora do JSON)."
-    )
-
-    user_content = f"""
-DOCUMENTO:
-\"\"\"{text}\"\"\"
-
-CHECKLIST:
-{json.dumps(itens, ensure_ascii=False, indent=2)}
-
-{instructions}
-"""
+    sections = _index_sections(text)
+    # Evidências do rígido (offsets no texto normalizado) → contexto focado
+    if evidencias is None:
+        evidencias = rigid_evidence(_rigid_scan(document_text, artefato))
+    locais = _pre_check(checklist or [], text, evidencias) if pre_check else {}
+    politica = politica_modelos(artefato)
+    versao = f"{SEMANTIC_VERSION}/{politica.assinatura}"
+    cache = obter_cache(artefato) if incremental else None
+    chaves: Dict[str, str] = {}
+    reaproveitados: Dict[str, Dict[str, Any]] = {}
+    pendentes: List[Dict[str, Any]] = []
+    for it in itens:
+        if str(it["id"]) in locais:
+            continue
+        chave = chave_item(it, _supporting_sections(sections, it), versao)
+        chaves[str(it["id"])] = chave
+        veredicto = cache.obter(chave) if cache else None
+        if veredicto is not None:
+            reaproveitados[str(it["id"])] = {**veredicto, "reavaliado": False}
+        else:
+            pendentes.append(it)
 
-    try:
-        # Análise profunda – gpt-4o (temperature 0 para consistência e auditabilidade)
-        resp = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": SEMANTIC_SYSTEM},
-                {"role": "user", "content": user_content},
-            ],
-            temperature=0.0,
-            max_tokens=2200,
+    novos: Dict[str, Dict[str, Any]] = {}
+    if pendentes:
+        veredictos = _evaluate_pending(
+            client, pendentes, lambda g: _group_context(sections, text, g, evidencias), politica
         )
-        raw = resp.choices[0].message.content or "[]"
-        # Extrai JSON (alguns modelos incluem rodeios)
-        m = re.search(r"\[.*\]", raw, flags=re.DOTALL)
-        data = json.loads(m.group(0) if m else raw)
-        if not isinstance(data, list):
-            data = []
-    except Exception:
-        data = []
+        for iid, d in veredictos.items():
+            novos[iid] = {**d, "reavaliado": True}
+            if cache:
+                cache.gravar(chaves[iid], d)
+        if cache:
+            cache.salvar()
+
+    data: List[Dict[str, Any]] = []
+    for it in itens:
+        d = locais.get(str(it["id"])) or reaproveitados.get(str(it["id"])) or novos.get(str(it["id"]))
+        if d is not None:
+            data.append(d)
 
     notas: List[float] = []
     for it in data:
@@ -394,20 +994,111 @@ def validate_document(document_text: str, artefato: str, client: Optional[OpenAI
       - rigid_result (lista de itens rígidos)
       - semantic_score (float)
       - semantic_result (lista de itens semânticos)
+      - revalidacao (ids semânticos reavaliados pela IA x reaproveitados)
+      - pre_check (ids resolvidos localmente x escalados, fracao_local)
+      - cascata (política de modelos, ids por modelo e itens escalados)
       - improved_document (Markdown com lacunas e marcadores)
+      - semantic_pendentes (ids do checklist sem veredicto semântico)
+      - cache_hit (True se o resultado veio do cache persistente)
+
+    Com client, o resultado completo é reaproveitado do cache
+    (result_cache) enquanto texto, checklist e versão não mudarem. Só é
+    gravado quando todos os itens têm veredicto (local ou da IA).
+    O artefato aceita nomes livres ("Pesquisa de Preços"), resolvidos pelo
+    registro de validadores.
     """
-    artefato = (artefato or "").strip().upper()
+    artefato = normalizar_artefato(artefato)
     text = document_text or ""
+
+    if client is None:
+        return _validate_document(text, artefato, client)
+
+    # Resultado completo em cache (texto normalizado + checklist + versão)
+    chave = chave_resultado(
+        f"validator_engine/{artefato}",
+        text,
+        [find_checklist_file(artefato)],
+        versao_modulo(
+            __file__,
+            f"{SEMANTIC_VERSION}/pc{precheck_fraction()}/{politica_modelos(artefato).assinatura}",
+        )
+        + versao_modulo(checklist_matcher.__file__),
+    )
+    payload, hit = obter_ou_calcular(
+        chave,
+        lambda: _validate_document(text, artefato, client),
+        # Resultado parcial (grupo semântico que falhou) não vai para o cache:
+        # a próxima chamada reavalia só os itens sem veredicto (verdict_cache)
+        cacheavel=lambda p: bool(p.get("semantic_result")) and not p.get("semantic_pendentes"),
+    )
+    if hit:
+        payload["revalidacao"] = {
+            "reavaliados": [],
+            "reaproveitados": [
+                s.get("id") for s in payload.get("semantic_result", []) if s.get("origem") != "local"
+            ],
+        }
+    payload["cache_hit"] = hit
+    return payload
+
+
+def _pre_check_report(semantic_result: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Itens resolvidos localmente x escalados para a IA."""
+    locais = [s.get("id") for s in semantic_result if s.get("origem") == "local"]
+    escalados = [s.get("id") for s in semantic_result if s.get("origem") != "local"]
+    total = len(locais) + len(escalados)
+    return {
+        "locais": locais,
+        "escalados": escalados,
+        "fracao_local": round(len(locais) / total, 3) if total else 0.0,
+    }
+
+
+def _cascade_report(semantic_result: List[Dict[str, Any]], artefato: str) -> Dict[str, Any]:
+    """Itens decididos por cada modelo e itens escalados (com motivos)."""
+    por_modelo: Dict[str, List[Any]] = {}
+    for s in semantic_result:
+        if s.get("modelo"):
+            por_modelo.setdefault(s["modelo"], []).append(s.get("id"))
+    return {
+        "politica": politica_modelos(artefato).assinatura,
+        "por_modelo": por_modelo,
+        "escalados": {s.get("id"): s["escalado"] for s in semantic_result if s.get("escalado")},
+    }
+
+
+def _semantic_pending(checklist: List[Dict[str, Any]], semantic_result: List[Dict[str, Any]]) -> List[Any]:
+    """Ids do checklist sem veredicto semântico (ex.: grupo que falhou)."""
+    avaliados = {str(s.get("id")) for s in semantic_result}
+    ids = [it.get("id", f"item_{idx}") for idx, it in enumerate(checklist or [])]
+    return [iid for iid in ids if str(iid) not in avaliados]
+
+
+def _validate_document(text: str, artefato: str, client: Optional[OpenAI]) -> Dict[str, Any]:
     checklist = load_checklist(artefato)
 
-    rigid_score, rigid_result = rigid_validate(text, artefato)
-    semantic_score, semantic_result = semantic_validate(text, artefato, checklist, client)
+    # Uma só varredura do checklist: resultado rígido e evidências do semântico
+    varredura = _rigid_scan(text, artefato)
+    rigid_score, rigid_result = rigid_validate(text, artefato, varredura)
+    semantic_score, semantic_result = semantic_validate(
+        text, artefato, checklist, client, evidencias=rigid_evidence(varredura)
+    )
 
     payload: Dict[str, Any] = {
         "rigid_score": rigid_score,
         "rigid_result": rigid_result,
         "semantic_score": semantic_score,
         "semantic_result": semantic_result,
+        "revalidacao": {
+            "reavaliados": [s.get("id") for s in semantic_result if s.get("reavaliado")],
+            "reaproveitados": [
+                s.get("id") for s in semantic_result
+                if not s.get("reavaliado") and s.get("origem") != "local"
+            ],
+        },
+        "pre_check": _pre_check_report(semantic_result),
+        "cascata": _cascade_report(semantic_result, artefato),
+        "semantic_pendentes": _semantic_pending(checklist, semantic_result) if client is not None else [],
     }
 
     try:
@@ -416,3 +1107,35 @@ def validate_document(document_text: str, artefato: str, client: Optional[OpenAI
         payload["improved_document"] = text or ""
 
     return payload
+
+
+# =============================================================================
+# Processo completo (DFD + ETP + TR + Edital + Contrato...)
+# =============================================================================
+PROCESS_MAX_WORKERS = 5  # artefatos validados ao mesmo tempo
+
+
+def validate_process(
+    documentos: Dict[str, str],
+    client: Optional[OpenAI],
+    max_workers: int = PROCESS_MAX_WORKERS,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Valida todos os artefatos de um processo em paralelo.
+    `documentos` mapeia artefato → texto; retorna artefato canônico → payload
+    de validate_document (com "erro" se a validação daquele artefato falhou).
+    Cada artefato mantém seu próprio paralelismo de grupos semânticos.
+    """
+    entradas = {normalizar_artefato(a): t for a, t in (documentos or {}).items()}
+    if not entradas:
+        return {}
+
+    def _validar(artefato: str) -> Dict[str, Any]:
+        try:
+            return validate_document(entradas[artefato], artefato, client)
+        except Exception as e:
+            return {"erro": f"{type(e).__name__}: {e}", "rigid_score": 0.0, "semantic_score": 0.0}
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(entradas)))) as pool:
+        futuros = {a: pool.submit(_validar, a) for a in entradas}
+        return {a: f.result() for a, f in futuros.items()}
@@ -20,7 +20,8 @@ Estrutura do retorno de validate_document():
   "semantic_result":[ {id, descricao, presente, adequacao_nota, justificativa, faltantes}... ],
   "guided_markdown": "texto markdown sem repetições",
   "guided_doc_title": "Rascunho Orientado – <tipo>",
-  "debug": { "model": "...", "used_context_files": [...] }
+  "debug": { "model": "...", "used_context_files": [...] },
+  "cache_hit": bool       # resultado reaproveitado do cache (result_cache)
 }
 -------------------------------------------------------------------------------
 """
@@ -31,16 +32,22 @@ import re
 import glob
 import math
 import json
+import hashlib
 import pathlib
 from typing import Dict, List, Tuple, Any
 
+from knowledge.validators.result_cache import chave_resultado, obter_ou_calcular, versao_modulo
+
 # ---------------------------------------------------------------------------
 # (1) utilitários de I/O
 # ---------------------------------------------------------------------------
 
-REPO_ROOT = pathlib.Path(__file__).resolve().parent
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[2]
 KB_ROOT = REPO_ROOT / "knowledge_base"
 
+# Orçamento (tokens) do contexto da KB quando há resumos hierárquicos
+KB_ORCAMENTO_TOKENS = 2200
+
 def _read_text_file(fp: pathlib.Path) -> str:
     try:
         return fp.read_text(encoding="utf-8", errors="ignore")
@@ -50,10 +57,21 @@ def _read_text_file(fp: pathlib.Path) -> str:
         except Exception:
             return ""
 
-def _gather_kb_snippets(doc_type: str, topk: int = 10, max_chars: int = 6000) -> Tuple[str, List[str]]:
+def _ler_kb(fp: pathlib.Path) -> str:
+    """Arquivo da KB pelo corpus empacotado (mmap), com fallback para o disco."""
+    try:
+        from utils.knowledge_loader import ler_documento
+        return ler_documento(fp)
+    except Exception:
+        return _read_text_file(fp)
+
+def _gather_kb_snippets(doc_type: str, topk: int = 10, max_chars: int = 6000,
+                        consulta: str = "") -> Tuple[str, List[str]]:
     """
-    Lê textos de knowledge_base/<pasta_do_tipo> e seleciona os N primeiros por ordem de nome,
-    concatenando até o limite de caracteres.
+    Lê textos de knowledge_base/<pasta_do_tipo>. Com `consulta` (texto do
+    documento/objeto), usa os resumos hierárquicos (utils.kb_resumos) das
+    seções mais relevantes; sem ela, ou se os resumos falharem, seleciona
+    os N primeiros arquivos por ordem de nome até o limite de caracteres.
     """
     used_files: List[str] = []
     if not KB_ROOT.exists():
@@ -71,12 +89,27 @@ def _gather_kb_snippets(doc_type: str, topk: int = 10, max_chars: int = 6000) ->
     search_dir = KB_ROOT / folder if folder else KB_ROOT
 
     files = sorted(search_dir.rglob("*.txt")) + sorted(search_dir.rglob("*.md"))
+
+    if consulta:
+        try:
+            from utils.kb_resumos import resumo_relevante
+            selecionados = files[:topk]
+            contexto = resumo_relevante(
+                None, consulta[:4000],
+                orcamento_tokens=min(KB_ORCAMENTO_TOKENS, max_chars // 4),
+                arquivos=selecionados,
+            )
+            if contexto:
+                return contexto, [str(f.relative_to(KB_ROOT)) for f in selecionados]
+        except Exception:
+            pass
+
     buff, count = [], 0
     size = 0
     for f in files:
         if count >= topk:
             break
-        txt = _read_text_file(f)
+        txt = _ler_kb(f)
         if not txt.strip():
             continue
         would = size + len(txt)
@@ -304,7 +337,24 @@ def validate_document(raw_text: str, doc_type: str, client) -> Dict[str, Any]:
     Executa a validação rígida e semântica e gera rascunho orientado (markdown).
     """
     # contextos da KB
-    kb_text, used_files = _gather_kb_snippets(doc_type, topk=12, max_chars=9000)
+    kb_text, used_files = _gather_kb_snippets(doc_type, topk=12, max_chars=9000, consulta=raw_text)
+
+    # Resultado em cache: texto + contexto da KB + modelo/prompt (código deste módulo)
+    chave = chave_resultado(
+        f"validator_engine_vNext/{doc_type.upper()}",
+        raw_text,
+        versao=versao_modulo(__file__, _pick_model()) + ":" + hashlib.sha256(kb_text.encode("utf-8")).hexdigest(),
+    )
+    resultado, hit = obter_ou_calcular(
+        chave,
+        lambda: _validate_uncached(raw_text, doc_type, client, kb_text, used_files),
+        cacheavel=lambda r: bool(r.get("rigid_result") or r.get("semantic_result")),
+    )
+    resultado["cache_hit"] = hit
+    return resultado
+
+
+def _validate_uncached(raw_text: str, doc_type: str, client, kb_text: str, used_files: List[str]) -> Dict[str, Any]:
     user_prompt = _build_user_prompt(doc_type, raw_text, kb_text)
     messages = [
         {"role": "system", "content": BASE_SYSTEM},
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+# =============================================================================
+# Synapse.IA – Cache de veredictos semânticos por (seções, item)
+#
+# Permite a revalidação incremental: cada veredicto da IA é gravado sob uma
+# chave formada pelo item do checklist e pelos hashes das seções do documento
+# que o sustentam. Ao validar de novo um documento levemente editado, só os
+# itens cujas seções mudaram voltam para a IA; os demais reaproveitam o
+# veredicto anterior.
+#
+# Persistência: um JSON por artefato em exports/cache/veredictos/, com
+# descarte dos veredictos menos usados acima de MAX_ENTRADAS.
+# =============================================================================
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+VEREDICTOS_DIR = BASE_DIR / "exports" / "cache" / "veredictos"
+
+# Veredictos mantidos por artefato
+MAX_ENTRADAS = 5000
+
+
+def hash_secao(texto: str) -> str:
+    """Hash curto do conteúdo normalizado de uma seção."""
+    return hashlib.sha1(" ".join(texto.split()).encode("utf-8")).hexdigest()[:16]
+
+
+def chave_item(item: Dict[str, Any], hashes_secoes: Iterable[str], versao: str) -> str:
+    """Chave do veredicto: item (id, descrição) + seções de apoio + versão do prompt/modelo."""
+    base = json.dumps(
+        [versao, str(item.get("id")), item.get("descricao", ""), sorted(set(hashes_secoes))],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(base.encode("utf-8")).hexdigest()
+
+
+class VerdictCache:
+    """Veredictos de um artefato, carregados sob demanda e gravados em lote."""
+
+    def __init__(self, artefato: str, destino: Path = VEREDICTOS_DIR):
+        self.caminho = Path(destino) / f"{artefato.lower()}.json"
+        self._lock = threading.Lock()
+        self._entradas: Optional[Dict[str, Dict[str, Any]]] = None
+        self._alterado = False
+
+    def _carregar(self) -> Dict[str, Dict[str, Any]]:
+        if self._entradas is None:
+            try:
+                with self.caminho.open("r", encoding="utf-8") as f:
+                    self._entradas = json.load(f).get("entradas", {})
+            except (OSError, ValueError):
+                self._entradas = {}
+        return self._entradas
+
+    def obter(self, chave: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entrada = self._carregar().get(chave)
+            if entrada is None:
+                return None
+            entrada["usado_em"] = time.time()
+            self._alterado = True
+            return dict(entrada["veredicto"])
+
+    def gravar(self, chave: str, veredicto: Dict[str, Any]) -> None:
+        with self._lock:
+            self._carregar()[chave] = {"veredicto": veredicto, "usado_em": time.time()}
+            self._alterado = True
+
+    def salvar(self) -> None:
+        with self._lock:
+            if not self._alterado or self._entradas is None:
+                return
+            if len(self._entradas) > MAX_ENTRADAS:
+                recentes = sorted(self._entradas.items(), key=lambda kv: kv[1]["usado_em"], reverse=True)
+                self._entradas = dict(recentes[:MAX_ENTRADAS])
+            try:
+                self.caminho.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self.caminho.with_suffix(".tmp")
+                with tmp.open("w", encoding="utf-8") as f:
+                    json.dump({"entradas": self._entradas}, f, ensure_ascii=False)
+                os.replace(tmp, self.caminho)
+                self._alterado = False
+            except OSError as e:
+                print(f"[verdict_cache] ⚠️ Não foi possível gravar {self.caminho.name}: {e}")
+
+
+_CACHES: Dict[str, VerdictCache] = {}
+_LOCK = threading.Lock()
+
+
+def obter_cache(artefato: str) -> VerdictCache:
+    """Cache compartilhado do processo para o artefato."""
+    chave = (artefato or "").strip().upper()
+    with _LOCK:
+        if chave not in _CACHES:
+            _CACHES[chave] = VerdictCache(chave)
+        return _CACHES[chave]
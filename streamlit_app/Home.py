@@ -42,6 +42,15 @@ from home_utils.home_components import (
 )
 from home_utils.sidebar_organizer import apply_sidebar_grouping
 
+# --------------------------------------------------------------
+# Aquecimento da base de conhecimento (uma vez por processo)
+# --------------------------------------------------------------
+try:
+    from utils.knowledge_registry import aquecer_registry
+    aquecer_registry()
+except Exception as e:
+    print(f"[Home] Aquecimento da base de conhecimento indisponível: {e}")
+
 # --------------------------------------------------------------
 # Configuração da página
 # --------------------------------------------------------------
@@ -18,7 +18,12 @@ from pathlib import Path
 # ==========================================================
 # 📦 Imports institucionais (padrão unificado)
 # ==========================================================
-from utils.integration_insumos import processar_insumo
+from utils.integration_insumos import (
+    classificar_insumo,
+    detectar_tipo,
+    extrair_texto_de_upload,
+    processar_insumo,
+)
 from utils.ui_components import aplicar_estilo_global, exibir_cabecalho_padrao
 from home_utils.sidebar_organizer import apply_sidebar_grouping
 from home_utils.sidebar_organizer import apply_sidebar_grouping
@@ -146,15 +151,34 @@ else:
 # ==========================================================
 # 🧭 Seleção do módulo de destino
 # ==========================================================
+artefato_opcoes = ["DFD", "ETP", "TR", "EDITAL", "CONTRATO"]
+
+# Detecção local do tipo de documento (uma vez por arquivo): pré-seleciona o destino
+if uploaded_file is not None:
+    assinatura_upload = (uploaded_file.name, uploaded_file.size)
+    if st.session_state.get("insumo_tipo_assinatura") != assinatura_upload:
+        texto_upload = extrair_texto_de_upload(uploaded_file, detectar_tipo(uploaded_file.name))
+        deteccao = classificar_insumo(texto_upload) if texto_upload.strip() else {}
+        st.session_state["insumo_tipo_detectado"] = deteccao
+        st.session_state["insumo_tipo_assinatura"] = assinatura_upload
+        if deteccao.get("confiavel") and deteccao.get("tipo") in artefato_opcoes:
+            st.session_state["insumo_destino"] = deteccao["tipo"]
+
 col_select, col_reset = st.columns([4, 1])
 
 with col_select:
-    artefato_opcoes = ["DFD", "ETP", "TR", "EDITAL", "CONTRATO"]
     artefato = st.selectbox(
         "Selecione o módulo de destino do insumo:",
         artefato_opcoes,
         key="insumo_destino"
     )
+    deteccao = st.session_state.get("insumo_tipo_detectado") or {}
+    if uploaded_file is not None and deteccao.get("tipo"):
+        st.caption(
+            f"🔎 Tipo detectado: **{deteccao['tipo']}** "
+            f"({deteccao['confianca']:.0%}{', pelo título' if deteccao.get('origem') == 'titulo' else ''}). "
+            "O destino pode ser alterado manualmente."
+        )
 
 with col_reset:
     st.write("")  # Espaçamento
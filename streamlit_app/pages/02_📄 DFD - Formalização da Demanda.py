@@ -19,6 +19,7 @@ if str(ROOT) not in sys.path:
 
 import json
 import io
+from pathlib import Path
 from typing import Any, Dict, List
 from datetime import datetime
 
@@ -33,6 +34,7 @@ from utils.integration_dfd import (
     gerar_rascunho_dfd_com_ia,
     status_dfd,
 )
+from utils.demandas_similares import ATUALIZACAO_INDICE_S, demandas_similares, obter_indice
 
 # ======================================================================
 # ⚙️ CONFIGURAÇÃO DA PÁGINA
@@ -422,6 +424,36 @@ texto_narrativo_inicial = _montar_texto_narrativo_inicial(
 with st.expander("Visualizar dados importados (JSON)", expanded=False):
     st.json(dfd_dados)
 
+# ======================================================================
+# DEMANDAS SEMELHANTES – oportunidades de consolidação
+# ======================================================================
+@st.cache_resource(ttl=ATUALIZACAO_INDICE_S, show_spinner=False)
+def _indice_demandas_atualizado():
+    """Atualiza o índice LSH no máximo uma vez por intervalo; os reruns só consultam."""
+    indice = obter_indice()
+    indice.atualizar()
+    return indice
+
+
+if st.button("🔄 Atualizar demandas semelhantes", key="btn_atualizar_demandas",
+             help="Relê agora os DFDs salvos e a base de campos"):
+    _indice_demandas_atualizado.clear()
+
+try:
+    _indice_demandas_atualizado()
+    semelhantes = demandas_similares(dfd_dados, atualizar=False)
+except Exception as e:
+    semelhantes = []
+    st.caption(f"Busca de demandas semelhantes indisponível: {e}")
+
+if semelhantes:
+    with st.expander(f"🔁 Demandas semelhantes já registradas ({len(semelhantes)})", expanded=True):
+        st.caption("Avalie a consolidação com as demandas abaixo antes de iniciar o ETP.")
+        for item in semelhantes:
+            origem = Path(item["fontes"][0]).name if item["fontes"] else "—"
+            st.markdown(f"**{item['similaridade'] * 100:.0f}%** · {item['data'] or '—'} · `{origem}`")
+            st.caption(item["trecho"])
+
 # ======================================================================
 # FORMULÁRIO DFD
 # ======================================================================
@@ -208,6 +208,20 @@ with st.expander("📤 Upload de Insumo (opcional)", expanded=False):
 st.markdown("### 🤖 Assistente IA")
 st.caption("Processamento automático: upload de arquivo ou geração a partir do contexto acumulado (DFD/ETP/TR/Edital)")
 
+# Modelo contratual de referência: automático (pelo objeto) ou escolhido pelo usuário
+try:
+    from utils.seletor_modelos import listar_modelos
+    _modelos_contrato = [m["nome"] for m in listar_modelos("CONTRATO")]
+except Exception:
+    _modelos_contrato = []
+_opcao_modelo = st.selectbox(
+    "Modelo contratual de referência",
+    ["Automático (pelo objeto)"] + _modelos_contrato,
+    key="contrato_modelo_referencia",
+    help="Por padrão o modelo é escolhido pela similaridade com o objeto do DFD/ETP/TR.",
+)
+modelo_manual = None if _opcao_modelo.startswith("Automático") else _opcao_modelo
+
 col_ia1, col_ia2, col_ia3 = st.columns(3)
 
 with col_ia1:
@@ -220,7 +234,7 @@ with col_ia1:
                     contexto = integrar_com_contexto(st.session_state)
                     
                     # Processar com ContratoAgent
-                    resultado = processar_insumo_contrato(arquivo_upload, contexto_previo=contexto)
+                    resultado = processar_insumo_contrato(arquivo_upload, contexto_previo=contexto, modelo_manual=modelo_manual)
                     
                     if "erro" in resultado:
                         st.error(f"❌ {resultado['erro']}")
@@ -252,7 +266,7 @@ with col_ia1:
                     contexto = integrar_com_contexto(st.session_state)
                     
                     # Gerar com ContratoAgent
-                    resultado = gerar_contrato_com_ia(contexto)
+                    resultado = gerar_contrato_com_ia(contexto, modelo_manual=modelo_manual)
                     
                     if "erro" in resultado:
                         st.error(f"❌ {resultado['erro']}")
@@ -24,6 +24,8 @@ import sys, os
 # ==========================================================
 from utils.ui_style import aplicar_estilo_institucional, rodape_institucional
 from utils.alertas_pipeline import gerar_alertas, export_alerts_json
+from utils.coerencia_processos import coerencia_entre_processos, exportar_heatmap, ultimo_heatmap
+from utils.base_campos import obter_base
 
 st.set_page_config(
     page_title="📊 Painel de Governança – SynapseNext",
@@ -146,6 +148,71 @@ with st.expander("🧠 Exibir Detalhamento dos Alertas", expanded=True):
 
 st.markdown("<br>", unsafe_allow_html=True)
 
+# ==========================================================
+# 🧭 Coerência entre processos (matriz N×N)
+# ==========================================================
+st.subheader("🧭 Coerência entre Processos")
+
+colE, colF, colG = st.columns(3)
+artefato_linhas = colE.selectbox("Linhas", ["TR", "ETP", "DFD", "Edital"], index=0)
+artefato_colunas = colF.selectbox("Colunas", ["Edital", "TR", "ETP", "Contrato"], index=0)
+ano_matriz = colG.number_input("Ano (0 = todos)", min_value=0, max_value=2100, value=0, step=1)
+
+if st.button("🧮 Calcular matriz de coerência", use_container_width=True):
+    with st.spinner("Calculando similaridade entre todos os processos..."):
+        resultado_matriz = coerencia_entre_processos(
+            artefato_linhas, artefato_colunas, ano=int(ano_matriz) or None
+        )
+        exportar_heatmap(resultado_matriz)
+
+heatmap = ultimo_heatmap()
+if heatmap and heatmap["x"] and heatmap["y"]:
+    fig_hm = px.imshow(
+        heatmap["z"], x=heatmap["x"], y=heatmap["y"], zmin=0, zmax=100,
+        color_continuous_scale="Blues", aspect="auto", title=heatmap["titulo"],
+        labels=dict(color="Coerência (%)"),
+    )
+    fig_hm.update_layout(title=dict(x=0.5, font=dict(size=18, color="#004A8F")), height=520)
+    st.plotly_chart(fig_hm, use_container_width=True)
+    if heatmap["mesmo_processo"]:
+        st.caption(f"Coerência média dentro do mesmo processo: {heatmap['coerencia_media']}%")
+        st.dataframe(pd.DataFrame(heatmap["mesmo_processo"][:10]), use_container_width=True, hide_index=True)
+else:
+    st.info("Nenhuma matriz calculada. Use o botão acima para comparar os snapshots auditados.")
+
+st.markdown("<br>", unsafe_allow_html=True)
+
+# ==========================================================
+# 🗄️ Consistência entre processos (base de campos)
+# ==========================================================
+st.subheader("🗄️ Consistência em Todos os Processos")
+
+base_campos = obter_base()
+base_campos.atualizar()
+resumo_base = base_campos.estatisticas()
+st.caption(f"{resumo_base['processos']} processos indexados – " + ", ".join(
+    f"{artefato}: {n}" for artefato, n in resumo_base["por_artefato"].items()
+))
+
+colH, colI, colJ, colK = st.columns(4)
+campo_base = colH.selectbox("Campo", ["valor", "prazo"], index=0)
+artefato_a = colI.selectbox("Artefato", ["EDITAL", "CONTRATO", "TR", "ETP"], index=0)
+artefato_b = colJ.selectbox("Comparado com", ["ETP", "DFD", "TR", "EDITAL"], index=0)
+limite_base = colK.number_input("Divergência máxima (%)", min_value=0, max_value=100, value=20, step=5)
+
+divergentes = base_campos.divergencias(campo_base, artefato_a, artefato_b, limite_base / 100)
+if divergentes:
+    st.dataframe(pd.DataFrame(divergentes), use_container_width=True, hide_index=True)
+else:
+    st.success(f"Nenhum processo com {campo_base} do {artefato_a} divergindo mais de {limite_base}% do {artefato_b}.")
+
+min_processos = st.number_input("CNPJs presentes em pelo menos N processos", min_value=2, value=3, step=1)
+recorrentes = base_campos.cnpjs_recorrentes(int(min_processos))
+if recorrentes:
+    st.dataframe(pd.DataFrame(recorrentes), use_container_width=True, hide_index=True)
+
+st.markdown("<br>", unsafe_allow_html=True)
+
 # ==========================================================
 # 💾 Exportação institucional
 # ==========================================================
@@ -38,7 +38,8 @@ apply_sidebar_grouping()
 # ==========================================================
 erro_import = None
 try:
-    from utils.comparador_pipeline import carregar_snapshots, analisar_coerencia, gerar_relatorio
+    from utils.comparador_pipeline import carregar_snapshots, carregar_campos, analisar_coerencia, gerar_relatorio
+    from utils.diff_versoes import diff_versoes, renderizar_html
 except Exception as e:
     erro_import = str(e)
 
@@ -107,7 +108,7 @@ if st.button("🔄 Carregar snapshots auditados", type="primary"):
     st.subheader("3️⃣ Análise de Coerência")
 
     with st.spinner("Executando análise comparativa entre os artefatos..."):
-        resultado = analisar_coerencia(artefatos)
+        resultado = analisar_coerencia(artefatos, campos=carregar_campos())
 
     st.success("✅ Análise concluída com sucesso.")
     st.markdown(f"### 📊 **Coerência Global:** {resultado.get('coerencia_global', 0)}%")
@@ -128,6 +129,15 @@ if st.button("🔄 Carregar snapshots auditados", type="primary"):
             else:
                 cor = "🟥"
             st.markdown(f"- {cor} **{par}** → Similaridade: `{valor}%`")
+            secoes = resultado.get("secoes", {}).get(par)
+            if secoes:
+                st.caption(" · ".join(f"{sec} {v}%" for sec, v in secoes.items()))
+            m = resultado.get("metricas", {}).get(par)
+            if m:
+                st.caption(
+                    f"palavras-chave {m['palavras_chave']}% · trechos em comum {m['trechos']}% · "
+                    f"seções alinhadas {m['secoes']}%"
+                )
     else:
         st.info("Sem comparações diretas disponíveis.")
 
@@ -188,6 +198,45 @@ if st.button("🔄 Carregar snapshots auditados", type="primary"):
 else:
     st.info("Clique em **Carregar snapshots auditados** para iniciar a análise.")
 
+# ==========================================================
+# 🔀 Diferenças entre versões do mesmo artefato
+# ==========================================================
+st.divider()
+st.subheader("🔀 Diferenças entre Versões")
+st.caption("Compara duas versões do mesmo artefato cláusula a cláusula (snapshots auditados).")
+
+pasta_snapshots = Path(__file__).resolve().parents[2] / "exports" / "auditoria" / "snapshots"
+artefato_diff = st.selectbox("Artefato", ["Edital", "TR", "ETP", "DFD", "Contrato"], key="diff_artefato")
+versoes = sorted(pasta_snapshots.glob(f"{artefato_diff}_*.md"), reverse=True)
+
+if len(versoes) < 2:
+    st.info(f"São necessárias ao menos duas versões auditadas de {artefato_diff} para comparar.")
+else:
+    nomes = [v.name for v in versoes]
+    col_v1, col_v2 = st.columns(2)
+    versao_antiga = col_v1.selectbox("Versão anterior", nomes, index=1, key="diff_antiga")
+    versao_nova = col_v2.selectbox("Versão nova", nomes, index=0, key="diff_nova")
+
+    if st.button("🔀 Comparar versões", use_container_width=True):
+        diff = diff_versoes(
+            (pasta_snapshots / versao_antiga).read_text(encoding="utf-8"),
+            (pasta_snapshots / versao_nova).read_text(encoding="utf-8"),
+        )
+        r = diff["resumo"]
+        c1, c2, c3, c4 = st.columns(4)
+        c1.metric("Inalteradas", r["igual"])
+        c2.metric("Alteradas", r["alterada"])
+        c3.metric("Inseridas", r["inserida"])
+        c4.metric("Removidas", r["removida"])
+
+        if not diff["clausulas"]:
+            st.success("✅ As versões têm o mesmo conteúdo.")
+        icones = {"alterada": "✏️", "inserida": "➕", "removida": "➖"}
+        for c in diff["clausulas"]:
+            rotulo = c["rotulo_novo"] or c["rotulo_antigo"]
+            with st.expander(f"{icones[c['tipo']]} {rotulo}", expanded=c["tipo"] == "alterada"):
+                st.markdown(renderizar_html(c), unsafe_allow_html=True)
+
 # ==========================================================
 # 📘 Rodapé institucional simplificado
 # ==========================================================
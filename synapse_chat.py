@@ -254,6 +254,8 @@ if st.session_state.last_result and st.session_state.last_result.get("token") ==
         st.error(f"❌ Erro ao processar o agente {st.session_state.last_result.get('agente')}: {payload['error']}")
     else:
         st.success(f"✅ Agente **{st.session_state.last_result.get('agente')}** executado com sucesso!")
+        if payload.get("cache_hit"):
+            st.caption("⚡ Resultado reaproveitado do cache: mesmo texto, checklist e versão do modelo.")
         st.markdown("### 🧾 Resultado da Análise")
 
         rigid_score = float(payload.get("rigid_score", 0) or 0.0)
@@ -278,6 +280,7 @@ if st.session_state.last_result and st.session_state.last_result.get("token") ==
                     "Critério": r.get("descricao", ""),
                     "Obrigatório": "✅" if r.get("obrigatorio") else "—",
                     "Presente": "✅" if r.get("presente") else "❌",
+                    "Evidência": (r.get("trecho") or "—")[:160],
                 } for r in rigid
             ]
             st.table(rigid_rows)
@@ -288,12 +291,27 @@ if st.session_state.last_result and st.session_state.last_result.get("token") ==
         sem = payload.get("semantic_result", []) or []
         st.markdown("#### 💡 Itens Avaliados (Semânticos)")
         if sem:
+            reval = payload.get("revalidacao") or {}
+            if reval.get("reaproveitados"):
+                st.caption(
+                    f"🔁 {len(reval.get('reavaliados', []))} de {len(sem)} itens reavaliados pela IA; "
+                    "os demais foram reaproveitados da validação anterior (seções sem alteração)."
+                )
+            pre = payload.get("pre_check") or {}
+            if pre.get("locais"):
+                st.caption(
+                    f"⚙️ {len(pre['locais'])} de {len(sem)} itens resolvidos localmente "
+                    f"({pre.get('fracao_local', 0):.0%}) por citação normativa encontrada no rígido; "
+                    "os demais foram escalados para a IA."
+                )
             sem_rows = [
                 {
                     "Critério": s.get("descricao", ""),
                     "Presente": "✅" if s.get("presente") else "❌",
                     "Nota": s.get("adequacao_nota", 0),
                     "Justificativa": s.get("justificativa", ""),
+                    "Reavaliado": "⚙️ local" if s.get("origem") == "local"
+                    else ("🔁" if s.get("reavaliado", True) else "—"),
                 } for s in sem
             ]
             st.table(sem_rows)
@@ -1,4 +1,9 @@
+import json
 import os
+import random
+import re
+from pathlib import Path
+
 from docx import Document
 from reportlab.pdfgen import canvas
 
@@ -61,6 +66,126 @@ def gerar_insumos_ficticios():
         "Documento de exemplo para testes de parsing e extração semântica."
     )
 
+
+# ==========================================================
+# Corpus de benchmark (validadores): editais/TR/ETP/DFD fictícios
+# de 10 KB a 2 MB montados a partir dos modelos da knowledge_base
+# ==========================================================
+ROOT_PATH = Path(__file__).resolve().parents[2]
+KB_PATH = ROOT_PATH / "knowledge_base"
+CORPUS_PATH = Path(__file__).resolve().parent / "corpus_benchmark"
+
+TAMANHOS_CORPUS = {"10KB": 10_000, "100KB": 100_000, "1MB": 1_000_000, "2MB": 2_000_000}
+
+# Pastas da KB usadas como fonte de parágrafos por artefato
+FONTES_CORPUS = {
+    "DFD": ["DFD"],
+    "ETP": ["ETP"],
+    "TR": ["TR"],
+    "EDITAL": ["TR", "legislacao", "instrucoes_normativas"],
+}
+
+SECOES_CORPUS = {
+    "DFD": ["IDENTIFICAÇÃO DA UNIDADE DEMANDANTE", "DESCRIÇÃO DO OBJETO", "JUSTIFICATIVA DA NECESSIDADE",
+            "ALINHAMENTO AO PLANEJAMENTO", "ESTIMATIVA PRELIMINAR DE CUSTOS", "RISCOS E MITIGAÇÃO"],
+    "ETP": ["NECESSIDADE DA CONTRATAÇÃO", "LEVANTAMENTO DE MERCADO", "ALTERNATIVAS POSSÍVEIS",
+            "ESTIMATIVA DE CUSTOS", "REQUISITOS DA SOLUÇÃO", "MATRIZ DE RISCOS", "CONCLUSÃO"],
+    "TR": ["OBJETO DA CONTRATAÇÃO", "JUSTIFICATIVA", "ESPECIFICAÇÕES TÉCNICAS", "PRAZO DE EXECUÇÃO",
+           "OBRIGAÇÕES DA CONTRATADA", "CRITÉRIOS DE MEDIÇÃO E PAGAMENTO", "SANÇÕES", "FISCALIZAÇÃO"],
+    "EDITAL": ["PREÂMBULO", "DO OBJETO", "DAS CONDIÇÕES DE PARTICIPAÇÃO", "DA HABILITAÇÃO",
+               "DO JULGAMENTO DAS PROPOSTAS", "DOS RECURSOS", "DAS SANÇÕES ADMINISTRATIVAS", "DO PAGAMENTO"],
+}
+
+OBJETOS_CORPUS = [
+    "serviços contínuos de limpeza predial", "fornecimento de água mineral em garrafão",
+    "manutenção preventiva e corretiva de elevadores", "aquisição de licenças de software",
+    "serviços de vigilância patrimonial", "fornecimento de energia elétrica no mercado livre",
+]
+
+
+def _paragrafos_fonte(pastas):
+    paragrafos = []
+    for pasta in pastas:
+        for arq in sorted((KB_PATH / pasta).glob("*.txt")):
+            texto = arq.read_text(encoding="utf-8", errors="ignore")
+            paragrafos += [p.strip() for p in re.split(r"\n\s*\n", texto) if len(p.strip()) > 80]
+    return paragrafos or ["Parágrafo de exemplo para o corpus de benchmark da validação de artefatos."]
+
+
+def _cnpj(rnd):
+    n = [rnd.randint(0, 9) for _ in range(12)]
+    return f"{n[0]}{n[1]}.{n[2]}{n[3]}{n[4]}.{n[5]}{n[6]}{n[7]}/0001-{rnd.randint(10, 99)}"
+
+
+def _bloco_dados(rnd, artefato, numero):
+    valor = rnd.randint(10_000, 9_000_000) + rnd.randint(0, 99) / 100
+    valor_txt = f"{valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+    return (
+        f"Processo SEI nº {rnd.randint(1000, 9999)}/{rnd.randint(2023, 2025)} – {artefato} "
+        f"(bloco {numero}). Objeto: {rnd.choice(OBJETOS_CORPUS)}. Valor estimado: R$ {valor_txt}. "
+        f"Prazo de vigência: {rnd.choice([6, 12, 24, 30])} meses, contados de "
+        f"{rnd.randint(1, 28):02d}/{rnd.randint(1, 12):02d}/{rnd.randint(2024, 2026)}. "
+        f"Contratada (fictícia): CNPJ {_cnpj(rnd)}. Fundamentação: Lei nº 14.133/2021 e "
+        f"Decreto Estadual nº 67.381/2022."
+    )
+
+
+def gerar_texto_corpus(artefato, tamanho, semente=2025, paragrafos=None):
+    """Texto fictício do artefato com ~tamanho bytes (UTF-8), determinístico pela semente."""
+    rnd = random.Random(f"{semente}:{artefato}:{tamanho}")
+    paragrafos = paragrafos or _paragrafos_fonte(FONTES_CORPUS[artefato])
+    secoes = SECOES_CORPUS[artefato]
+    partes = [f"{artefato} – DOCUMENTO FICTÍCIO PARA BENCHMARK", _bloco_dados(rnd, artefato, 1)]
+    total = sum(len(p.encode("utf-8")) + 2 for p in partes)
+    n = 0
+    while total < tamanho:
+        titulo = f"{n + 1}. {secoes[n % len(secoes)]}"
+        corpo = [rnd.choice(paragrafos) for _ in range(rnd.randint(2, 5))]
+        if n % 4 == 3:
+            corpo.append(_bloco_dados(rnd, artefato, n + 2))
+        for p in [titulo] + corpo:
+            partes.append(p)
+            total += len(p.encode("utf-8")) + 2
+        n += 1
+    texto = "\n\n".join(partes).encode("utf-8")[:tamanho].decode("utf-8", errors="ignore")
+    return texto[: texto.rfind("\n") if "\n" in texto else len(texto)].rstrip()
+
+
+def gerar_corpus_benchmark(destino=CORPUS_PATH, tamanhos=None, semente=2025, docx_ate=100_000):
+    """
+    Gera o corpus de benchmark (um .txt por artefato e tamanho; .docx até
+    docx_ate bytes) e o manifest.json. Retorna a lista do manifesto.
+    """
+    destino = Path(destino)
+    destino.mkdir(parents=True, exist_ok=True)
+    tamanhos = tamanhos or TAMANHOS_CORPUS
+    manifesto = []
+    for artefato, pastas in FONTES_CORPUS.items():
+        paragrafos = _paragrafos_fonte(pastas)
+        for rotulo, tamanho in tamanhos.items():
+            texto = gerar_texto_corpus(artefato, tamanho, semente, paragrafos)
+            arquivos = [destino / f"{artefato}_{rotulo}.txt"]
+            arquivos[0].write_text(texto, encoding="utf-8")
+            if tamanho <= docx_ate:
+                doc = Document()
+                for bloco in texto.split("\n\n"):
+                    doc.add_paragraph(bloco)
+                arquivos.append(destino / f"{artefato}_{rotulo}.docx")
+                doc.save(arquivos[-1])
+            for arq in arquivos:
+                manifesto.append({
+                    "artefato": artefato,
+                    "tamanho": rotulo,
+                    "arquivo": arq.name,
+                    "bytes": arq.stat().st_size,
+                })
+    (destino / "manifest.json").write_text(
+        json.dumps({"semente": semente, "documentos": manifesto}, ensure_ascii=False, indent=2),
+        encoding="utf-8",
+    )
+    return manifesto
+
+
 if __name__ == "__main__":
     gerar_insumos_ficticios()
     print(f"✅ Insumos fictícios gerados em: {BASE_PATH}")
@@ -0,0 +1,44 @@
+import json
+import os
+
+from utils import alertas_pipeline as ap
+
+
+def _gravar(caminho, campos):
+    caminho.write_text(json.dumps({"campos_ai": campos}, ensure_ascii=False), encoding="utf-8")
+
+
+def test_reavalia_apenas_o_que_mudou(tmp_path, monkeypatch):
+    arquivos = {m: tmp_path / f"{m.lower()}_data.json" for m in ("DFD", "ETP", "TR")}
+    monkeypatch.setattr(ap, "MODULOS_ARQUIVOS", arquivos)
+    ap.limpar_cache_alertas()
+    _gravar(arquivos["DFD"], {"objeto": "Aquisição de notebooks", "valor_estimado": "100000"})
+    _gravar(arquivos["ETP"], {"objeto": "Aquisição de notebooks", "valor_estimado": "100000"})
+
+    primeiro = ap.gerar_alertas_reais(salvar_historico=False)
+    assert primeiro["recalculados"] == {"documentos": ["DFD", "ETP", "TR"], "consistencia": True}
+    assert any(a["id"] == "arquivo_ausente_tr" for a in primeiro["alerts"])
+
+    segundo = ap.gerar_alertas_reais(salvar_historico=False)
+    assert segundo["recalculados"] == {"documentos": [], "consistencia": False}
+    assert [a["id"] for a in segundo["alerts"]] == [a["id"] for a in primeiro["alerts"]]
+
+    # Mesmo conteúdo com mtime novo: só o hash é conferido
+    st = arquivos["ETP"].stat()
+    os.utime(arquivos["ETP"], ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert ap.gerar_alertas_reais(salvar_historico=False)["recalculados"]["documentos"] == []
+
+    # Campo fora das regras entre documentos: reavalia só o ETP
+    _gravar(arquivos["ETP"], {"objeto": "Aquisição de notebooks", "valor_estimado": "100000", "riscos": "baixo"})
+    terceiro = ap.gerar_alertas_reais(salvar_historico=False)
+    assert terceiro["recalculados"] == {"documentos": ["ETP"], "consistencia": False}
+
+    # Campo participante: reavalia também a consistência
+    _gravar(arquivos["DFD"], {"objeto": "Aquisição de notebooks", "valor_estimado": "900000"})
+    quarto = ap.gerar_alertas_reais(salvar_historico=False)
+    assert quarto["recalculados"] == {"documentos": ["DFD"], "consistencia": True}
+
+    ap.limpar_cache_alertas()
+    completo = ap.gerar_alertas_reais(salvar_historico=False, incremental=False)
+    assert [a["id"] for a in completo["alerts"]] == [a["id"] for a in quarto["alerts"]]
+    ap.limpar_cache_alertas()
@@ -0,0 +1,97 @@
+import json
+import time
+
+from utils import base_campos as bc
+
+CNPJ_A = "11.222.333/0001-81"
+CNPJ_B = "11.444.777/0001-61"
+
+
+def _doc(processo, artefato, valor, objeto="Aquisição de notebooks corporativos", cnpjs=(), data="2025-01-01 00:00:00"):
+    return bc.CamposNormalizados(
+        processo=processo, artefato=artefato, data=data, fonte="teste", valor=valor,
+        objeto=objeto, cnpjs=cnpjs, termos=bc._termos_objeto(objeto),
+    )
+
+
+def test_normalizacao_de_campos_e_texto():
+    campos = {"objeto": "Aquisição de notebooks", "valor_estimado": "R$ 1.234,56",
+              "prazo_estimado": "12 (doze) meses", "partes": f"Empresa X, CNPJ {CNPJ_A}; TJSP 51.174.001/0001-50"}
+    doc = bc.normalizar_campos("P1", "dfd", campos, "2025-01-01 00:00:00")
+    assert (doc.artefato, doc.valor, doc.prazo_dias) == ("DFD", 1234.56, 360)
+    assert doc.cnpjs == (CNPJ_A,) and doc.termos == ("aquisicao", "notebooks")
+
+    texto = ("# Edital\n\n## Objeto\nAquisição de notebooks corporativos para modernização do parque tecnológico das unidades.\n\n"
+             "## Valor\n- Unitário: R$ 5.000,00\n- Total: R$ 750.000,00\n\n"
+             "## Garantia\n36 meses on-site\n\n## Entrega\nPrazo de entrega: 30 dias corridos\n")
+    doc = bc.normalizar_texto("P1", "Edital", texto, "2025-01-01 00:00:00")
+    assert (doc.valor, doc.prazo_dias) == (750000.0, 30)
+    assert doc.objeto.startswith("Aquisição de notebooks")
+
+
+def test_versao_mais_recente_e_atualizacao_incremental(tmp_path):
+    base = bc.BaseCampos(tmp_path / "base.sqlite3")
+    assert base.registrar([_doc("P1", "ETP", 100.0, data="2025-02-01 00:00:00")]) == 1
+    assert base.registrar([_doc("P1", "ETP", 999.0, data="2025-01-01 00:00:00")]) == 0
+    assert base.documentos("P1")[0]["valor"] == 100.0
+
+    arquivo = tmp_path / "dfd_data.json"
+    arquivo.write_text('{"objeto": "Aquisição de notebooks", "valor_estimado": "R$ 10,00"}', encoding="utf-8")
+    fontes = [(arquivo, bc._do_export_atual)]
+    assert base.atualizar(fontes)["fontes_lidas"] == 1
+    assert base.atualizar(fontes)["fontes_lidas"] == 0
+    assert base.documentos(bc.PROCESSO_ATUAL, "DFD")[0]["valor"] == 10.0
+    base.fechar()
+
+
+def test_consultas_em_lote_com_milhares_de_processos(tmp_path):
+    base = bc.BaseCampos(tmp_path / "base.sqlite3")
+    docs = []
+    for i in range(3000):
+        p = f"P{i:05d}"
+        docs.append(_doc(p, "ETP", 100_000.0))
+        docs.append(_doc(p, "EDITAL", 150_000.0 if i % 10 == 0 else 110_000.0,
+                         objeto="Serviço de limpeza predial" if i % 100 == 0 else "Aquisição de notebooks corporativos"))
+        docs.append(_doc(p, "CONTRATO", 100_000.0, cnpjs=(CNPJ_A,) if i % 500 == 0 else (CNPJ_B,) if i < 2 else ()))
+    base.registrar(docs)
+
+    inicio = time.perf_counter()
+    divergentes = base.divergencias("valor", "EDITAL", "ETP", limite=0.20)
+    recorrentes = base.cnpjs_recorrentes(3, "CONTRATO")
+    objetos = base.objetos_divergentes("EDITAL", "ETP", 0.30)
+    assert time.perf_counter() - inicio < 1.0
+
+    assert len(divergentes) == 300 and round(divergentes[0]["divergencia"], 4) == round(50 / 150, 4)
+    assert [(r["cnpj"], r["n_processos"]) for r in recorrentes] == [(CNPJ_A, 6)]
+    assert len(objetos) == 30 and objetos[0]["similaridade"] == 0.0
+    assert base.estatisticas()["processos"] == 3000
+    base.fechar()
+
+
+def test_export_com_campos_ai_e_processo_atual_fora_das_consultas(tmp_path):
+    base = bc.BaseCampos(tmp_path / "base.sqlite3")
+    numerados, sem_numero = tmp_path / "a", tmp_path / "b"
+    numerados.mkdir()
+    sem_numero.mkdir()
+    (numerados / "contrato_data.json").write_text(json.dumps({
+        "artefato": "CONTRATO", "nome_arquivo": "/tmp/contrato.txt", "status": "processado",
+        "campos_ai": {"objeto": "Aquisição de notebooks", "valor_global": "R$ 2.000,00",
+                      "processo": "Processo nº 2025.000123", "partes": f"Empresa X, CNPJ {CNPJ_A}"},
+    }), encoding="utf-8")
+    etp = {"objeto": "Aquisição de notebooks", "valor_estimado": "R$ 1.000,00"}
+    (numerados / "etp_data.json").write_text(json.dumps(etp), encoding="utf-8")
+    (sem_numero / "etp_data.json").write_text(json.dumps(etp), encoding="utf-8")
+    base.atualizar((p, bc._do_export_atual) for p in sorted(tmp_path.glob("*/*_data.json")))
+
+    # O ETP sem número herda o processo dos exports irmãos
+    assert {(d["processo"], d["artefato"]) for d in base.documentos("2025.000123")} == {
+        ("2025.000123", "CONTRATO"), ("2025.000123", "ETP")}
+    contrato = base.documentos(artefato="CONTRATO")[0]
+    assert (contrato["valor"], contrato["objeto"]) == (2000.0, "Aquisição de notebooks")
+
+    base.registrar([_doc(bc.PROCESSO_ATUAL, "EDITAL", 9_000.0, cnpjs=(CNPJ_A,)),
+                    _doc(bc.PROCESSO_ATUAL, "CONTRATO", 1_000.0, cnpjs=(CNPJ_A,))])
+    assert base.documentos(bc.PROCESSO_ATUAL, "ETP")[0]["valor"] == 1000.0
+    assert base.divergencias("valor", "EDITAL", "ETP") == []
+    assert base.cnpjs_recorrentes(2) == []
+    base.fechar()
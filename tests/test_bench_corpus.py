@@ -0,0 +1,46 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "data"))
+
+from generate_fictitious_inputs import gerar_corpus_benchmark, gerar_texto_corpus  # noqa: E402
+from tools.bench_validadores import _estatisticas, comparar, comparar_veredictos  # noqa: E402
+
+
+def test_texto_do_corpus_deterministico_e_no_tamanho():
+    texto = gerar_texto_corpus("TR", 20_000)
+    assert texto == gerar_texto_corpus("TR", 20_000)
+    assert 18_000 <= len(texto.encode("utf-8")) <= 20_000
+    assert "R$" in texto and "Lei nº 14.133/2021" in texto
+    assert gerar_texto_corpus("TR", 20_000, semente=7) != texto
+
+
+def test_manifesto_lista_txt_e_docx(tmp_path):
+    manifesto = gerar_corpus_benchmark(tmp_path, tamanhos={"10KB": 10_000})
+    assert {(d["artefato"], Path(d["arquivo"]).suffix) for d in manifesto} == {
+        (a, s) for a in ("DFD", "ETP", "TR", "EDITAL") for s in (".txt", ".docx")
+    }
+    assert (tmp_path / "manifest.json").exists()
+
+
+def test_estatisticas_e_comparacao():
+    est = _estatisticas([10.0, 20.0, 30.0, 40.0], 2_000_000)
+    assert est["p50_ms"] == 25.0 and est["p99_ms"] == 40.0
+    assert est["docs_por_s"] == 40.0 and est["mb_por_s"] == 80.0
+
+    atual = {"resultados": {"rigido": {"TR/10KB": {"p50_ms": 5.0}}}}
+    anterior = {"resultados": {"rigido": {"TR/10KB": {"p50_ms": 10.0}}}}
+    assert comparar(atual, anterior) == [("rigido", "TR/10KB", 10.0, 5.0, -50.0)]
+
+
+def test_veredictos_diferentes_da_referencia():
+    referencia = {"veredictos": {"TR/10KB": {"rigido": {"score": 80.0, "itens": {"objeto": True}}}}}
+    atual = {"veredictos": {
+        "TR/10KB": {"rigido": {"score": 70.0, "itens": {"objeto": False}}},
+        "TR/1MB": {"rigido": {"score": 10.0}},  # fora da referência
+    }}
+    assert comparar_veredictos(atual, referencia) == [
+        ("TR/10KB", "rigido.itens.objeto", True, False),
+        ("TR/10KB", "rigido.score", 80.0, 70.0),
+    ]
+    assert comparar_veredictos(referencia, referencia) == []
@@ -0,0 +1,35 @@
+from knowledge.validators.checklist_matcher import ChecklistMatcher, dobrar, dobrar_padrao
+from knowledge.validators.validator_engine import build_tolerant_pattern, normalize_text
+
+ITENS = [
+    {"id": "L", "descricao": "Base legal", "obrigatorio": True, "padrao": "Lei 14.133/2021"},
+    {"id": "R", "descricao": "Riscos", "padrao": r"(?i)(matriz\s+de\s+riscos|mitiga[cç][aã]o)"},
+    {"id": "S", "descricao": "Sustentabilidade ambiental", "padrao": "sustentabilidade"},
+    {"id": "H", "descricao": "Cronograma físico-financeiro"},
+    {"id": "X", "descricao": "Regex inválida", "padrao": "prazo (dias"},
+]
+
+
+def test_dobrar_preserva_offsets():
+    texto = "AÇÃO — Écran İ €"
+    assert dobrar(texto) == "acao — ecran i €"
+    assert len(dobrar(texto)) == len(texto)
+    assert dobrar_padrao(r"(?i)Decreto\s+\d+\S[A-Z]") == r"decreto\s+\d+\S[a-z]"
+
+
+def test_matcher_reporta_itens_e_offsets():
+    doc = normalize_text(
+        "Conforme a LEI Nº 14.133 / 2021,\n\n  a Mitigação dos riscos e o cronograma  de entrega,\n"
+        "com prazo (dias corridos)."
+    )
+    matcher = ChecklistMatcher(ITENS, build_tolerant_pattern)
+    res = {r["id"]: r for r in matcher.buscar(doc)}
+
+    assert [r["id"] for r in matcher.buscar(doc)] == ["L", "R", "S", "H", "X"]
+    assert res["L"]["presente"] and res["L"]["obrigatorio"]
+    assert doc[res["L"]["inicio"]:res["L"]["fim"]] == "LEI No 14.133 / 2021"  # º → o pela NFKC
+    assert doc[res["R"]["inicio"]:res["R"]["fim"]] == "Mitigação"
+    assert "Mitigação dos riscos" in res["R"]["trecho"]
+    assert not res["S"]["presente"] and res["S"]["inicio"] is None
+    assert res["H"]["presente"]  # heurística: "cronograma" na descrição
+    assert res["X"]["presente"]  # regex malformada → busca literal
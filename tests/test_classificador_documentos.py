@@ -0,0 +1,50 @@
+import pytest
+
+from utils import classificador_documentos as cd
+from utils.classificador_documentos import classificar_documento, detectar_titulo
+
+
+@pytest.fixture(autouse=True)
+def _modelo_temporario(tmp_path, monkeypatch):
+    monkeypatch.setattr(cd, "MODELO_PATH", tmp_path / "classificador_documentos.json")
+
+
+def test_titulo_no_cabecalho():
+    assert detectar_titulo("TERMO DE REFERÊNCIA\n(Lei 14.133/2021)\nOBJETO") == "TR"
+    assert detectar_titulo("DOCUMENTO DE FORMALIZAÇÃO DE DEMANDA (DFD)\nNº PCA 000/0000") == "DFD"
+    assert detectar_titulo("PREGÃO ELETRÔNICO Nº 90012/2025\nProcesso 2025/1") == "EDITAL"
+    # "ANEXO I DO EDITAL" cita o documento principal; o título do anexo vem depois
+    assert detectar_titulo("ANEXO I DO EDITAL\nTERMO DE REFERÊNCIA\nOBJETO") == "TR"
+    assert detectar_titulo("ANEXO II DO EDITAL Nº 12/2025 – MINUTA DE CONTRATO") == "CONTRATO"
+    # Menção ao plano de contratações no corpo do texto não é título
+    assert detectar_titulo("Justificativa da necessidade e vinculação ao plano de contratações anual, "
+                           "conforme calendário aprovado pela unidade demandante no exercício corrente "
+                           "e demais normas aplicáveis.") is None
+
+
+def test_classificacao_sem_titulo():
+    casos = {
+        "TR": "Especificação técnica do objeto. Obrigações da contratada e da contratante. "
+              "Critérios de medição e pagamento. Prazo de execução de 90 dias.",
+        "PESQUISA_PRECOS": "Foram realizadas cotações com três fornecedores e consulta ao painel de "
+                           "preços; o preço estimado corresponde à mediana dos valores obtidos.",
+        "CONTRATO": "CLÁUSULA PRIMEIRA – DO OBJETO. CLÁUSULA SEGUNDA – DA VIGÊNCIA. "
+                    "A CONTRATADA obriga-se perante o CONTRATANTE. CLÁUSULA DÉCIMA – DO FORO.",
+    }
+    for esperado, texto in casos.items():
+        resultado = classificar_documento(texto)
+        assert resultado["tipo"] == esperado
+        assert resultado["origem"] == "modelo"
+        assert resultado["confiavel"]
+
+
+def test_fontes_de_treino_verificadas_uma_vez_por_intervalo(monkeypatch):
+    varreduras = []
+    fontes_treino = cd._fontes_treino
+    monkeypatch.setattr(cd, "_fontes_treino", lambda: varreduras.append(1) or fontes_treino())
+    modelo = cd.obter_classificador()
+    assert cd.MODELO_PATH.exists()
+    assert cd.obter_classificador() is modelo and len(varreduras) == 1
+
+    monkeypatch.setattr(cd, "VALIDADE_FONTES_S", 0.0)
+    assert cd.obter_classificador() is modelo and len(varreduras) == 2
@@ -0,0 +1,67 @@
+import numpy as np
+
+from utils.coerencia_processos import (
+    coerencia_entre_processos,
+    coletar_documentos,
+    dados_heatmap,
+    matriz_coerencia,
+)
+
+OBJETOS = [
+    "aquisição de notebooks corporativos com garantia on-site",
+    "serviços contínuos de limpeza predial e jardinagem",
+    "manutenção preventiva de elevadores e escadas rolantes",
+    "fornecimento de energia elétrica no mercado livre",
+    "locação de veículos com motorista para o interior",
+]
+
+
+def _doc(objeto: str, artefato: str) -> str:
+    return f"{artefato}\n\nOBJETO\n\nContratação de {objeto}, conforme especificações e prazos do processo."
+
+
+def test_matriz_em_blocos_igual_a_calculo_direto():
+    textos = [_doc(o, "TR") for o in OBJETOS]
+    inteira = matriz_coerencia(textos, bloco=128)
+    em_blocos = matriz_coerencia(textos, bloco=2)
+    assert inteira.shape == (5, 5)
+    np.testing.assert_allclose(inteira, em_blocos, atol=1e-6)
+    np.testing.assert_allclose(np.diag(inteira), 1.0, atol=1e-5)
+    assert np.allclose(inteira, inteira.T, atol=1e-6)
+
+
+def test_tr_contra_edital_entre_processos(tmp_path):
+    for i, objeto in enumerate(OBJETOS):
+        for artefato in ("TR", "Edital"):
+            texto = f"Processo SEI nº 10{i}/2025\n\n" + _doc(objeto, artefato)
+            (tmp_path / f"{artefato}_2025010{i}_120000.md").write_text(texto, encoding="utf-8")
+    (tmp_path / "TR_20240101_120000.md").write_text(_doc("outro objeto", "TR"), encoding="utf-8")
+
+    documentos = coletar_documentos(("TR", "Edital"), ano=2025, pasta=tmp_path)
+    assert len(documentos) == 10
+    resultado = coerencia_entre_processos("TR", "Edital", documentos=documentos, bloco=2)
+    m = resultado["matriz"]
+    assert m.shape == (5, 5)
+    assert all(m[i, i] == m[i].max() for i in range(5))
+    proprios = resultado["mesmo_processo"]
+    assert {p["processo"] for p in proprios} == {f"10{i}/2025" for i in range(5)}
+    assert [p["coerencia"] for p in proprios] == sorted(p["coerencia"] for p in proprios)
+
+    heatmap = dados_heatmap(resultado)
+    assert heatmap["x"] == heatmap["y"] == resultado["processos_linhas"]
+    assert len(heatmap["z"]) == 5 and max(max(l) for l in heatmap["z"]) <= 100
+
+
+def test_processo_pelo_rotulo_e_pelo_carimbo(tmp_path):
+    citacao = "Conforme decidido nos autos 0001234-56.2024.8.26.0100, "
+    (tmp_path / "TR_20250301_100000.md").write_text(
+        "# Termo de Referência\n**Processo Administrativo:** 2025/000123\n\n" + _doc(OBJETOS[0], "TR"), encoding="utf-8")
+    (tmp_path / "Edital_20250301_100000.md").write_text(citacao + _doc(OBJETOS[0], "Edital"), encoding="utf-8")
+    (tmp_path / "Edital_20250302_100000.md").write_text(citacao + _doc(OBJETOS[1], "Edital"), encoding="utf-8")
+
+    processos = {d["arquivo"]: d["processo"] for d in coletar_documentos(("TR", "Edital"), pasta=tmp_path)}
+    assert processos == {
+        "TR_20250301_100000.md": "2025/000123",
+        "Edital_20250301_100000.md": "2025/000123",   # mesmo carimbo do TR
+        "Edital_20250302_100000.md": "20250302_100000",  # número citado no corpo não conta
+    }
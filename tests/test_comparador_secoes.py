@@ -0,0 +1,39 @@
+from utils import comparador_pipeline as cp
+
+OBJETO = "Aquisição de notebooks corporativos para modernização do parque tecnológico do tribunal."
+JUSTIFICATIVA = "Equipamentos obsoletos elevam custos de manutenção e reduzem a produtividade dos servidores."
+
+CAMPOS = {
+    "DFD": {"objeto": OBJETO, "justificativa": JUSTIFICATIVA, "prazo_estimado": "45 dias"},
+    "ETP": {"ETP": {"prazo_estimado": "45 dias", "secoes": {
+        "objeto": OBJETO, "descricao_necessidade": JUSTIFICATIVA,
+    }}},
+    "TR": {"campos_ai": {"objeto": OBJETO, "justificativa_tecnica": JUSTIFICATIVA, "prazo_execucao": "90 dias"}},
+}
+
+ANEXO = "ANEXO I\n\n" + "Planilha de composição de custos unitários e encargos sociais. " * 400
+
+
+def test_secoes_equivalentes_vem_dos_campos_dos_agentes():
+    assert cp.extrair_secoes_campos("ETP", CAMPOS["ETP"]) == {
+        "objeto": OBJETO, "justificativa": JUSTIFICATIVA, "prazos": "45 dias",
+    }
+    assert cp.extrair_secoes_campos("TR", CAMPOS["TR"])["prazos"] == "90 dias"
+
+
+def test_comparacao_por_secao_e_incremental(tmp_path, monkeypatch):
+    monkeypatch.setattr(cp, "CACHE_PARES_PATH", tmp_path / "pares.json")
+    textos = {"DFD": OBJETO, "ETP": OBJETO + "\n\n" + ANEXO, "TR": OBJETO}
+
+    r = cp.analisar_coerencia(textos, campos=CAMPOS)
+    assert r["secoes"]["DFD-ETP"] == {"objeto": 100.0, "justificativa": 100.0, "prazos": 100.0}
+    assert r["comparacoes"]["DFD-ETP"] == 100.0  # o anexo não entra na conta
+    assert r["secoes"]["ETP-TR"]["prazos"] < 100.0
+    assert len(r["recalculados"]) == 6
+
+    assert cp.analisar_coerencia(textos, campos=CAMPOS)["recalculados"] == []
+
+    CAMPOS_TR = {"TR": {"objeto": OBJETO, "justificativa_tecnica": JUSTIFICATIVA, "prazo_execucao": "45 dias"}}
+    r = cp.analisar_coerencia(textos, campos={**CAMPOS, **CAMPOS_TR})
+    assert r["recalculados"] == ["ETP-TR:prazos"]
+    assert r["comparacoes"]["ETP-TR"] == 100.0
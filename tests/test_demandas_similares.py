@@ -0,0 +1,91 @@
+import json
+import time
+
+from utils import demandas_similares as ds
+
+NOTEBOOKS = ("Aquisição de notebooks corporativos para modernização do parque tecnológico "
+             "das unidades judiciais da capital, com garantia on-site de trinta e seis meses.")
+PARECIDA = NOTEBOOKS.replace("da capital", "do interior")
+OBJETOS = ("mobiliário", "cadeiras", "impressoras", "veículos", "servidores", "licenças",
+           "uniformes", "ar-condicionado", "monitores", "scanners", "nobreaks", "projetores")
+LOCAIS = ("fórum", "almoxarifado", "cartório", "vara", "comarca", "tribunal", "arquivo")
+
+
+def test_similaridade_da_assinatura():
+    a, b = ds.preparar(NOTEBOOKS), ds.preparar(PARECIDA)
+    outra = ds.preparar("Contratação de serviço de limpeza predial e conservação para o fórum central.")
+    assert ds.jaccard_assinaturas(a.assinatura, b.assinatura) > 0.6
+    assert ds.jaccard_assinaturas(a.assinatura, outra.assinatura) < 0.2
+    assert ds.preparar("Notebooks") is None
+
+
+def test_indexa_insumos_e_consulta_sublinear(tmp_path):
+    pasta = tmp_path / "json"
+    pasta.mkdir()
+    (pasta / "DFD_20250101_100000.json").write_text(json.dumps(
+        {"artefato": "DFD", "campos_ai": {"objeto": NOTEBOOKS}, "data_salvamento": "2025-01-01 10:00:00"}
+    ), encoding="utf-8")
+    (pasta / "ETP_20250101_100000.json").write_text(json.dumps(
+        {"artefato": "ETP", "campos_ai": {"objeto": NOTEBOOKS}}
+    ), encoding="utf-8")
+
+    indice = ds.IndiceDemandas(tmp_path / "lsh.sqlite3")
+    arquivos = lambda: sorted(pasta.glob("DFD_*.json"))
+    assert indice.atualizar(arquivos(), base_campos=False) == {"fontes_lidas": 1, "demandas_novas": 1}
+    assert indice.atualizar(arquivos(), base_campos=False)["fontes_lidas"] == 0
+
+    historico = [
+        ds.preparar(f"Aquisição de {o} para o {l} número {i} conforme especificação técnica {i * 7}")
+        for i, (o, l) in enumerate((o, l) for o in OBJETOS for l in LOCAIS for _ in range(24))
+    ]
+    indice.adicionar(historico)
+    assert len(indice) > 2000
+
+    inicio = time.perf_counter()
+    achados = indice.similares(PARECIDA)
+    candidatos = indice.candidatos(ds.preparar(PARECIDA).assinatura)
+    assert time.perf_counter() - inicio < 0.5
+    assert len(candidatos) < len(indice) // 20
+    assert achados[0]["fontes"][0].endswith("DFD_20250101_100000.json")
+    assert achados[0]["similaridade"] > 0.6
+
+    # O próprio DFD sai pela fonte; o mesmo texto enviado por outra unidade continua
+    atual = str(pasta / "DFD_20250101_100000.json")
+    mesmo_id = lambda r: r["id"] == ds.preparar(NOTEBOOKS).id
+    assert not any(mesmo_id(r) for r in indice.similares(NOTEBOOKS, excluir_fontes=[atual]))
+    indice.adicionar([ds.preparar(NOTEBOOKS, "unidade_b/DFD_20250301_090000.json", "2025-03-01 09:00:00")])
+    achado = next(r for r in indice.similares(NOTEBOOKS, excluir_fontes=[atual]) if mesmo_id(r))
+    assert achado["fontes"] == ["unidade_b/DFD_20250301_090000.json"] and achado["similaridade"] == 1.0
+    indice.fechar()
+
+
+def test_fontes_do_dfd_em_edicao(tmp_path):
+    insumos, exports = tmp_path / "json", tmp_path / "exports"
+    insumos.mkdir()
+    exports.mkdir()
+    payload = json.dumps({"artefato": "DFD", "campos_ai": {"objeto": NOTEBOOKS}})
+    for nome in ("DFD_ultimo.json", "DFD_20250102_080000.json"):
+        (insumos / nome).write_text(payload, encoding="utf-8")
+    (insumos / "DFD_20250101_080000.json").write_text(payload.replace("capital", "litoral"), encoding="utf-8")
+    (exports / "dfd_data.json").write_text("{}", encoding="utf-8")
+    (exports / "etp_data.json").write_text("{}", encoding="utf-8")
+
+    assert sorted(ds.fontes_dfd_atual(insumos, exports)) == sorted(
+        [str(exports / "dfd_data.json"), str(insumos / "DFD_20250102_080000.json")]
+    )
+
+
+def test_dfd_da_base_com_o_mesmo_texto_da_consulta(tmp_path, monkeypatch):
+    from utils import base_campos as bc
+
+    campos = {"objeto": "Aquisição de notebooks", "descricao_necessidade": NOTEBOOKS}
+    export = tmp_path / "dfd_data.json"
+    export.write_text(json.dumps({"artefato": "DFD", "campos_ai": campos}), encoding="utf-8")
+    base = bc.BaseCampos(tmp_path / "base.sqlite3")
+    base.atualizar([(export, bc._do_export_atual)])
+    monkeypatch.setattr(base, "atualizar", lambda *a, **k: {})
+    monkeypatch.setattr(ds, "obter_base", lambda: base)
+
+    [demanda] = ds._da_base_campos()
+    assert demanda.id == ds.preparar(ds.texto_demanda(campos)).id and demanda.fonte == str(export)
+    base.fechar()
@@ -0,0 +1,76 @@
+import time
+
+from utils import diff_versoes as dv
+
+V1 = """EDITAL DE PREGÃO ELETRÔNICO
+
+1. DO OBJETO
+
+1.1. Aquisição de notebooks corporativos para as unidades da capital, conforme especificações do Termo de Referência.
+
+1.2. A entrega será realizada no almoxarifado central em até 45 dias corridos após a emissão da nota de empenho.
+
+2. DO PAGAMENTO
+
+2.1. O pagamento será efetuado em até trinta dias após o recebimento definitivo e a apresentação da nota fiscal.
+
+2.2. Eventuais glosas serão comunicadas à contratada, que poderá apresentar justificativa em cinco dias úteis.
+"""
+
+V2 = V1.replace("em até 45 dias corridos", "em até 60 dias corridos").replace(
+    "2.2. Eventuais glosas serão comunicadas à contratada, que poderá apresentar justificativa em cinco dias úteis.\n",
+    "2.2. Eventuais glosas serão comunicadas à contratada, que poderá apresentar justificativa em cinco dias úteis.\n\n"
+    "2.3. Não haverá antecipação de pagamento, salvo nas hipóteses do art. 145 da Lei nº 14.133/2021.\n",
+)
+
+
+def test_opcodes_patience():
+    a, b = list("abcXdef"), list("abcdeYf")
+    reconstruido = []
+    for tag, i1, i2, j1, j2 in dv.opcodes(a, b):
+        reconstruido.extend(b[j1:j2] if tag != "delete" else [])
+        if tag == "equal":
+            assert a[i1:i2] == b[j1:j2]
+    assert reconstruido == b
+
+
+def test_diff_por_clausula_e_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(dv, "CACHE_DIR", tmp_path)
+    diff = dv.diff_versoes(V1, V2)
+    assert not diff["cache_hit"]
+    assert diff["resumo"]["alterada"] == 1 and diff["resumo"]["inserida"] == 1
+    assert diff["resumo"]["removida"] == 0
+
+    alterada = next(c for c in diff["clausulas"] if c["tipo"] == "alterada")
+    assert alterada["rotulo_novo"].endswith("1.2")
+    assert [tuple(t) for t in alterada["trechos"] if t[0] != "igual"] == [("removido", "45"), ("inserido", "60")]
+    assert "<span" in dv.renderizar_html(alterada)
+
+    assert dv.diff_versoes(V1, V2)["cache_hit"]
+
+
+def test_documento_longo_em_menos_de_um_segundo(tmp_path, monkeypatch):
+    monkeypatch.setattr(dv, "CACHE_DIR", tmp_path)
+    longo = "\n\n".join(
+        f"{i}. SEÇÃO {i}\n\n" + "\n\n".join(
+            f"{i}.{k}. Cláusula {i}.{k} sobre obrigações da contratada, fiscalização, prazos e sanções, "
+            f"com redação padronizada número {i * 100 + k} para o processo." for k in range(1, 9)
+        ) for i in range(1, 40)
+    )
+    novo = longo.replace("número 1005", "número 9999").replace("número 2003 ", "número 2003 revisada ")
+    inicio = time.perf_counter()
+    diff = dv.diff_versoes(longo, novo)
+    assert time.perf_counter() - inicio < 1.0
+    assert diff["resumo"]["alterada"] == 2
+
+
+def test_titulo_renomeado_e_alteracao(tmp_path, monkeypatch):
+    monkeypatch.setattr(dv, "CACHE_DIR", tmp_path)
+    diff = dv.diff_versoes(V1, V1.replace("2. DO PAGAMENTO", "2. DA RESCISÃO"))
+    assert diff["resumo"]["alterada"] == 1 and diff["resumo"]["inserida"] == diff["resumo"]["removida"] == 0
+
+    titulo = diff["clausulas"][0]
+    assert titulo["rotulo_antigo"] == titulo["rotulo_novo"] == "Seção 2"
+    assert [tuple(t) for t in titulo["trechos"] if t[0] != "igual"] == [
+        ("removido", "DO"), ("inserido", "DA"), ("removido", "PAGAMENTO"), ("inserido", "RESCISÃO"),
+    ]
@@ -0,0 +1,45 @@
+from knowledge.validators import validator_engine as ve
+
+DOCUMENTO = (
+    "TERMO  DE  REFERÊNCIA\n\n"
+    "   1. OBJETO – Contratação de serviços de limpeza.\n"
+    "   Descrição   do\tobjeto: limpeza predial.\n"
+    "\t\n"
+    "2. FUNDAMENTAÇÃO: conforme a Lei nº 14.133/2021 e o Decreto Estadual 67.381/2022.\n"
+)
+
+
+def test_mapa_de_offsets_volta_ao_texto_original():
+    norm, mapa = ve.normalize_text_with_map(DOCUMENTO)
+    assert norm == ve.normalize_text(DOCUMENTO)
+
+    ini = norm.index("Lei no 14.133/2021")
+    a, b = mapa.intervalo(ini, ini + len("Lei no 14.133/2021"))
+    assert DOCUMENTO[a:b] == "Lei nº 14.133/2021"
+
+    ini = norm.index("OBJETO - Contratação")
+    a, b = mapa.intervalo(ini, ini + len("OBJETO - Contratação"))
+    assert DOCUMENTO[a:b] == "OBJETO – Contratação"
+
+
+def test_rigid_validate_devolve_span_no_original():
+    _, resultados = ve.rigid_validate(DOCUMENTO, "TR")
+    presentes = [r for r in resultados if r["presente"]]
+    assert presentes
+    objeto = next(r for r in presentes if r["id"] == "objeto")
+    assert DOCUMENTO[objeto["inicio"]:objeto["fim"]] == "Descrição   do\tobjeto"
+    assert "limpeza predial" in objeto["trecho"]
+
+
+def test_contexto_focado_nas_evidencias():
+    texto = "\n".join(f"linha {i} " + "x" * 80 for i in range(400))
+    alvo = texto.index("linha 200 ")
+    grupo = [{"id": "A", "descricao": "linha"}]
+
+    focado = ve._group_context(ve._index_sections(texto), texto, grupo, {"A": (alvo, alvo + 9)})
+    assert "linha 200 " in focado
+    assert len(focado) <= 2 * ve.SEMANTIC_EVIDENCE_WINDOW + 200
+
+    # item sem evidência → seções relevantes como antes
+    amplo = ve._group_context(ve._index_sections(texto), texto, grupo, {})
+    assert len(amplo) > len(focado)
@@ -0,0 +1,45 @@
+import time
+from datetime import date
+
+import numpy as np
+
+from utils.extracao_br import extrair, extrair_lote, prazo_dias, prazos_lote, valor_brl, valores_lote
+
+TEXTO = """Processo SEI nº 2025/0001234 – contratada ACME LTDA, CNPJ 11.222.333/0001-81 (11222333000182 é inválido).
+Valor global de R$ 1.234.567,89, assinado em 05/03/2025, vigência de 12 (doze) meses a partir de 1º de abril de 2025.
+Multa de 2,5% nos termos do art. 156 da Lei nº 14.133/2021 e do Decreto 10.024/2019."""
+
+
+def test_valores_e_prazos_de_campos():
+    assert valor_brl("R$ 1.234.567,89") == 1234567.89
+    assert valor_brl("R$ 1,234,567.89") == 1234567.89
+    assert valor_brl("R$ 2,5 milhões") == 2_500_000
+    assert valor_brl("150000") == 150000
+    assert valor_brl("Valor não divulgado") is None
+    assert prazo_dias("12 (doze) meses") == 360
+    assert prazo_dias("noventa dias corridos") == 90
+    assert prazo_dias("a definir") is None
+
+
+def test_extrair_todos_os_tipos():
+    achados = {tipo: [e.valor for e in itens] for tipo, itens in extrair(TEXTO).items()}
+    assert achados["cnpj"] == ["11.222.333/0001-81"]
+    assert achados["processo"] == ["2025/0001234"]
+    assert achados["valor"] == [1234567.89]
+    assert achados["data"] == [date(2025, 3, 5), date(2025, 4, 1)]
+    assert achados["prazo"][0]["dias"] == 360
+    assert achados["percentual"] == [2.5]
+    assert [(n["norma"], n["numero"], n["ano"], n["artigo"]) for n in achados["norma"]] == [
+        ("Lei", "14133", 2021, "156"), ("Decreto", "10024", 2019, None)
+    ]
+
+
+def test_lote_igual_ao_individual_e_rapido():
+    textos = [TEXTO, "sem números", f"R$ {7 * 1000:,}".replace(",", ".") + " em 30 dias"] * 2000
+    inicio = time.perf_counter()
+    lote = extrair_lote(textos)
+    assert time.perf_counter() - inicio < 2.0
+    for i in (0, 1, 2):
+        assert lote[i] == extrair(textos[i])
+    np.testing.assert_array_equal(valores_lote(textos[:3]), [1234567.89, np.nan, 7000.0])
+    np.testing.assert_array_equal(prazos_lote(textos[:3]), [360, np.nan, 30])
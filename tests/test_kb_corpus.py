@@ -0,0 +1,78 @@
+from utils.kb_corpus import KBCorpus, construir_corpus, obter_corpus
+
+
+def _kb(tmp_path):
+    kb = tmp_path / "kb"
+    (kb / "TR").mkdir(parents=True)
+    (kb / "legislacao").mkdir()
+    paragrafos = [f"Cláusula {i} – execução do serviço com acentuação." for i in range(200)]
+    (kb / "TR" / "modelo.txt").write_text("\n\n".join(paragrafos), encoding="utf-8")
+    (kb / "legislacao" / "lei.txt").write_text("Lei 14.133/2021\n\nArt. 1º", encoding="utf-8")
+    (kb / "TR" / "placeholder.txt").write_text("   ", encoding="utf-8")
+    return kb
+
+
+def test_passagens_reconstroem_documento(tmp_path):
+    kb = _kb(tmp_path)
+    resumo = construir_corpus(kb, tmp_path / "cache")
+    assert resumo["documentos"] == 2
+
+    corpus = KBCorpus(tmp_path / "cache")
+    pids = corpus.passagens_do_documento("TR/modelo.txt")
+    assert len(pids) > 1
+    original = (kb / "TR" / "modelo.txt").read_text(encoding="utf-8")
+    assert "".join(corpus.passagem(p) for p in pids) == original
+    assert corpus.metadados(pids[1])["ordem"] == 1
+    assert corpus.esta_atualizado(kb)
+    corpus.fechar()
+
+
+def test_ler_pastas_e_deteccao_de_alteracao(tmp_path):
+    kb = _kb(tmp_path)
+    construir_corpus(kb, tmp_path / "cache")
+    corpus = KBCorpus(tmp_path / "cache")
+
+    bloco = corpus.ler_pastas(["legislacao"], max_chars=100)
+    assert "=== lei.txt ===" in bloco and "14.133/2021" in bloco
+
+    (kb / "legislacao" / "nova.txt").write_text("Decreto 67.381/2022", encoding="utf-8")
+    assert not corpus.esta_atualizado(kb)
+    corpus.fechar()
+
+
+def test_knowledge_loader_usa_corpus_e_fallback(tmp_path, monkeypatch):
+    from utils import knowledge_loader as kl
+
+    kb = _kb(tmp_path)
+    construir_corpus(kb, tmp_path / "cache")
+    corpus = KBCorpus(tmp_path / "cache")
+    monkeypatch.setattr(kl, "KB_ROOT", str(kb))
+    monkeypatch.setattr(kl, "obter_corpus", lambda: corpus)
+    monkeypatch.setattr(kl, "_VALIDACAO", {"corpus": None, "atualizado": False, "verificado_em": 0.0})
+
+    lidos = []
+    monkeypatch.setattr(corpus, "documento", lambda d: lidos.append(d) or KBCorpus.documento(corpus, d))
+    assert "14.133/2021" in kl.read_txt_files(["legislacao"])
+    assert kl.ler_documento(kb / "legislacao" / "lei.txt").startswith("Lei 14.133")
+    assert lidos == ["legislacao/lei.txt", "legislacao/lei.txt"]
+
+    # Corpus desatualizado → leitura pelo registro (disco)
+    (kb / "legislacao" / "lei.txt").write_text("Lei 8.666/1993", encoding="utf-8")
+    monkeypatch.setattr(kl, "_VALIDACAO", {"corpus": None, "atualizado": False, "verificado_em": 0.0})
+    assert "8.666/1993" in kl.read_txt_files(["legislacao"])
+    assert len(lidos) == 2
+    corpus.fechar()
+
+
+def test_corpus_compartilhado_reaberto_apos_novo_build(tmp_path):
+    kb = _kb(tmp_path)
+    construir_corpus(kb, tmp_path / "cache")
+    corpus = obter_corpus(tmp_path / "cache")
+    assert obter_corpus(tmp_path / "cache") is corpus
+
+    (kb / "legislacao" / "decreto.txt").write_text("Decreto 11.462/2023", encoding="utf-8")
+    assert not corpus.esta_atualizado(kb)
+    construir_corpus(kb, tmp_path / "cache")
+    novo = obter_corpus(tmp_path / "cache")
+    assert novo is not corpus and novo.esta_atualizado(kb)
+    assert "legislacao/decreto.txt" in novo.documentos
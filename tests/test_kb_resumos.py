@@ -0,0 +1,65 @@
+from utils.kb_resumos import (
+    dividir_secoes,
+    estimar_tokens,
+    hash_conteudo,
+    obter_resumo,
+    resumo_relevante,
+)
+
+MODELO = """TERMO DE REFERÊNCIA
+
+OBJETO
+
+1.1 Contratação de empresa para reforma da fachada do fórum, com substituição de esquadrias e pintura externa. Os serviços incluem andaimes e proteção de pedestres.
+
+1.2 A execução observará o projeto básico e o memorial descritivo anexos ao processo administrativo.
+
+OBRIGAÇÕES DA CONTRATADA
+
+2.1 Manter preposto no local durante toda a execução dos serviços, com poderes para representar a empresa perante a fiscalização.
+
+2.2 Fornecer uniformes e equipamentos de proteção individual aos empregados alocados na obra e no canteiro.
+
+PAGAMENTO
+
+3.1 O pagamento será efetuado em até trinta dias após a medição aprovada pela fiscalização do contrato e emissão da nota fiscal.
+
+3.2 Eventuais glosas decorrentes da medição serão comunicadas à contratada, que poderá apresentar justificativa no prazo de cinco dias úteis.
+"""
+
+
+def test_secoes_e_cache_por_hash(tmp_path):
+    secoes = dividir_secoes(MODELO)
+    assert [t for t, _ in secoes][1:] == ["OBJETO", "OBRIGAÇÕES DA CONTRATADA", "PAGAMENTO"]
+
+    modelo = tmp_path / "modelo.txt"
+    modelo.write_text(MODELO, encoding="utf-8")
+    resumo = obter_resumo(modelo, tmp_path / "cache")
+    assert resumo["hash"] == hash_conteudo(MODELO)
+    assert (tmp_path / "cache" / f"{resumo['hash']}.json").exists()
+    objeto = next(s for s in resumo["secoes"] if s["titulo"] == "OBJETO")
+    assert [c["rotulo"] for c in objeto["clausulas"]] == ["1.1", "1.2"]
+
+
+def test_resumo_relevante_prioriza_objeto_e_respeita_orcamento(tmp_path):
+    modelo = tmp_path / "modelo.txt"
+    modelo.write_text(MODELO, encoding="utf-8")
+
+    contexto = resumo_relevante(
+        None, "pagamento após medição", orcamento_tokens=120,
+        arquivos=[modelo], destino=tmp_path / "cache",
+    )
+    assert "PAGAMENTO" in contexto
+    assert estimar_tokens(contexto) <= 120
+
+
+def test_resumo_relevante_sem_secoes_alheias_ao_objeto(tmp_path):
+    modelo = tmp_path / "modelo.txt"
+    modelo.write_text(MODELO, encoding="utf-8")
+    argumentos = dict(orcamento_tokens=2000, arquivos=[modelo], destino=tmp_path / "cache")
+
+    contexto = resumo_relevante(None, "glosas na medição", **argumentos)
+    assert "PAGAMENTO" in contexto and "OBRIGAÇÕES" not in contexto and "OBJETO" not in contexto
+    # Nenhuma seção cita o objeto: ordem do documento
+    titulos = [l.split(":", 1)[0] for l in resumo_relevante(None, "vigilância armada", **argumentos).splitlines()]
+    assert titulos == ["[modelo] OBJETO", "[modelo] OBRIGAÇÕES DA CONTRATADA", "[modelo] PAGAMENTO"]
@@ -0,0 +1,52 @@
+import os
+import time
+
+from utils.knowledge_registry import KnowledgeRegistry
+
+
+def _tocar(path, conteudo):
+    """Reescreve o arquivo garantindo mtime diferente."""
+    path.write_text(conteudo, encoding="utf-8")
+    futuro = time.time() + 5
+    os.utime(path, (futuro, futuro))
+
+
+def test_texto_lido_uma_vez_e_invalidado_por_alteracao(tmp_path):
+    arq = tmp_path / "modelo.txt"
+    arq.write_text("versão 1", encoding="utf-8")
+    reg = KnowledgeRegistry()
+
+    assert reg.ler_texto(arq) == "versão 1"
+    assert reg.ler_texto(arq) == "versão 1"
+    stats = reg.estatisticas()
+    assert stats["misses"] == 1 and stats["hits"] == 1
+
+    _tocar(arq, "versão 2 alterada")
+    assert reg.ler_texto(arq) == "versão 2 alterada"
+    assert reg.estatisticas()["misses"] == 2
+
+
+def test_yaml_e_listagem(tmp_path):
+    (tmp_path / "a.txt").write_text("A", encoding="utf-8")
+    (tmp_path / "b.txt").write_text("B", encoding="utf-8")
+    (tmp_path / "checklist.yml").write_text("items:\n  - id: x\n", encoding="utf-8")
+    reg = KnowledgeRegistry()
+
+    assert reg.listar_textos(tmp_path) == {"a.txt": "A", "b.txt": "B"}
+    assert reg.ler_yaml(tmp_path / "checklist.yml") == {"items": [{"id": "x"}]}
+
+    stats = reg.estatisticas()
+    assert stats["total_entradas"] == 3
+    assert stats["memoria_bytes"] > 0
+    assert set(stats["por_tipo"]) == {"texto", "yaml"}
+
+
+def test_arquivo_removido_sai_do_cache(tmp_path):
+    arq = tmp_path / "x.txt"
+    arq.write_text("conteúdo", encoding="utf-8")
+    reg = KnowledgeRegistry()
+    reg.ler_texto(arq)
+    arq.unlink()
+
+    assert reg.ler_texto(arq) == ""
+    assert reg.estatisticas()["total_entradas"] == 0
@@ -0,0 +1,61 @@
+import json
+import re
+from types import SimpleNamespace
+
+from knowledge.validators import model_router as mr
+from knowledge.validators import validator_engine as ve
+
+POLITICA = mr.PoliticaModelos(True, "rapido", "preciso", 1, (35.0, 65.0), 15.0)
+
+
+def test_confianca_por_esquema_faixa_e_autoconsistencia():
+    assert mr.avaliar_confianca([{"id": "A", "presente": True, "adequacao_nota": 90}], POLITICA) == (True, [])
+    assert not mr.avaliar_confianca([None], POLITICA)[0]
+    assert not mr.avaliar_confianca([{"id": "A", "adequacao_nota": "alta"}], POLITICA)[0]
+    assert not mr.avaliar_confianca([{"id": "A", "adequacao_nota": 50}], POLITICA)[0]
+    assert not mr.avaliar_confianca([{"id": "A", "presente": False, "adequacao_nota": 85}], POLITICA)[0]
+
+    ok, motivos = mr.avaliar_confianca(
+        [{"id": "A", "adequacao_nota": 90}, {"id": "A", "adequacao_nota": 70}], POLITICA
+    )
+    assert not ok and "divergem" in motivos[0]
+
+
+def test_politica_por_artefato_e_desligamento(monkeypatch):
+    assert mr.politica_modelos("EDITAL").amostras == 2
+    assert mr.politica_modelos("OBRAS").cascata is False
+    monkeypatch.setenv("SYNAPSE_CASCATA", "0")
+    assert mr.politica_modelos("TR").cascata is False
+
+
+class _ClienteFalso:
+    """Modelo rápido: A=90, B=50 (incerta), C ausente; modelo preciso: nota 70."""
+
+    def __init__(self):
+        self.pedidos = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, model, messages, temperature, max_tokens):
+        pedido = json.loads(re.search(r"CHECKLIST:\n(\[.*\])\n", messages[1]["content"], re.DOTALL).group(1))
+        ids = [it["id"] for it in pedido]
+        self.pedidos.append((model, ids))
+        if model == "rapido":
+            notas = {"A": 90, "B": 50}
+            resposta = [{"id": i, "presente": True, "adequacao_nota": notas[i]} for i in ids if i in notas]
+        else:
+            resposta = [{"id": i, "presente": True, "adequacao_nota": 70} for i in ids]
+        msg = SimpleNamespace(content=json.dumps(resposta))
+        return SimpleNamespace(choices=[SimpleNamespace(message=msg, finish_reason="stop")])
+
+
+def test_cascata_escala_so_itens_de_baixa_confianca(monkeypatch):
+    monkeypatch.setattr(ve, "politica_modelos", lambda artefato: POLITICA)
+    checklist = [{"id": i, "descricao": f"Item {i}"} for i in "ABC"]
+    cliente = _ClienteFalso()
+
+    score, itens = ve.semantic_validate("Documento.", "TR", checklist, cliente, incremental=False)
+
+    assert cliente.pedidos == [("rapido", ["A", "B", "C"]), ("preciso", ["B", "C"])]
+    assert [(it["id"], it["modelo"]) for it in itens] == [("A", "rapido"), ("B", "preciso"), ("C", "preciso")]
+    assert "faixa incerta" in itens[1]["escalado"][0]
+    assert score == round((90 + 70 + 70) / 3, 1)
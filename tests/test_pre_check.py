@@ -0,0 +1,81 @@
+import json
+import re
+from types import SimpleNamespace
+
+from knowledge.validators import validator_engine as ve
+from knowledge.validators.verdict_cache import VerdictCache
+
+CHECKLIST = [
+    {"id": "lei", "descricao": "Citar a Lei 14.133/2021", "padrao": r"lei\s*14\.133"},
+    {"id": "decreto", "descricao": "Citar o decreto estadual", "padrao": r"decreto\s+67\.381",
+     "pre_check": "nao"},
+    {"id": "objeto", "descricao": "Objeto descrito com clareza", "padrao": r"objeto"},
+    {"id": "riscos", "descricao": "Matriz de riscos", "padrao": r"matriz\s+de\s+riscos"},
+]
+DOCUMENTO = (
+    "OBJETO: serviços de limpeza.\n"
+    "Fundamentação: Lei 14.133/2021 e Decreto 67.381/2022.\n"
+    "Matriz de riscos anexa.\n"
+)
+
+
+class _ClienteFalso:
+    def __init__(self):
+        self.ids = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, messages, **kwargs):
+        pedido = json.loads(re.search(r"CHECKLIST:\n(\[.*\])\n", messages[1]["content"], re.DOTALL).group(1))
+        self.ids += [it["id"] for it in pedido]
+        msg = SimpleNamespace(content=json.dumps([{"id": it["id"], "adequacao_nota": 80} for it in pedido]))
+        return SimpleNamespace(choices=[SimpleNamespace(message=msg, finish_reason="stop")])
+
+
+def _evidencias(texto):
+    evidencias = {}
+    for it in CHECKLIST:
+        m = re.search(it["padrao"], texto, re.IGNORECASE)
+        if m:
+            evidencias[it["id"]] = (m.start(), m.end())
+    return evidencias
+
+
+def test_so_citacao_normativa_de_item_de_presenca_fica_local():
+    texto = ve.normalize_text(DOCUMENTO)
+    locais = ve._pre_check(CHECKLIST, texto, _evidencias(texto), max_fracao=1.0)
+
+    # "decreto" tem pre_check: nao; "objeto" é qualitativo; "riscos" não é citação
+    assert list(locais) == ["lei"]
+    assert locais["lei"]["origem"] == "local" and "Lei 14.133" in locais["lei"]["justificativa"]
+    assert ve._pre_check(CHECKLIST, texto, _evidencias(texto), max_fracao=0.0) == {}
+
+
+def test_semantic_validate_escala_apenas_itens_ambiguos(tmp_path, monkeypatch):
+    monkeypatch.setattr(ve, "obter_cache", lambda artefato: VerdictCache(artefato, tmp_path))
+    monkeypatch.setattr(ve, "get_checklist_matcher",
+                        lambda artefato: ve.ChecklistMatcher(CHECKLIST, ve.build_tolerant_pattern))
+    cliente = _ClienteFalso()
+
+    score, itens = ve.semantic_validate(DOCUMENTO, "TESTE", CHECKLIST, cliente)
+
+    assert sorted(cliente.ids) == ["decreto", "objeto", "riscos"]
+    assert [it["id"] for it in itens] == ["lei", "decreto", "objeto", "riscos"]
+    assert score == round((100 + 80 * 3) / 4, 1)
+
+    relatorio = ve._pre_check_report(itens)
+    assert relatorio["locais"] == ["lei"] and relatorio["fracao_local"] == 0.25
+
+
+def test_validate_document_varre_o_checklist_uma_vez(tmp_path, monkeypatch):
+    matcher = ve.ChecklistMatcher(CHECKLIST, ve.build_tolerant_pattern)
+    buscas = []
+    buscar = matcher.buscar
+    monkeypatch.setattr(matcher, "buscar", lambda texto: buscas.append(1) or buscar(texto))
+    monkeypatch.setattr(ve, "obter_cache", lambda artefato: VerdictCache(artefato, tmp_path))
+    monkeypatch.setattr(ve, "get_checklist_matcher", lambda artefato: matcher)
+    monkeypatch.setattr(ve, "load_checklist", lambda artefato: CHECKLIST)
+
+    resultado = ve._validate_document(DOCUMENTO, "TESTE", _ClienteFalso())
+    assert len(buscas) == 1
+    assert [it["id"] for it in resultado["semantic_result"]] == ["lei", "decreto", "objeto", "riscos"]
+    assert next(r for r in resultado["rigid_result"] if r["id"] == "lei")["presente"]
@@ -0,0 +1,58 @@
+from agents.contrato_agent import ContratoAgent
+from utils.pre_extracao import pre_extrair, substituir_cnpj
+
+CONTRATO = """CONTRATO ADMINISTRATIVO Nº 245/2025
+CONTRATANTE: TRIBUNAL DE JUSTIÇA DO ESTADO DE SÃO PAULO, CNPJ 51.174.001/0001-50.
+CONTRATADA: ACME SERVIÇOS LTDA, CNPJ 11.222.333/0001-81, com sede em São Paulo.
+CLÁUSULA TERCEIRA – DA VIGÊNCIA
+O presente contrato terá vigência de 12 (doze) meses, contados da assinatura.
+CLÁUSULA QUARTA – DO VALOR
+O valor global do contrato é de R$ 850.000,00 (oitocentos e cinquenta mil reais).
+Assinado em 15/12/2025.
+"""
+
+
+def test_fatos_do_contrato():
+    fatos = {campo: f.valor for campo, f in pre_extrair("CONTRATO", CONTRATO).items()}
+    assert fatos == {
+        "numero_contrato": "245/2025",
+        "data_assinatura": "15/12/2025",
+        "valor_global": "R$ 850.000,00",
+        "vigencia": "O presente contrato terá vigência de 12 (doze) meses, contados da assinatura.",
+        "cnpj_contratada": "11.222.333/0001-81",
+    }
+
+
+def test_valores_discordantes_ficam_para_o_modelo():
+    texto = "O valor global é de R$ 10.000,00. Após o aditivo, o valor global passa a R$ 12.500,00."
+    assert "valor_global" not in pre_extrair("CONTRATO", texto)
+    assert pre_extrair("DFD", "Prazo de execução: 3 meses.")["prazo_estimado"].valor == "3 meses"
+
+
+def test_prompt_sem_campos_fixos():
+    agente = ContratoAgent.__new__(ContratoAgent)
+    fatos = pre_extrair("CONTRATO", CONTRATO)
+    completo = agente._montar_prompt(None, "", None, {})
+    reduzido = agente._montar_prompt(None, "", None, fatos)
+    assert len(reduzido) < len(completo)
+    for campo in ("numero_contrato", "data_assinatura", "valor_global", "vigencia"):
+        assert f'"{campo}"' in completo and f'"{campo}"' not in reduzido
+    assert "**3. objeto**" in reduzido and "- valor_global: R$ 850.000,00" in reduzido
+
+
+def test_substituir_cnpj():
+    assert substituir_cnpj("ACME LTDA, CNPJ 12.345.678/0001-99", "11.222.333/0001-81") == "ACME LTDA, CNPJ 11.222.333/0001-81"
+    assert substituir_cnpj("ACME LTDA.", "11.222.333/0001-81") == "ACME LTDA, inscrita no CNPJ sob o nº 11.222.333/0001-81"
+
+
+def test_valor_fora_da_frase_da_ancora_e_so_indicio():
+    texto = ("CLÁUSULA TERCEIRA – DA VIGÊNCIA\n"
+             "A entrega dos equipamentos ocorrerá em até 30 (trinta) dias após a emissão da ordem de fornecimento.\n"
+             "O valor global do contrato é de R$ 850.000,00.")
+    fatos = pre_extrair("CONTRATO", texto)
+    assert not fatos["vigencia"].fixo and fatos["valor_global"].fixo
+
+    agente = ContratoAgent.__new__(ContratoAgent)
+    prompt = agente._montar_prompt(None, "", None, fatos)
+    assert '"vigencia"' in prompt and '"valor_global"' not in prompt
+    assert "**INDÍCIOS" in prompt and "- vigencia: A entrega dos equipamentos" in prompt
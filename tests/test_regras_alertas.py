@@ -0,0 +1,62 @@
+import time
+
+import pytest
+
+from utils.regras_alertas import carregar_regras, compilar_regras
+
+
+def test_regra_nova_sem_codigo():
+    regras = compilar_regras({
+        "limites": {"min_obrigatorio": 10},
+        "modulos": {"DFD": {
+            "obrigatorios": ["objeto"],
+            "regras": [
+                {"id": "dfd_valor_alto", "campo": "valor_estimado", "max_valor": 1_000_000, "tipo": "Informativo",
+                 "mensagem": "Valor acima de R$ {limite:,.0f} no {modulo}"},
+                {"id": "dfd_sem_cnpj", "campo": "fornecedor", "quando_vazio": True, "sem_padrao": r"\d{2}\.\d{3}\.\d{3}/"},
+            ],
+        }},
+    })
+    alertas = regras.avaliar("DFD", {"objeto": "curto", "valor_estimado": "R$ 2.500.000,00", "fornecedor": "ACME"})
+    assert [a["id"] for a in alertas] == ["dfd_objeto_vazio", "dfd_valor_alto", "dfd_sem_cnpj"]
+    assert alertas[1]["severidade"] == "baixo"
+    assert alertas[1]["mensagem"] == "Valor acima de R$ 1,000,000 no DFD"
+    assert len({a["timestamp"] for a in alertas}) == 1
+
+
+@pytest.mark.parametrize("regra", [
+    {"id": "x", "campo": "objeto", "padrao": "(", "tipo": "Médio"},
+    {"id": "x", "campo": "objeto", "padrao": "a", "min_caracteres": 3},
+    {"id": "x", "campo": "objeto", "min_caracteres": 3, "mensagem": "{inexistente}"},
+    {"id": "x", "campo": "objeto", "min_caracteres": 3, "tipo": "Grave"},
+    {"id": "x", "campo": "objeto", "min_caracteres": 3, "ignorar_caixa": True},
+])
+def test_regra_invalida_falha_na_compilacao(regra):
+    with pytest.raises(ValueError, match="'x'"):
+        compilar_regras({"modulos": {"DFD": {"regras": [regra]}}})
+
+
+def test_conjunto_padrao_em_lote():
+    regras = carregar_regras()
+    assert carregar_regras() is regras
+    campos = {"objeto": "Aquisição de notebooks", "prazo_estimado": "a definir", "orcamento_previsto": "R$ 10,00"}
+    inicio = time.perf_counter()
+    for _ in range(5000):
+        alertas = regras.avaliar("ETP", campos)
+    assert time.perf_counter() - inicio < 1.0
+    assert {a["id"] for a in alertas} >= {"etp_prazo_indefinido", "etp_justificativa_contratacao_vazio"}
+
+
+def test_caixa_e_espacos_como_no_pipeline_original():
+    regras = carregar_regras()
+    ids = lambda modulo, campos: {a["id"] for a in regras.avaliar(modulo, campos)}
+
+    assert "contrato_numero_invalido" in ids("CONTRATO", {"numero_contrato": "XXX/2025"})
+    assert "contrato_numero_invalido" not in ids("CONTRATO", {"numero_contrato": "Contrato xxx-12/2025"})
+    assert "etp_prazo_indefinido" in ids("ETP", {"prazo_estimado": "A Definir"})
+    assert "edital_numero_invalido" not in ids("EDITAL", {"numero_edital": "n/a"})
+
+    # só espaços: não é vazio, mas o obrigatório mede sem as pontas e os demais contam os espaços
+    alertas = {a["id"]: a for a in regras.avaliar("DFD", {"objeto": "   "})}
+    assert alertas["dfd_objeto_vazio"]
+    assert alertas["dfd_objeto_curto"]["mensagem"].startswith("Campo 'objeto' muito curto no DFD (3 caracteres")
@@ -0,0 +1,108 @@
+import json
+import os
+import re
+import time
+from types import SimpleNamespace
+
+from knowledge.validators import result_cache
+from knowledge.validators import validator_engine as ve
+from knowledge.validators.verdict_cache import VerdictCache
+
+DOCUMENTO = "TERMO DE REFERÊNCIA\nObjeto: serviços de limpeza. Lei 14.133/2021. Matriz de riscos.\n"
+
+
+class _ClienteFalso:
+    def __init__(self):
+        self.chamadas = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, messages, **kwargs):
+        self.chamadas += 1
+        pedido = json.loads(re.search(r"CHECKLIST:\n(\[.*\])\n", messages[1]["content"], re.DOTALL).group(1))
+        resposta = [{"id": it["id"], "presente": True, "adequacao_nota": 75} for it in pedido]
+        msg = SimpleNamespace(content=json.dumps(resposta))
+        return SimpleNamespace(choices=[SimpleNamespace(message=msg, finish_reason="stop")])
+
+
+def test_validate_document_reaproveita_payload_completo(tmp_path, monkeypatch):
+    monkeypatch.setattr(result_cache, "RESULTADOS_DIR", tmp_path / "resultados")
+    monkeypatch.setattr(ve, "obter_cache", lambda artefato: VerdictCache(artefato, tmp_path / "veredictos"))
+    monkeypatch.setenv("SYNAPSE_PRECHECK_FRACAO", "0")  # todos os itens passam pela IA
+    cliente = _ClienteFalso()
+
+    primeiro = ve.validate_document(DOCUMENTO, "TR", cliente)
+    chamadas = cliente.chamadas
+    segundo = ve.validate_document(DOCUMENTO + "  \n", "TR", cliente)  # só espaços mudam
+
+    assert chamadas > 0 and cliente.chamadas == chamadas
+    assert primeiro["cache_hit"] is False and segundo["cache_hit"] is True
+    assert segundo["improved_document"] == primeiro["improved_document"]
+    assert segundo["semantic_score"] == 75.0
+    assert segundo["revalidacao"]["reavaliados"] == []
+
+    monkeypatch.setenv("SYNAPSE_CACHE_VALIDACAO", "0")
+    assert ve.validate_document(DOCUMENTO, "TR", cliente)["cache_hit"] is False
+
+
+class _ClienteComFalha(_ClienteFalso):
+    """Falha sempre no grupo que contém `item_falho`."""
+
+    def __init__(self, item_falho):
+        super().__init__()
+        self.item_falho = item_falho
+
+    def _create(self, messages, **kwargs):
+        if f'"id": "{self.item_falho}"' in messages[1]["content"]:
+            self.chamadas += 1
+            raise TimeoutError("timeout simulado")
+        return super()._create(messages, **kwargs)
+
+
+def test_resultado_parcial_nao_vai_para_o_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(result_cache, "RESULTADOS_DIR", tmp_path / "resultados")
+    monkeypatch.setattr(ve, "obter_cache", lambda artefato: VerdictCache(artefato, tmp_path / "veredictos"))
+    monkeypatch.setattr(ve, "SEMANTIC_RETRIES", 0)
+    monkeypatch.setenv("SYNAPSE_PRECHECK_FRACAO", "0")
+    checklist = ve.load_checklist("EDITAL")
+    assert len(ve._semantic_groups(checklist)) > 1
+    ultimo = checklist[-1]["id"]  # só o último grupo falha
+
+    parcial = ve.validate_document(DOCUMENTO, "EDITAL", _ClienteComFalha(ultimo))
+    assert parcial["semantic_result"] and ultimo in parcial["semantic_pendentes"]
+
+    cliente = _ClienteFalso()
+    completo = ve.validate_document(DOCUMENTO, "EDITAL", cliente)
+    assert completo["cache_hit"] is False and cliente.chamadas > 0
+    assert completo["semantic_pendentes"] == []
+    assert len(completo["semantic_result"]) == len(checklist)
+    assert ve.validate_document(DOCUMENTO, "EDITAL", cliente)["cache_hit"] is True
+
+
+def test_chave_muda_quando_checklist_muda(tmp_path):
+    checklist = tmp_path / "tr_checklist.yml"
+    checklist.write_text("itens:\n  - id: A\n", encoding="utf-8")
+    antes = result_cache.chave_resultado("tr", DOCUMENTO, [checklist], "gpt:1")
+
+    checklist.write_text("itens:\n  - id: A\n  - id: B\n", encoding="utf-8")
+    futuro = time.time() + 5
+    os.utime(checklist, (futuro, futuro))
+
+    assert result_cache.chave_resultado("tr", DOCUMENTO, [checklist], "gpt:1") != antes
+    assert result_cache.chave_resultado("tr", DOCUMENTO, [checklist], "gpt:2") != antes
+
+
+def test_decorador_nao_grava_erros(tmp_path, monkeypatch):
+    monkeypatch.setattr(result_cache, "RESULTADOS_DIR", tmp_path)
+    chamadas = []
+
+    @result_cache.cache_semantico("teste", None, __file__, "modelo")
+    def validar(doc_text, client):
+        chamadas.append(doc_text)
+        if "falha" in doc_text:
+            return 0.0, [{"id": "erro", "justificativa": "timeout"}]
+        return 80.0, [{"id": "x", "adequacao_nota": 80}]
+
+    assert validar("texto ok", object()) == validar("texto ok", object())
+    validar("falha", object())
+    validar("falha", object())
+    assert chamadas == ["texto ok", "falha", "falha"]
@@ -0,0 +1,67 @@
+import json
+import re
+from types import SimpleNamespace
+
+from knowledge.validators import validator_engine as ve
+from knowledge.validators.verdict_cache import VerdictCache
+
+CHECKLIST = [
+    {"id": "OBJ", "descricao": "Objeto da contratação"},
+    {"id": "RIS", "descricao": "Matriz de riscos"},
+    {"id": "PAG", "descricao": "Condições de pagamento"},
+]
+
+
+def _documento(pagamento: str) -> str:
+    enchimento = "Texto descritivo complementar do processo administrativo. " * 6
+    return (
+        f"1. OBJETO DA CONTRATAÇÃO\nContratação de serviços de limpeza predial. {enchimento}\n"
+        f"2. MATRIZ DE RISCOS\nRiscos de atraso com medidas de mitigação. {enchimento}\n"
+        f"3. CONDIÇÕES DE PAGAMENTO\n{pagamento} {enchimento}\n"
+    )
+
+
+class _ClienteFalso:
+    def __init__(self):
+        self.itens_pedidos = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, messages, **kwargs):
+        pedido = json.loads(re.search(r"CHECKLIST:\n(\[.*\])\n", messages[1]["content"], re.DOTALL).group(1))
+        self.itens_pedidos += [it["id"] for it in pedido]
+        resposta = [{"id": it["id"], "presente": True, "adequacao_nota": 90} for it in pedido]
+        msg = SimpleNamespace(content=json.dumps(resposta))
+        return SimpleNamespace(choices=[SimpleNamespace(message=msg, finish_reason="stop")])
+
+
+def test_reavalia_apenas_itens_da_secao_editada(tmp_path, monkeypatch):
+    monkeypatch.setattr(ve, "obter_cache", lambda artefato: VerdictCache(artefato, tmp_path))
+    cliente = _ClienteFalso()
+
+    _, primeira = ve.semantic_validate(_documento("Pagamento em 30 dias."), "TR", CHECKLIST, cliente)
+    assert sorted(cliente.itens_pedidos) == ["OBJ", "PAG", "RIS"]
+    assert all(d["reavaliado"] for d in primeira)
+
+    cliente.itens_pedidos.clear()
+    score, segunda = ve.semantic_validate(_documento("Pagamento em 10 dias úteis."), "TR", CHECKLIST, cliente)
+
+    assert cliente.itens_pedidos == ["PAG"]
+    assert [d["id"] for d in segunda] == ["OBJ", "RIS", "PAG"]
+    assert {d["id"]: d["reavaliado"] for d in segunda} == {"OBJ": False, "RIS": False, "PAG": True}
+    assert score == 90.0
+    assert (tmp_path / "tr.json").exists()
+
+
+def test_termo_comum_nao_amarra_o_item_a_todas_as_secoes(tmp_path, monkeypatch):
+    monkeypatch.setattr(ve, "obter_cache", lambda artefato: VerdictCache(artefato, tmp_path))
+    checklist = [{**it, "descricao": f"{it['descricao']} do processo"} for it in CHECKLIST]
+    cliente = _ClienteFalso()
+
+    secoes = ve._index_sections(ve.normalize_text(_documento("Pagamento em 30 dias.")))
+    assert ve._supporting_sections(secoes, checklist[0]) == [secoes[0]["hash"]]
+
+    ve.semantic_validate(_documento("Pagamento em 30 dias."), "TR", checklist, cliente)
+    cliente.itens_pedidos.clear()
+    _, segunda = ve.semantic_validate(_documento("Pagamento em 10 dias úteis."), "TR", checklist, cliente)
+    assert cliente.itens_pedidos == ["PAG"]
+    assert {d["id"]: d["reavaliado"] for d in segunda} == {"OBJ": False, "RIS": False, "PAG": True}
@@ -0,0 +1,27 @@
+import time
+
+from utils.seletor_modelos import listar_modelos, selecionar_modelos
+
+
+def test_selecao_automatica_por_objeto():
+    casos = {
+        "Reforma da fachada e pintura do Fórum": "obras",
+        "Fornecimento de energia elétrica para o prédio do fórum": "energia",
+        "Aquisição de licenças de software de antivírus": "stic",
+    }
+    listar_modelos("CONTRATO")  # monta o índice fora da medição
+    for objeto, categoria in casos.items():
+        inicio = time.perf_counter()
+        escolhido = selecionar_modelos(objeto, "CONTRATO")[0]
+        assert (time.perf_counter() - inicio) < 0.05
+        assert escolhido["categoria"] == categoria
+        assert escolhido["origem"] == "automatica"
+
+
+def test_modelo_manual_prevalece():
+    nomes = [m["nome"] for m in listar_modelos("CONTRATO")]
+    assert "modelo_contrato_servicos.txt" in nomes
+
+    escolhido = selecionar_modelos("Reforma da fachada", "CONTRATO", modelo_manual="Serviços")[0]
+    assert escolhido["nome"] == "modelo_contrato_servicos.txt"
+    assert escolhido["origem"] == "manual"
@@ -0,0 +1,57 @@
+import json
+import re
+import threading
+from types import SimpleNamespace
+
+from knowledge.validators import validator_engine as ve
+
+
+class _ClienteFalso:
+    """Responde cada grupo com nota 70; a primeira chamada volta truncada."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.chamadas = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, model, messages, temperature, max_tokens):
+        conteudo = messages[1]["content"]
+        checklist = json.loads(re.search(r"CHECKLIST:\n(\[.*\])\n", conteudo, re.DOTALL).group(1))
+        with self.lock:
+            self.chamadas.append((len(checklist), max_tokens, conteudo))
+            truncar = len(self.chamadas) == 1
+        itens = [{"id": it["id"], "presente": True, "adequacao_nota": 70} for it in checklist]
+        msg = SimpleNamespace(content="[" if truncar else json.dumps(itens))
+        return SimpleNamespace(choices=[SimpleNamespace(message=msg, finish_reason="length" if truncar else "stop")])
+
+
+def test_grupos_concorrentes_com_retentativa(monkeypatch):
+    monkeypatch.setattr(ve.time, "sleep", lambda s: None)
+    monkeypatch.setenv("SYNAPSE_CASCATA", "0")  # só o modelo preciso
+    checklist = [{"id": f"I{n}", "descricao": f"Item {n}"} for n in range(20)]
+    cliente = _ClienteFalso()
+
+    score, data = ve.semantic_validate("Documento curto.", "EDITAL", checklist, cliente, incremental=False)
+
+    assert [d["id"] for d in data] == [f"I{n}" for n in range(20)]
+    assert score == 70.0
+    assert sorted(n for n, _, _ in cliente.chamadas) == [4, 8, 8, 8]  # 3 grupos + 1 retentativa
+    truncada = cliente.chamadas[0]
+    refeita = [c for c in cliente.chamadas[1:] if c[0] == truncada[0] and c[2] == truncada[2]]
+    assert refeita and refeita[0][1] == min(ve.SEMANTIC_MAX_TOKENS, 2 * truncada[1])
+
+
+def test_contexto_apenas_com_secoes_relevantes():
+    corpo = "Texto genérico de preenchimento sobre o processo administrativo. " * 80
+    texto = ve.normalize_text(
+        f"1. OBJETO\n{corpo}\n2. MATRIZ DE RISCOS\nRiscos de atraso e medidas de mitigação. {corpo}\n"
+        f"3. PAGAMENTO\nPagamento em 30 dias após o atesto. {corpo}\n"
+    )
+    secoes = ve._index_sections(texto)
+    grupo = [{"id": "R", "descricao": "Matriz de riscos e mitigação"}]
+
+    contexto = ve._relevant_context(secoes, texto, grupo, max_chars=6000)
+
+    assert "MATRIZ DE RISCOS" in contexto
+    assert "PAGAMENTO" not in contexto
+    assert len(contexto) <= 6000
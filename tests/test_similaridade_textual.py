@@ -0,0 +1,62 @@
+import time
+
+from utils.comparador_pipeline import analisar_coerencia
+from utils.similaridade_textual import (
+    LIMITE_CARACTERES,
+    alinhar_secoes,
+    amostrar,
+    cosseno_tfidf,
+    semelhanca_shingles,
+)
+
+ETP = """OBJETO
+
+Aquisição de notebooks corporativos para modernização do parque tecnológico do tribunal, com garantia on-site de trinta e seis meses e suporte técnico especializado. A entrega será feita no almoxarifado central, com instalação da imagem padrão do sistema operacional.
+
+REQUISITOS TÉCNICOS
+
+Processador de décima primeira geração, memória de oito gigabytes expansível, armazenamento em estado sólido e tela de quatorze polegadas com resolução Full HD. Os equipamentos devem possuir certificação de compatibilidade e conectividade sem fio de sexta geração.
+"""
+
+TR = """REQUISITOS TÉCNICOS
+
+Processador de décima primeira geração, memória de oito gigabytes expansível, armazenamento em estado sólido e tela de quatorze polegadas com resolução Full HD. Os equipamentos devem possuir certificação de compatibilidade e conectividade sem fio de sexta geração.
+
+OBJETO
+
+Aquisição de notebooks corporativos para modernização do parque tecnológico do tribunal, com garantia on-site de trinta e seis meses e suporte técnico especializado. A entrega será feita no almoxarifado central, com instalação da imagem padrão do sistema operacional.
+"""
+
+OUTRO = """OBJETO
+
+Prestação de serviços contínuos de limpeza predial e jardinagem nas unidades do interior, com fornecimento de materiais e equipamentos de limpeza.
+"""
+
+
+def test_secoes_alinhadas_ignoram_a_ordem():
+    alinhado = alinhar_secoes(ETP, TR)
+    assert alinhado["score"] > 0.99
+    assert {(p["de"], p["para"]) for p in alinhado["alinhamento"]} == {
+        ("OBJETO", "OBJETO"), ("REQUISITOS TÉCNICOS", "REQUISITOS TÉCNICOS")
+    }
+    assert alinhar_secoes(ETP, OUTRO)["score"] < 0.3
+
+
+def test_minhash_e_cosseno():
+    assert semelhanca_shingles(ETP, ETP) == 1.0
+    assert semelhanca_shingles(ETP, TR) > semelhanca_shingles(ETP, OUTRO)
+    m = cosseno_tfidf([ETP, TR, OUTRO])
+    assert m.shape == (3, 3)
+    assert m[0, 1] > 0.99 and m[0, 2] < m[0, 1]
+
+
+def test_tempo_limitado_em_documentos_enormes():
+    grande = (ETP + "\n") * (3 * LIMITE_CARACTERES // len(ETP))
+    assert len(amostrar(grande)) <= LIMITE_CARACTERES
+    assert amostrar(ETP) == ETP
+
+    inicio = time.perf_counter()
+    resultado = analisar_coerencia({"DFD": grande, "ETP": grande, "TR": TR}, incremental=False)
+    assert time.perf_counter() - inicio < 30
+    assert resultado["comparacoes"]["DFD-ETP"] == 100.0
+    assert set(resultado["metricas"]["ETP-TR"]) >= {"palavras_chave", "trechos", "secoes"}
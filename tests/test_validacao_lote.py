@@ -0,0 +1,89 @@
+import json
+import re
+from types import SimpleNamespace
+
+from knowledge.validators import result_cache
+from knowledge.validators import validator_engine as ve
+from knowledge.validators.verdict_cache import VerdictCache
+from utils import validacao_lote
+from utils.validacao_lote import validar_lote, validar_processo
+
+TR_COMPLETO = (
+    "TERMO DE REFERÊNCIA\n"
+    "Objeto: contratação de serviços de limpeza. Fundamentação na Lei 14.133/2021.\n"
+    "Justificativa da contratação, especificações técnicas, matriz de riscos,\n"
+    "critérios de medição e pagamento, prazo de execução e sanções administrativas.\n"
+)
+
+
+class _ClienteFalso:
+    """Imita client.chat.completions.create: nota 80 para cada item pedido."""
+
+    def __init__(self):
+        self.chamadas = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, messages, **kwargs):
+        self.chamadas += 1
+        pedido = re.search(r"CHECKLIST:\n(\[.*\])\n", messages[1]["content"], re.DOTALL).group(1)
+        conteudo = json.dumps([
+            {"id": it["id"], "presente": True, "adequacao_nota": 80} for it in json.loads(pedido)
+        ])
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=conteudo))])
+
+
+def test_lote_grava_jsonl_csv_e_resumo(tmp_path, monkeypatch):
+    monkeypatch.setattr(ve, "obter_cache", lambda artefato: VerdictCache(artefato, tmp_path / "veredictos"))
+    monkeypatch.setenv("SYNAPSE_PRECHECK_FRACAO", "0")  # todos os itens passam pela IA
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "tr_a.txt").write_text(TR_COMPLETO, encoding="utf-8")
+    (docs / "tr_b.txt").write_text("TERMO DE REFERÊNCIA\nTexto sem os itens exigidos.\n", encoding="utf-8")
+    (docs / "vazio.txt").write_text("", encoding="utf-8")
+    saida = tmp_path / "saida"
+
+    cliente = _ClienteFalso()
+    resumo = validar_lote([docs], artefato="TR", saida=saida, processos=2, semantico=True, client=cliente)
+
+    linhas = (saida / "resultados.jsonl").read_text(encoding="utf-8").splitlines()
+    assert len(linhas) == 3
+    assert len((saida / "resultados.csv").read_text(encoding="utf-8").splitlines()) == 4
+    assert (saida / "resumo.md").exists() and (saida / "resumo.json").exists()
+
+    assert resumo["validados"] == 2 and len(resumo["erros"]) == 1
+    tr = resumo["artefatos"]["TR"]
+    assert tr["rigid_score"]["n"] == 2
+    assert tr["rigid_score"]["maximo"] > tr["rigid_score"]["minimo"]
+    assert tr["itens_mais_falhados"][0]["falhas"] >= 1
+    assert tr["semantic_score"]["media"] == 80.0
+    assert cliente.chamadas == 2  # um grupo por documento; o vazio não vai para a IA
+
+    # Retomada: nada pendente, nenhum documento revalidado
+    resumo2 = validar_lote([docs], artefato="TR", saida=saida, processos=1, retomar=True)
+    assert resumo2["documentos"] == 3
+    assert len((saida / "resultados.jsonl").read_text(encoding="utf-8").splitlines()) == 3
+
+
+def test_pasta_validada_como_um_processo(tmp_path, monkeypatch):
+    monkeypatch.setattr(result_cache, "RESULTADOS_DIR", tmp_path / "resultados")
+    monkeypatch.setattr(ve, "obter_cache", lambda artefato: VerdictCache(artefato, tmp_path / "veredictos"))
+    monkeypatch.setenv("SYNAPSE_PRECHECK_FRACAO", "0")
+    processo = tmp_path / "processo"
+    processo.mkdir()
+    (processo / "tr.txt").write_text(TR_COMPLETO, encoding="utf-8")
+    (processo / "tr_retificado.txt").write_text(TR_COMPLETO[: len(TR_COMPLETO) // 3], encoding="utf-8")
+    (processo / "vazio.txt").write_text("", encoding="utf-8")
+
+    resultado = validar_processo(processo, _ClienteFalso(), artefato="TR")
+
+    assert list(resultado["artefatos"]) == ["TR"] and len(resultado["erros"]) == 1
+    tr, retificado = resultado["artefatos"]["TR"]
+    assert tr["arquivo"].endswith("tr.txt") and retificado["arquivo"].endswith("tr_retificado.txt")
+    assert tr["rigid_score"] > retificado["rigid_score"] and tr["semantic_score"] == 80.0
+
+
+def test_cli_por_processo_repassa_artefato_e_subpastas(monkeypatch):
+    chamadas = []
+    monkeypatch.setattr(validacao_lote, "validar_processos", lambda pastas, **kw: chamadas.append((pastas, kw)))
+    validacao_lote.main(["p1", "--por-processo", "--artefato", "TR", "--sem-subpastas"])
+    assert chamadas == [(["p1"], {"saida": None, "semantico": False, "artefato": "TR", "recursivo": False})]
@@ -0,0 +1,71 @@
+import json
+import re
+import sys
+from types import SimpleNamespace
+
+from knowledge.validators import registry, result_cache
+from knowledge.validators import validator_engine as ve
+from knowledge.validators.verdict_cache import VerdictCache
+
+
+def test_normaliza_nomes_livres():
+    assert registry.normalizar_artefato("Pesquisa de Preços") == "PESQUISA_PRECOS"
+    assert registry.normalizar_artefato(" contrato técnico ") == "CONTRATO_TECNICO"
+    assert registry.normalizar_artefato("tr") == "TR"
+    assert registry.obter_plugin("Mapa de Riscos").slug == "mapa_riscos"
+
+
+def test_validador_especifico_importado_sob_demanda(monkeypatch):
+    modulo = "knowledge.validators.mapa_riscos_semantic_validator"
+    monkeypatch.delitem(sys.modules, modulo, raising=False)
+    monkeypatch.delitem(registry._CARREGADOS, "MAPA_RISCOS", raising=False)
+    assert modulo not in sys.modules
+
+    fn = registry.carregar_semantico("mapa de riscos")
+    assert modulo in sys.modules and fn.__name__ == "semantic_validate_mapa_riscos"
+    assert registry.carregar_semantico("INEXISTENTE") is None
+
+
+class _ClienteFalso:
+    def __init__(self):
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, messages, **kwargs):
+        pedido = json.loads(re.search(r"CHECKLIST:\n(\[.*\])\n", messages[1]["content"], re.DOTALL).group(1))
+        msg = SimpleNamespace(content=json.dumps([{"id": it["id"], "presente": True, "adequacao_nota": 60} for it in pedido]))
+        return SimpleNamespace(choices=[SimpleNamespace(message=msg, finish_reason="stop")])
+
+
+def test_validate_process_valida_todos_os_artefatos(tmp_path, monkeypatch):
+    monkeypatch.setattr(result_cache, "RESULTADOS_DIR", tmp_path / "resultados")
+    monkeypatch.setattr(ve, "obter_cache", lambda artefato: VerdictCache(artefato, tmp_path / "veredictos"))
+    monkeypatch.setenv("SYNAPSE_PRECHECK_FRACAO", "0")  # todos os itens passam pela IA
+    cliente = _ClienteFalso()
+    documentos = {
+        "DFD": "Unidade demandante: Secretaria. Justificativa da necessidade.",
+        "etp": "Estudo Técnico Preliminar. Levantamento de mercado.",
+        "Termo de Referência": "Objeto: serviços de limpeza. Lei 14.133/2021.",
+    }
+
+    resultado = ve.validate_process(documentos, cliente)
+
+    assert set(resultado) == {"DFD", "ETP", "TR"}
+    for payload in resultado.values():
+        assert "erro" not in payload
+        assert payload["semantic_score"] == 60.0
+        assert payload["rigid_result"]
+
+
+def test_engine_usa_plugin_legado_sem_checklist(tmp_path, monkeypatch):
+    for nome in ("_PLUGINS", "_APELIDOS", "_CARREGADOS"):
+        monkeypatch.setattr(registry, nome, dict(getattr(registry, nome)))
+    monkeypatch.setattr(result_cache, "RESULTADOS_DIR", tmp_path / "resultados")
+    registry.registrar("RISCOS_LEGADO", semantico="mapa_riscos_semantic_validator:semantic_validate_mapa_riscos",
+                       apelidos=("Riscos (legado)",))
+
+    assert ve.find_checklist_file("Pesquisa de Preços").endswith("pesquisa_precos_checklist.yml")
+    assert ve.find_checklist_file("Riscos (legado)") is None
+
+    resultado = ve.validate_document("Risco de atraso; medida de mitigação definida.", "Riscos (legado)", _ClienteFalso())
+    assert [r["id"] for r in resultado["semantic_result"]] == ["identificacao", "tratamento"]
+    assert resultado["semantic_score"] == 100.0
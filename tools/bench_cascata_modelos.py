@@ -0,0 +1,149 @@
+# ============================================================
+# tools/bench_cascata_modelos.py
+# ------------------------------------------------------------
+# Modo benchmark da cascata de modelos da validação semântica:
+#   - base:    todos os itens no modelo preciso (SYNAPSE_CASCATA=0)
+#   - cascata: política do artefato (roteamento_modelos.yml)
+#
+# Relata a concordância de qualidade (presença e nota) da cascata
+# com a base, a latência e o custo estimado (usage × tabela de
+# custos do YAML) de cada modo, e os itens escalados.
+#
+# Sem OPENAI_API_KEY (ou com --simulado) usa o cliente offline de
+# tools/llm_simulado.py.
+#
+# Uso:
+#   python tools/bench_cascata_modelos.py [--artefato TR] [--arquivo doc.txt]
+#                                         [--simulado] [--saida relatorio.json]
+# ============================================================
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from knowledge.validators import validator_engine as ve  # noqa: E402
+from knowledge.validators.model_router import custo_usd, politica_modelos  # noqa: E402
+from utils.knowledge_registry import KB_ROOT  # noqa: E402
+
+
+class _ClienteMedido:
+    """Proxy do client que registra modelo, latência e tokens de cada chamada."""
+
+    def __init__(self, client):
+        self._client = client
+        self._lock = threading.Lock()
+        self.chamadas = []
+        self.chat = type("Chat", (), {})()
+        self.chat.completions = type("Completions", (), {})()
+        self.chat.completions.create = self._create
+
+    def _create(self, **kwargs):
+        inicio = time.perf_counter()
+        resp = self._client.chat.completions.create(**kwargs)
+        usage = getattr(resp, "usage", None)
+        with self._lock:
+            self.chamadas.append({
+                "modelo": kwargs.get("model"),
+                "segundos": time.perf_counter() - inicio,
+                "entrada": getattr(usage, "prompt_tokens", 0) or 0,
+                "saida": getattr(usage, "completion_tokens", 0) or 0,
+            })
+        return resp
+
+
+def _cliente(simulado: bool):
+    if simulado or not os.getenv("OPENAI_API_KEY"):
+        from tools.llm_simulado import ClienteSimulado
+        return ClienteSimulado(), True
+    from openai import OpenAI
+    return OpenAI(), False
+
+
+def _documento(artefato: str, arquivo: str = "") -> str:
+    if arquivo:
+        return Path(arquivo).read_text(encoding="utf-8", errors="ignore")
+    pasta = KB_ROOT / artefato
+    textos = [a.read_text(encoding="utf-8", errors="ignore") for a in sorted(pasta.glob("*.txt"))]
+    return "\n\n".join(textos) or (ROOT / "README.md").read_text(encoding="utf-8")
+
+
+def _rodar(texto: str, artefato: str, client, cascata: bool):
+    anterior = os.environ.get("SYNAPSE_CASCATA")
+    os.environ["SYNAPSE_CASCATA"] = "1" if cascata else "0"
+    medido = _ClienteMedido(client)
+    try:
+        inicio = time.perf_counter()
+        score, itens = ve.semantic_validate(
+            texto, artefato, ve.load_checklist(artefato), medido, incremental=False, pre_check=False
+        )
+        segundos = time.perf_counter() - inicio
+    finally:
+        if anterior is None:
+            os.environ.pop("SYNAPSE_CASCATA", None)
+        else:
+            os.environ["SYNAPSE_CASCATA"] = anterior
+    custo = sum(custo_usd(c["modelo"], c["entrada"], c["saida"]) for c in medido.chamadas)
+    return {
+        "score": score,
+        "itens": itens,
+        "segundos": round(segundos, 3),
+        "chamadas": len(medido.chamadas),
+        "tokens": sum(c["entrada"] + c["saida"] for c in medido.chamadas),
+        "custo_usd": round(custo, 6),
+    }
+
+
+def comparar(texto: str, artefato: str, client) -> dict:
+    base = _rodar(texto, artefato, client, cascata=False)
+    cascata = _rodar(texto, artefato, client, cascata=True)
+
+    por_id = {str(it["id"]): it for it in base["itens"]}
+    pares = [(por_id[str(it["id"])], it) for it in cascata["itens"] if str(it["id"]) in por_id]
+    concordam = sum(bool(a.get("presente")) == bool(b.get("presente")) for a, b in pares)
+    diferencas = [abs(float(a.get("adequacao_nota", 0)) - float(b.get("adequacao_nota", 0))) for a, b in pares]
+
+    def _resumo(r):
+        return {k: r[k] for k in ("score", "segundos", "chamadas", "tokens", "custo_usd")}
+
+    return {
+        "artefato": artefato,
+        "politica": politica_modelos(artefato).assinatura,
+        "itens": len(pares),
+        "base": _resumo(base),
+        "cascata": _resumo(cascata),
+        "escalados": [str(it["id"]) for it in cascata["itens"] if it.get("escalado")],
+        "concordancia_presenca": round(concordam / len(pares), 3) if pares else None,
+        "diferenca_media_nota": round(sum(diferencas) / len(diferencas), 2) if diferencas else None,
+        "economia_custo": round(1 - cascata["custo_usd"] / base["custo_usd"], 3) if base["custo_usd"] else None,
+        "ganho_latencia": round(base["segundos"] / cascata["segundos"], 2) if cascata["segundos"] else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark da cascata de modelos (qualidade x latência x custo)")
+    parser.add_argument("--artefato", default="TR")
+    parser.add_argument("--arquivo", default="")
+    parser.add_argument("--simulado", action="store_true", help="usa o LLM simulado offline")
+    parser.add_argument("--saida", default="")
+    args = parser.parse_args()
+
+    client, simulado = _cliente(args.simulado)
+    relatorio = comparar(_documento(args.artefato.upper(), args.arquivo), args.artefato.upper(), client)
+    relatorio["llm_simulado"] = simulado
+
+    texto = json.dumps(relatorio, ensure_ascii=False, indent=2)
+    print(texto)
+    if args.saida:
+        Path(args.saida).write_text(texto, encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
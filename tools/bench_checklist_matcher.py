@@ -0,0 +1,131 @@
+# ============================================================
+# tools/bench_checklist_matcher.py
+# ------------------------------------------------------------
+# Benchmark da validação rígida:
+#   - legado: load_checklist + re.search por item (+ fallback sem
+#     acentos), como no rigid_validate original
+#   - matcher: ChecklistMatcher compilado (texto dobrado uma vez)
+#
+# O documento de teste é montado concatenando modelos da
+# knowledge_base (simula um edital extenso). Também confere que
+# os dois caminhos produzem os mesmos veredictos.
+#
+# Uso:
+#   python tools/bench_checklist_matcher.py [--repeticoes 5] [--copias 4]
+# ============================================================
+
+import argparse
+import json
+import re
+import statistics
+import sys
+import time
+import unicodedata
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from knowledge.validators import validator_engine as ve  # noqa: E402
+from utils.knowledge_registry import KB_ROOT  # noqa: E402
+
+ARTEFATOS = ["CONTRATO", "DFD", "EDITAL", "ETP", "OBRAS", "TR", "MAPA_RISCOS", "FISCALIZACAO"]
+
+
+# ------------------------------------------------------------
+# Caminho legado (normalize_text + rigid_validate originais)
+# ------------------------------------------------------------
+def legado_normalize_text(text: str) -> str:
+    if not text:
+        return ""
+    t = unicodedata.normalize("NFKC", text)
+    replacements = {
+        "\u00A0": " ", "\u200B": "", "–": "-", "—": "-",
+        "“": '"', "”": '"', "‘": "'", "’": "'",
+    }
+    for k, v in replacements.items():
+        t = t.replace(k, v)
+    t = re.sub(r"[ \t]+", " ", t)
+    t = re.sub(r"\s+\n", "\n", t)
+    t = re.sub(r"\n\s+", "\n", t)
+    return t
+
+
+def legado_rigid_validate(document_text: str, artefato: str):
+    text = legado_normalize_text(document_text or "")
+    text_no_accents = ve.remove_accents(text).lower()
+    checklist = ve.load_checklist(artefato)
+    results = []
+    for item in checklist or []:
+        desc = item.get("descricao", "").strip()
+        padrao = (item.get("padrao") or item.get("pattern") or "").strip()
+        presente = False
+        if padrao:
+            rx = ve.build_tolerant_pattern(padrao)
+            try:
+                if re.search(rx, text, flags=re.IGNORECASE | re.DOTALL):
+                    presente = True
+                elif re.search(ve.remove_accents(rx), text_no_accents, flags=re.IGNORECASE | re.DOTALL):
+                    presente = True
+            except re.error:
+                if rx.lower() in text.lower() or ve.remove_accents(rx).lower() in text_no_accents:
+                    presente = True
+        else:
+            tokens = [w for w in re.split(r"\W+", desc.lower()) if len(w) > 4]
+            presente = any(tok in text_no_accents for tok in tokens[:3])
+        results.append(presente)
+    return results
+
+
+def _documento(copias: int) -> str:
+    partes = []
+    for pasta in ("TR", "ETP"):
+        for arq in sorted((KB_ROOT / pasta).glob("*.txt")):
+            partes.append(arq.read_text(encoding="utf-8", errors="ignore"))
+    return "\n\n".join(partes) * copias
+
+
+def _cronometrar(fn, *args) -> float:
+    inicio = time.perf_counter()
+    fn(*args)
+    return (time.perf_counter() - inicio) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark ChecklistMatcher vs rigid_validate legado")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--copias", type=int, default=4)
+    args = parser.parse_args()
+
+    doc = _documento(args.copias)
+    curto = doc[:20000]
+    print(f"Documento: {len(doc):,} caracteres")
+    assert ve.normalize_text(doc) == legado_normalize_text(doc), "normalize_text divergente"
+
+    resultado = {}
+    for artefato in ARTEFATOS:
+        for rotulo, texto in (("longo", doc), ("curto", curto)):
+            novo = [r["presente"] for r in ve.rigid_validate(texto, artefato)[1]]
+            antigo = legado_rigid_validate(texto, artefato)
+            assert novo == antigo, f"Divergência em {artefato}/{rotulo}"
+            t_leg = statistics.median(
+                _cronometrar(legado_rigid_validate, texto, artefato) for _ in range(args.repeticoes)
+            )
+            t_new = statistics.median(
+                _cronometrar(ve.rigid_validate, texto, artefato) for _ in range(args.repeticoes)
+            )
+            resultado[f"{artefato}/{rotulo}"] = {
+                "legado_ms": round(t_leg, 2),
+                "matcher_ms": round(t_new, 2),
+                "ganho": round(t_leg / t_new, 1) if t_new else None,
+            }
+
+    print(f"\n{'caso':<26}{'legado':>12}{'matcher':>12}{'ganho':>8}")
+    for caso, r in resultado.items():
+        print(f"{caso:<26}{r['legado_ms']:>12.2f}{r['matcher_ms']:>12.2f}{r['ganho']:>7.1f}x")
+    print(json.dumps(resultado, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# ============================================================
+# tools/bench_coerencia.py
+# ------------------------------------------------------------
+# Compara o tempo da coerência entre artefatos antes e depois
+# de utils.similaridade_textual, sobre o corpus fictício de
+# benchmark (DFD, ETP, TR e Edital de 10 KB a 2 MB):
+#   - legado: palavras-chave + difflib.SequenceMatcher no texto
+#             inteiro (fórmula anterior de comparador_pipeline)
+#   - atual:  comparador_pipeline.analisar_coerencia
+#
+# O legado é quadrático no pior caso; acima de --max-legado ele
+# não é executado. Cada medição usa um processo "frio" de perfis
+# (o LRU de similaridade_textual é limpo antes de cada rodada) e
+# não usa o cache de pares em disco (incremental=False).
+#
+# Uso:
+#   python tools/bench_coerencia.py [--tamanhos 10KB,100KB,1MB,2MB]
+#                                   [--max-legado 100KB] [--repeticoes 3]
+# ============================================================
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from difflib import SequenceMatcher
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+if str(ROOT / "tests" / "data") not in sys.path:
+    sys.path.insert(0, str(ROOT / "tests" / "data"))
+
+from generate_fictitious_inputs import CORPUS_PATH, TAMANHOS_CORPUS, gerar_corpus_benchmark  # noqa: E402
+from utils import similaridade_textual  # noqa: E402
+from utils.comparador_pipeline import _extract_keywords, analisar_coerencia  # noqa: E402
+
+PARES = [("DFD", "ETP"), ("ETP", "TR"), ("TR", "Edital")]
+ROTULO = {"DFD": "DFD", "ETP": "ETP", "TR": "TR", "EDITAL": "Edital"}
+
+
+def _similaridade_legado(a: str, b: str) -> float:
+    ka, kb = _extract_keywords(a), _extract_keywords(b)
+    jaccard = len(ka & kb) / len(ka | kb) * 100 if ka | kb else 0
+    sequencia = SequenceMatcher(None, a.lower(), b.lower()).ratio() * 100
+    return round(jaccard * 0.85 + sequencia * 0.15, 2)
+
+
+def coerencia_legado(artefatos: dict) -> dict:
+    return {
+        f"{a}-{b}": _similaridade_legado(artefatos[a], artefatos[b])
+        for a, b in PARES if artefatos.get(a) and artefatos.get(b)
+    }
+
+
+def _conjunto(tamanho: str) -> dict:
+    manifesto = CORPUS_PATH / "manifest.json"
+    if not manifesto.exists() or tamanho not in {
+        d["tamanho"] for d in json.loads(manifesto.read_text(encoding="utf-8"))["documentos"]
+    }:
+        gerar_corpus_benchmark(tamanhos={tamanho: TAMANHOS_CORPUS[tamanho]})
+    return {
+        ROTULO[a]: (CORPUS_PATH / f"{a}_{tamanho}.txt").read_text(encoding="utf-8")
+        for a in ROTULO
+    }
+
+
+def _cronometrar(fn, repeticoes: int):
+    tempos, resultado = [], None
+    for _ in range(repeticoes):
+        similaridade_textual._PERFIS.clear()
+        inicio = time.perf_counter()
+        resultado = fn()
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos), resultado
+
+
+def executar(tamanhos, max_legado: int, repeticoes: int) -> list:
+    linhas = []
+    for tamanho in tamanhos:
+        artefatos = _conjunto(tamanho)
+        atual_s, atual = _cronometrar(lambda: analisar_coerencia(artefatos, incremental=False), repeticoes)
+        linha = {
+            "tamanho": tamanho,
+            "atual_s": round(atual_s, 3),
+            "atual": atual["comparacoes"],
+            "legado_s": None,
+            "legado": None,
+            "ganho": None,
+        }
+        if TAMANHOS_CORPUS[tamanho] <= max_legado:
+            legado_s, legado = _cronometrar(lambda: coerencia_legado(artefatos), 1)
+            linha.update(legado_s=round(legado_s, 3), legado=legado, ganho=round(legado_s / atual_s, 1))
+        linhas.append(linha)
+    return linhas
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark da coerência entre artefatos (legado x atual)")
+    parser.add_argument("--tamanhos", default=",".join(TAMANHOS_CORPUS))
+    parser.add_argument("--max-legado", default="100KB", help="maior tamanho medido com SequenceMatcher")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--saida", default="")
+    args = parser.parse_args()
+
+    tamanhos = [t.strip() for t in args.tamanhos.split(",") if t.strip() in TAMANHOS_CORPUS]
+    linhas = executar(tamanhos, TAMANHOS_CORPUS.get(args.max_legado, 100_000), args.repeticoes)
+
+    print(f"{'tamanho':<10}{'legado s':>12}{'atual s':>12}{'ganho':>10}   comparações (legado → atual)")
+    for l in linhas:
+        legado = f"{l['legado_s']:.3f}" if l["legado_s"] is not None else "—"
+        ganho = f"{l['ganho']:.1f}x" if l["ganho"] else "—"
+        pares = ", ".join(
+            f"{par} {l['legado'][par] if l['legado'] else '—'} → {valor}" for par, valor in l["atual"].items()
+        )
+        print(f"{l['tamanho']:<10}{legado:>12}{l['atual_s']:>12.3f}{ganho:>10}   {pares}")
+
+    if args.saida:
+        Path(args.saida).write_text(json.dumps(linhas, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
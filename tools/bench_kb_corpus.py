@@ -0,0 +1,170 @@
+# ============================================================
+# tools/bench_kb_corpus.py
+# ------------------------------------------------------------
+# Benchmark de leitura da knowledge_base:
+#   - legado: os.walk + open/decode por arquivo (knowledge_loader original)
+#   - corpus: kb_corpus.bin via mmap + tabela de offsets
+#
+# Mede latência "fria" (primeira leitura em processo Python novo,
+# incluindo abertura do corpus) e "quente" (mediana de repetições no
+# mesmo processo), para leitura integral e acesso a passagens.
+#
+# Uso:
+#   python tools/bench_kb_corpus.py [--repeticoes 20]
+#
+# Observação: o cache de páginas do sistema operacional não é limpo;
+# "frio" refere-se ao processo, não ao disco.
+# ============================================================
+
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from utils.kb_corpus import KB_ROOT, construir_corpus, obter_corpus
+
+PASTAS = ["DFD", "ETP", "TR", "legislacao", "manuais_modelos", "notas_tecnicas"]
+AMOSTRA_PASSAGENS = 200
+
+
+# ------------------------------------------------------------
+# Caminho legado (os.walk + open/decode)
+# ------------------------------------------------------------
+def legado_ler_tudo() -> int:
+    total = 0
+    for sub in PASTAS:
+        for root, _, files in os.walk(KB_ROOT / sub):
+            for fn in files:
+                if fn.lower().endswith(".txt"):
+                    with open(os.path.join(root, fn), "r", encoding="utf-8", errors="ignore") as f:
+                        total += len(f.read())
+    return total
+
+
+def legado_passagens(amostra) -> int:
+    # Sem índice, cada passagem exige abrir e decodificar o arquivo inteiro
+    total = 0
+    for doc_id, ordem in amostra:
+        with open(KB_ROOT / doc_id, "r", encoding="utf-8", errors="ignore") as f:
+            texto = f.read()
+        inicio = ordem * 1500
+        total += len(texto[inicio:inicio + 1500])
+    return total
+
+
+# ------------------------------------------------------------
+# Caminho corpus (mmap)
+# ------------------------------------------------------------
+def corpus_ler_tudo() -> int:
+    corpus = obter_corpus()
+    total = 0
+    for sub in PASTAS:
+        for doc_id in corpus.documentos_da_pasta(sub):
+            if doc_id.lower().endswith(".txt"):
+                total += len(corpus.documento(doc_id))
+    return total
+
+
+def corpus_passagens(pids) -> int:
+    corpus = obter_corpus()
+    return sum(len(corpus.passagem(pid)) for pid in pids)
+
+
+# ------------------------------------------------------------
+# Medição
+# ------------------------------------------------------------
+def _amostra():
+    corpus = obter_corpus()
+    rnd = random.Random(42)
+    pids = rnd.sample(range(len(corpus)), min(AMOSTRA_PASSAGENS, len(corpus)))
+    pares = [(corpus.metadados(p)["doc_id"], corpus.metadados(p)["ordem"]) for p in pids]
+    return pids, pares
+
+
+def _cronometrar(fn, *args) -> float:
+    inicio = time.perf_counter()
+    fn(*args)
+    return (time.perf_counter() - inicio) * 1000
+
+
+def medir_quente(repeticoes: int) -> dict:
+    pids, pares = _amostra()
+    casos = {
+        "ler_tudo_legado": (legado_ler_tudo,),
+        "ler_tudo_corpus": (corpus_ler_tudo,),
+        "passagens_legado": (legado_passagens, pares),
+        "passagens_corpus": (corpus_passagens, pids),
+    }
+    resultado = {}
+    for nome, (fn, *args) in casos.items():
+        fn(*args)  # aquecimento
+        tempos = [_cronometrar(fn, *args) for _ in range(repeticoes)]
+        resultado[nome] = round(statistics.median(tempos), 3)
+    return resultado
+
+
+def medir_frio() -> dict:
+    """Executa cada caso em um processo Python novo (inclui abertura do corpus)."""
+    resultado = {}
+    for caso in ("ler_tudo_legado", "ler_tudo_corpus", "passagens_legado", "passagens_corpus"):
+        saida = subprocess.run(
+            [sys.executable, __file__, "--frio-caso", caso],
+            capture_output=True, text=True, check=True,
+        )
+        resultado[caso] = float(saida.stdout.strip().splitlines()[-1])
+    return resultado
+
+
+def _executar_caso_frio(caso: str) -> None:
+    inicio = time.perf_counter()
+    if caso == "ler_tudo_legado":
+        legado_ler_tudo()
+    elif caso == "ler_tudo_corpus":
+        corpus_ler_tudo()
+    else:
+        # A amostra é fixa (seed); o tempo de montá-la não entra na medição
+        pids, pares = _amostra()
+        inicio = time.perf_counter()
+        if caso == "passagens_legado":
+            legado_passagens(pares)
+        else:
+            corpus_passagens(pids)
+    print(round((time.perf_counter() - inicio) * 1000, 3))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark kb_corpus vs os.walk")
+    parser.add_argument("--repeticoes", type=int, default=20)
+    parser.add_argument("--frio-caso", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.frio_caso:
+        _executar_caso_frio(args.frio_caso)
+        return
+
+    corpus = obter_corpus()
+    if corpus is None or not corpus.esta_atualizado():
+        print("🔧 Corpus ausente ou desatualizado – executando build...")
+        construir_corpus()
+
+    frio = medir_frio()
+    quente = medir_quente(args.repeticoes)
+
+    print("\n📊 Latência (ms) – knowledge_base")
+    print(f"{'caso':<22}{'frio':>12}{'quente':>12}")
+    for caso in frio:
+        print(f"{caso:<22}{frio[caso]:>12.3f}{quente[caso]:>12.3f}")
+    print(json.dumps({"frio_ms": frio, "quente_ms": quente}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
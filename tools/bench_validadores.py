@@ -0,0 +1,290 @@
+# ============================================================
+# tools/bench_validadores.py
+# ------------------------------------------------------------
+# Benchmark de vazão e latência da validação de artefatos sobre
+# o corpus fictício (editais/TR/ETP/DFD de 10 KB a 2 MB gerados
+# por tests/data/generate_fictitious_inputs.py a partir dos
+# modelos da knowledge_base).
+#
+# Etapas medidas por artefato e tamanho:
+#   - extracao:     extrair_texto_arquivo (.txt e .docx)
+#   - normalizacao: validator_engine.normalize_text
+#   - rigido:       validator_engine.rigid_validate
+#   - semantico:    validator_engine.semantic_validate contra o LLM
+#                   simulado offline (tools/llm_simulado.py)
+#   - coerencia:    comparador_pipeline.analisar_coerencia (DFD, ETP,
+#                   TR e Edital do mesmo tamanho), sem o cache de pares
+#                   (incremental=False): mede o cálculo, não a leitura
+#                   do cache, e não grava em exports/cache
+#
+# Para cada etapa: p50/p95/p99 (ms), docs/s e MB/s. O resultado
+# vai para exports/benchmarks/validadores_<data>.json; --comparar
+# mostra a variação em relação a uma execução anterior (por
+# padrão, a mais recente do diretório).
+#
+# Além dos tempos, cada documento grava seus veredictos (caracteres
+# extraídos, score e itens presentes no rígido, notas do semântico,
+# coerência por par). Eles são comparados com uma execução de
+# referência (exports/benchmarks/referencia_validadores.json,
+# gravada com --gravar-referencia): otimização que muda resultado
+# aparece como divergência e o script termina com código 1.
+#
+# Uso:
+#   python tools/bench_validadores.py [--repeticoes 5] [--tamanhos 10KB,100KB]
+#                                     [--max-coerencia 2MB] [--comparar arquivo.json]
+#                                     [--referencia arquivo.json] [--gravar-referencia]
+# ============================================================
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+if str(ROOT / "tests" / "data") not in sys.path:
+    sys.path.insert(0, str(ROOT / "tests" / "data"))
+
+from generate_fictitious_inputs import CORPUS_PATH, TAMANHOS_CORPUS, gerar_corpus_benchmark  # noqa: E402
+from knowledge.validators import validator_engine as ve  # noqa: E402
+from tools.llm_simulado import ClienteSimulado  # noqa: E402
+from utils.comparador_pipeline import analisar_coerencia  # noqa: E402
+from utils.validacao_lote import extrair_texto_arquivo  # noqa: E402
+
+SAIDA_DIR = ROOT / "exports" / "benchmarks"
+REFERENCIA_PATH = SAIDA_DIR / "referencia_validadores.json"
+ROTULO_COERENCIA = {"DFD": "DFD", "ETP": "ETP", "TR": "TR", "EDITAL": "Edital"}
+
+
+def _estatisticas(tempos_ms, bytes_doc: int) -> dict:
+    ordenados = sorted(tempos_ms)
+
+    def _pct(p):
+        return ordenados[min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))]
+
+    media = statistics.fmean(ordenados)
+    return {
+        "n": len(ordenados),
+        "p50_ms": round(statistics.median(ordenados), 3),
+        "p95_ms": round(_pct(95), 3),
+        "p99_ms": round(_pct(99), 3),
+        "media_ms": round(media, 3),
+        "docs_por_s": round(1000 / media, 2) if media else None,
+        "mb_por_s": round(bytes_doc / 1e6 / (media / 1000), 2) if media else None,
+    }
+
+
+def _medir(fn, repeticoes: int):
+    """Tempos (ms) de cada repetição e o resultado da execução de aquecimento."""
+    resultado = fn()  # aquecimento (caches de checklist/matcher)
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        fn()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return tempos, resultado
+
+
+def _veredicto_rigido(resultado) -> dict:
+    score, itens = resultado
+    return {
+        "score": score,
+        "presentes": sum(1 for i in itens if i.get("presente")),
+        "itens": {str(i.get("id")): bool(i.get("presente")) for i in itens},
+    }
+
+
+def _veredicto_semantico(resultado) -> dict:
+    score, itens = resultado
+    return {
+        "score": score,
+        "presentes": sum(1 for i in itens if i.get("presente")),
+        "notas": {str(i.get("id")): i.get("adequacao_nota") for i in itens},
+    }
+
+
+def _corpus(tamanhos) -> dict:
+    manifesto_path = CORPUS_PATH / "manifest.json"
+    if manifesto_path.exists():
+        documentos = json.loads(manifesto_path.read_text(encoding="utf-8"))["documentos"]
+        if {d["tamanho"] for d in documentos} >= set(tamanhos):
+            return {"documentos": documentos}
+    print("🔧 Gerando corpus de benchmark...")
+    return {"documentos": gerar_corpus_benchmark(tamanhos={t: TAMANHOS_CORPUS[t] for t in tamanhos})}
+
+
+def executar(tamanhos, repeticoes: int, max_coerencia: int):
+    """(estatísticas de tempo por etapa/caso, veredictos por caso)."""
+    documentos = [d for d in _corpus(tamanhos)["documentos"] if d["tamanho"] in tamanhos]
+    cliente = ClienteSimulado(latencia=False)
+    resultados: dict = {}
+    veredictos: dict = {}
+
+    def _registrar(etapa, chave, medicao, n_bytes, veredicto=None):
+        tempos, resultado = medicao
+        resultados.setdefault(etapa, {})[chave] = _estatisticas(tempos, n_bytes)
+        if veredicto is not None:
+            veredictos.setdefault(chave, {})[etapa] = veredicto(resultado)
+        return resultado
+
+    textos = {}
+    for doc in documentos:
+        caminho = CORPUS_PATH / doc["arquivo"]
+        sufixo = caminho.suffix.lstrip(".")
+        chave = f"{doc['artefato']}/{doc['tamanho']}"
+        _registrar(f"extracao_{sufixo}", chave,
+                   _medir(lambda: extrair_texto_arquivo(caminho), repeticoes), doc["bytes"], len)
+        if sufixo == "txt":
+            textos[(doc["artefato"], doc["tamanho"])] = caminho.read_text(encoding="utf-8")
+
+    for (artefato, tamanho), texto in textos.items():
+        chave = f"{artefato}/{tamanho}"
+        n_bytes = len(texto.encode("utf-8"))
+        checklist = ve.load_checklist(artefato)
+        _registrar("normalizacao", chave, _medir(lambda: ve.normalize_text(texto), repeticoes), n_bytes)
+        _registrar("rigido", chave, _medir(lambda: ve.rigid_validate(texto, artefato), repeticoes), n_bytes,
+                   _veredicto_rigido)
+        _registrar("semantico", chave, _medir(
+            lambda: ve.semantic_validate(texto, artefato, checklist, cliente, incremental=False), repeticoes
+        ), n_bytes, _veredicto_semantico)
+
+    for tamanho in tamanhos:
+        conjunto = {
+            ROTULO_COERENCIA[a]: t for (a, tam), t in textos.items() if tam == tamanho
+        }
+        n_bytes = sum(len(t.encode("utf-8")) for t in conjunto.values())
+        if TAMANHOS_CORPUS[tamanho] > max_coerencia:
+            resultados.setdefault("coerencia", {})[tamanho] = {
+                "pulado": f"acima de --max-coerencia ({max_coerencia:,} bytes)"
+            }
+            continue
+        _registrar("coerencia", tamanho, _medir(
+            lambda: analisar_coerencia(conjunto, incremental=False), repeticoes
+        ), n_bytes, lambda r: {"global": r["coerencia_global"], "pares": r["comparacoes"]})
+
+    return resultados, veredictos
+
+
+def _commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return ""
+
+
+def comparar(atual: dict, anterior: dict) -> list:
+    """Linhas (etapa, caso, p50 anterior, p50 atual, variação %)."""
+    linhas = []
+    for etapa, casos in atual["resultados"].items():
+        for caso, est in casos.items():
+            antes = anterior.get("resultados", {}).get(etapa, {}).get(caso, {})
+            if "p50_ms" in est and "p50_ms" in antes and antes["p50_ms"]:
+                variacao = (est["p50_ms"] - antes["p50_ms"]) / antes["p50_ms"] * 100
+                linhas.append((etapa, caso, antes["p50_ms"], est["p50_ms"], round(variacao, 1)))
+    return linhas
+
+
+def _folhas(valor, prefixo=""):
+    if isinstance(valor, dict):
+        for k, v in valor.items():
+            yield from _folhas(v, f"{prefixo}.{k}" if prefixo else str(k))
+    else:
+        yield prefixo, valor
+
+
+def comparar_veredictos(atual: dict, referencia: dict) -> list:
+    """Linhas (caso, campo, referência, atual) dos veredictos que mudaram."""
+    linhas = []
+    ref_casos = referencia.get("veredictos", {})
+    for caso, etapas in atual["veredictos"].items():
+        if caso not in ref_casos:
+            continue  # caso fora da referência (outro --tamanhos)
+        antes = dict(_folhas(ref_casos[caso]))
+        depois = dict(_folhas(etapas))
+        for campo in sorted(set(antes) | set(depois)):
+            if antes.get(campo) != depois.get(campo):
+                linhas.append((caso, campo, antes.get(campo), depois.get(campo)))
+    return linhas
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de vazão/latência dos validadores")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--tamanhos", default=",".join(TAMANHOS_CORPUS))
+    parser.add_argument("--max-coerencia", default="2MB",
+                        help="maior tamanho medido na coerência")
+    parser.add_argument("--comparar", default="", help="JSON de uma execução anterior")
+    parser.add_argument("--saida", default=str(SAIDA_DIR))
+    parser.add_argument("--referencia", default=str(REFERENCIA_PATH),
+                        help="execução de referência dos veredictos")
+    parser.add_argument("--gravar-referencia", action="store_true",
+                        help="grava os veredictos desta execução como referência")
+    args = parser.parse_args()
+
+    tamanhos = [t.strip() for t in args.tamanhos.split(",") if t.strip() in TAMANHOS_CORPUS]
+    saida_dir = Path(args.saida)
+    anteriores = sorted(saida_dir.glob("validadores_*.json"))
+
+    resultados, veredictos = executar(tamanhos, args.repeticoes, TAMANHOS_CORPUS.get(args.max_coerencia, 2_000_000))
+    relatorio = {
+        "gerado_em": datetime.now().isoformat(timespec="seconds"),
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "repeticoes": args.repeticoes,
+        "resultados": resultados,
+        "veredictos": veredictos,
+    }
+
+    saida_dir.mkdir(parents=True, exist_ok=True)
+    destino = saida_dir / f"validadores_{datetime.now():%Y%m%d_%H%M%S}.json"
+    destino.write_text(json.dumps(relatorio, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    print(f"\n{'etapa':<16}{'caso':<20}{'p50 ms':>12}{'p95 ms':>12}{'docs/s':>10}{'MB/s':>9}")
+    for etapa, casos in relatorio["resultados"].items():
+        for caso, est in casos.items():
+            if "pulado" in est:
+                print(f"{etapa:<16}{caso:<20}{'—':>12}  ({est['pulado']})")
+                continue
+            print(f"{etapa:<16}{caso:<20}{est['p50_ms']:>12.2f}{est['p95_ms']:>12.2f}"
+                  f"{est['docs_por_s']:>10.1f}{est['mb_por_s']:>9.2f}")
+
+    referencia = Path(args.comparar) if args.comparar else (anteriores[-1] if anteriores else None)
+    if referencia and referencia.exists():
+        print(f"\nComparação com {referencia.name} (p50):")
+        for etapa, caso, antes, depois, var in comparar(relatorio, json.loads(referencia.read_text(encoding="utf-8"))):
+            print(f"  {etapa:<16}{caso:<20}{antes:>10.2f} → {depois:>10.2f} ms ({var:+.1f}%)")
+    print(f"\n💾 Resultado: {destino}")
+
+    referencia_veredictos = Path(args.referencia)
+    if args.gravar_referencia:
+        referencia_veredictos.parent.mkdir(parents=True, exist_ok=True)
+        referencia_veredictos.write_text(json.dumps(
+            {"gerado_em": relatorio["gerado_em"], "commit": relatorio["commit"], "veredictos": veredictos},
+            ensure_ascii=False, indent=2,
+        ), encoding="utf-8")
+        print(f"📌 Referência de veredictos gravada: {referencia_veredictos}")
+    elif referencia_veredictos.exists():
+        divergencias = comparar_veredictos(
+            relatorio, json.loads(referencia_veredictos.read_text(encoding="utf-8"))
+        )
+        if divergencias:
+            print(f"\n❌ {len(divergencias)} veredicto(s) diferente(s) de {referencia_veredictos.name}:")
+            for caso, campo, antes, depois in divergencias:
+                print(f"  {caso:<20}{campo:<40}{antes!r} → {depois!r}")
+            sys.exit(1)
+        print(f"\n✅ Veredictos iguais aos de {referencia_veredictos.name}")
+    else:
+        print("\nℹ️ Sem referência de veredictos; grave uma com --gravar-referencia")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# ============================================================
+# tools/llm_simulado.py
+# ------------------------------------------------------------
+# Cliente OpenAI simulado (offline, determinístico) para os
+# benchmarks da validação semântica.
+#
+# Imita client.chat.completions.create(...) no formato usado
+# pelo validator_engine: lê o CHECKLIST do prompt e devolve a
+# lista JSON de veredictos. A nota de cada item depende de os
+# termos da descrição aparecerem no DOCUMENTO enviado; o modelo
+# "rápido" (nome com "mini") erra mais e, com temperatura > 0,
+# varia entre amostras (a n-ésima amostra de um item é sempre a
+# mesma, para que os veredictos do benchmark sejam comparáveis
+# entre execuções). Latência e usage (tokens) são proporcionais
+# ao tamanho do prompt.
+# ============================================================
+
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+_CHECKLIST = re.compile(r"CHECKLIST:\n(\[.*\])\n", re.DOTALL)
+_DOCUMENTO = re.compile(r'DOCUMENTO:\n"""(.*?)"""', re.DOTALL)
+
+# segundos por 1.000 tokens de entrada (escala reduzida)
+LATENCIA_POR_MIL_TOKENS = {"mini": 0.002, "padrao": 0.008}
+
+
+def _ruido(*partes) -> float:
+    """Número em [-1, 1) derivado das partes (determinístico)."""
+    h = hashlib.sha1("|".join(str(p) for p in partes).encode("utf-8")).digest()
+    return int.from_bytes(h[:4], "big") / 2 ** 31 - 1.0
+
+
+class ClienteSimulado:
+    def __init__(self, latencia: bool = True):
+        self.latencia = latencia
+        self._amostras: Counter = Counter()
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, model, messages, temperature=0.0, max_tokens=None, **kwargs):
+        conteudo = messages[-1]["content"]
+        m = _CHECKLIST.search(conteudo)
+        itens = json.loads(m.group(1)) if m else []
+        d = _DOCUMENTO.search(conteudo)
+        documento = (d.group(1) if d else conteudo).lower()
+
+        rapido = "mini" in model
+        respostas = []
+        for it in itens:
+            termos = [t for t in re.findall(r"\w{5,}", it.get("descricao", "").lower())]
+            cobertura = sum(t in documento for t in termos) / len(termos) if termos else 0.0
+            nota = 20 + 75 * cobertura
+            if rapido:
+                nota += 18 * _ruido(model, it["id"], documento[:200])
+                if temperature:
+                    chave = (model, it["id"], temperature, documento[:200])
+                    with self._lock:
+                        self._amostras[chave] += 1
+                        amostra = self._amostras[chave]
+                    nota += 20 * _ruido(*chave, amostra)
+            nota = round(max(0, min(100, nota)))
+            respostas.append({
+                "id": it["id"],
+                "descricao": it.get("descricao", ""),
+                "presente": nota >= 50,
+                "adequacao_nota": nota,
+                "justificativa": f"Cobertura de {cobertura:.0%} dos termos do critério.",
+            })
+
+        tokens_entrada = len(conteudo) // 4
+        tokens_saida = 60 * len(respostas)
+        if self.latencia:
+            chave = "mini" if rapido else "padrao"
+            time.sleep(LATENCIA_POR_MIL_TOKENS[chave] * tokens_entrada / 1000)
+        msg = SimpleNamespace(content=json.dumps(respostas, ensure_ascii=False))
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=msg, finish_reason="stop")],
+            usage=SimpleNamespace(prompt_tokens=tokens_entrada, completion_tokens=tokens_saida),
+        )
@@ -7,20 +7,28 @@ da jornada de contratação pública (DFD, ETP, TR, Edital, Contrato).
 
 FUNCIONALIDADES:
 - Coleta estado real dos documentos em exports/
-- Detecta campos obrigatórios vazios
+- Detecta campos obrigatórios vazios (regras declaradas em
+  knowledge/regras_alertas.yml, compiladas por utils/regras_alertas)
 - Valida consistência entre documentos
 - Gera alertas contextualizados por severidade
 - Mantém histórico de alertas
+- Reavalia só o que mudou: documentos por mtime/tamanho/SHA-256 e
+  regras entre documentos pelos campos participantes
 
 Versão: v2025.1 (REFATORADO COMPLETO)
 ==============================================================
 """
 
+import hashlib
 import json
 import os
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
+
+from utils.extracao_br import divergencia_relativa, prazo_dias, valor_brl
+from utils.regras_alertas import RegrasAlertas, carregar_regras
 
 # ======================================================
 # 🔧 Configurações e Paths
@@ -29,28 +37,33 @@ EXPORTS_DIR = Path(__file__).resolve().parents[1] / "exports"
 ALERTAS_HISTORICO_DIR = EXPORTS_DIR / "analises" / "historico_alertas"
 ALERTAS_HISTORICO_DIR.mkdir(parents=True, exist_ok=True)
 
-# Campos obrigatórios por módulo
-CAMPOS_OBRIGATORIOS = {
-    "DFD": ["objeto", "justificativa", "valor_estimado", "responsavel"],
-    "ETP": ["objeto", "justificativa_contratacao", "prazo_estimado", "orcamento_previsto"],
-    "TR": ["objeto", "especificacao_tecnica", "prazo_execucao", "criterio_aceitacao"],
-    "EDITAL": ["numero_edital", "tipo_licitacao", "objeto", "valor_estimado"],
-    "CONTRATO": ["numero_contrato", "objeto", "valor_global", "vigencia", "partes_contratada"],
-}
-
-# Limites de validação
-LIMITES = {
-    "min_tamanho_objeto": 100,  # caracteres
-    "max_divergencia_valor": 0.20,  # 20% de diferença aceitável
-    "min_tamanho_justificativa": 150,
-    "min_obrigacoes": 5,  # número mínimo de obrigações listadas
+# Arquivo de campos de cada módulo
+MODULOS_ARQUIVOS = {
+    "DFD": EXPORTS_DIR / "dfd_data.json",
+    "ETP": EXPORTS_DIR / "etp_data.json",
+    "TR": EXPORTS_DIR / "tr_data.json",
+    "EDITAL": EXPORTS_DIR / "edital_data.json",
+    "CONTRATO": EXPORTS_DIR / "contrato_data.json",
 }
 
-
 # ======================================================
 # 📂 Funções de Coleta de Estado do Sistema
 # ======================================================
 
+def _info_documento(modulo: str, caminho: Path, dados: Any = None, erro: str = "") -> Dict[str, Any]:
+    if erro:
+        return {"existe": True, "erro": f"Erro ao ler arquivo: {erro}"}
+    # Extrair campos do módulo (pode estar em diferentes estruturas)
+    campos = dados.get(modulo, dados.get("campos_ai", dados))
+    return {
+        "existe": True,
+        "caminho": str(caminho),
+        "timestamp": dados.get("timestamp", "N/A"),
+        "campos": campos,
+        "total_campos": len(campos) if isinstance(campos, dict) else 0,
+    }
+
+
 def coletar_estado_sistema() -> Dict[str, Any]:
     """
     Varre exports/ e coleta estado atual de todos os documentos.
@@ -65,35 +78,14 @@ def coletar_estado_sistema() -> Dict[str, Any]:
     }
     
     # Verificar cada módulo
-    modulos = {
-        "DFD": EXPORTS_DIR / "dfd_data.json",
-        "ETP": EXPORTS_DIR / "etp_data.json",
-        "TR": EXPORTS_DIR / "tr_data.json",
-        "EDITAL": EXPORTS_DIR / "edital_data.json",
-        "CONTRATO": EXPORTS_DIR / "contrato_data.json",
-    }
-    
-    for modulo, caminho in modulos.items():
+    for modulo, caminho in MODULOS_ARQUIVOS.items():
         if caminho.exists():
             try:
                 with open(caminho, "r", encoding="utf-8") as f:
                     dados = json.load(f)
-                    
-                # Extrair campos do módulo (pode estar em diferentes estruturas)
-                campos = dados.get(modulo, dados.get("campos_ai", dados))
-                
-                estado["documentos"][modulo] = {
-                    "existe": True,
-                    "caminho": str(caminho),
-                    "timestamp": dados.get("timestamp", "N/A"),
-                    "campos": campos,
-                    "total_campos": len(campos) if isinstance(campos, dict) else 0,
-                }
+                estado["documentos"][modulo] = _info_documento(modulo, caminho, dados)
             except Exception as e:
-                estado["documentos"][modulo] = {
-                    "existe": True,
-                    "erro": f"Erro ao ler arquivo: {e}",
-                }
+                estado["documentos"][modulo] = _info_documento(modulo, caminho, erro=str(e))
         else:
             estado["arquivos_ausentes"].append(str(caminho))
             estado["documentos"][modulo] = {
@@ -104,275 +96,40 @@ def coletar_estado_sistema() -> Dict[str, Any]:
     return estado
 
 
-def analisar_documento(modulo: str, campos: Dict[str, str]) -> List[Dict[str, Any]]:
+def analisar_documento(
+    modulo: str,
+    campos: Dict[str, str],
+    regras: Optional[RegrasAlertas] = None,
+) -> List[Dict[str, Any]]:
     """
     Analisa um documento específico e retorna lista de alertas.
     
     Args:
         modulo: Nome do módulo (DFD, ETP, TR, EDITAL, CONTRATO)
         campos: Dicionário com campos do documento
+        regras: Conjunto compilado (padrão: knowledge/regras_alertas.yml)
         
     Returns:
         Lista de alertas encontrados
     """
-    alertas = []
-    
-    if not campos:
-        return alertas
-    
-    # Verificar campos obrigatórios
-    campos_obrigatorios = CAMPOS_OBRIGATORIOS.get(modulo, [])
-    for campo in campos_obrigatorios:
-        valor = campos.get(campo, "")
-        
-        if not valor or (isinstance(valor, str) and len(valor.strip()) < 10):
-            alertas.append({
-                "id": f"{modulo.lower()}_{campo}_vazio",
-                "modulo": modulo,
-                "campo": campo,
-                "tipo": "Crítico",
-                "severidade": "alto",
-                "categoria": "Campo Obrigatório",
-                "mensagem": f"Campo obrigatório '{campo}' está vazio ou muito curto no {modulo}",
-                "recomendacao": f"Preencher o campo '{campo}' com informações completas e detalhadas",
-                "timestamp": datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
-            })
-    
-    # Validações específicas por módulo
-    if modulo == "DFD":
-        alertas.extend(_validar_dfd(campos))
-    elif modulo == "ETP":
-        alertas.extend(_validar_etp(campos))
-    elif modulo == "TR":
-        alertas.extend(_validar_tr(campos))
-    elif modulo == "EDITAL":
-        alertas.extend(_validar_edital(campos))
-    elif modulo == "CONTRATO":
-        alertas.extend(_validar_contrato(campos))
-    
-    return alertas
-
-
-def _validar_dfd(campos: Dict[str, str]) -> List[Dict[str, Any]]:
-    """Validações específicas do DFD."""
-    alertas = []
-    
-    # Validar tamanho do objeto
-    objeto = campos.get("objeto", "")
-    if objeto and len(objeto) < LIMITES["min_tamanho_objeto"]:
-        alertas.append({
-            "id": "dfd_objeto_curto",
-            "modulo": "DFD",
-            "campo": "objeto",
-            "tipo": "Médio",
-            "severidade": "medio",
-            "categoria": "Qualidade do Conteúdo",
-            "mensagem": f"Campo 'objeto' muito curto no DFD ({len(objeto)} caracteres, mínimo {LIMITES['min_tamanho_objeto']})",
-            "recomendacao": "Detalhar melhor o objeto da contratação com especificações completas",
-            "timestamp": datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
-        })
-    
-    # Validar justificativa
-    justificativa = campos.get("justificativa", "")
-    if justificativa and len(justificativa) < LIMITES["min_tamanho_justificativa"]:
-        alertas.append({
-            "id": "dfd_justificativa_curta",
-            "modulo": "DFD",
-            "campo": "justificativa",
-            "tipo": "Médio",
-            "severidade": "medio",
-            "categoria": "Qualidade do Conteúdo",
-            "mensagem": f"Justificativa muito curta no DFD ({len(justificativa)} caracteres)",
-            "recomendacao": "Expandir justificativa com fundamentação técnica e legal detalhada",
-            "timestamp": datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
-        })
-    
-    # Validar valor estimado
-    valor = campos.get("valor_estimado", "")
-    if valor and "R$" not in valor and not any(c.isdigit() for c in valor):
-        alertas.append({
-            "id": "dfd_valor_invalido",
-            "modulo": "DFD",
-            "campo": "valor_estimado",
-            "tipo": "Crítico",
-            "severidade": "alto",
-            "categoria": "Dados Financeiros",
-            "mensagem": "Valor estimado sem formatação monetária adequada no DFD",
-            "recomendacao": "Informar valor no formato 'R$ XXX.XXX,XX'",
-            "timestamp": datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
-        })
-    
-    return alertas
-
-
-def _validar_etp(campos: Dict[str, str]) -> List[Dict[str, Any]]:
-    """Validações específicas do ETP."""
-    alertas = []
-    
-    # Validar prazo estimado
-    prazo = campos.get("prazo_estimado", "")
-    if not prazo or prazo.lower() in ["a definir", "n/a", "não informado"]:
-        alertas.append({
-            "id": "etp_prazo_indefinido",
-            "modulo": "ETP",
-            "campo": "prazo_estimado",
-            "tipo": "Crítico",
-            "severidade": "alto",
-            "categoria": "Planejamento",
-            "mensagem": "Prazo estimado não definido no ETP",
-            "recomendacao": "Definir prazo específico em dias, meses ou anos",
-            "timestamp": datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
-        })
-    
-    # Validar orçamento
-    orcamento = campos.get("orcamento_previsto", "")
-    if not orcamento or "definir" in orcamento.lower():
-        alertas.append({
-            "id": "etp_orcamento_indefinido",
-            "modulo": "ETP",
-            "campo": "orcamento_previsto",
-            "tipo": "Crítico",
-            "severidade": "alto",
-            "categoria": "Dados Financeiros",
-            "mensagem": "Orçamento previsto não definido no ETP",
-            "recomendacao": "Informar valor orçamentário com base em pesquisa de preços",
-            "timestamp": datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
-        })
-    
-    return alertas
-
-
-def _validar_tr(campos: Dict[str, str]) -> List[Dict[str, Any]]:
-    """Validações específicas do TR."""
-    alertas = []
-    
-    # Validar especificação técnica
-    especificacao = campos.get("especificacao_tecnica", "")
-    if especificacao and len(especificacao) < 200:
-        alertas.append({
-            "id": "tr_especificacao_curta",
-            "modulo": "TR",
-            "campo": "especificacao_tecnica",
-            "tipo": "Médio",
-            "severidade": "medio",
-            "categoria": "Qualidade Técnica",
-            "mensagem": f"Especificação técnica muito curta no TR ({len(especificacao)} caracteres)",
-            "recomendacao": "Detalhar especificações técnicas com requisitos, quantitativos e padrões",
-            "timestamp": datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
-        })
-    
-    # Validar critério de aceitação
-    criterio = campos.get("criterio_aceitacao", "")
-    if not criterio or len(criterio) < 50:
-        alertas.append({
-            "id": "tr_criterio_ausente",
-            "modulo": "TR",
-            "campo": "criterio_aceitacao",
-            "tipo": "Crítico",
-            "severidade": "alto",
-            "categoria": "Fiscalização",
-            "mensagem": "Critério de aceitação ausente ou incompleto no TR",
-            "recomendacao": "Definir critérios objetivos e mensuráveis para aceitação dos serviços/produtos",
-            "timestamp": datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
-        })
-    
-    return alertas
-
-
-def _validar_edital(campos: Dict[str, str]) -> List[Dict[str, Any]]:
-    """Validações específicas do Edital."""
-    alertas = []
-    
-    # Validar número do edital
-    numero = campos.get("numero_edital", "")
-    if not numero or numero in ["N/A", "XXX/YYYY"]:
-        alertas.append({
-            "id": "edital_numero_invalido",
-            "modulo": "EDITAL",
-            "campo": "numero_edital",
-            "tipo": "Crítico",
-            "severidade": "alto",
-            "categoria": "Identificação",
-            "mensagem": "Número do edital não definido ou placeholder",
-            "recomendacao": "Informar número oficial do edital no formato XXX/AAAA",
-            "timestamp": datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
-        })
-    
-    # Validar obrigações
-    obrigacoes = campos.get("obrigacoes_contratada", "")
-    if obrigacoes:
-        num_obrigacoes = len([x for x in obrigacoes.split(";") if x.strip()])
-        if num_obrigacoes < LIMITES["min_obrigacoes"]:
-            alertas.append({
-                "id": "edital_poucas_obrigacoes",
-                "modulo": "EDITAL",
-                "campo": "obrigacoes_contratada",
-                "tipo": "Médio",
-                "severidade": "medio",
-                "categoria": "Qualidade Contratual",
-                "mensagem": f"Poucas obrigações da contratada listadas ({num_obrigacoes}, mínimo {LIMITES['min_obrigacoes']})",
-                "recomendacao": "Listar detalhadamente todas as obrigações e responsabilidades da contratada",
-                "timestamp": datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
-            })
-    
-    return alertas
+    return (regras or carregar_regras()).avaliar(modulo, campos)
 
 
-def _validar_contrato(campos: Dict[str, str]) -> List[Dict[str, Any]]:
-    """Validações específicas do Contrato."""
-    alertas = []
-    
-    # Validar número do contrato
-    numero = campos.get("numero_contrato", "")
-    if not numero or "XXX" in numero:
-        alertas.append({
-            "id": "contrato_numero_invalido",
-            "modulo": "CONTRATO",
-            "campo": "numero_contrato",
-            "tipo": "Crítico",
-            "severidade": "alto",
-            "categoria": "Identificação",
-            "mensagem": "Número do contrato não definido ou placeholder",
-            "recomendacao": "Informar número oficial do contrato no formato XXX/AAAA",
-            "timestamp": datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
-        })
-    
-    # Validar partes
-    contratada = campos.get("partes_contratada", "")
-    if not contratada or len(contratada) < 50:
-        alertas.append({
-            "id": "contrato_contratada_incompleta",
-            "modulo": "CONTRATO",
-            "campo": "partes_contratada",
-            "tipo": "Crítico",
-            "severidade": "alto",
-            "categoria": "Partes Contratuais",
-            "mensagem": "Identificação da contratada incompleta no contrato",
-            "recomendacao": "Incluir razão social completa, CNPJ, endereço e representante legal",
-            "timestamp": datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
-        })
-    
-    # Validar obrigações (campo crítico)
-    obrigacoes = campos.get("obrigacoes_contratada", "")
-    if obrigacoes and len(obrigacoes) < 500:
-        alertas.append({
-            "id": "contrato_obrigacoes_curtas",
-            "modulo": "CONTRATO",
-            "campo": "obrigacoes_contratada",
-            "tipo": "Médio",
-            "severidade": "medio",
-            "categoria": "Qualidade Contratual",
-            "mensagem": f"Obrigações da contratada muito curtas ({len(obrigacoes)} caracteres, recomendado mínimo 500)",
-            "recomendacao": "Detalhar todas as obrigações com no mínimo 10-15 itens numerados",
-            "timestamp": datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
-        })
-    
-    return alertas
+def _primeiro_campo(campos: Dict[str, Any], nomes: Tuple[str, ...]) -> Any:
+    for nome in nomes:
+        if campos.get(nome):
+            return campos[nome]
+    return None
 
 
-def validar_consistencia_entre_documentos(estado: Dict[str, Any]) -> List[Dict[str, Any]]:
+def validar_consistencia_entre_documentos(
+    estado: Dict[str, Any],
+    regras: Optional[RegrasAlertas] = None,
+) -> List[Dict[str, Any]]:
     """
     Valida consistência de valores, prazos e objetos entre documentos.
+    Campos e limites vêm das seções "consistencia" e "limites" do YAML;
+    valores e prazos são normalizados por utils.extracao_br (R$ e dias).
     
     Args:
         estado: Estado do sistema retornado por coletar_estado_sistema()
@@ -380,145 +137,256 @@ def validar_consistencia_entre_documentos(estado: Dict[str, Any]) -> List[Dict[s
     Returns:
         Lista de alertas de inconsistência
     """
+    regras = regras or carregar_regras()
+    limites = regras.limites
     alertas = []
     docs = estado.get("documentos", {})
+    timestamp = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
     
     # Extrair valores de cada documento
     valores = {}
-    objetos = {}
     prazos = {}
+    objetos = {}
     
     for modulo, info in docs.items():
         if not info.get("existe"):
             continue
         
         campos = info.get("campos", {})
-        if not campos:
+        if not campos or not isinstance(campos, dict):
             continue
         
-        # Coletar valores
-        for campo_valor in ["valor_estimado", "valor_global", "orcamento_previsto"]:
-            if campo_valor in campos:
-                val = campos[campo_valor]
-                if val and isinstance(val, str):
-                    # Tentar extrair número
-                    import re
-                    match = re.search(r'[\d.,]+', val.replace(".", "").replace(",", "."))
-                    if match:
-                        try:
-                            valores[modulo] = float(match.group().replace(",", "."))
-                        except:
-                            pass
+        valor = valor_brl(_primeiro_campo(campos, regras.consistencia.get("valores", ())))
+        if valor is not None:
+            valores[modulo] = valor
         
-        # Coletar objetos
-        if "objeto" in campos:
-            objetos[modulo] = campos["objeto"]
+        prazo = prazo_dias(_primeiro_campo(campos, regras.consistencia.get("prazos", ())))
+        if prazo:
+            prazos[modulo] = prazo
         
-        # Coletar prazos
-        for campo_prazo in ["prazo_estimado", "prazo_execucao", "vigencia"]:
-            if campo_prazo in campos:
-                prazos[modulo] = campos[campo_prazo]
-                break
+        objeto = _primeiro_campo(campos, regras.consistencia.get("objeto", ()))
+        if isinstance(objeto, str):
+            objetos[modulo] = objeto
     
     # Validar valores (DFD vs ETP vs Edital vs Contrato)
-    if len(valores) >= 2:
-        valores_lista = list(valores.values())
-        max_val = max(valores_lista)
-        min_val = min(valores_lista)
-        
-        if max_val > 0:
-            divergencia = (max_val - min_val) / max_val
-            
-            if divergencia > LIMITES["max_divergencia_valor"]:
-                modulos_str = ", ".join(valores.keys())
-                alertas.append({
-                    "id": "consistencia_valores_divergentes",
-                    "modulo": "SISTEMA",
-                    "tipo": "Crítico",
-                    "severidade": "alto",
-                    "categoria": "Consistência Entre Documentos",
-                    "mensagem": f"Valores divergentes entre documentos ({modulos_str}): diferença de {divergencia*100:.1f}%",
-                    "recomendacao": f"Revisar valores nos documentos. Maior: R$ {max_val:,.2f} | Menor: R$ {min_val:,.2f}",
-                    "timestamp": datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
-                })
+    divergencia = divergencia_relativa(list(valores.values()))
+    if divergencia > limites.get("max_divergencia_valor", 0.20):
+        max_val, min_val = max(valores.values()), min(valores.values())
+        modulos_str = ", ".join(valores.keys())
+        alertas.append({
+            "id": "consistencia_valores_divergentes",
+            "modulo": "SISTEMA",
+            "tipo": "Crítico",
+            "severidade": "alto",
+            "categoria": "Consistência Entre Documentos",
+            "mensagem": f"Valores divergentes entre documentos ({modulos_str}): diferença de {divergencia*100:.1f}%",
+            "recomendacao": f"Revisar valores nos documentos. Maior: R$ {max_val:,.2f} | Menor: R$ {min_val:,.2f}",
+            "timestamp": timestamp,
+        })
     
-    # Validar similaridade de objetos
+    # Validar prazos (comparados em dias: "3 meses" = "90 dias")
+    divergencia = divergencia_relativa(list(prazos.values()))
+    if divergencia > limites.get("max_divergencia_prazo", 0.20):
+        detalhes = ", ".join(f"{m}: {d} dias" for m, d in prazos.items())
+        alertas.append({
+            "id": "consistencia_prazos_divergentes",
+            "modulo": "SISTEMA",
+            "tipo": "Médio",
+            "severidade": "medio",
+            "categoria": "Consistência Entre Documentos",
+            "mensagem": f"Prazos divergentes entre documentos ({detalhes}): diferença de {divergencia*100:.1f}%",
+            "recomendacao": "Alinhar o prazo estimado do ETP com o prazo de execução do TR e do Edital",
+            "timestamp": timestamp,
+        })
+    
+    # Validar similaridade de objetos (primeiro objeto contra os demais)
     if len(objetos) >= 2:
-        objetos_lista = list(objetos.values())
-        # Comparar primeiro objeto com os demais
-        obj_base = objetos_lista[0]
-        for i, obj_comp in enumerate(objetos_lista[1:], 1):
+        min_palavras = limites.get("min_palavras_objeto", 5)
+        min_similaridade = limites.get("min_similaridade_objeto", 0.30)
+        nomes = list(objetos.keys())
+        palavras_base = set(objetos[nomes[0]].lower().split())
+        for i, nome in enumerate(nomes[1:], 1):
             # Similaridade simples por palavras comuns
-            palavras_base = set(obj_base.lower().split())
-            palavras_comp = set(obj_comp.lower().split())
+            palavras_comp = set(objetos[nome].lower().split())
             
-            if len(palavras_base) > 5 and len(palavras_comp) > 5:
-                intersecao = len(palavras_base & palavras_comp)
+            if len(palavras_base) > min_palavras and len(palavras_comp) > min_palavras:
                 uniao = len(palavras_base | palavras_comp)
-                similaridade = intersecao / uniao if uniao > 0 else 0
+                similaridade = len(palavras_base & palavras_comp) / uniao if uniao > 0 else 0
                 
-                if similaridade < 0.3:  # Menos de 30% de palavras comuns
-                    modulos_str = f"{list(objetos.keys())[0]} vs {list(objetos.keys())[i]}"
+                if similaridade < min_similaridade:
                     alertas.append({
                         "id": f"consistencia_objetos_diferentes_{i}",
                         "modulo": "SISTEMA",
                         "tipo": "Médio",
                         "severidade": "medio",
                         "categoria": "Consistência Entre Documentos",
-                        "mensagem": f"Objetos muito diferentes entre {modulos_str} (similaridade {similaridade*100:.0f}%)",
+                        "mensagem": f"Objetos muito diferentes entre {nomes[0]} vs {nome} (similaridade {similaridade*100:.0f}%)",
                         "recomendacao": "Verificar se o objeto da contratação está sendo descrito consistentemente",
-                        "timestamp": datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
+                        "timestamp": timestamp,
                     })
     
     return alertas
 
 
+# ======================================================
+# ♻️ Motor incremental
+# ======================================================
+# Cache em memória (o processo do Streamlit é compartilhado entre os
+# reruns das páginas): por módulo, a marca (mtime, tamanho) e o SHA-256
+# do arquivo, o estado lido e os alertas do documento; para as regras
+# entre documentos, a assinatura dos campos participantes.
+_CACHE_DOCUMENTOS: Dict[str, Dict[str, Any]] = {}
+_CACHE_CONSISTENCIA: Dict[str, Any] = {}
+_CACHE_LOCK = threading.Lock()
+
+
+def limpar_cache_alertas() -> None:
+    with _CACHE_LOCK:
+        _CACHE_DOCUMENTOS.clear()
+        _CACHE_CONSISTENCIA.clear()
+
+
+def _alerta_ausente(caminho: Path) -> Dict[str, Any]:
+    modulo_nome = caminho.stem.split("_")[0].upper()
+    return {
+        "id": f"arquivo_ausente_{modulo_nome.lower()}",
+        "modulo": modulo_nome,
+        "tipo": "Informativo",
+        "severidade": "baixo",
+        "categoria": "Arquivos",
+        "mensagem": f"Arquivo {caminho.name} não encontrado",
+        "recomendacao": f"Processar documento {modulo_nome} para gerar o arquivo",
+        "timestamp": datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
+    }
+
+
+def _documento_incremental(
+    modulo: str, caminho: Path, regras: RegrasAlertas
+) -> Tuple[Dict[str, Any], bool]:
+    """
+    Entrada de cache do módulo ({"info", "alertas", "ausente"}) e se
+    foi recalculada. Arquivo com mesma marca (mtime, tamanho) nem é lido;
+    marca nova com o mesmo SHA-256 reaproveita os alertas. Mudança no
+    conjunto de regras reavalia o estado já lido.
+    """
+    anterior = _CACHE_DOCUMENTOS.get(modulo)
+    try:
+        st = caminho.stat()
+    except OSError:
+        if anterior and anterior["marca"] is None:
+            return anterior, False
+        entrada = {
+            "marca": None, "sha": None, "regras": None,
+            "info": {"existe": False, "caminho": str(caminho)},
+            "alertas": [], "ausente": _alerta_ausente(caminho),
+        }
+        _CACHE_DOCUMENTOS[modulo] = entrada
+        return entrada, True
+
+    marca = (st.st_mtime_ns, st.st_size)
+    if anterior and anterior["marca"] == marca:
+        sha, info = anterior["sha"], anterior["info"]
+    else:
+        conteudo = caminho.read_bytes()
+        sha = hashlib.sha256(conteudo).hexdigest()
+        if anterior and anterior["sha"] == sha:
+            anterior["marca"] = marca
+            info = anterior["info"]
+        else:
+            try:
+                info = _info_documento(modulo, caminho, json.loads(conteudo.decode("utf-8")))
+            except Exception as e:
+                info = _info_documento(modulo, caminho, erro=str(e))
+            anterior = None
+
+    if anterior and anterior["regras"] == regras.assinatura:
+        return anterior, False
+
+    campos = info.get("campos")
+    entrada = {
+        "marca": marca, "sha": sha, "regras": regras.assinatura, "info": info, "ausente": None,
+        "alertas": analisar_documento(modulo, campos, regras) if campos else [],
+    }
+    _CACHE_DOCUMENTOS[modulo] = entrada
+    return entrada, True
+
+
+def _assinatura_consistencia(estado: Dict[str, Any], regras: RegrasAlertas) -> str:
+    participantes = {"_regras": regras.assinatura}
+    for modulo, info in estado["documentos"].items():
+        campos = info.get("campos") if info.get("existe") else None
+        if isinstance(campos, dict):
+            participantes[modulo] = {c: campos[c] for c in regras.campos_consistencia if c in campos}
+    texto = json.dumps(participantes, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()
+
+
+def avaliar_alertas_incremental() -> Dict[str, Any]:
+    """
+    Estado do sistema e alertas, recalculando apenas os documentos que
+    mudaram e as regras entre documentos cujos campos mudaram.
+    """
+    regras = carregar_regras()
+    with _CACHE_LOCK:
+        estado = {"timestamp": datetime.now().isoformat(), "documentos": {}, "arquivos_ausentes": []}
+        alertas_docs, ausentes, recalculados = [], [], []
+        for modulo, caminho in MODULOS_ARQUIVOS.items():
+            entrada, mudou = _documento_incremental(modulo, caminho, regras)
+            estado["documentos"][modulo] = entrada["info"]
+            alertas_docs.extend(entrada["alertas"])
+            if entrada["ausente"]:
+                estado["arquivos_ausentes"].append(str(caminho))
+                ausentes.append(entrada["ausente"])
+            if mudou:
+                recalculados.append(modulo)
+
+        assinatura = _assinatura_consistencia(estado, regras)
+        consistencia_recalculada = _CACHE_CONSISTENCIA.get("assinatura") != assinatura
+        if consistencia_recalculada:
+            _CACHE_CONSISTENCIA.update(
+                assinatura=assinatura, alertas=validar_consistencia_entre_documentos(estado, regras)
+            )
+        return {
+            "estado": estado,
+            "documentos": alertas_docs,
+            "consistencia": _CACHE_CONSISTENCIA["alertas"],
+            "ausentes": ausentes,
+            "recalculados": {"documentos": recalculados, "consistencia": consistencia_recalculada},
+        }
+
+
 # ======================================================
 # 🚀 Função Principal: Gerar Alertas Reais
 # ======================================================
 
-def gerar_alertas_reais(salvar_historico: bool = True) -> Dict[str, Any]:
+def gerar_alertas_reais(salvar_historico: bool = True, incremental: bool = True) -> Dict[str, Any]:
     """
     Função PRINCIPAL que gera alertas reais do sistema.
     
     Args:
         salvar_historico: Se True, salva alertas no histórico
+        incremental: Se False, descarta o cache e reavalia tudo
         
     Returns:
         Dict com alertas, totais e timestamp
     """
-    print("[alertas_pipeline] Iniciando geração de alertas reais...")
-    
-    # 1. Coletar estado do sistema
-    estado = coletar_estado_sistema()
-    
-    # 2. Gerar alertas por documento
-    todos_alertas = []
-    
-    for modulo, info in estado["documentos"].items():
-        if info.get("existe") and info.get("campos"):
-            alertas_doc = analisar_documento(modulo, info["campos"])
-            todos_alertas.extend(alertas_doc)
-            print(f"[alertas_pipeline] {modulo}: {len(alertas_doc)} alertas")
-    
-    # 3. Validar consistência entre documentos
-    alertas_consistencia = validar_consistencia_entre_documentos(estado)
-    todos_alertas.extend(alertas_consistencia)
-    print(f"[alertas_pipeline] Consistência: {len(alertas_consistencia)} alertas")
-    
-    # 4. Adicionar alertas de arquivos ausentes
-    for arquivo_ausente in estado["arquivos_ausentes"]:
-        modulo_nome = Path(arquivo_ausente).stem.split("_")[0].upper()
-        todos_alertas.append({
-            "id": f"arquivo_ausente_{modulo_nome.lower()}",
-            "modulo": modulo_nome,
-            "tipo": "Informativo",
-            "severidade": "baixo",
-            "categoria": "Arquivos",
-            "mensagem": f"Arquivo {Path(arquivo_ausente).name} não encontrado",
-            "recomendacao": f"Processar documento {modulo_nome} para gerar o arquivo",
-            "timestamp": datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
-        })
+    if not incremental:
+        limpar_cache_alertas()
+
+    # 1–4. Estado do sistema, alertas por documento, consistência e ausências
+    avaliacao = avaliar_alertas_incremental()
+    estado = avaliacao["estado"]
+    # Cópias: as páginas podem anotar os alertas sem afetar o cache
+    todos_alertas = [
+        dict(a) for a in avaliacao["documentos"] + avaliacao["consistencia"] + avaliacao["ausentes"]
+    ]
+
+    recalculados = avaliacao["recalculados"]
+    if recalculados["documentos"] or recalculados["consistencia"]:
+        print(
+            f"[alertas_pipeline] Reavaliados: {', '.join(recalculados['documentos']) or 'nenhum documento'}"
+            f"{' + consistência' if recalculados['consistencia'] else ''}"
+        )
     
     # 5. Calcular totais
     totais = {
@@ -538,6 +406,7 @@ def gerar_alertas_reais(salvar_historico: bool = True) -> Dict[str, Any]:
         "alerts": todos_alertas,
         "resumo": f"{totais['total']} alertas – {totais['critico']} críticos, {totais['medio']} médios, {totais['informativo']} informativos",
         "estado_sistema": estado,
+        "recalculados": recalculados,
     }
     
     # 6. Salvar no histórico
@@ -0,0 +1,506 @@
+# -*- coding: utf-8 -*-
+"""
+base_campos.py – Base indexada de campos normalizados por processo
+==============================================================
+As verificações entre documentos do pipeline de alertas enxergam só o
+conjunto atual de exports/*_data.json. Esta base guarda, para cada
+(processo, artefato) já gerado, os campos normalizados que interessam
+às verificações cruzadas:
+
+    - valor (R$, float) e prazo (dias) via utils.extracao_br;
+    - termos do objeto (kb_resumos.termos) numa tabela invertida;
+    - CNPJs citados (dígitos verificadores validados, sem o do TJSP).
+
+Fica num SQLite (biblioteca padrão) em exports/cache, com índices por
+artefato, processo, CNPJ e termo. As consultas em lote são uma única
+instrução SQL cada e respondem em milissegundos com milhares de
+processos, por exemplo:
+
+    - divergencias("valor", "EDITAL", "ETP", 0.20): processos em que o
+      valor do Edital diverge mais de 20% do ETP;
+    - cnpjs_recorrentes(3, "CONTRATO"): CNPJs contratados em 3 ou mais
+      processos;
+    - objetos_divergentes("TR", "EDITAL", 0.30): objetos com menos de
+      30% dos termos em comum.
+
+atualizar() varre snapshots auditados, registros de versão e os
+*_data.json atuais e só relê arquivos novos ou alterados (mtime/tamanho).
+Prevalece a versão mais recente de cada (processo, artefato). O processo
+é o número rotulado nos campos/texto ou em outro documento do mesmo grupo
+(carimbo do snapshot, registro, exports atuais); exports sem número ficam
+no processo "atual", que as consultas entre processos ignoram.
+
+Uso:
+    from utils.base_campos import obter_base
+    base = obter_base()
+    base.atualizar()
+    base.divergencias("valor", "EDITAL", "ETP", limite=0.20)
+
+Versão: v2025.1
+==============================================================
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from utils.coerencia_processos import SNAPSHOTS_DIR, identificar_processo, textos_do_carimbo
+from utils.extracao_br import extrair, prazo_dias, valor_brl
+from utils.kb_resumos import termos
+from utils.pre_extracao import CNPJS_CONTRATANTE
+from utils.regras_alertas import carregar_regras
+
+# ======================================================
+# ⚙️ Parâmetros
+# ======================================================
+BASE_DIR = Path(__file__).resolve().parents[1]
+EXPORTS_DIR = BASE_DIR / "exports"
+BASE_PATH = EXPORTS_DIR / "cache" / "base_campos.sqlite3"
+REGISTROS_DIRS = (EXPORTS_DIR / "versoes", EXPORTS_DIR / "snapshots")
+
+VERSAO_ESQUEMA = "3"
+MAX_TERMOS_OBJETO = 64
+CAMPOS_NUMERICOS = {"valor": "valor", "prazo": "prazo_dias"}
+PROCESSO_ATUAL = "atual"     # exports sem número de processo (fora das consultas em lote)
+MIN_OBJETO_INLINE = 20        # "OBJETO: texto" na mesma linha
+MAX_CARACTERES_OBJETO = 1000
+JANELA_ANCORA = 80            # caracteres antes do prazo em que a âncora é procurada
+
+_RE_CARIMBO = re.compile(r"(20\d{2})(\d{2})(\d{2})(?:_(\d{2})(\d{2})(\d{2}))?")
+_RE_ANCORA_PRAZO = re.compile(r"prazo|vig[êe]ncia|execu[çc][ãa]o", re.IGNORECASE)
+_RE_TITULO_OBJETO = re.compile(
+    r"^[#*\s\d.]*(?:d[oa]\s+)?objeto\b[*\s]*:?[*\s]*(?P<inline>[^\n]*)$", re.IGNORECASE | re.MULTILINE
+)
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS meta (chave TEXT PRIMARY KEY, valor TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS documentos (
+    artefato   TEXT NOT NULL,
+    processo   TEXT NOT NULL,
+    data       TEXT NOT NULL,
+    fonte      TEXT NOT NULL,
+    valor      REAL,
+    prazo_dias INTEGER,
+    objeto     TEXT,
+    n_termos   INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (artefato, processo)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_documentos_processo ON documentos (processo);
+CREATE TABLE IF NOT EXISTS cnpjs (
+    cnpj     TEXT NOT NULL,
+    processo TEXT NOT NULL,
+    artefato TEXT NOT NULL,
+    PRIMARY KEY (cnpj, processo, artefato)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_cnpjs_documento ON cnpjs (artefato, processo);
+CREATE TABLE IF NOT EXISTS termos (
+    artefato TEXT NOT NULL,
+    processo TEXT NOT NULL,
+    termo    TEXT NOT NULL,
+    PRIMARY KEY (artefato, processo, termo)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS fontes (caminho TEXT PRIMARY KEY, marca TEXT NOT NULL);
+"""
+
+
+# ======================================================
+# 🧱 Normalização
+# ======================================================
+@dataclass(frozen=True)
+class CamposNormalizados:
+    processo: str
+    artefato: str
+    data: str                 # "AAAA-MM-DD HH:MM:SS" (ordenável)
+    fonte: str
+    valor: Optional[float] = None
+    prazo_dias: Optional[int] = None
+    objeto: Optional[str] = None
+    cnpjs: Tuple[str, ...] = ()
+    termos: Tuple[str, ...] = ()
+
+
+def _artefato(nome: str) -> str:
+    return (nome or "").strip().upper()
+
+
+def _termos_objeto(objeto: Optional[str]) -> Tuple[str, ...]:
+    return tuple(dict.fromkeys(termos(objeto or "")))[:MAX_TERMOS_OBJETO]
+
+
+def _cnpjs(texto: str) -> Tuple[str, ...]:
+    achados = (e.valor for e in extrair(texto, ("cnpj",))["cnpj"])
+    return tuple(sorted({c for c in achados if c not in CNPJS_CONTRATANTE}))
+
+
+def _primeiro_campo(campos: Dict[str, Any], nomes: Sequence[str]) -> Any:
+    for nome in nomes:
+        if campos.get(nome):
+            return campos[nome]
+    return None
+
+
+def normalizar_campos(
+    processo: str, artefato: str, campos: Dict[str, Any], data: str, fonte: str = ""
+) -> CamposNormalizados:
+    """Campos de um artefato gerado (dict do agente/formulário)."""
+    consistencia = carregar_regras().consistencia
+    objeto = _primeiro_campo(campos, consistencia.get("objeto", ("objeto",)))
+    objeto = objeto if isinstance(objeto, str) else None
+    prazo = prazo_dias(_primeiro_campo(campos, consistencia.get("prazos", ())))
+    texto = json.dumps(campos, ensure_ascii=False, default=str)
+    return CamposNormalizados(
+        processo=processo,
+        artefato=_artefato(artefato),
+        data=data,
+        fonte=fonte,
+        valor=valor_brl(_primeiro_campo(campos, consistencia.get("valores", ()))),
+        prazo_dias=prazo or None,
+        objeto=objeto,
+        cnpjs=_cnpjs(texto),
+        termos=_termos_objeto(objeto),
+    )
+
+
+def normalizar_texto(
+    processo: str, artefato: str, texto: str, data: str, fonte: str = ""
+) -> CamposNormalizados:
+    """
+    Campos de um documento em texto (snapshot .md). O valor é o maior
+    valor em R$ citado (o total, não o unitário), o prazo é o primeiro
+    prazo junto de "prazo"/"vigência"/"execução" e o objeto é o parágrafo sob o título "Objeto" / "DO OBJETO".
+    """
+    achados = extrair(texto, ("valor", "prazo"))
+    valores = [e.valor for e in achados["valor"]]
+    objeto = _objeto_texto(texto)
+    return CamposNormalizados(
+        processo=processo,
+        artefato=_artefato(artefato),
+        data=data,
+        fonte=fonte,
+        valor=max(valores) if valores else None,
+        prazo_dias=_prazo_ancorado(texto, achados["prazo"]),
+        objeto=objeto,
+        cnpjs=_cnpjs(texto),
+        termos=_termos_objeto(objeto),
+    )
+
+
+def _objeto_texto(texto: str) -> Optional[str]:
+    m = _RE_TITULO_OBJETO.search(texto)
+    if not m:
+        return None
+    if len(m.group("inline").strip()) >= MIN_OBJETO_INLINE:
+        return m.group("inline").strip()
+    paragrafo = texto[m.end():].strip().split("\n\n", 1)[0].strip()
+    return paragrafo[:MAX_CARACTERES_OBJETO] or None
+
+
+def _prazo_ancorado(texto: str, prazos: Sequence[Any]) -> Optional[int]:
+    """Primeiro prazo precedido de "prazo"/"vigência"/"execução"; senão o primeiro."""
+    for e in prazos:
+        if _RE_ANCORA_PRAZO.search(texto[max(0, e.inicio - JANELA_ANCORA):e.inicio]):
+            return e.valor["dias"]
+    return prazos[0].valor["dias"] if prazos else None
+
+
+def _data_carimbo(nome: str, padrao: str = "") -> str:
+    m = _RE_CARIMBO.search(nome)
+    if not m:
+        return padrao
+    h, mi, s = (m.group(i) or "00" for i in (4, 5, 6))
+    return f"{m.group(1)}-{m.group(2)}-{m.group(3)} {h}:{mi}:{s}"
+
+
+def _data_arquivo(caminho: Path) -> str:
+    return datetime.fromtimestamp(caminho.stat().st_mtime).strftime("%Y-%m-%d %H:%M:%S")
+
+
+# ======================================================
+# 📂 Fontes (snapshots, registros de versão, exports atuais)
+# ======================================================
+def _ler_json(caminho: Path) -> Optional[Dict[str, Any]]:
+    try:
+        dados = json.loads(caminho.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return dados if isinstance(dados, dict) else None
+
+
+def _campos_versao(dados: Dict[str, Any]) -> Dict[str, Any]:
+    """Registros de versão guardam os campos na raiz ou em campos_ai/CAMPOS."""
+    for chave in ("campos_ai", "campos", "CAMPOS"):
+        if isinstance(dados.get(chave), dict):
+            return dados[chave]
+    return dados
+
+
+def _texto_campos(campos: Dict[str, Any]) -> str:
+    return json.dumps(campos, ensure_ascii=False, default=str)
+
+
+def _textos_irmaos(caminho: Path, padrao: str) -> Iterator[str]:
+    """Campos dos demais JSON do mesmo grupo (registro de versão ou exports atuais)."""
+    for irmao in sorted(caminho.parent.glob(padrao)):
+        if irmao != caminho:
+            dados = _ler_json(irmao)
+            if dados:
+                yield _texto_campos(_campos_versao(dados))
+
+
+def _do_snapshot(caminho: Path) -> List[CamposNormalizados]:
+    texto = caminho.read_text(encoding="utf-8", errors="ignore")
+    artefato = caminho.stem.split("_", 1)[0]
+    processo = identificar_processo(texto, caminho.name, textos_do_carimbo(caminho))
+    return [normalizar_texto(processo, artefato, texto, _data_carimbo(caminho.stem), str(caminho))]
+
+
+def _do_registro(caminho: Path) -> List[CamposNormalizados]:
+    dados = _ler_json(caminho)
+    if not dados:
+        return []
+    campos = _campos_versao(dados)
+    registro = caminho.parent.name
+    processo = identificar_processo(_texto_campos(campos), registro, _textos_irmaos(caminho, "*_versao.json"))
+    artefato = dados.get("artefato") or caminho.stem.rsplit("_", 1)[0]
+    return [normalizar_campos(processo, artefato, campos, _data_carimbo(registro), str(caminho))]
+
+
+def _do_export_atual(caminho: Path) -> List[CamposNormalizados]:
+    dados = _ler_json(caminho)
+    if not dados:
+        return []
+    campos = _campos_versao(dados)
+    processo = identificar_processo(_texto_campos(campos), PROCESSO_ATUAL, _textos_irmaos(caminho, "*_data.json"))
+    artefato = dados.get("artefato") or caminho.stem.rsplit("_", 1)[0]
+    return [normalizar_campos(processo, artefato, campos, _data_arquivo(caminho), str(caminho))]
+
+
+def fontes_padrao() -> Iterator[Tuple[Path, Any]]:
+    """(arquivo, leitor) de tudo o que o sistema já gerou."""
+    for caminho in sorted(SNAPSHOTS_DIR.glob("*.md")):
+        yield caminho, _do_snapshot
+    for pasta in REGISTROS_DIRS:
+        for caminho in sorted(pasta.glob("registro_*/*_versao.json")):
+            yield caminho, _do_registro
+    for caminho in sorted(EXPORTS_DIR.glob("*_data.json")):
+        yield caminho, _do_export_atual
+
+
+# ======================================================
+# 🗄️ Base indexada
+# ======================================================
+class BaseCampos:
+    """Campos normalizados de todos os processos, em SQLite indexado."""
+
+    def __init__(self, caminho: Path = BASE_PATH):
+        self.caminho = Path(caminho)
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._con = sqlite3.connect(str(self.caminho), check_same_thread=False)
+        self._con.execute("PRAGMA journal_mode=WAL")
+        self._con.execute("PRAGMA synchronous=NORMAL")
+        versao = None
+        try:
+            versao = self._con.execute("SELECT valor FROM meta WHERE chave = 'esquema'").fetchone()
+        except sqlite3.DatabaseError:
+            pass
+        if not versao or versao[0] != VERSAO_ESQUEMA:
+            self._recriar()
+
+    def _recriar(self) -> None:
+        with self._con:
+            for tabela in ("meta", "documentos", "cnpjs", "termos", "fontes"):
+                self._con.execute(f"DROP TABLE IF EXISTS {tabela}")
+            self._con.executescript(_ESQUEMA)
+            self._con.execute("INSERT INTO meta VALUES ('esquema', ?)", (VERSAO_ESQUEMA,))
+
+    def fechar(self) -> None:
+        with self._lock:
+            self._con.close()
+
+    def _consultar(self, sql: str, parametros: Sequence[Any] = ()) -> List[Dict[str, Any]]:
+        with self._lock:
+            cursor = self._con.execute(sql, parametros)
+            colunas = [c[0] for c in cursor.description]
+            return [dict(zip(colunas, linha)) for linha in cursor.fetchall()]
+
+    # ---------------- Escrita ----------------
+    def _gravar(self, doc: CamposNormalizados) -> bool:
+        cursor = self._con.execute(
+            """
+            INSERT INTO documentos (artefato, processo, data, fonte, valor, prazo_dias, objeto, n_termos)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (artefato, processo) DO UPDATE SET
+                data = excluded.data, fonte = excluded.fonte, valor = excluded.valor,
+                prazo_dias = excluded.prazo_dias, objeto = excluded.objeto, n_termos = excluded.n_termos
+            WHERE excluded.data >= documentos.data
+            """,
+            (doc.artefato, doc.processo, doc.data, doc.fonte, doc.valor, doc.prazo_dias,
+             doc.objeto, len(doc.termos)),
+        )
+        if not cursor.rowcount:
+            return False  # já havia versão mais recente
+        chave = (doc.artefato, doc.processo)
+        self._con.execute("DELETE FROM cnpjs WHERE artefato = ? AND processo = ?", chave)
+        self._con.execute("DELETE FROM termos WHERE artefato = ? AND processo = ?", chave)
+        self._con.executemany(
+            "INSERT INTO cnpjs VALUES (?, ?, ?)", [(c, doc.processo, doc.artefato) for c in doc.cnpjs]
+        )
+        self._con.executemany(
+            "INSERT INTO termos VALUES (?, ?, ?)", [(doc.artefato, doc.processo, t) for t in doc.termos]
+        )
+        return True
+
+    def registrar(self, documentos: Iterable[CamposNormalizados]) -> int:
+        """Grava os documentos (numa transação); devolve quantos entraram."""
+        with self._lock, self._con:
+            return sum(self._gravar(doc) for doc in documentos)
+
+    def atualizar(self, fontes: Optional[Iterable[Tuple[Path, Any]]] = None) -> Dict[str, int]:
+        """Relê só as fontes novas ou alteradas desde a última atualização."""
+        fontes = fontes_padrao() if fontes is None else fontes
+        with self._lock:
+            marcas = dict(self._con.execute("SELECT caminho, marca FROM fontes"))
+        lidas = gravados = 0
+        for caminho, leitor in fontes:
+            try:
+                st = caminho.stat()
+            except OSError:
+                continue
+            marca = f"{st.st_mtime_ns}:{st.st_size}"
+            if marcas.get(str(caminho)) == marca:
+                continue
+            try:
+                documentos = leitor(caminho)
+            except Exception as e:
+                print(f"[base_campos] ⚠️ Falha ao ler {caminho.name}: {e}")
+                continue
+            with self._lock, self._con:
+                gravados += sum(self._gravar(doc) for doc in documentos)
+                self._con.execute("INSERT OR REPLACE INTO fontes VALUES (?, ?)", (str(caminho), marca))
+            lidas += 1
+        return {"fontes_lidas": lidas, "documentos_gravados": gravados}
+
+    # ---------------- Consultas em lote ----------------
+    def documentos(
+        self, processo: Optional[str] = None, artefato: Optional[str] = None, desde: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Documentos gravados; `desde` filtra pela data da versão (≥)."""
+        filtros, parametros = [], []
+        if desde:
+            filtros.append("data >= ?")
+            parametros.append(desde)
+        if processo:
+            filtros.append("processo = ?")
+            parametros.append(processo)
+        if artefato:
+            filtros.append("artefato = ?")
+            parametros.append(_artefato(artefato))
+        where = f"WHERE {' AND '.join(filtros)}" if filtros else ""
+        return self._consultar(
+            f"SELECT processo, artefato, data, fonte, valor, prazo_dias, objeto FROM documentos {where} "
+            "ORDER BY processo, artefato",
+            parametros,
+        )
+
+    def divergencias(
+        self, campo: str, artefato_a: str, artefato_b: str, limite: float = 0.20
+    ) -> List[Dict[str, Any]]:
+        """
+        Processos em que `campo` ("valor" ou "prazo") de artefato_a diverge
+        de artefato_b mais que `limite` – (maior − menor) / maior, a mesma
+        medida de extracao_br.divergencia_relativa. Maior divergência primeiro.
+        """
+        if campo not in CAMPOS_NUMERICOS:
+            raise ValueError(f"Campo '{campo}' inválido (use: {', '.join(CAMPOS_NUMERICOS)})")
+        coluna = CAMPOS_NUMERICOS[campo]
+        return self._consultar(
+            f"""
+            SELECT processo, valor_a, valor_b,
+                   (MAX(valor_a, valor_b) - MIN(valor_a, valor_b)) * 1.0 / MAX(valor_a, valor_b) AS divergencia
+            FROM (
+                SELECT a.processo, a.{coluna} AS valor_a, b.{coluna} AS valor_b
+                FROM documentos a
+                JOIN documentos b ON b.artefato = ? AND b.processo = a.processo
+                WHERE a.artefato = ? AND a.processo != ? AND a.{coluna} IS NOT NULL AND b.{coluna} IS NOT NULL
+            )
+            WHERE MAX(valor_a, valor_b) > 0 AND divergencia > ?
+            ORDER BY divergencia DESC, processo
+            """,
+            (_artefato(artefato_b), _artefato(artefato_a), PROCESSO_ATUAL, float(limite)),
+        )
+
+    def cnpjs_recorrentes(self, min_processos: int = 2, artefato: Optional[str] = None) -> List[Dict[str, Any]]:
+        """CNPJs citados em `min_processos` processos ou mais (opcionalmente num só artefato)."""
+        filtro = "WHERE processo != ?" + (" AND artefato = ?" if artefato else "")
+        parametros: List[Any] = [PROCESSO_ATUAL] + ([_artefato(artefato)] if artefato else [])
+        linhas = self._consultar(
+            f"""
+            SELECT cnpj, COUNT(DISTINCT processo) AS n_processos, GROUP_CONCAT(DISTINCT processo) AS processos
+            FROM cnpjs {filtro}
+            GROUP BY cnpj
+            HAVING COUNT(DISTINCT processo) >= ?
+            ORDER BY n_processos DESC, cnpj
+            """,
+            parametros + [int(min_processos)],
+        )
+        for linha in linhas:
+            linha["processos"] = sorted(linha["processos"].split(","))
+        return linhas
+
+    def objetos_divergentes(
+        self, artefato_a: str, artefato_b: str, min_similaridade: float = 0.30
+    ) -> List[Dict[str, Any]]:
+        """
+        Processos cujo objeto em artefato_a e artefato_b tem Jaccard de
+        termos abaixo de `min_similaridade`. Menor similaridade primeiro.
+        """
+        return self._consultar(
+            """
+            SELECT a.processo,
+                   COALESCE(c.comuns, 0) * 1.0 / (a.n_termos + b.n_termos - COALESCE(c.comuns, 0)) AS similaridade
+            FROM documentos a
+            JOIN documentos b ON b.artefato = ? AND b.processo = a.processo
+            LEFT JOIN (
+                SELECT ta.processo, COUNT(*) AS comuns
+                FROM termos ta
+                JOIN termos tb ON tb.artefato = ? AND tb.processo = ta.processo AND tb.termo = ta.termo
+                WHERE ta.artefato = ?
+                GROUP BY ta.processo
+            ) c ON c.processo = a.processo
+            WHERE a.artefato = ? AND a.processo != ? AND a.n_termos > 0 AND b.n_termos > 0 AND similaridade < ?
+            ORDER BY similaridade, a.processo
+            """,
+            (_artefato(artefato_b), _artefato(artefato_b), _artefato(artefato_a),
+             _artefato(artefato_a), PROCESSO_ATUAL, float(min_similaridade)),
+        )
+
+    def estatisticas(self) -> Dict[str, Any]:
+        linhas = self._consultar(
+            "SELECT artefato, COUNT(*) AS documentos FROM documentos GROUP BY artefato ORDER BY artefato"
+        )
+        processos = self._consultar("SELECT COUNT(DISTINCT processo) AS n FROM documentos")[0]["n"]
+        return {"processos": processos, "por_artefato": {l["artefato"]: l["documentos"] for l in linhas}}
+
+
+# ======================================================
+# 🔁 Instância compartilhada
+# ======================================================
+_BASES: Dict[str, BaseCampos] = {}
+_BASES_LOCK = threading.Lock()
+
+
+def obter_base(caminho: Path = BASE_PATH) -> BaseCampos:
+    """Base compartilhada do processo (uma conexão por arquivo)."""
+    with _BASES_LOCK:
+        chave = str(Path(caminho))
+        if chave not in _BASES:
+            _BASES[chave] = BaseCampos(caminho)
+        return _BASES[chave]
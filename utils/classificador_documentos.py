@@ -0,0 +1,448 @@
+# -*- coding: utf-8 -*-
+"""
+classificador_documentos.py – Classificador local do tipo de documento
+==============================================================
+Identifica, sem chamada à IA, se um insumo é DFD, ETP, TR, Edital,
+Contrato, PCA ou Pesquisa de Preços. Usado para:
+- sugerir o módulo de destino na página de Insumos;
+- informar ao DocumentAgent o tipo de origem, enxugando o prompt
+  genérico ("IDENTIFIQUE o tipo de documento...").
+
+Duas etapas:
+1. título explícito no cabeçalho ("TERMO DE REFERÊNCIA", "DOCUMENTO
+   DE FORMALIZAÇÃO DE DEMANDA"...), por expressão regular;
+2. sem título reconhecível, Naive Bayes multinomial (unigramas +
+   bigramas, sem acento e sem stopwords) com priores uniformes.
+
+Dados de treino (rotulados pelo nome do arquivo):
+- knowledge_base/ (modelos de DFD, ETP, TR, pesquisa de preços)
+- knowledge/contrato_models/
+- checklists YAML de cada artefato (knowledge/ e knowledge/validators/)
+- tests/data/insumos_ficticios/
+- descritores fixos por classe (títulos e expressões típicas)
+
+O modelo treinado fica em exports/cache/classificador_documentos.json
+e só é refeito quando algum arquivo de treino muda (verificado no máximo
+uma vez a cada VALIDADE_FONTES_S).
+
+Uso:
+    from utils.classificador_documentos import classificar_documento
+    r = classificar_documento(texto)   # {"tipo": "TR", "confianca": 0.97, ...}
+
+Versão: v2025.1
+==============================================================
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from utils.kb_resumos import termos
+from utils.knowledge_registry import (
+    BASE_DIR,
+    CONTRATO_MODELS_DIR,
+    KB_ROOT,
+    KNOWLEDGE_DIR,
+    VALIDATORS_DIR,
+    obter_registry,
+)
+
+# ======================================================
+# 🔧 Configurações
+# ======================================================
+CLASSES = ["DFD", "ETP", "TR", "EDITAL", "CONTRATO", "PCA", "PESQUISA_PRECOS"]
+
+# Tipos que têm módulo de destino na página de Insumos
+TIPOS_COM_MODULO = {"DFD", "ETP", "TR", "EDITAL", "CONTRATO"}
+
+MODELO_PATH = BASE_DIR / "exports" / "cache" / "classificador_documentos.json"
+# Intervalo mínimo (s) entre verificações das fontes de treino
+VALIDADE_FONTES_S = 60.0
+INSUMOS_FICTICIOS_DIR = BASE_DIR / "tests" / "data" / "insumos_ficticios"
+
+VERSAO_FORMATO = 1
+
+# Trecho do documento considerado (treino e predição)
+MAX_CHARS = 20000
+# Caracteres iniciais (título/cabeçalho) e seu peso
+CHARS_CABECALHO = 600
+PESO_CABECALHO = 3
+
+# Suavização de Laplace e escala da confiança (softmax da log-verossimilhança média)
+ALFA = 0.5
+ESCALA_CONFIANCA = 10.0
+
+# Abaixo desta confiança o tipo é tratado como indefinido
+CONFIANCA_MINIMA = 0.6
+
+# Títulos procurados nas linhas curtas do cabeçalho (texto sem acento, maiúsculo);
+# vence a primeira linha que casar. Em linhas "ANEXO I DO EDITAL" a menção ao
+# documento principal não é o título do anexo (_RE_ANEXO_REFERENCIA)
+CHARS_TITULO = 1500
+MAX_CHARS_LINHA_TITULO = 120
+CONFIANCA_TITULO = 0.95
+PADROES_TITULO: Dict[str, re.Pattern] = {
+    "DFD": re.compile(r"FORMALIZACAO DE? ?D[AE] DEMANDA|OFICIALIZACAO DA DEMANDA|\bDFD\b|\bD\.O\.D\b"),
+    "ETP": re.compile(r"ESTUDO TECNICO PRELIMINAR|\bETP\b"),
+    "TR": re.compile(r"TERMO DE REFERENCIA"),
+    "EDITAL": re.compile(r"\bEDITAL\b|^PREGAO (ELETRONICO|PRESENCIAL)|^CONCORRENCIA (ELETRONICA|PUBLICA)?\s*N"),
+    "CONTRATO": re.compile(r"\b(TERMO|MINUTA) DE CONTRATO\b|\bCONTRATO (ADMINISTRATIVO|N[O.º°]?\s*\d)"),
+    "PCA": re.compile(r"PLANO (ANUAL )?DE CONTRATACOES( ANUAL)?"),
+    "PESQUISA_PRECOS": re.compile(r"PESQUISA DE PRECOS?\b"),
+}
+
+_RE_ANEXO_REFERENCIA = re.compile(
+    r"\b(?:D[OA]|AO|A)\s+(?:EDITAL|TERMO DE REFERENCIA|CONTRATO|ESTUDO TECNICO PRELIMINAR|ETP)\b"
+    r"(?:\s+N[Oo.°]?\s*[\d./-]+)?"
+)
+
+DESCRITORES: Dict[str, List[str]] = {
+    "DFD": [
+        "documento de formalização da demanda", "formalização da demanda",
+        "unidade demandante", "DFD", "DOD documento de oficialização da demanda",
+    ],
+    "ETP": [
+        "estudo técnico preliminar", "ETP", "levantamento de mercado",
+        "análise das alternativas possíveis", "viabilidade da contratação",
+    ],
+    "TR": [
+        "termo de referência", "TR", "especificação técnica do objeto",
+        "obrigações da contratada", "critérios de medição e pagamento",
+    ],
+    "EDITAL": [
+        "edital de licitação", "pregão eletrônico", "minuta do edital",
+        "sessão pública", "proposta de preços e habilitação", "impugnação ao edital",
+        "licitantes", "critério de julgamento menor preço",
+    ],
+    "CONTRATO": [
+        "contrato administrativo", "cláusula primeira do objeto", "contratante", "contratada",
+        "vigência contratual", "rescisão", "foro", "termo de contrato",
+    ],
+    "PCA": [
+        "plano de contratações anual", "PCA", "planejamento anual de contratações",
+        "calendário de contratações", "demandas previstas para o exercício",
+    ],
+    "PESQUISA_PRECOS": [
+        "pesquisa de preços", "relatório de pesquisa de preços", "cotações de fornecedores",
+        "painel de preços", "preço médio", "mediana", "cesta de preços",
+    ],
+}
+
+
+# ======================================================
+# 🏷️ Rotulagem das fontes de treino
+# ======================================================
+def rotulo_por_nome(nome: str) -> Optional[str]:
+    """Rótulo a partir do nome do arquivo, ou None se não for um artefato."""
+    n = "".join(termos(nome.replace("_", " ")))
+    n_esp = " ".join(termos(nome.replace("_", " ")))
+    if "manual" in n or "relatorio final" in n_esp:
+        return None
+    if "pesquisa precos" in n_esp:
+        return "PESQUISA_PRECOS"
+    if "termo referencia" in n_esp:
+        return "TR"
+    if "estudo tecnico preliminar" in n_esp or n_esp.split()[-1:] == ["etp"] or " etp " in f" {n_esp} ":
+        return "ETP"
+    if n_esp.startswith(("dfd", "dod")) or " dfd " in f" {n_esp} " or " dod " in f" {n_esp} ":
+        return "DFD"
+    if "edital" in n:
+        return "EDITAL"
+    if "contrato" in n:
+        return "CONTRATO"
+    if n_esp.startswith("pca") or "plano contratacoes" in n_esp:
+        return "PCA"
+    return None
+
+
+def _textos_yaml(dados: Any) -> Iterable[str]:
+    if isinstance(dados, str):
+        yield dados
+    elif isinstance(dados, dict):
+        for v in dados.values():
+            yield from _textos_yaml(v)
+    elif isinstance(dados, list):
+        for v in dados:
+            yield from _textos_yaml(v)
+
+
+def _extrair_insumo(caminho: Path) -> str:
+    try:
+        if caminho.suffix.lower() == ".docx":
+            import docx2txt
+            return docx2txt.process(str(caminho)) or ""
+        if caminho.suffix.lower() == ".pdf":
+            import fitz
+            with fitz.open(str(caminho)) as pdf:
+                return "\n".join(p.get_text("text") for p in pdf)
+        return caminho.read_text(encoding="utf-8", errors="ignore")
+    except Exception as e:
+        print(f"[classificador_documentos] ⚠️ Falha ao ler {caminho.name}: {e}")
+        return ""
+
+
+def _fontes_treino() -> List[Tuple[Path, str]]:
+    """[(caminho, rótulo)] de todos os arquivos usados no treino."""
+    fontes: List[Tuple[Path, str]] = []
+    if KB_ROOT.is_dir():
+        for arq in sorted(KB_ROOT.rglob("*.txt")):
+            rotulo = rotulo_por_nome(arq.stem)
+            if rotulo:
+                fontes.append((arq, rotulo))
+    for arq in sorted(CONTRATO_MODELS_DIR.glob("*.txt")) if CONTRATO_MODELS_DIR.is_dir() else []:
+        fontes.append((arq, "CONTRATO"))
+    for pasta in (KNOWLEDGE_DIR, VALIDATORS_DIR):
+        if not pasta.is_dir():
+            continue
+        for arq in sorted(pasta.glob("*_checklist.yml")):
+            rotulo = arq.stem.replace("_checklist", "").upper()
+            if rotulo in CLASSES:
+                fontes.append((arq, rotulo))
+    if INSUMOS_FICTICIOS_DIR.is_dir():
+        for arq in sorted(INSUMOS_FICTICIOS_DIR.iterdir()):
+            rotulo = rotulo_por_nome(arq.stem)
+            if rotulo and arq.suffix.lower() in (".txt", ".docx", ".pdf"):
+                fontes.append((arq, rotulo))
+    return fontes
+
+
+def _assinatura(fontes: List[Tuple[Path, str]]) -> str:
+    h = hashlib.sha256(f"v{VERSAO_FORMATO}".encode())
+    for arq, rotulo in fontes:
+        try:
+            st = arq.stat()
+        except OSError:
+            continue
+        h.update(f"{arq.name}|{rotulo}|{st.st_mtime_ns}|{st.st_size}".encode("utf-8"))
+    return h.hexdigest()
+
+
+# ======================================================
+# 🔤 Atributos
+# ======================================================
+def detectar_titulo(texto: str) -> Optional[str]:
+    """Tipo indicado por uma linha de título no cabeçalho, ou None."""
+    cabecalho = "".join(
+        c for c in unicodedata.normalize("NFKD", (texto or "")[:CHARS_TITULO].upper())
+        if not unicodedata.combining(c)
+    )
+    for linha in cabecalho.splitlines():
+        linha = re.sub(r"\s+", " ", linha).strip()
+        if not linha or len(linha) > MAX_CHARS_LINHA_TITULO:
+            continue
+        if linha.startswith("ANEXO"):
+            linha = _RE_ANEXO_REFERENCIA.sub(" ", linha)
+        achados = [(m.start(), tipo) for tipo, p in PADROES_TITULO.items() if (m := p.search(linha))]
+        if achados:
+            return min(achados)[1]
+    return None
+
+
+def atributos(texto: str) -> Counter:
+    """Contagem de unigramas e bigramas; o cabeçalho conta PESO_CABECALHO vezes."""
+    texto = (texto or "")[:MAX_CHARS]
+
+    def _ngramas(trecho: str) -> List[str]:
+        t = termos(trecho)
+        return t + [f"{a}_{b}" for a, b in zip(t, t[1:])]
+
+    contagem = Counter(_ngramas(texto))
+    for g in _ngramas(texto[:CHARS_CABECALHO]):
+        contagem[g] += PESO_CABECALHO - 1
+    return contagem
+
+
+# ======================================================
+# 🧠 Naive Bayes multinomial
+# ======================================================
+class ClassificadorDocumentos:
+    """Naive Bayes multinomial com priores uniformes."""
+
+    def __init__(self, log_prob: Dict[str, Dict[str, float]], log_desconhecido: Dict[str, float],
+                 assinatura: str = "", amostras: Optional[Dict[str, int]] = None):
+        self.log_prob = log_prob
+        self.log_desconhecido = log_desconhecido
+        self.assinatura = assinatura
+        self.amostras = amostras or {}
+
+    @classmethod
+    def treinar(cls, exemplos: List[Tuple[str, str]], assinatura: str = "") -> "ClassificadorDocumentos":
+        contagens: Dict[str, Counter] = defaultdict(Counter)
+        amostras: Counter = Counter()
+        for texto, rotulo in exemplos:
+            contagens[rotulo].update(atributos(texto))
+            amostras[rotulo] += 1
+
+        vocab = set()
+        for c in contagens.values():
+            vocab.update(c)
+        v = len(vocab) + 1
+
+        log_prob: Dict[str, Dict[str, float]] = {}
+        log_desconhecido: Dict[str, float] = {}
+        for classe in CLASSES:
+            c = contagens.get(classe, Counter())
+            total = sum(c.values()) + ALFA * v
+            log_prob[classe] = {t: math.log((f + ALFA) / total) for t, f in c.items()}
+            log_desconhecido[classe] = math.log(ALFA / total)
+        return cls(log_prob, log_desconhecido, assinatura, dict(amostras))
+
+    def prever(self, texto: str) -> Dict[str, Any]:
+        contagem = atributos(texto)
+        n = sum(contagem.values())
+        if not n:
+            return {"tipo": None, "confianca": 0.0, "probabilidades": {}}
+
+        # Só atributos vistos no treino entram na decisão
+        conhecidos = {t: f for t, f in contagem.items() if any(t in lp for lp in self.log_prob.values())}
+        n_conhecidos = sum(conhecidos.values()) or 1
+        scores = {}
+        for classe in CLASSES:
+            lp, desconhecido = self.log_prob[classe], self.log_desconhecido[classe]
+            scores[classe] = sum(f * lp.get(t, desconhecido) for t, f in conhecidos.items()) / n_conhecidos
+
+        maior = max(scores.values())
+        exps = {c: math.exp((s - maior) * ESCALA_CONFIANCA) for c, s in scores.items()}
+        soma = sum(exps.values())
+        probs = {c: round(e / soma, 4) for c, e in sorted(exps.items(), key=lambda kv: -kv[1])}
+        tipo = next(iter(probs))
+        return {"tipo": tipo, "confianca": probs[tipo], "probabilidades": probs}
+
+    # --------------------------------------------------
+    # Persistência
+    # --------------------------------------------------
+    def salvar(self, caminho: Path = MODELO_PATH) -> None:
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        tmp = caminho.with_suffix(".tmp")
+        tmp.write_text(json.dumps({
+            "versao": VERSAO_FORMATO,
+            "assinatura": self.assinatura,
+            "amostras": self.amostras,
+            "log_desconhecido": self.log_desconhecido,
+            "log_prob": self.log_prob,
+        }, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, caminho)
+
+    @classmethod
+    def carregar(cls, caminho: Path = MODELO_PATH) -> Optional["ClassificadorDocumentos"]:
+        try:
+            dados = json.loads(caminho.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if dados.get("versao") != VERSAO_FORMATO:
+            return None
+        return cls(dados["log_prob"], dados["log_desconhecido"], dados.get("assinatura", ""),
+                   dados.get("amostras", {}))
+
+
+def construir_exemplos(fontes: Optional[List[Tuple[Path, str]]] = None) -> List[Tuple[str, str]]:
+    """Lê as fontes de treino (sem duplicatas de conteúdo) e acrescenta os descritores."""
+    reg = obter_registry()
+    exemplos: List[Tuple[str, str]] = []
+    vistos = set()
+    for arq, rotulo in (fontes if fontes is not None else _fontes_treino()):
+        if arq.suffix.lower() == ".yml":
+            texto = "\n".join(_textos_yaml(reg.ler_yaml(arq)))
+        elif arq.suffix.lower() in (".txt", ".md"):
+            texto = reg.ler_texto(arq)
+        else:
+            texto = _extrair_insumo(arq)
+        chave = hashlib.sha256(texto.encode("utf-8")).hexdigest()
+        if not texto.strip() or chave in vistos:
+            continue
+        vistos.add(chave)
+        exemplos.append((texto, rotulo))
+    for classe, frases in DESCRITORES.items():
+        exemplos.append(("\n".join(frases * 3), classe))
+    return exemplos
+
+
+# ======================================================
+# 🌐 Instância única por processo
+# ======================================================
+_CLASSIFICADOR: Optional[ClassificadorDocumentos] = None
+_VERIFICACAO = {"caminho": None, "verificado_em": 0.0}
+_LOCK = threading.Lock()
+
+
+def obter_classificador(caminho: Optional[Path] = None) -> ClassificadorDocumentos:
+    """
+    Classificador do processo: carrega o modelo salvo se as fontes de
+    treino não mudaram; caso contrário treina de novo e salva. As fontes
+    são varridas no máximo uma vez a cada VALIDADE_FONTES_S.
+    """
+    global _CLASSIFICADOR
+    caminho = Path(caminho or MODELO_PATH)
+    with _LOCK:
+        agora = time.monotonic()
+        if (
+            _CLASSIFICADOR is not None
+            and _VERIFICACAO["caminho"] == str(caminho)
+            and agora - _VERIFICACAO["verificado_em"] <= VALIDADE_FONTES_S
+        ):
+            return _CLASSIFICADOR
+        fontes = _fontes_treino()
+        assinatura = _assinatura(fontes)
+        modelo = _CLASSIFICADOR if _VERIFICACAO["caminho"] == str(caminho) else None
+        if modelo is None or modelo.assinatura != assinatura:
+            modelo = ClassificadorDocumentos.carregar(caminho)
+        if modelo is None or modelo.assinatura != assinatura:
+            modelo = ClassificadorDocumentos.treinar(construir_exemplos(fontes), assinatura)
+            try:
+                modelo.salvar(caminho)
+            except OSError as e:
+                print(f"[classificador_documentos] ⚠️ Não foi possível salvar o modelo: {e}")
+        _CLASSIFICADOR = modelo
+        _VERIFICACAO.update(caminho=str(caminho), verificado_em=agora)
+        return modelo
+
+
+def classificar_documento(texto: str) -> Dict[str, Any]:
+    """
+    Retorna {"tipo", "confianca", "probabilidades", "origem", "confiavel"}.
+    origem: "titulo" (cabeçalho) ou "modelo" (Naive Bayes);
+    "confiavel" indica confiança >= CONFIANCA_MINIMA.
+    """
+    resultado = obter_classificador().prever(texto)
+    resultado["origem"] = "modelo"
+    titulo = detectar_titulo(texto)
+    if titulo:
+        resultado["tipo"] = titulo
+        resultado["confianca"] = max(resultado["probabilidades"].get(titulo, 0.0), CONFIANCA_TITULO)
+        resultado["origem"] = "titulo"
+    resultado["confiavel"] = bool(resultado["tipo"]) and resultado["confianca"] >= CONFIANCA_MINIMA
+    return resultado
+
+
+# ======================================================
+# 🧪 Execução direta (treino + avaliação leave-one-out)
+# ======================================================
+if __name__ == "__main__":
+    fontes = _fontes_treino()
+    exemplos = construir_exemplos(fontes)
+    modelo = ClassificadorDocumentos.treinar(exemplos, _assinatura(fontes))
+    modelo.salvar()
+    print(f"[classificador_documentos] ✅ Treinado: {modelo.amostras}")
+
+    # Avalia apenas documentos (checklists e descritores não têm cabeçalho)
+    documentos = construir_exemplos([f for f in fontes if f[0].suffix.lower() != ".yml"])
+    documentos = documentos[:-len(DESCRITORES)]
+    acertos = 0
+    for texto, rotulo in documentos:
+        restantes = [e for e in exemplos if e[0] != texto]
+        previsto = ClassificadorDocumentos.treinar(restantes).prever(texto)
+        previsto["tipo"] = detectar_titulo(texto) or previsto["tipo"]
+        acertos += previsto["tipo"] == rotulo
+        if previsto["tipo"] != rotulo:
+            print(f"  ❌ {rotulo} → {previsto['tipo']}: {texto[:60]!r}")
+    print(f"[classificador_documentos] Leave-one-out: {acertos}/{len(documentos)}")
@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""
+coerencia_processos.py – Matriz de coerência entre processos de contratação
+==============================================================
+O Comparador analisa os quatro artefatos mais recentes; a Governança
+precisa comparar centenas de processos de uma vez (ex.: todo TR do ano
+contra o respectivo Edital). Este módulo:
+
+    1. coleta os snapshots auditados e identifica o processo de cada
+       um (número rotulado "Processo nº ..." no cabeçalho, dele ou de
+       outro snapshot do mesmo carimbo; na falta, o próprio carimbo);
+    2. monta vetores TF-IDF de todos os documentos num espaço de
+       dimensão fixa (feature hashing dos termos de similaridade_textual);
+    3. calcula a matriz N×M de cosseno com NumPy em blocos de linhas e
+       colunas – a memória de trabalho é limitada por BLOCO × DIMENSAO,
+       independente do número de processos;
+    4. devolve os dados prontos para o heatmap do Painel de Governança.
+
+Uso:
+    from utils.coerencia_processos import coerencia_entre_processos
+    resultado = coerencia_entre_processos("TR", "Edital", ano=2025)
+
+Linha de comando:
+    python -m utils.coerencia_processos --linhas TR --colunas Edital --ano 2025
+
+Versão: v2025.1
+==============================================================
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.similaridade_textual import PerfilTexto, amostrar, perfil
+
+# ======================================================
+# ⚙️ Parâmetros
+# ======================================================
+BASE_DIR = Path(__file__).resolve().parents[1]
+SNAPSHOTS_DIR = BASE_DIR / "exports" / "auditoria" / "snapshots"
+ANALISES_DIR = BASE_DIR / "exports" / "analises"
+
+DIMENSAO = 1 << 15       # colunas do espaço TF-IDF (feature hashing)
+BLOCO = 128              # documentos por bloco (linhas e colunas)
+ARTEFATOS = ("DFD", "ETP", "TR", "Edital", "Contrato")
+
+CHARS_CABECALHO = 5000   # trecho inicial em que o número do processo é procurado
+
+_RE_DATA_ARQUIVO = re.compile(r"(20\d{2})(\d{2})(\d{2})")
+# "Processo nº 123/2025", "**Processo Administrativo:** 2025/000123", "processo": "..."
+_RE_PROCESSO_ROTULO = re.compile(
+    r"\bprocesso(?:\s+(?:sei|administrativo|digital))?[\s*_\"']*(?:n[º°o.]*)?[\s*_:\"'\-–]*"
+    r"(?P<num>\d[\d./\-]{3,}\d)",
+    re.IGNORECASE,
+)
+
+
+# ======================================================
+# 📂 Coleta dos snapshots por processo
+# ======================================================
+def numero_processo(texto: str) -> Optional[str]:
+    """Número junto do rótulo "Processo (SEI/administrativo) nº" no cabeçalho, ou None."""
+    m = _RE_PROCESSO_ROTULO.search((texto or "")[:CHARS_CABECALHO])
+    return m.group("num").strip(".-/") if m else None
+
+
+def identificar_processo(texto: str, nome_arquivo: str, textos_do_grupo: Iterable[str] = ()) -> str:
+    """
+    Número do processo rotulado no texto; senão, o de outro documento do
+    mesmo grupo (snapshots do mesmo carimbo, registro de versão); senão,
+    o carimbo do grupo. Números soltos (ex.: processo judicial citado no
+    corpo) não identificam o processo.
+    """
+    numero = numero_processo(texto)
+    if numero:
+        return numero
+    for outro in textos_do_grupo:
+        numero = numero_processo(outro)
+        if numero:
+            return numero
+    stem = Path(nome_arquivo).stem
+    return stem.split("_", 1)[1] if "_" in stem else stem
+
+
+def textos_do_carimbo(caminho: Path) -> Iterator[str]:
+    """Textos dos demais snapshots gravados com o mesmo carimbo (mesmo processo)."""
+    caminho = Path(caminho)
+    if "_" not in caminho.stem:
+        return
+    carimbo = caminho.stem.split("_", 1)[1]
+    for irmao in sorted(caminho.parent.glob(f"*_{carimbo}{caminho.suffix}")):
+        if irmao != caminho:
+            try:
+                yield irmao.read_text(encoding="utf-8", errors="ignore")
+            except OSError:
+                continue
+
+
+def coletar_documentos(
+    artefatos: Sequence[str] = ARTEFATOS,
+    ano: Optional[int] = None,
+    pasta: Path = SNAPSHOTS_DIR,
+) -> List[Dict[str, Any]]:
+    """
+    Snapshot mais recente de cada (processo, artefato) em `pasta`.
+    Retorna [{"processo", "artefato", "arquivo", "data", "texto"}].
+    """
+    escolhidos: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for caminho in sorted(Path(pasta).glob("*.md")):
+        artefato = caminho.stem.split("_", 1)[0]
+        if artefato not in artefatos:
+            continue
+        m = _RE_DATA_ARQUIVO.search(caminho.stem)
+        data = f"{m.group(1)}-{m.group(2)}-{m.group(3)}" if m else ""
+        if ano and not data.startswith(str(ano)):
+            continue
+        texto = caminho.read_text(encoding="utf-8", errors="ignore")
+        doc = {
+            "processo": identificar_processo(texto, caminho.name, textos_do_carimbo(caminho)),
+            "artefato": artefato,
+            "arquivo": caminho.name,
+            "data": data,
+            "texto": texto,
+        }
+        chave = (doc["processo"], artefato)
+        if chave not in escolhidos or caminho.name > escolhidos[chave]["arquivo"]:
+            escolhidos[chave] = doc
+    return sorted(escolhidos.values(), key=lambda d: (d["processo"], d["artefato"]))
+
+
+# ======================================================
+# 📐 TF-IDF em dimensão fixa
+# ======================================================
+def _idf(perfis: Sequence[PerfilTexto]) -> np.ndarray:
+    df = np.zeros(DIMENSAO, dtype=np.float64)
+    for p in perfis:
+        df[np.unique(p.ids % DIMENSAO)] += 1
+    return (np.log((1 + len(perfis)) / (1 + df)) + 1.0).astype(np.float32)
+
+
+def _bloco_tfidf(perfis: Sequence[PerfilTexto], idf: np.ndarray) -> np.ndarray:
+    matriz = np.zeros((len(perfis), DIMENSAO), dtype=np.float32)
+    for i, p in enumerate(perfis):
+        if p.ids.size:
+            np.add.at(matriz[i], p.ids % DIMENSAO, 1.0 + np.log(p.frequencias))
+    matriz *= idf
+    normas = np.linalg.norm(matriz, axis=1, keepdims=True)
+    return matriz / np.where(normas == 0, 1.0, normas)
+
+
+def _blocos(perfis: Sequence[PerfilTexto], idf: np.ndarray, bloco: int) -> Iterator[Tuple[int, np.ndarray]]:
+    for ini in range(0, len(perfis), bloco):
+        yield ini, _bloco_tfidf(perfis[ini:ini + bloco], idf)
+
+
+def matriz_coerencia(
+    linhas: Sequence[str],
+    colunas: Optional[Sequence[str]] = None,
+    bloco: int = BLOCO,
+) -> np.ndarray:
+    """
+    Matriz len(linhas) × len(colunas) de cosseno TF-IDF (0–1, float32).
+    IDF calculado sobre todos os documentos; sem `colunas`, compara as
+    linhas entre si. Só dois blocos de BLOCO × DIMENSAO ficam em memória.
+    """
+    perfis_l = [perfil(amostrar(t or "")) for t in linhas]
+    perfis_c = perfis_l if colunas is None else [perfil(amostrar(t or "")) for t in colunas]
+    idf = _idf(perfis_l if colunas is None else list(perfis_l) + list(perfis_c))
+
+    saida = np.zeros((len(perfis_l), len(perfis_c)), dtype=np.float32)
+    for i, a in _blocos(perfis_l, idf, bloco):
+        for j, b in _blocos(perfis_c, idf, bloco):
+            saida[i:i + a.shape[0], j:j + b.shape[0]] = a @ b.T
+    return np.clip(saida, 0.0, 1.0)
+
+
+# ======================================================
+# 🧭 Lote: artefato × artefato entre processos
+# ======================================================
+def coerencia_entre_processos(
+    artefato_linhas: str = "TR",
+    artefato_colunas: str = "Edital",
+    ano: Optional[int] = None,
+    documentos: Optional[List[Dict[str, Any]]] = None,
+    bloco: int = BLOCO,
+) -> Dict[str, Any]:
+    """
+    Compara o `artefato_linhas` de cada processo com o `artefato_colunas`
+    de todos os processos. A diagonal (mesmo processo) é a coerência do
+    próprio processo; fora dela, valores altos indicam textos reaproveitados
+    entre processos distintos.
+    """
+    if documentos is None:
+        documentos = coletar_documentos((artefato_linhas, artefato_colunas), ano=ano)
+    linhas = [d for d in documentos if d["artefato"] == artefato_linhas]
+    colunas = [d for d in documentos if d["artefato"] == artefato_colunas]
+    matriz = matriz_coerencia([d["texto"] for d in linhas], [d["texto"] for d in colunas], bloco=bloco)
+
+    indice_colunas = {d["processo"]: j for j, d in enumerate(colunas)}
+    proprios = []
+    for i, d in enumerate(linhas):
+        j = indice_colunas.get(d["processo"])
+        if j is not None:
+            proprios.append({"processo": d["processo"], "coerencia": round(float(matriz[i, j]) * 100, 2)})
+    proprios.sort(key=lambda p: p["coerencia"])
+
+    return {
+        "gerado_em": datetime.now().isoformat(timespec="seconds"),
+        "linhas": artefato_linhas,
+        "colunas": artefato_colunas,
+        "ano": ano,
+        "processos_linhas": [d["processo"] for d in linhas],
+        "processos_colunas": [d["processo"] for d in colunas],
+        "matriz": matriz,
+        "mesmo_processo": proprios,
+        "coerencia_media": round(float(np.mean([p["coerencia"] for p in proprios])), 2) if proprios else None,
+    }
+
+
+def dados_heatmap(resultado: Dict[str, Any], casas: int = 1) -> Dict[str, Any]:
+    """Formato serializável para px.imshow / plotly heatmap (valores 0–100)."""
+    return {
+        "titulo": f"Coerência {resultado['linhas']} × {resultado['colunas']}"
+                  + (f" ({resultado['ano']})" if resultado.get("ano") else ""),
+        "x": resultado["processos_colunas"],
+        "y": resultado["processos_linhas"],
+        "z": np.round(resultado["matriz"] * 100, casas).tolist(),
+        "mesmo_processo": resultado["mesmo_processo"],
+        "coerencia_media": resultado["coerencia_media"],
+        "gerado_em": resultado["gerado_em"],
+    }
+
+
+def exportar_heatmap(resultado: Dict[str, Any], destino: Path = ANALISES_DIR) -> Path:
+    destino.mkdir(parents=True, exist_ok=True)
+    caminho = destino / (
+        f"coerencia_processos_{resultado['linhas']}_{resultado['colunas']}_{datetime.now():%Y%m%d_%H%M%S}.json"
+    )
+    caminho.write_text(json.dumps(dados_heatmap(resultado), ensure_ascii=False), encoding="utf-8")
+    return caminho
+
+
+def ultimo_heatmap(destino: Path = ANALISES_DIR) -> Optional[Dict[str, Any]]:
+    arquivos = sorted(Path(destino).glob("coerencia_processos_*.json"))
+    if not arquivos:
+        return None
+    return json.loads(arquivos[-1].read_text(encoding="utf-8"))
+
+
+# ======================================================
+# 🚀 Linha de comando
+# ======================================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Matriz de coerência entre processos")
+    parser.add_argument("--linhas", default="TR")
+    parser.add_argument("--colunas", default="Edital")
+    parser.add_argument("--ano", type=int, default=None)
+    args = parser.parse_args()
+
+    resultado = coerencia_entre_processos(args.linhas, args.colunas, ano=args.ano)
+    caminho = exportar_heatmap(resultado)
+    print(f"🧭 {len(resultado['processos_linhas'])} × {len(resultado['processos_colunas'])} processos")
+    print(f"💾 Heatmap: {caminho}")
@@ -8,10 +8,70 @@
 from __future__ import annotations
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
+import hashlib
 import json
 import re
-from difflib import SequenceMatcher
+import unicodedata
+
+from utils.extracao_br import extrair
+from utils.similaridade_textual import alinhar_secoes, semelhanca_shingles
+
+# Versão da fórmula de similaridade (invalida o cache de pares)
+COERENCIA_VERSAO = "v3"
+CACHE_PARES_PATH = Path(__file__).resolve().parents[1] / "exports" / "cache" / "coerencia_pares.json"
+
+PARES_COERENCIA = [("DFD", "ETP"), ("ETP", "TR"), ("TR", "Edital")]
+MIN_SECOES_ALINHADAS = 2
+
+# Seções equivalentes entre os artefatos, com os nomes de campo que cada
+# agente produz (document_agent, etp_agent, tr_agent, edital_agent).
+SECOES_EQUIVALENTES: Dict[str, Dict[str, List[str]]] = {
+    "objeto": {
+        "DFD": ["objeto", "Escopo Inicial da Demanda", "Objetivos da Contratação"],
+        "ETP": ["objeto", "descricao_solucao"],
+        "TR": ["objeto"],
+        "Edital": ["objeto"],
+    },
+    "justificativa": {
+        "DFD": ["justificativa", "descricao_necessidade", "motivacao", "Fundamentação da Necessidade"],
+        "ETP": ["justificativa_contratacao", "descricao_necessidade"],
+        "TR": ["justificativa_tecnica"],
+        "Edital": ["justificativa"],
+    },
+    "requisitos": {
+        "DFD": ["Requisitos Mínimos"],
+        "ETP": ["requisitos_contratacao"],
+        "TR": ["especificacao_tecnica"],
+        "Edital": ["exigencias_habilitacao"],
+    },
+    "prazos": {
+        "DFD": ["prazo_estimado"],
+        "ETP": ["prazo_estimado", "estimativa_prazo_vigencia"],
+        "TR": ["prazo_execucao"],
+        "Edital": ["prazo_execucao"],
+    },
+    "valor": {
+        "DFD": ["valor_estimado"],
+        "ETP": ["valor_estimado", "estimativa_valor", "estimativa"],
+        "TR": ["estimativa_valor"],
+        "Edital": ["valor_estimado"],
+    },
+    "riscos": {
+        "DFD": ["Riscos da Não Contratação"],
+        "ETP": ["plano_riscos"],
+        "TR": ["riscos"],
+    },
+    "julgamento": {
+        "ETP": ["modalidade_licitacao"],
+        "TR": ["criterios_julgamento"],
+        "Edital": ["criterio_julgamento", "tipo_licitacao"],
+    },
+    "recursos": {
+        "TR": ["fonte_recurso"],
+        "Edital": ["fontes_recursos"],
+    },
+}
 
 # ==========================================================
 # 🧠 Funções utilitárias
@@ -42,9 +102,10 @@ def _load_latest_snapshot(artefato: str) -> str | None:
         return f.read()
 
 def _clean_text(text: str) -> str:
-    """Limpa formatação, títulos e espaçamento."""
-    text = re.sub(r"[*#>\-]+", " ", text)
-    text = re.sub(r"\s+", " ", text)
+    """Limpa formatação e espaçamento, preservando as quebras de linha (seções)."""
+    text = re.sub(r"[*>\-]+", " ", text)
+    text = re.sub(r"[ \t]+", " ", text)
+    text = re.sub(r"\n\s*\n+", "\n\n", text)
     return text.strip()
 
 def _extract_keywords(text: str) -> set:
@@ -71,36 +132,167 @@ def _extract_keywords(text: str) -> set:
     
     return keywords
 
-def _similarity(a: str, b: str) -> float:
+def _metricas(a: str, b: str) -> Dict[str, Any]:
     """
-    Calcula similaridade (0–100) entre duas strings usando:
-    1. Sobreposição de palavras-chave (85% do peso) - conceitos e termos técnicos
-    2. Similaridade de sequência SequenceMatcher (15% do peso) - estrutura textual
+    Métricas de similaridade entre dois artefatos (0–100):
+    1. palavras_chave: Jaccard das palavras-chave (conceitos e termos técnicos)
+    2. trechos: Jaccard estimada (MinHash) de shingles de 3 termos
+    3. secoes: cosseno TF-IDF das seções alinhadas (estrutura)
+    Todas lineares no tamanho do texto (utils.similaridade_textual).
     """
-    if not a or not b:
-        return 0.0
-    
-    # 1. Análise baseada em palavras-chave (mais inteligente)
     keywords_a = _extract_keywords(a)
     keywords_b = _extract_keywords(b)
-    
-    if not keywords_a or not keywords_b:
-        # Fallback para SequenceMatcher se não houver keywords
-        return round(SequenceMatcher(None, a.lower(), b.lower()).ratio() * 100, 2)
-    
-    # Calcular Jaccard similarity (interseção / união)
-    intersecao = keywords_a & keywords_b
     uniao = keywords_a | keywords_b
-    jaccard_sim = (len(intersecao) / len(uniao)) * 100 if uniao else 0
-    
-    # 2. SequenceMatcher como complemento (detecta ordem e estrutura)
-    sequence_sim = SequenceMatcher(None, a.lower(), b.lower()).ratio() * 100
-    
-    # Combinar métricas: 85% keywords (conceitos), 15% sequence (estrutura)
+    alinhamento = alinhar_secoes(a, b)
+    return {
+        "palavras_chave": round(len(keywords_a & keywords_b) / len(uniao) * 100, 2) if uniao else 0.0,
+        "trechos": round(semelhanca_shingles(a, b) * 100, 2),
+        "secoes": round(alinhamento["score"] * 100, 2),
+        "alinhamento": alinhamento["alinhamento"],
+    }
+
+
+def _similarity(a: str, b: str, metricas: Dict[str, Any] | None = None) -> float:
+    """
+    Calcula similaridade (0–100) entre dois textos:
+    1. Sobreposição de palavras-chave (85% do peso) - conceitos e termos técnicos
+    2. Estrutura (15% do peso) - média de trechos em comum (MinHash) e
+       seções alinhadas (TF-IDF), no lugar do antigo SequenceMatcher
+    """
+    if not a or not b:
+        return 0.0
+    m = metricas or _metricas(a, b)
+    estrutura = (m["trechos"] + m["secoes"]) / 2
+
+    if not _extract_keywords(a) or not _extract_keywords(b):
+        return round(estrutura, 2)
+
     # Prioriza concordância conceitual sobre ordem exata das palavras
-    similaridade_final = (jaccard_sim * 0.85) + (sequence_sim * 0.15)
-    
-    return round(similaridade_final, 2)
+    return round(m["palavras_chave"] * 0.85 + estrutura * 0.15, 2)
+
+
+# ==========================================================
+# 🧩 Seções equivalentes (campos dos agentes)
+# ==========================================================
+
+def _chave_campo(nome: str) -> str:
+    nome = unicodedata.normalize("NFKD", str(nome).lower())
+    nome = "".join(c for c in nome if not unicodedata.combining(c))
+    return re.sub(r"[^a-z0-9]+", "_", nome).strip("_")
+
+
+def _achatar_campos(campos: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Campos de texto do artefato, com a chave normalizada. Aceita os
+    formatos gravados pelos agentes: {"ETP": {...}}, {"campos_ai": {...}},
+    {"resultado_ia": {...}} e o sub-dicionário "secoes".
+    """
+    planos: Dict[str, str] = {}
+    pendentes = [campos]
+    while pendentes:
+        atual = pendentes.pop()
+        for chave, valor in atual.items():
+            if isinstance(valor, dict):
+                pendentes.append(valor)
+            elif isinstance(valor, str) and valor.strip():
+                planos.setdefault(_chave_campo(chave), valor.strip())
+    return planos
+
+
+def extrair_secoes_campos(artefato: str, campos: Dict[str, Any]) -> Dict[str, str]:
+    """Texto de cada seção equivalente presente nos campos do artefato."""
+    planos = _achatar_campos(campos or {})
+    secoes = {}
+    for secao, por_artefato in SECOES_EQUIVALENTES.items():
+        partes = [planos[_chave_campo(n)] for n in por_artefato.get(artefato, []) if _chave_campo(n) in planos]
+        if partes:
+            secoes[secao] = "\n\n".join(dict.fromkeys(partes))
+    return secoes
+
+
+def carregar_campos() -> Dict[str, Dict[str, Any]]:
+    """Campos gravados pelos agentes em exports/<artefato>_data.json."""
+    campos = {}
+    for art in ("DFD", "ETP", "TR", "Edital"):
+        caminho = _root() / "exports" / f"{art.lower()}_data.json"
+        try:
+            dados = json.loads(caminho.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        if isinstance(dados, dict) and dados:
+            campos[art] = dados
+    return campos
+
+
+# ==========================================================
+# ♻️ Cache de pares (só recalcula o que mudou)
+# ==========================================================
+
+def _assinatura(*textos: str) -> str:
+    h = hashlib.sha256(COERENCIA_VERSAO.encode("utf-8"))
+    for t in textos:
+        h.update(b"\0" + t.encode("utf-8"))
+    return h.hexdigest()
+
+
+def _ler_cache_pares() -> Dict[str, Any]:
+    try:
+        return json.loads(CACHE_PARES_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _gravar_cache_pares(cache: Dict[str, Any]) -> None:
+    try:
+        CACHE_PARES_PATH.parent.mkdir(parents=True, exist_ok=True)
+        CACHE_PARES_PATH.write_text(json.dumps(cache, ensure_ascii=False), encoding="utf-8")
+    except OSError:
+        pass
+
+
+_RE_NUMERO = re.compile(r"\d+(?:[.,]\d+)*")
+_TIPOS_QUANTIDADE = ("valor", "prazo", "percentual", "data")
+
+
+def _quantidades(texto: str) -> set:
+    """
+    Valores, prazos (em dias), percentuais e datas normalizados: "3 meses"
+    concorda com "90 dias" e "R$ 1.000,00" com "R$ 1000". Sem nenhum
+    deles, os números como aparecem no texto.
+    """
+    achados = {
+        (tipo, e.valor["dias"] if tipo == "prazo" else e.valor)
+        for tipo, itens in extrair(texto, _TIPOS_QUANTIDADE).items() for e in itens
+    }
+    return achados or set(_RE_NUMERO.findall(texto))
+
+
+def _similaridade_secao(t1: str, t2: str, metricas: Dict[str, Any]) -> float:
+    """
+    Similaridade de uma seção alinhada. Prazos e valores são curtos e as
+    palavras-chave ignoram números ("45 dias" × "90 dias"): quando as duas
+    seções citam quantidades, a similaridade é ponderada pela concordância
+    delas (normalizadas por _quantidades).
+    """
+    sim = _similarity(t1, t2, metricas)
+    n1, n2 = _quantidades(t1), _quantidades(t2)
+    if n1 and n2:
+        metricas["numeros"] = round(len(n1 & n2) / len(n1 | n2) * 100, 2)
+        sim = round(sim * metricas["numeros"] / 100, 2)
+    return sim
+
+
+def _comparar_com_cache(chave: str, t1: str, t2: str, cache: Dict[str, Any],
+                        recalculados: List[str], secao: bool = False) -> Tuple[float, Dict[str, Any]]:
+    assinatura = _assinatura(t1, t2)
+    anterior = cache.get(chave)
+    if anterior and anterior.get("assinatura") == assinatura:
+        return anterior["similaridade"], anterior["metricas"]
+    metricas = _metricas(t1, t2)
+    sim = _similaridade_secao(t1, t2, metricas) if secao else _similarity(t1, t2, metricas)
+    cache[chave] = {"assinatura": assinatura, "similaridade": sim, "metricas": metricas}
+    recalculados.append(chave)
+    return sim, metricas
 
 
 # ==========================================================
@@ -120,9 +312,24 @@ def carregar_snapshots(recente: bool = True) -> Dict[str, str]:
     return dados
 
 
-def analisar_coerencia(artefatos: Dict[str, str]) -> Dict[str, Any]:
+def analisar_coerencia(
+    artefatos: Dict[str, str],
+    campos: Optional[Dict[str, Dict[str, Any]]] = None,
+    incremental: bool = True,
+) -> Dict[str, Any]:
     """
     Compara os artefatos carregados e gera métricas de coerência textual.
+
+    Com `campos` (dicionários gravados pelos agentes, ver carregar_campos),
+    cada par é comparado seção a seção – objeto ↔ objeto, justificativa ↔
+    fundamentação, prazos ↔ prazo_execucao... (SECOES_EQUIVALENTES) – e o
+    score do par é a média das seções, de modo que um anexo longo não
+    domina o resultado. Pares com menos de MIN_SECOES_ALINHADAS seções em
+    comum usam o texto inteiro (quando houver).
+
+    Com `incremental`, o resultado de cada par/seção fica em cache
+    (exports/cache/coerencia_pares.json) e só o que mudou desde a última
+    execução é recalculado.
     
     VALORES ESPERADOS DE COERÊNCIA:
     - 60-100%: Excelente coerência (vocabulário muito similar)
@@ -134,41 +341,66 @@ def analisar_coerencia(artefatos: Dict[str, str]) -> Dict[str, Any]:
     coerência moderada (35-45%) pois cada um tem propósito específico e 
     nível de detalhamento distinto, mesmo tratando do mesmo objeto.
     """
-    resultados = {"coerencia_global": 0, "comparacoes": {}, "divergencias": [], "ausencias": []}
+    resultados = {
+        "coerencia_global": 0, "comparacoes": {}, "metricas": {}, "secoes": {},
+        "divergencias": [], "ausencias": [], "recalculados": [],
+    }
 
-    pares = [("DFD", "ETP"), ("ETP", "TR"), ("TR", "Edital")]
+    campos = campos or {}
+    secoes_por_artefato = {art: extrair_secoes_campos(art, c) for art, c in campos.items()}
+    cache = _ler_cache_pares() if incremental else {}
     total_sim = 0
     total_pairs = 0
 
-    for a1, a2 in pares:
-        t1, t2 = artefatos.get(a1), artefatos.get(a2)
-        if not t1 or not t2:
-            resultados["ausencias"].append({
-                "campo": f"{a1}-{a2}",
-                "descricao": f"Não há conteúdo disponível para {a1} ou {a2}."
-            })
-            continue
+    for a1, a2 in PARES_COERENCIA:
+        par = f"{a1}-{a2}"
+        s1, s2 = secoes_por_artefato.get(a1, {}), secoes_por_artefato.get(a2, {})
+        comuns = [sec for sec in SECOES_EQUIVALENTES if sec in s1 and sec in s2]
+        pior = None
+
+        if len(comuns) >= MIN_SECOES_ALINHADAS or (comuns and not (artefatos.get(a1) and artefatos.get(a2))):
+            por_secao = {}
+            for sec in comuns:
+                por_secao[sec], _ = _comparar_com_cache(
+                    f"{par}:{sec}", s1[sec], s2[sec], cache, resultados["recalculados"], secao=True
+                )
+            sim = round(sum(por_secao.values()) / len(por_secao), 2)
+            resultados["secoes"][par] = por_secao
+            pior = min(por_secao, key=por_secao.get)
+        else:
+            t1, t2 = artefatos.get(a1), artefatos.get(a2)
+            if not t1 or not t2:
+                resultados["ausencias"].append({
+                    "campo": par,
+                    "descricao": f"Não há conteúdo disponível para {a1} ou {a2}."
+                })
+                continue
+            sim, resultados["metricas"][par] = _comparar_com_cache(
+                par, t1, t2, cache, resultados["recalculados"]
+            )
 
-        sim = _similarity(t1, t2)
-        resultados["comparacoes"][f"{a1}-{a2}"] = sim
+        resultados["comparacoes"][par] = sim
         total_sim += sim
         total_pairs += 1
 
         # Regras de alerta ajustadas para valores realistas
         # Documentos progressivos (DFD→ETP→TR→Edital) naturalmente têm 30-45% de coerência
+        detalhe = f" Seção mais divergente: {pior} ({resultados['secoes'][par][pior]}%)." if pior else ""
         if sim < 25:
             resultados["divergencias"].append({
-                "campo": f"{a1}-{a2}",
-                "descricao": f"🔴 Coerência muito baixa entre {a1} e {a2} ({sim}%). Recomenda-se revisar urgentemente o alinhamento de informações, objeto e justificativa."
+                "campo": par,
+                "descricao": f"🔴 Coerência muito baixa entre {a1} e {a2} ({sim}%). Recomenda-se revisar urgentemente o alinhamento de informações, objeto e justificativa.{detalhe}"
             })
         elif 25 <= sim < 35:
             resultados["divergencias"].append({
-                "campo": f"{a1}-{a2}",
-                "descricao": f"🟡 Coerência baixa entre {a1} e {a2} ({sim}%). Verificar se objeto, justificativa e especificações estão alinhados entre os documentos."
+                "campo": par,
+                "descricao": f"🟡 Coerência baixa entre {a1} e {a2} ({sim}%). Verificar se objeto, justificativa e especificações estão alinhados entre os documentos.{detalhe}"
             })
 
     if total_pairs > 0:
         resultados["coerencia_global"] = round(total_sim / total_pairs, 2)
+    if incremental and resultados["recalculados"]:
+        _gravar_cache_pares(cache)
 
     return resultados
 
@@ -201,6 +433,14 @@ def gerar_relatorio(resultados: Dict[str, Any]) -> Dict[str, str]:
     ]
     for k, v in resultados.get("comparacoes", {}).items():
         md.append(f"- **{k}** → Similaridade: `{v}%`")
+        for secao, valor in resultados.get("secoes", {}).get(k, {}).items():
+            md.append(f"  - {secao}: `{valor}%`")
+        m = resultados.get("metricas", {}).get(k)
+        if m:
+            md.append(
+                f"  - palavras-chave `{m['palavras_chave']}%` · trechos em comum `{m['trechos']}%`"
+                f" · seções alinhadas `{m['secoes']}%`"
+            )
 
     if resultados.get("divergencias"):
         md.append("\n## ⚠️ Divergências")
@@ -232,6 +472,6 @@ if __name__ == "__main__":
         print("⚠️ Nenhum snapshot encontrado em exports/auditoria/snapshots/")
     else:
         print("🧩 Artefatos carregados:", list(dados.keys()))
-        resultado = analisar_coerencia(dados)
+        resultado = analisar_coerencia(dados, campos=carregar_campos())
         saida = gerar_relatorio(resultado)
         print(f"✅ Relatório salvo em: {saida['md_path']}")
@@ -0,0 +1,401 @@
+# -*- coding: utf-8 -*-
+"""
+demandas_similares.py – Demandas semelhantes em DFDs históricos (MinHash-LSH)
+==============================================================
+Unidades diferentes costumam enviar demandas quase idênticas. Este
+módulo mantém um índice MinHash-LSH dos textos de demanda (objeto +
+descricao_necessidade) de todos os DFDs já processados e, para um DFD
+novo, devolve as demandas passadas parecidas – oportunidades de
+consolidação antes de iniciar o ETP.
+
+    - assinatura: similaridade_textual.assinatura_minhash sobre
+      shingles de 2 termos (PERMUTACOES posições);
+    - LSH: a assinatura é cortada em BANDAS bandas de LINHAS posições;
+      cada banda vira uma chave de balde. Dois textos viram candidatos
+      se coincidirem em pelo menos uma banda – probabilidade
+      1 − (1 − J^LINHAS)^BANDAS, ~50% em J ≈ 0,42 e > 99% em J ≥ 0,7;
+    - consulta: BANDAS buscas no índice (SQLite, chave (banda, balde)),
+      sem varrer os arquivos passados; os candidatos são ordenados pela
+      Jaccard estimada das assinaturas completas.
+
+Fontes: exports/insumos/json/DFD_*.json (insumos e DFDs salvos) e os
+DFDs da base de campos (utils.base_campos). Textos idênticos entram uma
+vez só (chave = hash do texto normalizado), com a lista de fontes.
+atualizar() só relê arquivos novos ou alterados. Na consulta, só as
+fontes do próprio DFD em edição são descartadas (excluir_fontes): um
+texto idêntico vindo de outra unidade continua no resultado.
+
+Uso:
+    from utils.demandas_similares import fontes_dfd_atual, obter_indice, texto_demanda
+    indice = obter_indice()
+    indice.atualizar()
+    indice.similares(texto_demanda(campos_dfd), excluir_fontes=fontes_dfd_atual())
+
+Versão: v2025.1
+==============================================================
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from utils.base_campos import EXPORTS_DIR, obter_base
+from utils.kb_resumos import termos
+from utils.similaridade_textual import assinatura_minhash
+
+# ======================================================
+# ⚙️ Parâmetros
+# ======================================================
+BASE_DIR = Path(__file__).resolve().parents[1]
+INSUMOS_DIR = BASE_DIR / "exports" / "insumos" / "json"
+INDICE_PATH = BASE_DIR / "exports" / "cache" / "demandas_lsh.sqlite3"
+
+PERMUTACOES = 128
+BANDAS = 32
+LINHAS = PERMUTACOES // BANDAS
+TAMANHO_SHINGLE = 2           # demandas são curtas: pares de termos
+MIN_TERMOS = 3                # textos mais curtos não são indexados
+LIMIAR = 0.5                  # Jaccard estimada mínima no resultado
+MAX_TRECHO = 300
+CAMPOS_DEMANDA = ("objeto", "descricao_necessidade")
+ATUALIZACAO_INDICE_S = 300    # intervalo mínimo entre atualizações pela interface
+VERSAO_ESQUEMA = f"2:{PERMUTACOES}:{BANDAS}:{TAMANHO_SHINGLE}"
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS meta (chave TEXT PRIMARY KEY, valor TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS demandas (
+    id         TEXT PRIMARY KEY,
+    data       TEXT NOT NULL,
+    trecho     TEXT NOT NULL,
+    fontes     TEXT NOT NULL,
+    assinatura BLOB NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS baldes (
+    banda INTEGER NOT NULL,
+    chave INTEGER NOT NULL,
+    id    TEXT NOT NULL,
+    PRIMARY KEY (banda, chave, id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS fontes (caminho TEXT PRIMARY KEY, marca TEXT NOT NULL);
+"""
+
+_MISTURA = np.uint64(0x9E3779B97F4A7C15)
+
+
+# ======================================================
+# 🧾 Texto da demanda
+# ======================================================
+def texto_demanda(campos: Dict[str, Any]) -> str:
+    """objeto + descricao_necessidade do DFD (os que estiverem preenchidos)."""
+    if not isinstance(campos, dict):
+        return ""
+    if isinstance(campos.get("DFD"), dict):
+        campos = campos["DFD"]
+    partes = [campos.get(c) for c in CAMPOS_DEMANDA]
+    return "\n".join(p.strip() for p in partes if isinstance(p, str) and p.strip())
+
+
+def _id_texto(texto: str) -> str:
+    normalizado = " ".join(termos(texto))
+    return hashlib.sha256(normalizado.encode("utf-8")).hexdigest()[:20]
+
+
+def chaves_bandas(assinatura: np.ndarray) -> np.ndarray:
+    """Uma chave (int64) por banda de LINHAS posições da assinatura."""
+    bandas = assinatura[:BANDAS * LINHAS].reshape(BANDAS, LINHAS)
+    chave = bandas[:, 0].copy()
+    with np.errstate(over="ignore"):
+        for j in range(1, LINHAS):
+            chave = (chave ^ (chave >> np.uint64(29))) * _MISTURA + bandas[:, j]
+    return chave.view(np.int64)
+
+
+def jaccard_assinaturas(a: np.ndarray, b: np.ndarray) -> float:
+    """Fração de posições iguais (estimativa da Jaccard dos shingles)."""
+    return float(np.count_nonzero(a == b) / a.size) if a.size and a.size == b.size else 0.0
+
+
+@dataclass(frozen=True)
+class Demanda:
+    id: str
+    data: str
+    trecho: str
+    fonte: str
+    assinatura: np.ndarray
+
+
+def preparar(texto: str, fonte: str = "", data: str = "") -> Optional[Demanda]:
+    """Demanda pronta para indexar (None se o texto for curto demais)."""
+    if len(termos(texto or "")) < MIN_TERMOS:
+        return None
+    assinatura = assinatura_minhash(texto, PERMUTACOES, TAMANHO_SHINGLE)
+    trecho = " ".join(texto.split())[:MAX_TRECHO]
+    return Demanda(_id_texto(texto), data, trecho, fonte, assinatura)
+
+
+# ======================================================
+# 📂 Fontes
+# ======================================================
+def _campos_insumo(dados: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Mesmos formatos lidos por integration_dfd (formulário, IA, insumo bruto)
+    e pela base de campos (registros de versão e exports, campos na raiz).
+    """
+    for chave in ("campos_ai", "resultado_ia", "campos", "CAMPOS"):
+        if isinstance(dados.get(chave), dict):
+            return dados[chave]
+    texto = dados.get("conteudo_textual")
+    return {"descricao_necessidade": texto} if isinstance(texto, str) else dados
+
+
+def _do_insumo(caminho: Path) -> List[Demanda]:
+    try:
+        dados = json.loads(caminho.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return []
+    if not isinstance(dados, dict) or (dados.get("artefato") or "DFD").upper() != "DFD":
+        return []
+    data = str(dados.get("data_salvamento") or dados.get("data_processamento") or "")
+    demanda = preparar(texto_demanda(_campos_insumo(dados)), str(caminho), data)
+    return [demanda] if demanda else []
+
+
+def fontes_dfd_atual(insumos_dir: Path = INSUMOS_DIR, exports_dir: Path = EXPORTS_DIR) -> List[str]:
+    """
+    Fontes indexadas que são o próprio DFD em edição: a cópia com carimbo
+    gravada junto com DFD_ultimo.json (salvar_dfd_em_json grava as duas com
+    o mesmo conteúdo) e o export atual (exports/dfd_data.json).
+    """
+    fontes = [str(p) for p in exports_dir.glob("*_data.json") if p.stem.rsplit("_", 1)[0].upper() == "DFD"]
+    ultimo = insumos_dir / "DFD_ultimo.json"
+    try:
+        conteudo = ultimo.read_bytes()
+    except OSError:
+        return fontes
+    for caminho in insumos_dir.glob("DFD_*.json"):
+        try:
+            if caminho != ultimo and caminho.stat().st_size == len(conteudo) and caminho.read_bytes() == conteudo:
+                fontes.append(str(caminho))
+        except OSError:
+            continue
+    return fontes
+
+
+def _texto_documento(doc: Dict[str, Any]) -> str:
+    """
+    Texto da demanda de um DFD da base de campos. A base guarda só o
+    objeto; objeto + descricao_necessidade são relidos da fonte JSON para
+    que o DFD indexado e o consultado gerem o mesmo texto. Snapshots em
+    texto ficam com o objeto.
+    """
+    fonte = Path(doc["fonte"] or "")
+    if fonte.suffix == ".json":
+        try:
+            dados = json.loads(fonte.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            dados = None
+        if isinstance(dados, dict):
+            texto = texto_demanda(_campos_insumo(dados))
+            if texto:
+                return texto
+    return doc["objeto"] or ""
+
+
+def _da_base_campos(desde: str = "") -> List[Demanda]:
+    base = obter_base()
+    base.atualizar()
+    documentos = base.documentos(artefato="DFD", desde=desde or None)
+    demandas = (preparar(_texto_documento(d), d["fonte"], d["data"]) for d in documentos)
+    return [d for d in demandas if d]
+
+
+# ======================================================
+# 🗄️ Índice LSH
+# ======================================================
+class IndiceDemandas:
+    """Índice MinHash-LSH persistido em SQLite (baldes indexados por banda)."""
+
+    def __init__(self, caminho: Path = INDICE_PATH):
+        self.caminho = Path(caminho)
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._con = sqlite3.connect(str(self.caminho), check_same_thread=False)
+        self._con.execute("PRAGMA journal_mode=WAL")
+        self._con.execute("PRAGMA synchronous=NORMAL")
+        versao = None
+        try:
+            versao = self._con.execute("SELECT valor FROM meta WHERE chave = 'esquema'").fetchone()
+        except sqlite3.DatabaseError:
+            pass
+        if not versao or versao[0] != VERSAO_ESQUEMA:
+            self._recriar()
+
+    def _recriar(self) -> None:
+        with self._con:
+            for tabela in ("meta", "demandas", "baldes", "fontes"):
+                self._con.execute(f"DROP TABLE IF EXISTS {tabela}")
+            self._con.executescript(_ESQUEMA)
+            self._con.execute("INSERT INTO meta VALUES ('esquema', ?)", (VERSAO_ESQUEMA,))
+
+    def fechar(self) -> None:
+        with self._lock:
+            self._con.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._con.execute("SELECT COUNT(*) FROM demandas").fetchone()[0]
+
+    # ---------------- Escrita ----------------
+    def _gravar(self, demanda: Demanda) -> bool:
+        linha = self._con.execute("SELECT fontes FROM demandas WHERE id = ?", (demanda.id,)).fetchone()
+        if linha:
+            fontes = json.loads(linha[0])
+            if not demanda.fonte or demanda.fonte in fontes:
+                return False
+            self._con.execute(
+                "UPDATE demandas SET fontes = ?, data = MIN(data, ?) WHERE id = ?",
+                (json.dumps(fontes + [demanda.fonte], ensure_ascii=False), demanda.data or "9999", demanda.id),
+            )
+            return False
+        self._con.execute(
+            "INSERT INTO demandas VALUES (?, ?, ?, ?, ?)",
+            (demanda.id, demanda.data, demanda.trecho,
+             json.dumps([demanda.fonte] if demanda.fonte else [], ensure_ascii=False),
+             demanda.assinatura.tobytes()),
+        )
+        self._con.executemany(
+            "INSERT OR IGNORE INTO baldes VALUES (?, ?, ?)",
+            [(banda, int(chave), demanda.id) for banda, chave in enumerate(chaves_bandas(demanda.assinatura))],
+        )
+        return True
+
+    def adicionar(self, demandas: Iterable[Optional[Demanda]]) -> int:
+        """Indexa as demandas; devolve quantas eram novas."""
+        with self._lock, self._con:
+            return sum(self._gravar(d) for d in demandas if d)
+
+    def atualizar(self, arquivos: Optional[Iterable[Path]] = None, base_campos: bool = True) -> Dict[str, int]:
+        """Indexa DFDs novos/alterados dos insumos e, opcionalmente, da base de campos."""
+        if arquivos is None:
+            arquivos = (p for p in sorted(INSUMOS_DIR.glob("DFD_*.json")) if p.name != "DFD_ultimo.json")
+        with self._lock:
+            marcas = dict(self._con.execute("SELECT caminho, marca FROM fontes"))
+        lidas = novas = 0
+        for caminho in arquivos:
+            try:
+                st = caminho.stat()
+            except OSError:
+                continue
+            marca = f"{st.st_mtime_ns}:{st.st_size}"
+            if marcas.get(str(caminho)) == marca:
+                continue
+            demandas = _do_insumo(caminho)
+            with self._lock, self._con:
+                novas += sum(self._gravar(d) for d in demandas)
+                self._con.execute("INSERT OR REPLACE INTO fontes VALUES (?, ?)", (str(caminho), marca))
+            lidas += 1
+        if base_campos:
+            # Só as versões da base gravadas desde a última atualização
+            with self._lock:
+                linha = self._con.execute("SELECT valor FROM meta WHERE chave = 'base_campos'").fetchone()
+            demandas = _da_base_campos(linha[0] if linha else "")
+            novas += self.adicionar(demandas)
+            if demandas:
+                with self._lock, self._con:
+                    self._con.execute(
+                        "INSERT OR REPLACE INTO meta VALUES ('base_campos', ?)",
+                        (max(d.data for d in demandas),),
+                    )
+        return {"fontes_lidas": lidas, "demandas_novas": novas}
+
+    # ---------------- Consulta ----------------
+    def candidatos(self, assinatura: np.ndarray) -> List[str]:
+        """Ids que compartilham ao menos um balde com a assinatura."""
+        chaves = chaves_bandas(assinatura)
+        valores = ",".join("(?, ?)" for _ in range(BANDAS))
+        parametros = [p for banda, chave in enumerate(chaves) for p in (banda, int(chave))]
+        with self._lock:
+            linhas = self._con.execute(
+                f"SELECT DISTINCT id FROM baldes WHERE (banda, chave) IN (VALUES {valores})", parametros
+            ).fetchall()
+        return [l[0] for l in linhas]
+
+    def similares(
+        self,
+        texto: str,
+        limiar: float = LIMIAR,
+        top: int = 10,
+        excluir_fontes: Iterable[str] = (),
+    ) -> List[Dict[str, Any]]:
+        """
+        Demandas indexadas com Jaccard estimada ≥ limiar, da mais
+        parecida para a menos. `excluir_fontes` (o DFD em edição) sai das
+        fontes listadas; a demanda só é descartada se não sobrar fonte,
+        de modo que o mesmo texto enviado por outra unidade aparece.
+        """
+        consulta = preparar(texto)
+        if consulta is None:
+            return []
+        excluir = set(excluir_fontes)
+        ids = self.candidatos(consulta.assinatura)
+        if not ids:
+            return []
+        marcadores = ",".join("?" for _ in ids)
+        with self._lock:
+            linhas = self._con.execute(
+                f"SELECT id, data, trecho, fontes, assinatura FROM demandas WHERE id IN ({marcadores})", ids
+            ).fetchall()
+        resultado = []
+        for id_, data, trecho, fontes, blob in linhas:
+            fontes = json.loads(fontes)
+            outras = [f for f in fontes if f not in excluir]
+            if fontes and not outras:
+                continue
+            jaccard = jaccard_assinaturas(consulta.assinatura, np.frombuffer(blob, dtype=np.uint64))
+            if jaccard >= limiar:
+                resultado.append({
+                    "id": id_, "similaridade": round(jaccard, 3), "data": data,
+                    "trecho": trecho, "fontes": outras,
+                })
+        resultado.sort(key=lambda r: (-r["similaridade"], r["data"]))
+        return resultado[:top]
+
+
+# ======================================================
+# 🔁 Instância compartilhada
+# ======================================================
+_INDICES: Dict[str, IndiceDemandas] = {}
+_INDICES_LOCK = threading.Lock()
+
+
+def obter_indice(caminho: Path = INDICE_PATH) -> IndiceDemandas:
+    """Índice compartilhado do processo (uma conexão por arquivo)."""
+    with _INDICES_LOCK:
+        chave = str(Path(caminho))
+        if chave not in _INDICES:
+            _INDICES[chave] = IndiceDemandas(caminho)
+        return _INDICES[chave]
+
+
+def demandas_similares(
+    campos: Dict[str, Any],
+    limiar: float = LIMIAR,
+    top: int = 10,
+    atualizar: bool = True,
+) -> List[Dict[str, Any]]:
+    """
+    Atalho: (opcionalmente) atualiza o índice e busca demandas parecidas
+    com o DFD `campos`, sem contar as fontes do próprio DFD em edição.
+    """
+    indice = obter_indice()
+    if atualizar:
+        indice.atualizar()
+    return indice.similares(texto_demanda(campos), limiar, top, excluir_fontes=fontes_dfd_atual())
@@ -0,0 +1,328 @@
+# -*- coding: utf-8 -*-
+"""
+diff_versoes.py – Diferenças entre duas versões do mesmo artefato
+==============================================================
+Compara duas versões de um edital, TR ou contrato cláusula a cláusula:
+
+    1. segmenta cada versão em seções e cláusulas (kb_resumos);
+    2. alinha as cláusulas pelo hash do conteúdo com um diff
+       "patience" (cláusulas únicas servem de âncora); nas lacunas,
+       pareia as cláusulas alteradas pelo rótulo (7.1 ↔ 7.1) e, na
+       falta dele, pelo cosseno TF-IDF;
+    3. para cada par alterado, roda o mesmo diff patience no nível de
+       token (palavras, pontuação e espaços).
+
+Só as cláusulas alteradas chegam ao diff de tokens, por isso documentos
+de 100 páginas com poucas mudanças saem em frações de segundo. O
+resultado fica em cache em disco, chaveado pelos hashes das duas versões.
+
+Uso:
+    from utils.diff_versoes import diff_versoes, renderizar_html
+    diff = diff_versoes(texto_v1, texto_v2)
+    html = renderizar_html(diff["clausulas"][0])
+
+Versão: v2025.1
+==============================================================
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from html import escape
+from pathlib import Path
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.kb_resumos import dividir_clausulas, dividir_secoes, hash_conteudo
+from utils.similaridade_textual import cosseno_tfidf
+
+# ======================================================
+# ⚙️ Parâmetros
+# ======================================================
+DIFF_VERSAO = "v2"
+CACHE_DIR = Path(__file__).resolve().parents[1] / "exports" / "cache" / "diffs"
+LIMIAR_PAREAMENTO = 0.35  # cosseno mínimo para parear cláusulas sem rótulo em comum
+
+_RE_TOKEN = re.compile(r"\w+|[^\w\s]|\s+")
+_RE_NUMERO_TITULO = re.compile(r"^(CL[ÁA]USULA\s+[\wÀ-ú]+|(?:\d+\.)*\d+)", re.I)
+
+
+# ======================================================
+# ✂️ Segmentação em cláusulas
+# ======================================================
+@dataclass(frozen=True)
+class Clausula:
+    rotulo: str
+    texto: str
+
+    @property
+    def chave(self) -> str:
+        return hash_conteudo(" ".join(self.texto.split()))
+
+
+def _rotulo_titulo(titulo: str) -> str:
+    """Rótulo do título pela numeração ("Seção 2"), para parear títulos renomeados."""
+    m = _RE_NUMERO_TITULO.match(titulo)
+    return f"Seção {m.group(1).upper()}" if m else f"§ {titulo}"
+
+
+def segmentar(texto: str) -> List[Clausula]:
+    """
+    Cláusulas do texto. O título de cada seção entra como cláusula própria:
+    renomear "DO PRAZO" para "DA RESCISÃO" é uma alteração, mesmo com o
+    corpo intacto.
+    """
+    clausulas = []
+    for titulo, corpo in dividir_secoes(texto or ""):
+        if titulo != "Preâmbulo":
+            clausulas.append(Clausula(_rotulo_titulo(titulo), titulo))
+        for rotulo, trecho in dividir_clausulas(corpo):
+            clausulas.append(Clausula(f"{titulo} › {rotulo}", trecho))
+    return clausulas
+
+
+# ======================================================
+# 🧵 Diff patience (sequências genéricas)
+# ======================================================
+def _lis(ancoras: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Maior subsequência crescente em j (ancoras já ordenadas por i)."""
+    pilhas: List[int] = []
+    topo: List[int] = []
+    anterior = [-1] * len(ancoras)
+    for k, (_, j) in enumerate(ancoras):
+        p = bisect_left(pilhas, j)
+        if p == len(pilhas):
+            pilhas.append(j)
+            topo.append(k)
+        else:
+            pilhas[p] = j
+            topo[p] = k
+        anterior[k] = topo[p - 1] if p else -1
+    caminho = []
+    k = topo[-1] if topo else -1
+    while k >= 0:
+        caminho.append(ancoras[k])
+        k = anterior[k]
+    return caminho[::-1]
+
+
+def _casamentos(a: Sequence[Hashable], b: Sequence[Hashable],
+                alo: int, ahi: int, blo: int, bhi: int, saida: List[Tuple[int, int, int]]) -> None:
+    ia, ib = alo, blo
+    while alo < ahi and blo < bhi and a[alo] == b[blo]:
+        alo += 1
+        blo += 1
+    if alo > ia:
+        saida.append((ia, ib, alo - ia))
+
+    fa = ahi
+    while ahi > alo and bhi > blo and a[ahi - 1] == b[bhi - 1]:
+        ahi -= 1
+        bhi -= 1
+    sufixo = (ahi, bhi, fa - ahi) if fa > ahi else None
+
+    if alo < ahi and blo < bhi:
+        conta_a = Counter(a[alo:ahi])
+        conta_b = Counter(b[blo:bhi])
+        pos_b = {x: j for j, x in enumerate(b[blo:bhi], blo) if conta_b[x] == 1}
+        ancoras = [(i, pos_b[x]) for i, x in enumerate(a[alo:ahi], alo) if conta_a[x] == 1 and x in pos_b]
+        caminho = _lis(ancoras)
+        if caminho:
+            pa, pb = alo, blo
+            for i, j in caminho:
+                _casamentos(a, b, pa, i, pb, j, saida)
+                pa, pb = i, j
+            _casamentos(a, b, pa, ahi, pb, bhi, saida)
+        else:
+            # sem âncoras únicas (ex.: só tokens repetidos): difflib na lacuna
+            sm = SequenceMatcher(None, a[alo:ahi], b[blo:bhi], autojunk=False)
+            saida.extend((alo + i, blo + j, n) for i, j, n in sm.get_matching_blocks() if n)
+
+    if sufixo:
+        saida.append(sufixo)
+
+
+def opcodes(a: Sequence[Hashable], b: Sequence[Hashable]) -> List[Tuple[str, int, int, int, int]]:
+    """Opcodes no formato do difflib (equal/replace/delete/insert) via diff patience."""
+    blocos: List[Tuple[int, int, int]] = []
+    _casamentos(a, b, 0, len(a), 0, len(b), blocos)
+    blocos.sort()
+    resultado = []
+    i = j = 0
+    for bi, bj, n in blocos + [(len(a), len(b), 0)]:
+        if i < bi and j < bj:
+            resultado.append(("replace", i, bi, j, bj))
+        elif i < bi:
+            resultado.append(("delete", i, bi, j, j))
+        elif j < bj:
+            resultado.append(("insert", i, i, j, bj))
+        if n:
+            if resultado and resultado[-1][0] == "equal" and resultado[-1][2] == bi:
+                _, i0, _, j0, _ = resultado.pop()
+                resultado.append(("equal", i0, bi + n, j0, bj + n))
+            else:
+                resultado.append(("equal", bi, bi + n, bj, bj + n))
+        i, j = bi + n, bj + n
+    return resultado
+
+
+# ======================================================
+# 🔤 Diff de tokens dentro da cláusula
+# ======================================================
+def diff_tokens(antigo: str, novo: str) -> List[Tuple[str, str]]:
+    """[(tag, trecho)] com tag em igual / removido / inserido."""
+    ta, tb = _RE_TOKEN.findall(antigo), _RE_TOKEN.findall(novo)
+    trechos: List[Tuple[str, str]] = []
+
+    def _add(tag, texto):
+        if not texto:
+            return
+        if trechos and trechos[-1][0] == tag:
+            trechos[-1] = (tag, trechos[-1][1] + texto)
+        else:
+            trechos.append((tag, texto))
+
+    for tag, i1, i2, j1, j2 in opcodes(ta, tb):
+        if tag == "equal":
+            _add("igual", "".join(ta[i1:i2]))
+        else:
+            _add("removido", "".join(ta[i1:i2]))
+            _add("inserido", "".join(tb[j1:j2]))
+    return trechos
+
+
+# ======================================================
+# 🧩 Alinhamento de cláusulas
+# ======================================================
+def _rotulo_estavel(rotulo: str) -> bool:
+    """Numeração de cláusula (7.1) identifica a cláusula; "§3" é só a posição do parágrafo."""
+    return not rotulo.rsplit(" › ", 1)[-1].startswith("§")
+
+
+def _parear(antigas: List[Clausula], novas: List[Clausula]) -> List[Tuple[Optional[Clausula], Optional[Clausula]]]:
+    """Pareia as cláusulas de uma lacuna: mesmo rótulo, depois cosseno."""
+    pares: Dict[int, int] = {}
+    por_rotulo = {}
+    for j, c in enumerate(novas):
+        if _rotulo_estavel(c.rotulo):
+            por_rotulo.setdefault(c.rotulo, j)
+    for i, c in enumerate(antigas):
+        j = por_rotulo.pop(c.rotulo, None)
+        if j is not None:
+            pares[i] = j
+
+    usados_b = set(pares.values())
+    livres_a = [i for i in range(len(antigas)) if i not in pares]
+    livres_b = [j for j in range(len(novas)) if j not in usados_b]
+    if livres_a and livres_b:
+        textos = [antigas[i].texto for i in livres_a] + [novas[j].texto for j in livres_b]
+        sim = cosseno_tfidf(textos)[:len(livres_a), len(livres_a):]
+        usados_a = set()
+        for x, y in zip(*np.unravel_index(np.argsort(-sim, axis=None, kind="stable"), sim.shape)):
+            if sim[x, y] < LIMIAR_PAREAMENTO:
+                break
+            if x not in usados_a and livres_b[y] not in usados_b:
+                pares[livres_a[x]] = livres_b[y]
+                usados_a.add(x)
+                usados_b.add(livres_b[y])
+
+    # ordem do documento novo; cada removida entra logo após a última
+    # cláusula antiga pareada que a precedia
+    inverso = {j: i for i, j in pares.items()}
+    ordem = [(j, 0, inverso.get(j), j) for j in range(len(novas))]
+    ultimo_j = -1
+    for i in range(len(antigas)):
+        if i in pares:
+            ultimo_j = pares[i]
+        else:
+            ordem.append((ultimo_j, 1, i, None))
+    ordem.sort(key=lambda o: (o[0], o[1]))
+    return [
+        (antigas[i] if i is not None else None, novas[j] if j is not None else None)
+        for _, _, i, j in ordem
+    ]
+
+
+def alinhar_clausulas(antigas: List[Clausula], novas: List[Clausula]):
+    """[(tag, antiga, nova)] com tag em igual / alterada / inserida / removida."""
+    alinhado = []
+    for tag, i1, i2, j1, j2 in opcodes([c.chave for c in antigas], [c.chave for c in novas]):
+        if tag == "equal":
+            alinhado.extend(("igual", a, n) for a, n in zip(antigas[i1:i2], novas[j1:j2]))
+            continue
+        for a, n in _parear(antigas[i1:i2], novas[j1:j2]):
+            alinhado.append(("alterada" if a and n else ("removida" if a else "inserida"), a, n))
+    return alinhado
+
+
+# ======================================================
+# 🚀 Diff entre versões (com cache)
+# ======================================================
+def _calcular(texto_antigo: str, texto_novo: str) -> Dict[str, Any]:
+    resumo = Counter()
+    clausulas = []
+    for tag, antiga, nova in alinhar_clausulas(segmentar(texto_antigo), segmentar(texto_novo)):
+        resumo[tag] += 1
+        if tag == "igual":
+            continue
+        clausulas.append({
+            "tipo": tag,
+            "rotulo_antigo": antiga.rotulo if antiga else None,
+            "rotulo_novo": nova.rotulo if nova else None,
+            "trechos": diff_tokens(antiga.texto if antiga else "", nova.texto if nova else ""),
+        })
+    return {
+        "resumo": {t: resumo.get(t, 0) for t in ("igual", "alterada", "inserida", "removida")},
+        "clausulas": clausulas,
+    }
+
+
+def diff_versoes(texto_antigo: str, texto_novo: str, usar_cache: bool = True) -> Dict[str, Any]:
+    """
+    Diff cláusula a cláusula entre duas versões. Retorna
+    {"versao_antiga", "versao_nova", "resumo", "clausulas", "cache_hit"};
+    cada cláusula traz tipo, rótulos e os trechos [(tag, texto)].
+    """
+    h_antigo, h_novo = hash_conteudo(texto_antigo or ""), hash_conteudo(texto_novo or "")
+    caminho = CACHE_DIR / f"{DIFF_VERSAO}_{h_antigo[:20]}_{h_novo[:20]}.json"
+    if usar_cache and caminho.exists():
+        try:
+            resultado = json.loads(caminho.read_text(encoding="utf-8"))
+            resultado["cache_hit"] = True
+            return resultado
+        except (OSError, ValueError):
+            pass
+
+    resultado = {"versao_antiga": h_antigo, "versao_nova": h_novo, **_calcular(texto_antigo or "", texto_novo or "")}
+    if usar_cache:
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            caminho.write_text(json.dumps(resultado, ensure_ascii=False), encoding="utf-8")
+        except OSError:
+            pass
+    resultado["cache_hit"] = False
+    return resultado
+
+
+# ======================================================
+# 🎨 Renderização
+# ======================================================
+_ESTILO = {
+    "removido": "background:#fde2e1;color:#8a1c12;text-decoration:line-through;",
+    "inserido": "background:#dff5e1;color:#14532d;",
+}
+
+
+def renderizar_html(clausula: Dict[str, Any]) -> str:
+    """HTML de uma cláusula do diff (trechos removidos riscados, inseridos em verde)."""
+    partes = []
+    for tag, texto in clausula["trechos"]:
+        texto = escape(texto).replace("\n", "<br>")
+        partes.append(f'<span style="{_ESTILO[tag]}">{texto}</span>' if tag in _ESTILO else texto)
+    return f'<div style="font-size:0.92rem;line-height:1.5;">{"".join(partes)}</div>'
@@ -8,9 +8,10 @@
 # ==========================================================
 
 from pathlib import Path
-import yaml
 import datetime
 
+from utils.knowledge_registry import obter_registry
+
 # ==========================================================
 # 🧩 Função principal
 # ==========================================================
@@ -41,11 +42,13 @@ def carregar_checklist(tipo: str = "servicos") -> list:
         return []
 
     try:
-        with open(base_path, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f)
+        data = obter_registry().ler_yaml(base_path)
     except Exception as e:
         log_mensagem(f"⚠️ [ERRO] Falha ao carregar YAML: {e}")
         return []
+    if not isinstance(data, dict):
+        log_mensagem(f"⚠️ [ERRO] Falha ao carregar YAML: {base_path.name}")
+        return []
 
     # ======================================================
     # 🔎 Carregamento dos blocos
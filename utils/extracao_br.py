@@ -0,0 +1,408 @@
+# -*- coding: utf-8 -*-
+"""
+extracao_br.py – Extração de valores, datas, prazos e identificadores
+==============================================================
+Biblioteca de extração no padrão brasileiro para as verificações
+numéricas entre documentos (alertas, comparador, agentes):
+
+    - valor:      "R$ 1.234.567,89", "R$ 2,5 milhões", "150 mil reais"
+    - percentual: "12,5%", "10 por cento"
+    - data:       "05/03/2025", "2025-03-05", "5 de março de 2025"
+    - prazo:      "90 dias", "12 (doze) meses", "cinco dias úteis"
+                  (normalizado em dias: semana 7, mês 30, ano 365)
+    - cnpj:       com ou sem máscara, dígitos verificadores conferidos
+    - processo:   numeração única CNJ ou "Processo SEI nº ..."
+    - norma:      "Lei nº 14.133/2021", "art. 75 da Lei 14.133/2021",
+                  "Decreto 10.024/2019", "LC 123/2006"
+
+Todas as regexes são compiladas na importação. O modo em lote
+(extrair_lote, valores_lote, prazos_lote) varre cada padrão UMA vez
+sobre os textos concatenados e distribui as ocorrências por documento
+com np.searchsorted, em vez de uma varredura por texto e por tipo.
+
+Uso:
+    from utils.extracao_br import valor_brl, prazo_dias, extrair
+    valor_brl("R$ 1.234.567,89")        # 1234567.89
+    prazo_dias("12 (doze) meses")       # 360
+    extrair(texto)["cnpj"]              # [Extracao(...), ...]
+
+Versão: v2025.1
+==============================================================
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# ======================================================
+# 📚 Vocabulário
+# ======================================================
+NUMEROS_EXTENSO = {
+    "um": 1, "uma": 1, "dois": 2, "duas": 2, "três": 3, "tres": 3, "quatro": 4,
+    "cinco": 5, "seis": 6, "sete": 7, "oito": 8, "nove": 9, "dez": 10,
+    "onze": 11, "doze": 12, "treze": 13, "quatorze": 14, "catorze": 14,
+    "quinze": 15, "dezesseis": 16, "dezessete": 17, "dezoito": 18, "dezenove": 19,
+    "vinte": 20, "trinta": 30, "quarenta": 40, "cinquenta": 50, "sessenta": 60,
+    "setenta": 70, "oitenta": 80, "noventa": 90, "cem": 100, "cento": 100,
+    "duzentos": 200, "trezentos": 300, "quatrocentos": 400, "quinhentos": 500,
+    "seiscentos": 600, "setecentos": 700, "oitocentos": 800, "novecentos": 900,
+}
+MESES = {
+    "janeiro": 1, "fevereiro": 2, "março": 3, "marco": 3, "abril": 4, "maio": 5,
+    "junho": 6, "julho": 7, "agosto": 8, "setembro": 9, "outubro": 10,
+    "novembro": 11, "dezembro": 12,
+}
+DIAS_POR_UNIDADE = {"dia": 1, "semana": 7, "mes": 30, "ano": 365}
+ESCALAS = {"mil": 1e3, "milhao": 1e6, "milhoes": 1e6, "bilhao": 1e9, "bilhoes": 1e9}
+NORMAS = {
+    "lei": "Lei", "lei complementar": "Lei Complementar", "lc": "Lei Complementar",
+    "decreto": "Decreto", "decreto-lei": "Decreto-Lei", "portaria": "Portaria",
+    "instrucao normativa": "Instrução Normativa", "in": "Instrução Normativa",
+    "resolucao": "Resolução",
+}
+
+# Separador entre textos no modo em lote: nenhum padrão atravessa \x00
+_SEPARADOR = "\n\x00\n"
+
+# ======================================================
+# 🧩 Padrões (compilados uma vez)
+# ======================================================
+def _regex_trie(palavras: Iterable[str]) -> str:
+    """
+    Alternância fatorada por prefixo ("d(?:ez(?:oito|...)?|ois|...)"):
+    o motor de regex descarta cada posição pelo primeiro caractere em vez
+    de testar as palavras uma a uma.
+    """
+    raiz: Dict[str, Any] = {}
+    for palavra in palavras:
+        no = raiz
+        for c in palavra:
+            no = no.setdefault(c, {})
+        no[""] = {}
+
+    def montar(no: Dict[str, Any]) -> str:
+        ramos = [re.escape(c) + montar(filho) for c, filho in sorted(no.items()) if c]
+        if not ramos:
+            return ""
+        corpo = ramos[0] if len(ramos) == 1 else "(?:" + "|".join(ramos) + ")"
+        if "" in no:
+            return f"(?:{corpo})?"
+        return corpo
+
+    return montar(raiz)
+
+
+_NUM = r"\d[\d.,]*\d|\d"
+_ESCALA = r"mil|milh[õo]es|milh[ãa]o|bilh[õo]es|bilh[ãa]o"
+_PALAVRAS = _regex_trie(NUMEROS_EXTENSO)
+
+_RE_VALOR = re.compile(
+    rf"R\$\s*(?P<num>{_NUM})(?:\s*(?P<escala>{_ESCALA})\b)?"
+    rf"|\b(?P<num2>{_NUM})\s*(?:(?P<escala2>{_ESCALA})\s+)?(?:de\s+)?reais\b",
+    re.IGNORECASE,
+)
+_RE_NUMERO = re.compile(_NUM)
+_RE_MILHAR_PONTO = re.compile(r"\d{1,3}(?:\.\d{3})+")
+_RE_MILHAR_VIRGULA = re.compile(r"\d{1,3}(?:,\d{3})+")
+
+_RE_PERCENTUAL = re.compile(r"(?P<num>\d+(?:[.,]\d+)?)\s*(?:%|por\s*cento\b)", re.IGNORECASE)
+
+_RE_DATA = re.compile(
+    r"\b(?:(?P<d>\d{1,2})[/.\-](?P<m>\d{1,2})[/.\-](?P<a>\d{4}|\d{2})(?![\d/.\-]*\d)"
+    r"|(?P<ai>\d{4})-(?P<mi>\d{2})-(?P<di>\d{2})"
+    rf"|(?P<de>\d{{1,2}})[º°o]?\s+de\s+(?P<me>{'|'.join(MESES)})\s+de\s+(?P<ae>\d{{4}}))\b",
+    re.IGNORECASE,
+)
+
+_RE_PRAZO = re.compile(
+    rf"\b(?:(?P<num>\d{{1,4}})(?:\s*\((?P<ext>[^)\n]{{1,40}})\))?"
+    rf"|(?P<pal>(?:{_PALAVRAS})(?:\s+e\s+(?:{_PALAVRAS}))*))"
+    r"\s*(?P<unidade>dias?|semanas?|m[eê]s(?:es)?|anos?)\b"
+    r"(?:\s+(?P<tipo>[úu]teis|corridos)\b)?",
+    re.IGNORECASE,
+)
+
+_RE_CNPJ = re.compile(r"(?<![\d/])\d{2}\.?\d{3}\.?\d{3}/?\d{4}-?\d{2}(?![\d/])")
+
+_RE_PROCESSO = re.compile(
+    r"\b(?P<cnj>\d{7}-\d{2}\.\d{4}\.\d\.\d{2}\.\d{4})\b"
+    r"|processo(?:\s+(?:sei|administrativo|digital))?\s*(?:n[º°o.]*\s*)?[:\-]?\s*(?P<num>\d[\d./\-]{3,}\d)",
+    re.IGNORECASE,
+)
+
+_RE_NORMA = re.compile(
+    r"(?:\bart(?:igo)?s?\.?\s*(?P<artigo>\d+)[º°o]?[^\n;]{0,80}?)?"
+    r"\b(?P<norma>lei\s+complementar|lei|decreto(?:-lei)?|portaria|instru[çc][ãa]o\s+normativa|resolu[çc][ãa]o|(?-i:LC|IN))\b"
+    r"(?:\s+(?:federal|estadual|municipal))?\s*(?:n[º°o.]*\s*)?(?P<numero>\d{1,3}(?:\.\d{3})+|\d+)"
+    rf"(?:\s*/\s*|,?\s+de\s+\d{{1,2}}[º°o]?\s+de\s+(?:{'|'.join(MESES)})\s+de\s+)(?P<ano>\d{{4}}|\d{{2}})\b",
+    re.IGNORECASE,
+)
+
+_TABELA_ACENTOS = str.maketrans("áàâãéêíóôõúç", "aaaaeeiooouc")
+
+
+# ======================================================
+# 🧱 Resultado
+# ======================================================
+@dataclass(frozen=True)
+class Extracao:
+    tipo: str
+    valor: Any
+    trecho: str
+    inicio: int
+    fim: int
+
+
+# ======================================================
+# 🔢 Conversões
+# ======================================================
+def numero_br(texto: str) -> Optional[float]:
+    """
+    Número no formato brasileiro ou internacional: "1.234.567,89",
+    "1,234,567.89", "1234,5", "10.000" → float. Ambíguo = milhar.
+    """
+    s = texto.strip()
+    if "," in s and "." in s:
+        decimal = "," if s.rfind(",") > s.rfind(".") else "."
+    elif "," in s:
+        decimal = None if s.count(",") > 1 and _RE_MILHAR_VIRGULA.fullmatch(s) else ","
+    elif "." in s:
+        decimal = None if _RE_MILHAR_PONTO.fullmatch(s) else "."
+    else:
+        decimal = None
+    milhar = {",": ".", ".": ",", None: ".,"}[decimal]
+    for c in milhar:
+        s = s.replace(c, "")
+    if decimal:
+        s = s.replace(decimal, ".")
+    try:
+        return float(s)
+    except ValueError:
+        return None
+
+
+def _sem_acentos(texto: str) -> str:
+    return texto.lower().translate(_TABELA_ACENTOS)
+
+
+def _por_extenso(texto: str) -> Optional[int]:
+    partes = re.split(r"\s+e\s+", texto.strip().lower())
+    valores = [NUMEROS_EXTENSO.get(p) for p in partes]
+    return sum(valores) if valores and None not in valores else None
+
+
+def _digitos_cnpj_validos(d: str) -> bool:
+    if len(d) != 14 or len(set(d)) == 1:
+        return False
+    pesos = [5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]
+    for n in (12, 13):
+        soma = sum(int(x) * p for x, p in zip(d[:n], pesos if n == 12 else [6] + pesos))
+        dv = 0 if soma % 11 < 2 else 11 - soma % 11
+        if int(d[n]) != dv:
+            return False
+    return True
+
+
+# ======================================================
+# 🧪 Leitores (match → valor normalizado ou None)
+# ======================================================
+def _ler_valor(m: re.Match) -> Optional[float]:
+    num = numero_br(m.group("num") or m.group("num2"))
+    escala = m.group("escala") or m.group("escala2")
+    if num is None:
+        return None
+    return round(num * ESCALAS.get(_sem_acentos(escala), 1.0) if escala else num, 2)
+
+
+def _ler_percentual(m: re.Match) -> Optional[float]:
+    return numero_br(m.group("num").replace(".", ","))
+
+
+def _ler_data(m: re.Match) -> Optional[date]:
+    try:
+        if m.group("d"):
+            ano = int(m.group("a"))
+            return date(ano + 2000 if ano < 100 else ano, int(m.group("m")), int(m.group("d")))
+        if m.group("ai"):
+            return date(int(m.group("ai")), int(m.group("mi")), int(m.group("di")))
+        return date(int(m.group("ae")), MESES[m.group("me").lower()], int(m.group("de")))
+    except ValueError:
+        return None
+
+
+def _ler_prazo(m: re.Match) -> Optional[Dict[str, Any]]:
+    quantidade = int(m.group("num")) if m.group("num") else _por_extenso(m.group("pal"))
+    if not quantidade:
+        return None
+    unidade = _sem_acentos(m.group("unidade"))
+    unidade = "mes" if unidade.startswith("mes") else unidade.rstrip("s")
+    return {
+        "quantidade": quantidade,
+        "unidade": unidade,
+        "dias": quantidade * DIAS_POR_UNIDADE[unidade],
+        "uteis": bool(m.group("tipo")) and _sem_acentos(m.group("tipo")) == "uteis",
+    }
+
+
+def _ler_cnpj(m: re.Match) -> Optional[str]:
+    d = re.sub(r"\D", "", m.group())
+    if not _digitos_cnpj_validos(d):
+        return None
+    return f"{d[:2]}.{d[2:5]}.{d[5:8]}/{d[8:12]}-{d[12:]}"
+
+
+def _ler_processo(m: re.Match) -> Optional[str]:
+    return m.group("cnj") or m.group("num").strip(".-/")
+
+
+def _ler_norma(m: re.Match) -> Optional[Dict[str, Any]]:
+    norma = NORMAS.get(re.sub(r"\s+", " ", _sem_acentos(m.group("norma"))))
+    ano = int(m.group("ano"))
+    if ano < 100:
+        ano += 1900 if ano > 30 else 2000
+    return {
+        "norma": norma,
+        "numero": m.group("numero").replace(".", ""),
+        "ano": ano,
+        "artigo": m.group("artigo"),
+    }
+
+
+EXTRATORES: Dict[str, Tuple[re.Pattern, Callable[[re.Match], Any]]] = {
+    "valor": (_RE_VALOR, _ler_valor),
+    "percentual": (_RE_PERCENTUAL, _ler_percentual),
+    "data": (_RE_DATA, _ler_data),
+    "prazo": (_RE_PRAZO, _ler_prazo),
+    "cnpj": (_RE_CNPJ, _ler_cnpj),
+    "processo": (_RE_PROCESSO, _ler_processo),
+    "norma": (_RE_NORMA, _ler_norma),
+}
+TIPOS = tuple(EXTRATORES)
+
+
+# ======================================================
+# 🔎 Extração
+# ======================================================
+def _texto(valor: Any) -> str:
+    if isinstance(valor, str):
+        return valor
+    if isinstance(valor, (list, tuple)):
+        return "\n".join(str(v) for v in valor)
+    return "" if valor is None else str(valor)
+
+
+def extrair(texto: Any, tipos: Iterable[str] = TIPOS) -> Dict[str, List[Extracao]]:
+    """{tipo: [Extracao, ...]} na ordem em que aparecem no texto."""
+    texto = _texto(texto)
+    saida: Dict[str, List[Extracao]] = {}
+    for tipo in tipos:
+        regex, ler = EXTRATORES[tipo]
+        itens = saida[tipo] = []
+        for m in regex.finditer(texto):
+            valor = ler(m)
+            if valor is not None:
+                itens.append(Extracao(tipo, valor, m.group(), m.start(), m.end()))
+    return saida
+
+
+def extrair_lote(textos: Sequence[Any], tipos: Iterable[str] = TIPOS) -> List[Dict[str, List[Extracao]]]:
+    """
+    extrair() para muitos textos: cada padrão percorre os textos
+    concatenados uma única vez. As posições são relativas a cada texto.
+    """
+    tipos = tuple(tipos)
+    textos = [_texto(t) for t in textos]
+    saida: List[Dict[str, List[Extracao]]] = [{tipo: [] for tipo in tipos} for _ in textos]
+    if not textos:
+        return saida
+    inicios = np.cumsum([0] + [len(t) + len(_SEPARADOR) for t in textos[:-1]])
+    unido = _SEPARADOR.join(textos)
+    for tipo in tipos:
+        regex, ler = EXTRATORES[tipo]
+        matches = list(regex.finditer(unido))
+        if not matches:
+            continue
+        docs = np.searchsorted(inicios, [m.start() for m in matches], side="right") - 1
+        for m, i in zip(matches, docs.tolist()):
+            valor = ler(m)
+            if valor is not None:
+                base = int(inicios[i])
+                saida[i][tipo].append(Extracao(tipo, valor, m.group(), m.start() - base, m.end() - base))
+    return saida
+
+
+def primeiro(texto: Any, tipo: str) -> Any:
+    """Valor da primeira ocorrência válida do tipo, ou None."""
+    regex, ler = EXTRATORES[tipo]
+    for m in regex.finditer(_texto(texto)):
+        valor = ler(m)
+        if valor is not None:
+            return valor
+    return None
+
+
+# ======================================================
+# 💰 Atalhos para campos
+# ======================================================
+def valor_brl(valor: Any, estrito: bool = False) -> Optional[float]:
+    """
+    Valor monetário de um campo. Sem "R$"/"reais" no texto, usa o
+    primeiro número (campos como "150000" ou "1.234,56"), salvo se
+    `estrito`. "Valor não divulgado" → None.
+    """
+    if isinstance(valor, (int, float)) and not isinstance(valor, bool):
+        return float(valor)
+    texto = _texto(valor)
+    achado = primeiro(texto, "valor")
+    if achado is not None or estrito:
+        return achado
+    m = _RE_NUMERO.search(texto)
+    return numero_br(m.group()) if m else None
+
+
+def formatar_brl(valor: float) -> str:
+    """1234567.891 → "R$ 1.234.567,89"."""
+    return "R$ " + f"{valor:,.2f}".replace(",", "_").replace(".", ",").replace("_", ".")
+
+
+def prazo_dias(valor: Any) -> Optional[int]:
+    """Primeiro prazo do campo em dias ("12 (doze) meses" → 360), ou None."""
+    if isinstance(valor, (int, float)) and not isinstance(valor, bool):
+        return int(valor)
+    achado = primeiro(valor, "prazo")
+    return achado["dias"] if achado else None
+
+
+def valores_lote(textos: Sequence[Any], estrito: bool = True) -> np.ndarray:
+    """Primeiro valor monetário de cada texto (float64, NaN se ausente)."""
+    saida = np.full(len(textos), np.nan)
+    for i, achados in enumerate(extrair_lote(textos, ("valor",))):
+        if achados["valor"]:
+            saida[i] = achados["valor"][0].valor
+        elif not estrito:
+            v = valor_brl(textos[i])
+            saida[i] = np.nan if v is None else v
+    return saida
+
+
+def prazos_lote(textos: Sequence[Any]) -> np.ndarray:
+    """Primeiro prazo de cada texto em dias (float64, NaN se ausente)."""
+    saida = np.full(len(textos), np.nan)
+    for i, achados in enumerate(extrair_lote(textos, ("prazo",))):
+        if achados["prazo"]:
+            saida[i] = achados["prazo"][0].valor["dias"]
+    return saida
+
+
+def divergencia_relativa(valores: Sequence[float]) -> float:
+    """(máx − mín) / máx dos valores conhecidos (NaN ignorado); 0 se < 2."""
+    v = np.asarray(valores, dtype=np.float64)
+    v = v[~np.isnan(v)]
+    if v.size < 2 or v.max() <= 0:
+        return 0.0
+    return float((v.max() - v.min()) / v.max())
@@ -124,10 +124,12 @@ def processar_insumo_contrato(
     arquivo,
     artefato: str = "CONTRATO",
     contexto_previo: Dict[str, Any] | None = None,
+    modelo_manual: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     Processa insumo de CONTRATO com ContratoAgent.
     Retorna dict estruturado com 20 campos.
+    modelo_manual força o modelo contratual de referência (senão é automático).
     """
     print(f"[integration_contrato] Processando arquivo: {getattr(arquivo, 'name', 'N/A')}")
     
@@ -140,7 +142,7 @@ def processar_insumo_contrato(
     
     # Processar com ContratoAgent
     try:
-        resultado = processar_contrato_com_ia(texto, contexto_previo)
+        resultado = processar_contrato_com_ia(texto, contexto_previo, modelo_manual)
         
         if "erro" in resultado:
             return resultado
@@ -156,6 +158,7 @@ def processar_insumo_contrato(
             "status": "processado",
             "timestamp": resultado.get("timestamp", datetime.now().isoformat()),
             "CONTRATO": contrato_campos,
+            "modelo_referencia": resultado.get("modelo_referencia"),
         }
     
     except Exception as e:
@@ -168,7 +171,7 @@ def processar_insumo_contrato(
 # -----------------------------
 # 🤖 Processamento com contexto integrado (wrapper para UI)
 # -----------------------------
-def gerar_contrato_com_ia(contexto_previo: dict = None) -> dict:
+def gerar_contrato_com_ia(contexto_previo: dict = None, modelo_manual: Optional[str] = None) -> dict:
     """
     Gera contrato usando APENAS contexto (sem insumo).
     Útil quando o usuário já tem DFD/ETP/TR/Edital completos.
@@ -183,7 +186,7 @@ def gerar_contrato_com_ia(contexto_previo: dict = None) -> dict:
     
     # Processar com ContratoAgent
     try:
-        resultado = processar_contrato_com_ia(texto_contexto, contexto_previo)
+        resultado = processar_contrato_com_ia(texto_contexto, contexto_previo, modelo_manual)
         
         if "erro" in resultado:
             return resultado
@@ -198,6 +201,7 @@ def gerar_contrato_com_ia(contexto_previo: dict = None) -> dict:
             "status": "processado",
             "timestamp": resultado.get("timestamp", datetime.now().isoformat()),
             "CONTRATO": contrato_campos,
+            "modelo_referencia": resultado.get("modelo_referencia"),
         }
     
     except Exception as e:
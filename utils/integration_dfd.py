@@ -168,7 +168,10 @@ def gerar_rascunho_dfd_com_ia() -> dict:
 
     try:
         from agents.document_agent import processar_dfd_com_ia
-        resultado_ia = processar_dfd_com_ia(texto)
+        # Tipo do documento de origem, detectado localmente no upload (Insumos)
+        tipo_info = dados_completos.get("tipo_documento") or {}
+        tipo_origem = tipo_info.get("tipo") if tipo_info.get("confiavel") else None
+        resultado_ia = processar_dfd_com_ia(texto, tipo_origem)
 
         # Verificar se houve erro
         if "erro" in resultado_ia:
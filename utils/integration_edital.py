@@ -56,7 +56,10 @@ def _get_openai_client():
         return None, None
 
     try:
-        return OpenAI(api_key=api_key), "gpt-4o-mini"
+        # modelo rápido da política de roteamento do EDITAL (roteamento_modelos.yml)
+        from knowledge.validators.model_router import politica_modelos
+
+        return OpenAI(api_key=api_key), politica_modelos("EDITAL").rapido
     except Exception:
         return None, None
 
@@ -75,14 +78,10 @@ KB_EDITAL_DIR = (BASE_DIR / "knowledge_base" / "edital")  # tolerante: não obri
 # 📚 Leitura de modelos da KB (tolerante)
 # ==========================================================
 def ler_modelos_edital() -> str:
-    textos = []
-    if KB_EDITAL_DIR.exists():
-        for arq in KB_EDITAL_DIR.glob("*.txt"):
-            try:
-                textos.append(arq.read_text(encoding="utf-8"))
-            except Exception:
-                pass
-    return "\n\n".join(textos)
+    from utils.knowledge_registry import obter_registry
+
+    textos = obter_registry().listar_textos(KB_EDITAL_DIR, "*.txt")
+    return "\n\n".join(textos.values())
 
 
 # ==========================================================
@@ -106,6 +106,29 @@ def extrair_texto_de_upload(uploaded_file, tipo: str) -> str:
     return ""
 
 
+# ==========================================================
+# Classificação local do tipo de documento
+# ==========================================================
+def classificar_insumo(texto: str) -> dict:
+    """
+    Detecta o tipo do documento (DFD, ETP, TR, EDITAL, CONTRATO, PCA,
+    PESQUISA_PRECOS) com o classificador local, sem chamada à IA.
+    Retorna {} se o classificador estiver indisponível.
+    """
+    try:
+        from utils.classificador_documentos import classificar_documento
+        r = classificar_documento(texto)
+    except Exception as e:
+        print(f"[integration_insumos] classificador indisponível: {e}")
+        return {}
+    return {
+        "tipo": r["tipo"],
+        "confianca": r["confianca"],
+        "origem": r["origem"],
+        "confiavel": r["confiavel"],
+    }
+
+
 # ==========================================================
 # Processamento principal
 # ==========================================================
@@ -113,6 +136,9 @@ def processar_insumo(uploaded_file, artefato: str = "DFD") -> dict:
     """
     Extrai texto, monta payload Moderno 2025 e grava:
        exports/insumos/json/<ARTEFATO>_ultimo.json
+
+    artefato="AUTO" encaminha para o módulo do tipo detectado localmente
+    (DFD quando o tipo não tem módulo próprio ou a confiança é baixa).
     """
 
     if uploaded_file is None:
@@ -120,7 +146,7 @@ def processar_insumo(uploaded_file, artefato: str = "DFD") -> dict:
         return {}
 
     artefato = (artefato or "DFD").upper().strip()
-    if artefato not in {"DFD", "ETP", "TR", "EDITAL", "CONTRATO"}:
+    if artefato not in {"DFD", "ETP", "TR", "EDITAL", "CONTRATO", "AUTO"}:
         artefato = "DFD"
 
     nome = uploaded_file.name
@@ -145,6 +171,12 @@ def processar_insumo(uploaded_file, artefato: str = "DFD") -> dict:
         st.error("⚠️ O documento não contém texto suficiente.")
         return {}
 
+    tipo_documento = classificar_insumo(texto)
+    if artefato == "AUTO":
+        detectado = tipo_documento.get("tipo")
+        modulos = {"DFD", "ETP", "TR", "EDITAL", "CONTRATO"}
+        artefato = detectado if tipo_documento.get("confiavel") and detectado in modulos else "DFD"
+
     # =======================
     # Payload MODERNO 2025-D4
     # =======================
@@ -153,6 +185,7 @@ def processar_insumo(uploaded_file, artefato: str = "DFD") -> dict:
         "arquivo_original": nome,
         "tipo": tipo,
         "conteudo_textual": texto,
+        "tipo_documento": tipo_documento,
         "data_processamento": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         "origem": "insumos_v2025",
         "status": "ok",
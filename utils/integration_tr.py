@@ -11,7 +11,6 @@ import json
 import os
 import re
 from typing import Dict, Any, Optional
-from pathlib import Path
 from datetime import datetime
 
 # ==========================================================
@@ -59,22 +58,25 @@ def load_tr_from_json(path: str = TR_JSON_PATH) -> Dict[str, Any]:
 # ==========================================================
 # 🧠 Base de conhecimento institucional (Knowledge Base)
 # ==========================================================
-def ler_modelos_tr() -> str:
-    """Lê os modelos textuais da pasta knowledge/tr_models."""
-    base = Path(__file__).resolve().parents[1] / "knowledge" / "tr_models"
-    textos = []
-    if base.exists():
-        for arq in base.glob("*.txt"):
-            try:
-                textos.append(arq.read_text(encoding="utf-8"))
-            except Exception:
-                pass
-    return "\n\n".join(textos)
+def ler_modelos_tr(objeto: str = "", modelo_manual: Optional[str] = None, orcamento_tokens: int = 1500) -> str:
+    """
+    Retorna o modelo de TR institucional (knowledge_base/TR) mais aderente
+    ao objeto, reduzido às seções relevantes dentro do orçamento de tokens.
+    modelo_manual (nome do arquivo ou categoria) substitui a escolha automática.
+    """
+    if not (objeto or modelo_manual):
+        return ""
+    from utils.seletor_modelos import contexto_modelo
+
+    texto, selecao = contexto_modelo(objeto, "TR", modelo_manual=modelo_manual, orcamento_tokens=orcamento_tokens)
+    if not selecao:
+        return ""
+    return f"=== {selecao['categoria']} ===\n{texto}"
 
 # ==========================================================
 # 🤖 Processamento de Insumo – IA Institucional TR
 # ==========================================================
-def processar_insumo_tr(arquivo, artefato: str = "TR") -> dict:
+def processar_insumo_tr(arquivo, artefato: str = "TR", modelo_manual: Optional[str] = None) -> dict:
     """
     Extrai o texto do arquivo enviado (PDF, DOCX ou TXT),
     realiza análise semântica e retorna campos padronizados do TR.
@@ -105,7 +107,7 @@ def processar_insumo_tr(arquivo, artefato: str = "TR") -> dict:
         return {"erro": "Texto vazio após leitura do insumo."}
 
     texto_limpo = re.sub(r"\s+", " ", texto_extraido).strip()
-    modelos = ler_modelos_tr()
+    modelos = ler_modelos_tr(texto_limpo[:2000], modelo_manual)
 
     # 2️⃣ Lazy loading da IA institucional
     ai = _get_openai_client()
@@ -0,0 +1,366 @@
+# -*- coding: utf-8 -*-
+"""
+kb_corpus.py – Corpus empacotado da knowledge_base (acesso por offsets)
+==============================================================
+Empacota todos os textos de knowledge_base/ em um único arquivo
+binário UTF-8 (kb_corpus.bin) acompanhado de uma tabela de offsets
+(kb_corpus_index.json) com:
+- documentos: id (caminho relativo), pasta, arquivo, faixa de bytes,
+  mtime/tamanho de origem e faixa de passagens
+- passagens: [doc_id, início, fim] em bytes, com id = posição na tabela
+
+A leitura usa mmap: cada passagem é obtida fatiando o arquivo, sem
+abrir/decodificar centenas de arquivos pequenos a cada requisição.
+
+Build (linha de comando):
+    python -m utils.kb_corpus
+
+Uso:
+    from utils.kb_corpus import obter_corpus
+    corpus = obter_corpus()
+    if corpus:
+        texto = corpus.passagem(42)
+
+Versão: v2025.1
+==============================================================
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import re
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# ======================================================
+# 🔧 Configurações e Paths
+# ======================================================
+BASE_DIR = Path(__file__).resolve().parents[1]
+KB_ROOT = BASE_DIR / "knowledge_base"
+CORPUS_DIR = BASE_DIR / "exports" / "cache"
+CORPUS_BIN = "kb_corpus.bin"
+CORPUS_INDEX = "kb_corpus_index.json"
+
+VERSAO_FORMATO = 1
+EXTENSOES_TEXTO = (".txt", ".md")
+
+# Tamanho-alvo de cada passagem (caracteres); parágrafos são agrupados até este limite
+TAMANHO_PASSAGEM = 1500
+
+_RE_PARAGRAFO = re.compile(r"\n\s*\n")
+
+
+# ======================================================
+# ✂️ Segmentação em passagens
+# ======================================================
+def _quebrar_longo(texto: str, inicio: int, fim: int, alvo: int) -> List[Tuple[int, int]]:
+    """Quebra uma faixa longa em pedaços de ~alvo caracteres, preferindo quebras de linha."""
+    faixas: List[Tuple[int, int]] = []
+    while fim - inicio > 2 * alvo:
+        corte = texto.rfind("\n", inicio + alvo // 2, inicio + alvo * 2)
+        if corte == -1:
+            corte = texto.rfind(" ", inicio + alvo // 2, inicio + alvo * 2)
+        corte = corte + 1 if corte != -1 else inicio + alvo
+        faixas.append((inicio, corte))
+        inicio = corte
+    faixas.append((inicio, fim))
+    return faixas
+
+
+def _segmentar(texto: str, alvo: int = TAMANHO_PASSAGEM) -> List[Tuple[int, int]]:
+    """
+    Divide o texto em faixas contíguas de caracteres [início, fim)
+    agrupando parágrafos consecutivos até o tamanho-alvo. Blocos sem
+    parágrafos (comuns em PDFs convertidos) são quebrados por linha.
+    """
+    brutas: List[Tuple[int, int]] = []
+    inicio = 0
+    for m in _RE_PARAGRAFO.finditer(texto):
+        if m.start() - inicio >= alvo:
+            brutas.append((inicio, m.end()))
+            inicio = m.end()
+    if inicio < len(texto):
+        brutas.append((inicio, len(texto)))
+
+    faixas: List[Tuple[int, int]] = []
+    for ini, fim in brutas:
+        faixas.extend(_quebrar_longo(texto, ini, fim, alvo))
+    return faixas
+
+
+def _listar_arquivos(kb_root: Path) -> List[Path]:
+    return sorted(
+        p for p in kb_root.rglob("*")
+        if p.is_file() and p.suffix.lower() in EXTENSOES_TEXTO
+    )
+
+
+# ======================================================
+# 🏗️ Build do corpus
+# ======================================================
+def construir_corpus(kb_root: Path = KB_ROOT, destino: Path = CORPUS_DIR) -> Dict[str, Any]:
+    """
+    Gera kb_corpus.bin e kb_corpus_index.json em `destino`.
+    A escrita é atômica (arquivos temporários + os.replace).
+
+    Returns:
+        Dict com caminhos gerados e totais de documentos/passagens/bytes
+    """
+    kb_root = Path(kb_root)
+    destino = Path(destino)
+    destino.mkdir(parents=True, exist_ok=True)
+
+    bin_path = destino / CORPUS_BIN
+    idx_path = destino / CORPUS_INDEX
+    tmp_bin = bin_path.with_suffix(".bin.tmp")
+    tmp_idx = idx_path.with_suffix(".json.tmp")
+
+    documentos: Dict[str, Dict[str, Any]] = {}
+    ignorados: Dict[str, List[int]] = {}
+    passagens: List[List[Any]] = []
+    cursor = 0
+
+    with open(tmp_bin, "wb") as out:
+        for arq in _listar_arquivos(kb_root):
+            try:
+                texto = arq.read_text(encoding="utf-8", errors="ignore")
+            except Exception:
+                continue
+            doc_id = arq.relative_to(kb_root).as_posix()
+            st = arq.stat()
+            if not texto.strip():
+                # Mantém assinatura para a verificação de atualização
+                ignorados[doc_id] = [st.st_mtime_ns, st.st_size]
+                continue
+
+            doc_inicio = cursor
+            primeira = len(passagens)
+
+            # Converte faixas de caracteres em faixas de bytes de forma incremental
+            char_ant, byte_ant = 0, doc_inicio
+            for ini, fim in _segmentar(texto):
+                byte_ant += len(texto[char_ant:ini].encode("utf-8"))
+                trecho = texto[ini:fim].encode("utf-8")
+                passagens.append([doc_id, byte_ant, byte_ant + len(trecho)])
+                byte_ant += len(trecho)
+                char_ant = fim
+
+            dados = texto.encode("utf-8")
+            out.write(dados)
+            cursor += len(dados)
+
+            documentos[doc_id] = {
+                "pasta": arq.parent.relative_to(kb_root).as_posix(),
+                "arquivo": arq.name,
+                "inicio": doc_inicio,
+                "fim": cursor,
+                "mtime_ns": st.st_mtime_ns,
+                "tamanho": st.st_size,
+                "passagens": [primeira, len(passagens)],
+            }
+
+    indice = {
+        "versao": VERSAO_FORMATO,
+        "gerado_em": datetime.now().isoformat(),
+        "kb_root": str(kb_root),
+        "total_bytes": cursor,
+        "documentos": documentos,
+        "ignorados": ignorados,
+        "passagens": passagens,
+    }
+    with open(tmp_idx, "w", encoding="utf-8") as f:
+        json.dump(indice, f, ensure_ascii=False)
+
+    os.replace(tmp_bin, bin_path)
+    os.replace(tmp_idx, idx_path)
+
+    return {
+        "bin_path": str(bin_path),
+        "index_path": str(idx_path),
+        "documentos": len(documentos),
+        "passagens": len(passagens),
+        "total_bytes": cursor,
+    }
+
+
+# ======================================================
+# 📖 Leitor com mmap
+# ======================================================
+class KBCorpus:
+    """Leitor somente-leitura do corpus empacotado (mmap + tabela de offsets)."""
+
+    def __init__(self, diretorio: Path = CORPUS_DIR):
+        diretorio = Path(diretorio)
+        with open(diretorio / CORPUS_INDEX, "r", encoding="utf-8") as f:
+            self.indice: Dict[str, Any] = json.load(f)
+        if self.indice.get("versao") != VERSAO_FORMATO:
+            raise ValueError(f"Formato de corpus incompatível: {self.indice.get('versao')}")
+
+        self._arquivo = open(diretorio / CORPUS_BIN, "rb")
+        if self.indice.get("total_bytes", 0) > 0:
+            self._mm = mmap.mmap(self._arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._mm = b""
+        self.documentos: Dict[str, Dict[str, Any]] = self.indice["documentos"]
+        self._passagens: List[List[Any]] = self.indice["passagens"]
+
+    # --------------------------------------------------
+    # Acesso
+    # --------------------------------------------------
+    def __len__(self) -> int:
+        return len(self._passagens)
+
+    def _fatia(self, inicio: int, fim: int) -> str:
+        return self._mm[inicio:fim].decode("utf-8", errors="ignore")
+
+    def passagem(self, pid: int) -> str:
+        """Retorna o texto da passagem pelo id (posição na tabela de offsets)."""
+        _, inicio, fim = self._passagens[pid]
+        return self._fatia(inicio, fim)
+
+    def metadados(self, pid: int) -> Dict[str, Any]:
+        """Metadados da passagem: documento de origem, pasta, offsets e ordem."""
+        doc_id, inicio, fim = self._passagens[pid]
+        doc = self.documentos[doc_id]
+        return {
+            "id": pid,
+            "doc_id": doc_id,
+            "pasta": doc["pasta"],
+            "arquivo": doc["arquivo"],
+            "inicio": inicio,
+            "fim": fim,
+            "ordem": pid - doc["passagens"][0],
+        }
+
+    def passagens_do_documento(self, doc_id: str) -> List[int]:
+        """Ids das passagens de um documento, em ordem."""
+        doc = self.documentos.get(doc_id)
+        if not doc:
+            return []
+        return list(range(*doc["passagens"]))
+
+    def documento(self, doc_id: str) -> str:
+        """Texto integral de um documento."""
+        doc = self.documentos.get(doc_id)
+        return self._fatia(doc["inicio"], doc["fim"]) if doc else ""
+
+    def documentos_da_pasta(self, pasta: str) -> List[str]:
+        """Ids dos documentos sob a pasta informada (inclui subpastas)."""
+        prefixo = pasta.strip("/")
+        return [
+            d for d, meta in self.documentos.items()
+            if meta["pasta"] == prefixo or meta["pasta"].startswith(prefixo + "/")
+        ]
+
+    def iterar_passagens(self, pasta: Optional[str] = None) -> Iterator[Tuple[int, str]]:
+        """Itera (id, texto) de todas as passagens, opcionalmente filtrando por pasta."""
+        docs = self.documentos_da_pasta(pasta) if pasta else list(self.documentos)
+        for doc_id in docs:
+            for pid in self.passagens_do_documento(doc_id):
+                yield pid, self.passagem(pid)
+
+    def ler_pastas(self, subpastas: List[str], max_chars: int = 20000) -> str:
+        """
+        Equivalente a knowledge_loader.read_txt_files, servido pelo corpus:
+        concatena documentos das subpastas até o limite de caracteres.
+        """
+        chunks: List[str] = []
+        total = 0
+        for sub in subpastas:
+            for doc_id in self.documentos_da_pasta(sub):
+                if not doc_id.lower().endswith(".txt"):
+                    continue
+                texto = self.documento(doc_id)
+                if not texto.strip():
+                    continue
+                if total + len(texto) > max_chars:
+                    texto = texto[:max(0, max_chars - total)]
+                chunks.append(f"\n\n=== {self.documentos[doc_id]['arquivo']} ===\n" + texto)
+                total += len(texto)
+                if total >= max_chars:
+                    return "\n".join(chunks)
+        return "\n".join(chunks)
+
+    # --------------------------------------------------
+    # Manutenção
+    # --------------------------------------------------
+    def esta_atualizado(self, kb_root: Path = KB_ROOT) -> bool:
+        """Compara mtime/tamanho dos arquivos de origem com o índice."""
+        kb_root = Path(kb_root)
+        atuais = {}
+        for arq in _listar_arquivos(kb_root):
+            st = arq.stat()
+            atuais[arq.relative_to(kb_root).as_posix()] = (st.st_mtime_ns, st.st_size)
+        for doc_id, meta in self.documentos.items():
+            if atuais.pop(doc_id, None) != (meta["mtime_ns"], meta["tamanho"]):
+                return False
+        for doc_id, (mtime_ns, tamanho) in self.indice.get("ignorados", {}).items():
+            if atuais.pop(doc_id, None) != (mtime_ns, tamanho):
+                return False
+        # Qualquer arquivo restante é novo na knowledge_base
+        return not atuais
+
+    def fechar(self) -> None:
+        if isinstance(self._mm, mmap.mmap):
+            self._mm.close()
+        self._arquivo.close()
+
+
+# ======================================================
+# 🌐 Instância compartilhada
+# ======================================================
+_CORPUS: Optional[KBCorpus] = None
+_CORPUS_MARCA: Optional[Tuple[str, int, int]] = None
+_CORPUS_LOCK = threading.Lock()
+
+
+def _marca_indice(diretorio: Path) -> Optional[Tuple[str, int, int]]:
+    """(diretório, mtime_ns, tamanho) do índice; muda a cada construir_corpus."""
+    try:
+        st = (Path(diretorio) / CORPUS_INDEX).stat()
+    except OSError:
+        return None
+    return str(Path(diretorio)), st.st_mtime_ns, st.st_size
+
+
+def obter_corpus(diretorio: Path = CORPUS_DIR) -> Optional[KBCorpus]:
+    """
+    Retorna o corpus aberto (compartilhado pelo processo) ou None se o
+    build ainda não foi executado. Se o índice foi regravado (novo
+    construir_corpus), o corpus é reaberto. Chamadores devem manter o
+    caminho tradicional (knowledge_loader) como fallback.
+    """
+    global _CORPUS, _CORPUS_MARCA
+    marca = _marca_indice(diretorio)
+    if marca is None:
+        return None
+    if _CORPUS is not None and _CORPUS_MARCA == marca:
+        return _CORPUS
+    with _CORPUS_LOCK:
+        if _CORPUS is None or _CORPUS_MARCA != marca:
+            try:
+                corpus = KBCorpus(diretorio)
+            except Exception as e:
+                print(f"[kb_corpus] ⚠️ Corpus indisponível: {e}")
+                return None
+            # O corpus anterior não é fechado: leitores em andamento ainda o usam
+            # (o mmap mantém o arquivo antigo até ser coletado).
+            _CORPUS, _CORPUS_MARCA = corpus, marca
+    return _CORPUS
+
+
+# ======================================================
+# 🚀 Execução direta (build)
+# ======================================================
+if __name__ == "__main__":
+    resumo = construir_corpus()
+    print(
+        f"✅ Corpus gerado: {resumo['documentos']} documentos, "
+        f"{resumo['passagens']} passagens, {resumo['total_bytes']:,} bytes"
+    )
+    print(f"   {resumo['bin_path']}")
+    print(f"   {resumo['index_path']}")
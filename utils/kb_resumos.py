@@ -0,0 +1,416 @@
+# -*- coding: utf-8 -*-
+"""
+kb_resumos.py – Resumos hierárquicos pré-computados da knowledge_base
+==============================================================
+Modelos como o TR de Obras e Serviços de Engenharia passam de 100 KB
+de texto – muito além do que um prompt comporta. Este módulo gera,
+offline, resumos hierárquicos de cada modelo/manual:
+
+    documento → seções → cláusulas
+
+Os resumos são extrativos (frases mais representativas de cada
+trecho, sem chamada à IA) e ficam em cache em disco, um JSON por
+documento, com nome igual ao SHA-256 do conteúdo. Se o texto do
+modelo mudar, o hash muda e o resumo é refeito; textos idênticos
+copiados em várias pastas compartilham o mesmo cache.
+
+Os agentes pedem "o resumo das seções relevantes para este objeto"
+dentro de um orçamento de tokens, em vez de truncar o texto às cegas:
+    from utils.kb_resumos import resumo_relevante
+    contexto = resumo_relevante(["TR"], objeto, orcamento_tokens=1500)
+
+Build (linha de comando):
+    python -m utils.kb_resumos
+
+Versão: v2025.1
+==============================================================
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+import unicodedata
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from utils.knowledge_registry import (
+    BASE_DIR,
+    CONTRATO_MODELS_DIR,
+    EXTENSOES_TEXTO,
+    KB_ROOT,
+)
+from utils.knowledge_loader import ler_documento
+
+# ======================================================
+# 🔧 Configurações e Paths
+# ======================================================
+RESUMOS_DIR = BASE_DIR / "exports" / "cache" / "resumos"
+
+VERSAO_FORMATO = 1
+
+# Aproximação de tokens por caracteres (pt-BR, modelos OpenAI)
+CHARS_POR_TOKEN = 4
+
+# Limites de frases extraídas por nível
+FRASES_DOCUMENTO = 5
+FRASES_SECAO = 3
+FRASES_CLAUSULA = 1
+
+# Seções menores que isto (caracteres) são anexadas à anterior
+MIN_CHARS_SECAO = 200
+
+STOPWORDS = {
+    "a", "o", "e", "de", "da", "do", "das", "dos", "em", "no", "na", "nos", "nas",
+    "para", "por", "com", "sem", "um", "uma", "uns", "umas", "ao", "aos", "as", "os",
+    "que", "se", "ou", "como", "mais", "menos", "ser", "sera", "pelo", "pela", "pelos",
+    "pelas", "sua", "seu", "suas", "seus", "este", "esta", "esse", "essa", "isto",
+    "quando", "onde", "deve", "devera", "deverao", "sao", "nao", "sob", "entre", "ate",
+    "lei", "art", "artigo", "inciso", "item",
+}
+
+_RE_PALAVRA = re.compile(r"[a-z0-9]+")
+_RE_FRASE = re.compile(r"(?<=[.;:!?])\s+(?=[A-ZÀ-Ú0-9(“\"])")
+_RE_CLAUSULA = re.compile(r"^\s*(\d{1,2}(?:\.\d{1,2}){1,4}\.?)\s+\S", re.MULTILINE)
+_RE_TITULO_NUMERADO = re.compile(r"^\s*(\d{1,2})\.?\s+([A-ZÀ-Ú][^a-z]{3,})$")
+_RE_TITULO_CLAUSULA = re.compile(r"^\s*#*\s*CL[ÁA]USULA\b", re.IGNORECASE)
+_RE_TITULO_MARKDOWN = re.compile(r"^\s*#{1,4}\s+(?=\w)")
+_RE_COMBINANTES = re.compile("[\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f]")
+
+
+# ======================================================
+# 🔤 Normalização e termos
+# ======================================================
+def _sem_acentos(texto: str) -> str:
+    if texto.isascii():
+        return texto
+    return _RE_COMBINANTES.sub("", unicodedata.normalize("NFKD", texto))
+
+
+def termos(texto: str) -> List[str]:
+    """Tokens minúsculos, sem acento e sem stopwords (mín. 3 caracteres)."""
+    return [
+        t for t in _RE_PALAVRA.findall(_sem_acentos(texto.lower()))
+        if len(t) >= 3 and t not in STOPWORDS
+    ]
+
+
+def estimar_tokens(texto: str) -> int:
+    return math.ceil(len(texto) / CHARS_POR_TOKEN)
+
+
+def hash_conteudo(texto: str) -> str:
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()
+
+
+# ======================================================
+# ✂️ Segmentação hierárquica
+# ======================================================
+def _eh_titulo(linha: str) -> bool:
+    s = linha.strip()
+    if not s or len(s) > 120:
+        return False
+    if _RE_TITULO_CLAUSULA.match(s) or _RE_TITULO_NUMERADO.match(s):
+        return True
+    if _RE_TITULO_MARKDOWN.match(s):
+        return True
+    # Linha curta predominantemente em maiúsculas (ex.: "OBRIGAÇÕES DA CONTRATADA")
+    letras = [c for c in s if c.isalpha()]
+    if len(letras) < 4 or s.upper().startswith("NOTA"):
+        return False
+    return sum(c.isupper() for c in letras) / len(letras) > 0.8
+
+
+def _limpar_titulo(linha: str) -> str:
+    return re.sub(r"\s+", " ", linha.strip().lstrip("#").strip()).rstrip(":")
+
+
+def dividir_secoes(texto: str) -> List[Tuple[str, str]]:
+    """
+    Divide o texto em [(título, corpo)] pelas linhas de título.
+    O trecho antes do primeiro título vira a seção "Preâmbulo";
+    seções muito curtas são anexadas à anterior.
+    """
+    secoes: List[List[str]] = [["Preâmbulo", ""]]
+    corpo: List[str] = []
+    for linha in texto.splitlines():
+        if _eh_titulo(linha):
+            secoes[-1][1] = "\n".join(corpo)
+            secoes.append([_limpar_titulo(linha), ""])
+            corpo = []
+        else:
+            corpo.append(linha)
+    secoes[-1][1] = "\n".join(corpo)
+
+    resultado: List[Tuple[str, str]] = []
+    for titulo, conteudo in secoes:
+        conteudo = conteudo.strip()
+        if resultado and len(conteudo) < MIN_CHARS_SECAO:
+            anterior_titulo, anterior = resultado[-1]
+            resultado[-1] = (anterior_titulo, f"{anterior}\n{titulo}\n{conteudo}".strip())
+        elif conteudo or titulo != "Preâmbulo":
+            resultado.append((titulo, conteudo))
+    return resultado
+
+
+def dividir_clausulas(secao: str) -> List[Tuple[str, str]]:
+    """
+    Divide o corpo de uma seção em [(rótulo, texto)] pelas numerações
+    de cláusula (7.1, 8.5.3.1. ...). Sem numeração, usa parágrafos.
+    """
+    marcas = list(_RE_CLAUSULA.finditer(secao))
+    if marcas:
+        clausulas = []
+        for i, m in enumerate(marcas):
+            fim = marcas[i + 1].start() if i + 1 < len(marcas) else len(secao)
+            clausulas.append((m.group(1).rstrip("."), secao[m.start():fim].strip()))
+        return clausulas
+    paragrafos = [p.strip() for p in re.split(r"\n\s*\n", secao) if p.strip()]
+    return [(f"§{i + 1}", p) for i, p in enumerate(paragrafos)]
+
+
+# ======================================================
+# 📝 Resumo extrativo
+# ======================================================
+def _frases(texto: str) -> List[str]:
+    texto = re.sub(r"[ \t]+", " ", texto)
+    partes = []
+    for bloco in re.split(r"\n\s*\n|\n(?=\s*\d+(?:\.\d+)*\.?\s)", texto):
+        bloco = " ".join(bloco.split())
+        if bloco:
+            partes.extend(f.strip() for f in _RE_FRASE.split(bloco) if f.strip())
+    return [f for f in partes if len(f) >= 25]
+
+
+def resumir_extrativo(texto: str, max_frases: int, max_chars_frase: int = 320) -> str:
+    """
+    Seleciona as frases de maior peso (frequência dos termos no
+    trecho, normalizada pelo tamanho, com bônus para a frase inicial)
+    e as devolve na ordem original.
+    """
+    frases = _frases(texto)
+    if not frases:
+        return ""
+    freq = Counter(termos(texto))
+    pontuadas = []
+    for i, frase in enumerate(frases):
+        tf = termos(frase)
+        if not tf:
+            continue
+        peso = sum(freq[t] for t in set(tf)) / math.sqrt(len(tf))
+        if i == 0:
+            peso *= 1.5
+        pontuadas.append((peso, i))
+    escolhidas = sorted(i for _, i in sorted(pontuadas, reverse=True)[:max_frases])
+    return " ".join(
+        frases[i] if len(frases[i]) <= max_chars_frase else frases[i][:max_chars_frase].rsplit(" ", 1)[0] + "…"
+        for i in escolhidas
+    )
+
+
+def resumir_documento(texto: str, titulo: str = "") -> Dict[str, Any]:
+    """Constrói o resumo hierárquico (documento → seções → cláusulas)."""
+    secoes = []
+    for titulo_secao, corpo in dividir_secoes(texto):
+        clausulas = [
+            {"rotulo": rotulo, "resumo": resumo}
+            for rotulo, trecho in dividir_clausulas(corpo)
+            if (resumo := resumir_extrativo(trecho, FRASES_CLAUSULA))
+        ]
+        resumo_secao = resumir_extrativo(corpo, FRASES_SECAO)
+        contagem = Counter(termos(f"{titulo_secao} {corpo}"))
+        secoes.append({
+            "titulo": titulo_secao,
+            "resumo": resumo_secao,
+            "chars_originais": len(corpo),
+            "termos": [t for t, _ in contagem.most_common(40)],
+            "clausulas": clausulas,
+        })
+    return {
+        "versao": VERSAO_FORMATO,
+        "hash": hash_conteudo(texto),
+        "titulo": titulo,
+        "chars_originais": len(texto),
+        "resumo": resumir_extrativo(texto, FRASES_DOCUMENTO),
+        "secoes": secoes,
+        "gerado_em": datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+# ======================================================
+# 💾 Cache por hash de conteúdo
+# ======================================================
+_MEMORIA: Dict[str, Dict[str, Any]] = {}
+_LOCK = threading.Lock()
+
+
+def obter_resumo(caminho: Path | str, destino: Path = RESUMOS_DIR) -> Optional[Dict[str, Any]]:
+    """
+    Retorna o resumo hierárquico do arquivo, lendo do cache (memória
+    ou disco) pelo hash do conteúdo; gera e grava se ainda não existir.
+    """
+    caminho = Path(caminho)
+    texto = ler_documento(caminho)
+    if not texto.strip():
+        return None
+    chave = hash_conteudo(texto)
+
+    with _LOCK:
+        if chave in _MEMORIA:
+            return _MEMORIA[chave]
+
+    arquivo = Path(destino) / f"{chave}.json"
+    resumo = None
+    if arquivo.exists():
+        try:
+            resumo = json.loads(arquivo.read_text(encoding="utf-8"))
+            if resumo.get("versao") != VERSAO_FORMATO:
+                resumo = None
+        except Exception:
+            resumo = None
+
+    if resumo is None:
+        resumo = resumir_documento(texto, titulo=caminho.stem)
+        try:
+            arquivo.parent.mkdir(parents=True, exist_ok=True)
+            tmp = arquivo.with_suffix(".tmp")
+            tmp.write_text(json.dumps(resumo, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, arquivo)
+        except OSError as e:
+            print(f"[kb_resumos] ⚠️ Não foi possível gravar cache de {caminho.name}: {e}")
+
+    with _LOCK:
+        _MEMORIA[chave] = resumo
+    return resumo
+
+
+def _arquivos_base(pastas: Optional[Iterable[str]] = None) -> List[Path]:
+    """Arquivos de texto das pastas da knowledge_base (todas, se None) e modelos contratuais."""
+    raizes = [KB_ROOT / p for p in pastas] if pastas is not None else [KB_ROOT, CONTRATO_MODELS_DIR]
+    arquivos: List[Path] = []
+    for raiz in raizes:
+        if raiz.is_dir():
+            arquivos.extend(
+                p for p in sorted(raiz.rglob("*"))
+                if p.is_file() and p.suffix.lower() in EXTENSOES_TEXTO
+            )
+    return arquivos
+
+
+def gerar_resumos(destino: Path = RESUMOS_DIR, limpar_orfaos: bool = True) -> Dict[str, Any]:
+    """
+    Job offline: gera/atualiza o resumo de todos os modelos e manuais.
+    Com limpar_orfaos, remove do cache os hashes que não correspondem
+    mais a nenhum arquivo.
+    """
+    destino = Path(destino)
+    hashes = set()
+    documentos = 0
+    for arq in _arquivos_base():
+        resumo = obter_resumo(arq, destino)
+        if resumo:
+            hashes.add(resumo["hash"])
+            documentos += 1
+
+    removidos = 0
+    if limpar_orfaos and destino.is_dir():
+        for cache in destino.glob("*.json"):
+            if cache.stem not in hashes:
+                cache.unlink(missing_ok=True)
+                removidos += 1
+
+    stats = {
+        "documentos": documentos,
+        "resumos_unicos": len(hashes),
+        "orfaos_removidos": removidos,
+        "destino": str(destino),
+    }
+    print(f"[kb_resumos] ✅ {documentos} documentos, {len(hashes)} resumos únicos em {destino}")
+    return stats
+
+
+# ======================================================
+# 🎯 Seleção por relevância ao objeto
+# ======================================================
+def _pontuar(consulta: List[str], termos_trecho: Iterable[str], titulo: str) -> float:
+    if not consulta:
+        return 0.0
+    conjunto = set(termos_trecho)
+    titulo_termos = set(termos(titulo))
+    score = sum(1.0 for t in consulta if t in conjunto)
+    score += sum(2.0 for t in consulta if t in titulo_termos)
+    return score / len(consulta)
+
+
+def resumo_relevante(
+    pastas: Iterable[str] | None,
+    objeto: str,
+    orcamento_tokens: int = 1500,
+    arquivos: Optional[Iterable[Path | str]] = None,
+    destino: Path = RESUMOS_DIR,
+) -> str:
+    """
+    Monta um contexto com os resumos das seções mais relevantes para
+    o objeto, limitado a orcamento_tokens. Primeiro entram os resumos
+    de seção, por relevância; com orçamento restante, as cláusulas das
+    seções escolhidas que citam termos do objeto. Seções sem nenhum
+    termo do objeto só entram (em ordem) se nenhuma seção o citar.
+
+    pastas: subpastas de knowledge_base (ex.: ["TR"]); ignorado se
+    arquivos for informado.
+    """
+    caminhos = [Path(a) for a in arquivos] if arquivos is not None else _arquivos_base(pastas)
+    consulta = list(dict.fromkeys(termos(objeto or "")))
+
+    candidatos = []  # (score, ordem, documento, secao)
+    vistos = set()
+    for ordem, caminho in enumerate(caminhos):
+        resumo = obter_resumo(caminho, destino)
+        if not resumo or resumo["hash"] in vistos:
+            continue
+        vistos.add(resumo["hash"])
+        for i, secao in enumerate(resumo["secoes"]):
+            if not secao["resumo"]:
+                continue
+            score = _pontuar(consulta, secao["termos"], secao["titulo"])
+            candidatos.append((score, (ordem, i), resumo["titulo"], secao))
+
+    if consulta and any(c[0] > 0 for c in candidatos):
+        # Só seções que citam o objeto; sem nenhuma, vale a ordem do documento
+        candidatos = sorted((c for c in candidatos if c[0] > 0), key=lambda c: (-c[0], c[1]))
+    restante = orcamento_tokens
+    escolhidas: Dict[Tuple[int, int], Dict[str, Any]] = {}
+
+    for score, pos, doc, secao in candidatos:
+        bloco = f"[{doc}] {secao['titulo']}: {secao['resumo']}"
+        custo = estimar_tokens(bloco)
+        if custo <= restante:
+            escolhidas[pos] = {"doc": doc, "secao": secao, "linhas": [bloco], "score": score}
+            restante -= custo
+
+    # Expansão: cláusulas que mencionam o objeto, nas seções mais relevantes
+    if consulta:
+        for pos, item in sorted(escolhidas.items(), key=lambda e: -e[1]["score"]):
+            for clausula in item["secao"]["clausulas"]:
+                if not set(termos(clausula["resumo"])) & set(consulta):
+                    continue
+                linha = f"  - {clausula['rotulo']}: {clausula['resumo']}"
+                custo = estimar_tokens(linha)
+                if custo <= restante and clausula["resumo"] not in item["secao"]["resumo"]:
+                    item["linhas"].append(linha)
+                    restante -= custo
+
+    return "\n".join("\n".join(escolhidas[pos]["linhas"]) for pos in sorted(escolhidas))
+
+
+# ======================================================
+# 🧪 Execução direta (build)
+# ======================================================
+if __name__ == "__main__":
+    gerar_resumos()
@@ -5,43 +5,90 @@ utils/knowledge_loader.py – Carregador simples da knowledge_base
 
 Objetivo: Ler textos .txt de pastas selecionadas e fornecer um bloco de contexto
 para enriquecer o prompt do agente (sem dependência de embeddings neste patch).
+Quando o corpus empacotado (utils.kb_corpus) existe e está atualizado, os
+textos saem do mmap, sem abrir/decodificar arquivo a arquivo; senão são
+servidos pelo registro compartilhado (utils.knowledge_registry), evitando
+releitura do disco a cada chamada.
 """
 from __future__ import annotations
 import os
-from typing import List
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from utils.kb_corpus import KBCorpus, obter_corpus
+from utils.knowledge_registry import obter_registry
 
 
 KB_ROOT = os.path.join(os.path.dirname(os.path.dirname(__file__)), "knowledge_base")
 
+# Intervalo entre verificações de atualização do corpus (stat dos arquivos de origem)
+VALIDADE_CORPUS_S = 60.0
+
+_VALIDACAO = {"corpus": None, "atualizado": False, "verificado_em": 0.0}
+_VALIDACAO_LOCK = threading.Lock()
+
 
+def corpus_atualizado() -> Optional[KBCorpus]:
+    """Corpus empacotado, se existir e refletir a knowledge_base; senão None."""
+    corpus = obter_corpus()
+    if corpus is None:
+        return None
+    with _VALIDACAO_LOCK:
+        agora = time.monotonic()
+        if _VALIDACAO["corpus"] is not corpus or agora - _VALIDACAO["verificado_em"] > VALIDADE_CORPUS_S:
+            try:
+                atualizado = corpus.esta_atualizado(Path(KB_ROOT))
+            except OSError:
+                atualizado = False
+            _VALIDACAO.update(corpus=corpus, atualizado=atualizado, verificado_em=agora)
+        return corpus if _VALIDACAO["atualizado"] else None
+
+
+def ler_documento(caminho: Path | str) -> str:
+    """Texto de um arquivo da knowledge_base (corpus mmap → registro)."""
+    corpus = corpus_atualizado()
+    if corpus is not None:
+        try:
+            doc_id = Path(caminho).resolve().relative_to(Path(KB_ROOT).resolve()).as_posix()
+        except ValueError:
+            doc_id = ""
+        if doc_id in corpus.documentos:
+            return corpus.documento(doc_id)
+    return obter_registry().ler_texto(caminho)
 
 
 def read_txt_files(subfolders: List[str], max_chars: int = 20000) -> str:
-"""Concatena conteúdo .txt de subpastas sob knowledge_base, respeitando um limite de caracteres."""
-chunks: List[str] = []
-total = 0
-for sub in subfolders:
-base = os.path.join(KB_ROOT, sub)
-if not os.path.isdir(base):
-continue
-for root, _, files in os.walk(base):
-for fn in files:
-if not fn.lower().endswith(".txt"):
-continue
-path = os.path.join(root, fn)
-try:
-with open(path, "r", encoding="utf-8", errors="ignore") as f:
-text = f.read()
-if not text.strip():
-continue
-# Respeita orçamento simples de caracteres
-if total + len(text) > max_chars:
-remaining = max(0, max_chars - total)
-text = text[:remaining]
-chunks.append(f"\n\n=== {fn} ===\n" + text)
-total += len(text)
-if total >= max_chars:
-return "\n".join(chunks)
-except Exception:
-continue
-return "\n".join(chunks)
+    """Concatena conteúdo .txt de subpastas sob knowledge_base, respeitando um limite de caracteres."""
+    corpus = corpus_atualizado()
+    if corpus is not None:
+        return corpus.ler_pastas(subfolders, max_chars=max_chars)
+
+    registry = obter_registry()
+    chunks: List[str] = []
+    total = 0
+    for sub in subfolders:
+        base = os.path.join(KB_ROOT, sub)
+        if not os.path.isdir(base):
+            continue
+        for root, _, files in os.walk(base):
+            for fn in files:
+                if not fn.lower().endswith(".txt"):
+                    continue
+                path = os.path.join(root, fn)
+                try:
+                    text = registry.ler_texto(path)
+                    if not text.strip():
+                        continue
+                    # Respeita orçamento simples de caracteres
+                    if total + len(text) > max_chars:
+                        remaining = max(0, max_chars - total)
+                        text = text[:remaining]
+                    chunks.append(f"\n\n=== {fn} ===\n" + text)
+                    total += len(text)
+                    if total >= max_chars:
+                        return "\n".join(chunks)
+                except Exception:
+                    continue
+    return "\n".join(chunks)
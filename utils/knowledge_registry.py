@@ -0,0 +1,306 @@
+# -*- coding: utf-8 -*-
+"""
+knowledge_registry.py – Registro compartilhado de ativos de conhecimento
+==============================================================
+Cache em processo para os ativos lidos repetidamente pelos agentes
+e validadores:
+- textos da knowledge_base/ (.txt / .md)
+- modelos contratuais (knowledge/contrato_models/)
+- checklists YAML (knowledge/ e knowledge/validators/)
+
+Cada arquivo é lido e interpretado UMA vez por processo. Como o
+Streamlit executa todas as sessões e páginas no mesmo processo
+Python, o registro é compartilhado entre usuários. A invalidação é
+feita por arquivo, comparando mtime e tamanho a cada acesso (um
+os.stat, sem leitura do conteúdo).
+
+Uso típico:
+    from utils.knowledge_registry import obter_registry
+    reg = obter_registry()
+    texto = reg.ler_texto(caminho)
+    dados = reg.ler_yaml(caminho_checklist)
+
+Versão: v2025.1
+==============================================================
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import yaml  # pyyaml
+except Exception:  # pragma: no cover
+    yaml = None
+
+# ======================================================
+# 🔧 Configurações e Paths
+# ======================================================
+BASE_DIR = Path(__file__).resolve().parents[1]
+KB_ROOT = BASE_DIR / "knowledge_base"
+KNOWLEDGE_DIR = BASE_DIR / "knowledge"
+CONTRATO_MODELS_DIR = KNOWLEDGE_DIR / "contrato_models"
+VALIDATORS_DIR = KNOWLEDGE_DIR / "validators"
+
+# Extensões tratadas como texto da base de conhecimento
+EXTENSOES_TEXTO = (".txt", ".md")
+
+
+# ======================================================
+# 🧮 Contabilidade de memória
+# ======================================================
+def _estimar_bytes(obj: Any, _vistos: Optional[set] = None) -> int:
+    """
+    Estima recursivamente a memória ocupada por um objeto Python
+    (strings, listas e dicionários vindos de YAML/texto).
+    """
+    if _vistos is None:
+        _vistos = set()
+    oid = id(obj)
+    if oid in _vistos:
+        return 0
+    _vistos.add(oid)
+
+    total = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            total += _estimar_bytes(k, _vistos) + _estimar_bytes(v, _vistos)
+    elif isinstance(obj, (list, tuple, set)):
+        for v in obj:
+            total += _estimar_bytes(v, _vistos)
+    return total
+
+
+# ======================================================
+# 📚 Registro de ativos
+# ======================================================
+class KnowledgeRegistry:
+    """
+    Cache thread-safe de ativos de conhecimento, invalidado por
+    alteração de arquivo (mtime_ns + tamanho).
+
+    Os valores devolvidos são compartilhados entre sessões e devem
+    ser tratados como somente leitura pelos chamadores.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        # chave: (tipo, caminho absoluto) → entrada
+        self._entradas: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._hits = 0
+        self._misses = 0
+        self._aquecido_em: Optional[str] = None
+
+    # --------------------------------------------------
+    # Núcleo: leitura com invalidação por assinatura
+    # --------------------------------------------------
+    @staticmethod
+    def _assinatura(caminho: Path) -> Optional[Tuple[int, int]]:
+        try:
+            st = caminho.stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _obter(self, tipo: str, caminho: Path, carregador: Callable[[Path], Any]) -> Any:
+        caminho = Path(caminho).resolve()
+        chave = (tipo, str(caminho))
+        assinatura = self._assinatura(caminho)
+
+        if assinatura is None:
+            # Arquivo removido: descarta entrada antiga
+            with self._lock:
+                self._entradas.pop(chave, None)
+            return None
+
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is not None and entrada["assinatura"] == assinatura:
+                self._hits += 1
+                return entrada["valor"]
+
+        # Leitura fora do lock para não bloquear outras sessões
+        valor = carregador(caminho)
+
+        with self._lock:
+            self._misses += 1
+            self._entradas[chave] = {
+                "assinatura": assinatura,
+                "valor": valor,
+                "bytes": _estimar_bytes(valor),
+                "carregado_em": time.time(),
+            }
+        return valor
+
+    # --------------------------------------------------
+    # Carregadores
+    # --------------------------------------------------
+    @staticmethod
+    def _carregar_texto(caminho: Path) -> str:
+        try:
+            return caminho.read_text(encoding="utf-8", errors="ignore")
+        except Exception:
+            return ""
+
+    @staticmethod
+    def _carregar_yaml(caminho: Path) -> Any:
+        if yaml is None:
+            return None
+        try:
+            with open(caminho, "r", encoding="utf-8") as f:
+                return yaml.safe_load(f)
+        except Exception as e:
+            print(f"[knowledge_registry] ⚠️ Falha ao carregar YAML {caminho.name}: {e}")
+            return None
+
+    # --------------------------------------------------
+    # API pública
+    # --------------------------------------------------
+    def ler_texto(self, caminho: Path | str) -> str:
+        """Retorna o conteúdo textual (UTF-8) do arquivo, ou "" se ausente."""
+        valor = self._obter("texto", Path(caminho), self._carregar_texto)
+        return valor or ""
+
+    def ler_yaml(self, caminho: Path | str) -> Any:
+        """Retorna o YAML interpretado do arquivo, ou None se ausente/inválido."""
+        return self._obter("yaml", Path(caminho), self._carregar_yaml)
+
+    def listar_textos(
+        self,
+        pasta: Path | str,
+        padrao: str = "*.txt",
+        recursivo: bool = False,
+    ) -> Dict[str, str]:
+        """
+        Retorna {nome_arquivo: conteúdo} para os arquivos da pasta que
+        casam com o padrão, em ordem de nome. Apenas arquivos novos ou
+        alterados são relidos do disco.
+        """
+        pasta = Path(pasta)
+        if not pasta.is_dir():
+            return {}
+        arquivos = sorted(pasta.rglob(padrao) if recursivo else pasta.glob(padrao))
+        return {arq.name: self.ler_texto(arq) for arq in arquivos if arq.is_file()}
+
+    def invalidar(self, caminho: Path | str | None = None) -> None:
+        """Descarta uma entrada específica ou todo o cache (caminho=None)."""
+        with self._lock:
+            if caminho is None:
+                self._entradas.clear()
+                return
+            alvo = str(Path(caminho).resolve())
+            for chave in [k for k in self._entradas if k[1] == alvo]:
+                del self._entradas[chave]
+
+    def aquecer(self) -> Dict[str, Any]:
+        """
+        Pré-carrega knowledge_base/, modelos contratuais e checklists
+        YAML. Destinado à inicialização do servidor (Home.py).
+        """
+        inicio = time.perf_counter()
+
+        if KB_ROOT.is_dir():
+            for arq in KB_ROOT.rglob("*"):
+                if arq.is_file() and arq.suffix.lower() in EXTENSOES_TEXTO:
+                    self.ler_texto(arq)
+
+        self.listar_textos(CONTRATO_MODELS_DIR, "*.txt")
+
+        for pasta in (KNOWLEDGE_DIR, VALIDATORS_DIR):
+            if pasta.is_dir():
+                for arq in sorted(pasta.glob("*.yml")):
+                    self.ler_yaml(arq)
+
+        with self._lock:
+            self._aquecido_em = time.strftime("%Y-%m-%d %H:%M:%S")
+
+        stats = self.estatisticas()
+        stats["tempo_aquecimento_s"] = round(time.perf_counter() - inicio, 3)
+        print(
+            f"[knowledge_registry] ✅ Aquecido: {stats['total_entradas']} ativos, "
+            f"{stats['memoria_mb']} MB em {stats['tempo_aquecimento_s']}s"
+        )
+        return stats
+
+    def estatisticas(self) -> Dict[str, Any]:
+        """Resumo de uso do cache: entradas, memória estimada e taxa de acerto."""
+        with self._lock:
+            por_tipo: Dict[str, Dict[str, int]] = {}
+            total_bytes = 0
+            for (tipo, _), entrada in self._entradas.items():
+                grupo = por_tipo.setdefault(tipo, {"entradas": 0, "bytes": 0})
+                grupo["entradas"] += 1
+                grupo["bytes"] += entrada["bytes"]
+                total_bytes += entrada["bytes"]
+            acessos = self._hits + self._misses
+            return {
+                "total_entradas": len(self._entradas),
+                "memoria_bytes": total_bytes,
+                "memoria_mb": round(total_bytes / (1024 * 1024), 2),
+                "por_tipo": por_tipo,
+                "hits": self._hits,
+                "misses": self._misses,
+                "taxa_acerto": round(self._hits / acessos, 3) if acessos else 0.0,
+                "aquecido_em": self._aquecido_em,
+            }
+
+    def maiores_ativos(self, limite: int = 10) -> List[Dict[str, Any]]:
+        """Lista os ativos que mais ocupam memória (diagnóstico)."""
+        with self._lock:
+            itens = [
+                {"tipo": tipo, "caminho": caminho, "bytes": e["bytes"]}
+                for (tipo, caminho), e in self._entradas.items()
+            ]
+        return sorted(itens, key=lambda i: i["bytes"], reverse=True)[:limite]
+
+
+# ======================================================
+# 🌐 Instância única por processo
+# ======================================================
+_REGISTRY: Optional[KnowledgeRegistry] = None
+_REGISTRY_LOCK = threading.Lock()
+_AQUECIMENTO_INICIADO = False
+
+
+def obter_registry() -> KnowledgeRegistry:
+    """Retorna o registro compartilhado do processo (criado sob demanda)."""
+    global _REGISTRY
+    if _REGISTRY is None:
+        with _REGISTRY_LOCK:
+            if _REGISTRY is None:
+                _REGISTRY = KnowledgeRegistry()
+    return _REGISTRY
+
+
+def aquecer_registry(em_segundo_plano: bool = True) -> None:
+    """
+    Hook de aquecimento chamado na subida do servidor. Executa apenas
+    uma vez por processo; por padrão roda em thread daemon para não
+    atrasar a renderização da primeira página.
+    """
+    global _AQUECIMENTO_INICIADO
+    with _REGISTRY_LOCK:
+        if _AQUECIMENTO_INICIADO:
+            return
+        _AQUECIMENTO_INICIADO = True
+
+    reg = obter_registry()
+    if em_segundo_plano:
+        threading.Thread(target=reg.aquecer, name="knowledge-warmup", daemon=True).start()
+    else:
+        reg.aquecer()
+
+
+# ======================================================
+# 🧪 Execução direta (diagnóstico)
+# ======================================================
+if __name__ == "__main__":
+    reg = obter_registry()
+    stats = reg.aquecer()
+    print(stats)
+    for item in reg.maiores_ativos(5):
+        print(f"  {item['bytes']:>12,} B  {Path(item['caminho']).name}")
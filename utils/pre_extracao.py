@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+"""
+pre_extracao.py – Pré-extração determinística de campos estruturados
+==============================================================
+Número do contrato, data de assinatura, valores, vigência, prazos e
+CNPJ costumam estar escritos literalmente no insumo. Pedir ao modelo
+que os "gere" custa tokens de saída e abre espaço para números
+inventados. Este módulo, antes da chamada à IA:
+
+    1. procura cada campo junto de uma âncora ("valor global",
+       "vigência", "assinado em" …) usando utils.extracao_br;
+    2. descarta o campo se as ocorrências ancoradas discordam no valor
+       normalizado;
+    3. o fato é FIXO (alta confiança) só se o valor estiver na mesma
+       frase/cláusula da âncora: o agente o informa como dado fixo,
+       retira do esquema de geração e grava por cima da resposta do
+       modelo. Um valor achado além da frase da âncora (ex.: título
+       "DA VIGÊNCIA" seguido de um prazo qualquer) vai só como indício,
+       e o modelo decide.
+
+Uso:
+    from utils.pre_extracao import pre_extrair, bloco_fatos, fixos
+    fatos = pre_extrair("CONTRATO", texto)
+    fixos(fatos)   # só os de alta confiança
+
+Versão: v2025.1
+==============================================================
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, replace
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple
+
+from utils.extracao_br import extrair, formatar_brl
+
+# ======================================================
+# ⚙️ Parâmetros
+# ======================================================
+JANELA = 160                 # caracteres após a âncora em que o valor é procurado
+LIMITE_SENTENCA = 400        # campos "sentenca" mais longos ficam com o trecho
+CNPJS_CONTRATANTE = {"51.174.001/0001-50"}   # TJSP
+
+_RE_NUMERO_CONTRATO = re.compile(
+    r"\bcontrato(?:\s+administrativo)?\s*n[º°o.]*\s*(?P<v>\d{1,6}/\d{4})\b", re.IGNORECASE
+)
+_RE_CNPJ_FORMATO = re.compile(r"\d{2}\.?\d{3}\.?\d{3}/?\d{4}-?\d{2}")
+_RE_FIM_FRASE = re.compile(r"[.;](?:\s|$)|\n")
+
+
+@dataclass(frozen=True)
+class Especificacao:
+    campo: str
+    ancora: Pattern
+    tipo: str                 # tipo de utils.extracao_br
+    formato: str = "canonico"  # canonico | trecho | sentenca
+
+
+def _ancora(padrao: str) -> Pattern:
+    return re.compile(padrao, re.IGNORECASE)
+
+
+ESPECIFICACOES: Dict[str, Tuple[Especificacao, ...]] = {
+    "CONTRATO": (
+        Especificacao("data_assinatura", _ancora(r"assinad[oa]\s+em|data\s+d[ae]\s+assinatura|assinatura\s*:"), "data"),
+        Especificacao("valor_global", _ancora(r"valor\s+(?:global|total)(?:\s+do\s+contrato)?"), "valor"),
+        Especificacao("vigencia", _ancora(r"vig[êe]ncia"), "prazo", "sentenca"),
+    ),
+    "DFD": (
+        Especificacao("valor_estimado", _ancora(
+            r"valor\s+(?:total\s+)?estimado|estimativa\s+d[eo]\s+valor|or[çc]amento\s+estimado"
+        ), "valor"),
+        Especificacao("prazo_estimado", _ancora(
+            r"prazo\s+(?:estimado|de\s+execu[çc][ãa]o|de\s+vig[êe]ncia|contratual)"
+        ), "prazo", "trecho"),
+    ),
+}
+
+
+@dataclass(frozen=True)
+class Fato:
+    campo: str
+    valor: str
+    evidencia: str
+    fixo: bool = True          # False: indício para o modelo, sem sobrescrever a resposta
+
+
+# ======================================================
+# 🔎 Extração ancorada
+# ======================================================
+def _chave(tipo: str, valor) -> object:
+    return valor["dias"] if tipo == "prazo" else valor
+
+
+def _formatar(tipo: str, valor) -> str:
+    if tipo == "valor":
+        return formatar_brl(valor)
+    if tipo == "data":
+        return valor.strftime("%d/%m/%Y")
+    return str(valor)
+
+
+def _sentenca(texto: str, inicio: int, fim: int) -> str:
+    ini = max(texto.rfind(".", 0, inicio), texto.rfind("\n", 0, inicio)) + 1
+    candidatos = [p for p in (texto.find(". ", fim), texto.find("\n", fim)) if p >= 0]
+    fim_sentenca = min(candidatos) + 1 if candidatos else len(texto)
+    return texto[ini:fim_sentenca].strip()
+
+
+def _ancorado(texto: str, espec: Especificacao) -> Optional[Fato]:
+    candidatos: Dict[object, Fato] = {}
+    na_frase = set()          # valores achados na mesma frase da âncora
+    for m in espec.ancora.finditer(texto):
+        janela = texto[m.end():m.end() + JANELA].split("\n\n", 1)[0]
+        achados = extrair(janela, (espec.tipo,))[espec.tipo]
+        if not achados:
+            continue
+        e = achados[0]
+        fim = m.end() + e.fim
+        evidencia = texto[m.start():fim]
+        if espec.formato == "trecho":
+            valor = e.trecho
+        elif espec.formato == "sentenca":
+            valor = _sentenca(texto, m.end() + e.inicio, fim)
+            valor = valor if len(valor) <= LIMITE_SENTENCA else e.trecho
+        else:
+            valor = _formatar(espec.tipo, e.valor)
+        chave = _chave(espec.tipo, e.valor)
+        if not _RE_FIM_FRASE.search(janela[:e.inicio]):
+            na_frase.add(chave)
+        # Entre ocorrências concordantes, fica a mais próxima da âncora
+        if chave not in candidatos or len(evidencia) < len(candidatos[chave].evidencia):
+            candidatos[chave] = Fato(espec.campo, valor, evidencia)
+    # Valores discordantes: o campo fica para o modelo
+    if len(candidatos) != 1:
+        return None
+    chave, fato = next(iter(candidatos.items()))
+    return fato if chave in na_frase else replace(fato, fixo=False)
+
+
+def _unico(texto: str, regex: Pattern, campo: str) -> Optional[Fato]:
+    valores = {m.group("v"): m.group() for m in regex.finditer(texto)}
+    if len(valores) != 1:
+        return None
+    valor, evidencia = next(iter(valores.items()))
+    return Fato(campo, valor, evidencia)
+
+
+def _cnpj_contratada(texto: str) -> Optional[Fato]:
+    achados = [e for e in extrair(texto, ("cnpj",))["cnpj"] if e.valor not in CNPJS_CONTRATANTE]
+    if len({e.valor for e in achados}) != 1:
+        return None
+    return Fato("cnpj_contratada", achados[0].valor, achados[0].trecho)
+
+
+def pre_extrair(artefato: str, texto: str) -> Dict[str, Fato]:
+    """
+    Campos de `artefato` extraídos do texto: fixos (alta confiança) ou
+    indícios (fixo=False). Campos ambíguos (valores discordantes) ficam
+    para o modelo.
+    """
+    artefato = (artefato or "").upper()
+    if not texto:
+        return {}
+    fatos: List[Optional[Fato]] = [_ancorado(texto, e) for e in ESPECIFICACOES.get(artefato, ())]
+    if artefato == "CONTRATO":
+        fatos.append(_unico(texto, _RE_NUMERO_CONTRATO, "numero_contrato"))
+        fatos.append(_cnpj_contratada(texto))
+    return {f.campo: f for f in fatos if f}
+
+
+# ======================================================
+# 🧩 Apoio aos agentes
+# ======================================================
+def fixos(fatos: Dict[str, Fato]) -> Dict[str, Fato]:
+    """Só os fatos de alta confiança (gravados por cima da resposta do modelo)."""
+    return {campo: f for campo, f in fatos.items() if f.fixo}
+
+
+def bloco_fatos(fatos: Dict[str, Fato]) -> str:
+    """Trecho de prompt com os dados fixos e os indícios (vazio sem fatos)."""
+    bloco = ""
+    linhas = "\n".join(f"- {f.campo}: {f.valor}" for f in fatos.values() if f.fixo)
+    if linhas:
+        bloco += (
+            "**DADOS FIXOS (extraídos literalmente do documento – NÃO gere, NÃO altere):**\n"
+            f"{linhas}\n"
+            "Use-os de forma coerente nos demais campos.\n"
+        )
+    linhas = "\n".join(f"- {f.campo}: {f.valor}" for f in fatos.values() if not f.fixo)
+    if linhas:
+        bloco += (
+            "**INDÍCIOS (encontrados perto do rótulo, mas não na mesma frase – confirme no documento):**\n"
+            f"{linhas}\n"
+        )
+    return bloco
+
+
+def remover_campos_json(formato: str, campos: Iterable[str]) -> str:
+    """Retira do modelo de resposta JSON as linhas `"campo": ...` dos campos."""
+    campos = list(campos)
+    if not campos:
+        return formato
+    padrao = re.compile(r'^[ \t]*"(?:' + "|".join(map(re.escape, campos)) + r')":[^\n]*\n', re.MULTILINE)
+    return padrao.sub("", formato)
+
+
+def substituir_cnpj(texto: str, cnpj: str) -> str:
+    """Troca qualquer CNPJ do texto pelo extraído; sem CNPJ, acrescenta-o."""
+    if not texto:
+        return f"CNPJ nº {cnpj}"
+    if _RE_CNPJ_FORMATO.search(texto):
+        return _RE_CNPJ_FORMATO.sub(cnpj, texto)
+    return f"{texto.rstrip(' .,;')}, inscrita no CNPJ sob o nº {cnpj}"
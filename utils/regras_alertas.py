@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+"""
+regras_alertas.py – Regras declarativas do pipeline de alertas
+==============================================================
+As regras de alerta por documento (campos obrigatórios, tamanhos
+mínimos, placeholders, quantidade de itens, faixas de valor) ficam em
+knowledge/regras_alertas.yml, no mesmo espírito dos checklists.
+
+O YAML é compilado UMA vez num RegrasAlertas imutável: regexes
+pré-compiladas, testes convertidos em funções, modelos de mensagem
+validados e regras agrupadas por módulo. A avaliação de um documento
+é uma única passada pelas regras do módulo, com a forma normalizada de
+cada campo calculada uma só vez. O conjunto é recompilado quando o
+arquivo muda (mtime/tamanho), sem reiniciar o servidor.
+
+Uso:
+    from utils.regras_alertas import carregar_regras
+    alertas = carregar_regras().avaliar("DFD", campos)
+
+Versão: v2025.1
+==============================================================
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from utils.extracao_br import valor_brl
+from utils.knowledge_registry import obter_registry
+
+# ======================================================
+# 🔧 Configurações
+# ======================================================
+BASE_DIR = Path(__file__).resolve().parents[1]
+REGRAS_PATH = BASE_DIR / "knowledge" / "regras_alertas.yml"
+
+SEVERIDADE_POR_TIPO = {"Crítico": "alto", "Médio": "medio", "Informativo": "baixo"}
+TESTES = ("min_caracteres", "min_itens", "em", "padrao", "sem_padrao", "min_valor", "max_valor")
+# Opções de regra → testes que as aceitam
+OPCOES_TESTE = {
+    "ignorar_caixa": ("em", "padrao", "sem_padrao"),
+    "ignorar_espacos": ("min_caracteres",),
+}
+_PARAMETROS_MENSAGEM = {"modulo": "", "campo": "", "tamanho": 0, "limite": 0, "itens": 0, "valor": 0.0}
+
+# ======================================================
+# 🧱 Estruturas compiladas
+# ======================================================
+# Teste compilado: recebe (texto, eh_texto) do campo e devolve os
+# parâmetros da mensagem quando a regra dispara, ou None.
+Teste = Callable[[str, bool], Optional[Dict[str, Any]]]
+
+
+@dataclass(frozen=True)
+class RegraCompilada:
+    id: str
+    modulo: str
+    campo: str
+    tipo: str
+    severidade: str
+    categoria: str
+    mensagem: str
+    recomendacao: str
+    quando_vazio: bool
+    teste: Optional[Teste]
+
+
+@dataclass(frozen=True)
+class RegrasAlertas:
+    versao: str
+    assinatura: str
+    limites: Dict[str, Any]
+    por_modulo: Dict[str, Tuple[RegraCompilada, ...]]
+    consistencia: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+
+    @property
+    def campos_consistencia(self) -> Tuple[str, ...]:
+        return tuple(c for campos in self.consistencia.values() for c in campos)
+
+    def avaliar(self, modulo: str, campos: Dict[str, Any], timestamp: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Alertas do documento, na ordem das regras do YAML."""
+        if not campos or not isinstance(campos, dict):
+            return []
+        timestamp = timestamp or datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+        visoes: Dict[str, Tuple[str, bool, bool]] = {}
+        alertas = []
+        for regra in self.por_modulo.get(modulo, ()):
+            visao = visoes.get(regra.campo)
+            if visao is None:
+                visao = visoes[regra.campo] = _visao(campos.get(regra.campo))
+            texto, eh_texto, vazio = visao
+
+            if vazio:
+                if not regra.quando_vazio:
+                    continue
+                parametros: Optional[Dict[str, Any]] = {"tamanho": 0}
+            else:
+                parametros = regra.teste(texto, eh_texto) if regra.teste else None
+            if parametros is None:
+                continue
+
+            parametros.update(modulo=modulo, campo=regra.campo)
+            alertas.append({
+                "id": regra.id,
+                "modulo": modulo,
+                "campo": regra.campo,
+                "tipo": regra.tipo,
+                "severidade": regra.severidade,
+                "categoria": regra.categoria,
+                "mensagem": regra.mensagem.format_map(_Parametros(parametros)),
+                "recomendacao": regra.recomendacao.format_map(_Parametros(parametros)),
+                "timestamp": timestamp,
+            })
+        return alertas
+
+
+class _Parametros(dict):
+    def __missing__(self, chave: str) -> Any:
+        return _PARAMETROS_MENSAGEM.get(chave, "")
+
+
+def _visao(valor: Any) -> Tuple[str, bool, bool]:
+    """(texto, veio como texto?, vazio?) de um campo. Só espaços não é vazio."""
+    if isinstance(valor, str):
+        return valor, True, not valor
+    if not valor:
+        return "", False, True
+    if isinstance(valor, (list, tuple)):
+        return "; ".join(str(v) for v in valor), False, False
+    return str(valor), False, False
+
+
+# ======================================================
+# ⚙️ Compilação
+# ======================================================
+def _compilar_teste(nome: str, parametro: Any, regra: Dict[str, Any]) -> Teste:
+    ignorar_caixa = bool(regra.get("ignorar_caixa", False))
+
+    if nome == "min_caracteres":
+        limite = int(parametro)
+        ignorar_espacos = bool(regra.get("ignorar_espacos", False))
+
+        def teste(texto: str, eh_texto: bool) -> Optional[Dict[str, Any]]:
+            tamanho = len(texto.strip() if ignorar_espacos else texto)
+            return {"tamanho": tamanho, "limite": limite} if eh_texto and tamanho < limite else None
+        return teste
+
+    if nome == "min_itens":
+        limite = int(parametro)
+        separador = str(regra.get("separador", ";"))
+
+        def teste(texto: str, eh_texto: bool) -> Optional[Dict[str, Any]]:
+            itens = sum(1 for x in texto.split(separador) if x.strip())
+            return {"itens": itens, "limite": limite, "tamanho": len(texto)} if itens < limite else None
+        return teste
+
+    if nome == "em":
+        caixa = str.casefold if ignorar_caixa else str
+        valores = frozenset(caixa(str(v)) for v in parametro or ())
+
+        def teste(texto: str, eh_texto: bool) -> Optional[Dict[str, Any]]:
+            return {"tamanho": len(texto)} if caixa(texto) in valores else None
+        return teste
+
+    if nome in ("padrao", "sem_padrao"):
+        regex = re.compile(str(parametro), re.IGNORECASE if ignorar_caixa else 0)
+        dispara_se_casar = nome == "padrao"
+
+        def teste(texto: str, eh_texto: bool) -> Optional[Dict[str, Any]]:
+            casou = regex.search(texto) is not None
+            return {"tamanho": len(texto)} if casou == dispara_se_casar else None
+        return teste
+
+    # min_valor / max_valor
+    limite_valor = float(parametro)
+    abaixo = nome == "min_valor"
+
+    def teste(texto: str, eh_texto: bool) -> Optional[Dict[str, Any]]:
+        valor = valor_brl(texto)
+        if valor is None or (valor < limite_valor if abaixo else valor > limite_valor):
+            return {"valor": valor or 0.0, "limite": limite_valor, "tamanho": len(texto)}
+        return None
+    return teste
+
+
+def _compilar_regra(modulo: str, regra: Dict[str, Any]) -> RegraCompilada:
+    rid = regra.get("id") or f"{modulo.lower()}_{regra.get('campo')}"
+    if not regra.get("campo"):
+        raise ValueError(f"Regra '{rid}' sem campo")
+    testes = [t for t in TESTES if t in regra]
+    if len(testes) > 1:
+        raise ValueError(f"Regra '{rid}' com mais de um teste: {', '.join(testes)}")
+    if not testes and not regra.get("quando_vazio"):
+        raise ValueError(f"Regra '{rid}' nunca dispara (sem teste e sem quando_vazio)")
+    for opcao, aceitos in OPCOES_TESTE.items():
+        if opcao in regra and not set(testes) & set(aceitos):
+            raise ValueError(f"Regra '{rid}': {opcao} só vale com {', '.join(aceitos)}")
+    tipo = regra.get("tipo", "Médio")
+    if tipo not in SEVERIDADE_POR_TIPO:
+        raise ValueError(f"Regra '{rid}': tipo '{tipo}' inválido")
+
+    mensagem = str(regra.get("mensagem", f"Alerta '{rid}' no campo '{{campo}}' do {{modulo}}"))
+    recomendacao = str(regra.get("recomendacao", ""))
+    try:
+        mensagem.format(**_PARAMETROS_MENSAGEM)
+        recomendacao.format(**_PARAMETROS_MENSAGEM)
+    except (KeyError, IndexError, ValueError) as e:
+        raise ValueError(f"Regra '{rid}': mensagem com parâmetro inválido ({e})") from e
+
+    try:
+        teste = _compilar_teste(testes[0], regra[testes[0]], regra) if testes else None
+    except (re.error, TypeError, ValueError) as e:
+        raise ValueError(f"Regra '{rid}': teste '{testes[0]}' inválido ({e})") from e
+
+    return RegraCompilada(
+        id=str(rid),
+        modulo=modulo,
+        campo=str(regra["campo"]),
+        tipo=tipo,
+        severidade=regra.get("severidade", SEVERIDADE_POR_TIPO[tipo]),
+        categoria=str(regra.get("categoria", "Geral")),
+        mensagem=mensagem,
+        recomendacao=recomendacao,
+        quando_vazio=bool(regra.get("quando_vazio", False)),
+        teste=teste,
+    )
+
+
+def compilar_regras(dados: Dict[str, Any]) -> RegrasAlertas:
+    """Compila o conteúdo do YAML. Regras inválidas levantam ValueError."""
+    dados = dados or {}
+    limites = dict(dados.get("limites") or {})
+    base_obrigatorio = dict(dados.get("obrigatorio") or {})
+    base_obrigatorio.pop("id", None)
+
+    por_modulo: Dict[str, Tuple[RegraCompilada, ...]] = {}
+    for modulo, conf in (dados.get("modulos") or {}).items():
+        conf = conf or {}
+        regras = [
+            _compilar_regra(modulo, {
+                **base_obrigatorio,
+                "id": f"{modulo.lower()}_{campo}_vazio",
+                "campo": campo,
+                "quando_vazio": True,
+                "min_caracteres": limites.get("min_obrigatorio", 10),
+                "ignorar_espacos": True,
+            })
+            for campo in conf.get("obrigatorios") or ()
+        ]
+        regras.extend(_compilar_regra(modulo, r) for r in conf.get("regras") or ())
+        por_modulo[modulo] = tuple(regras)
+
+    texto = json.dumps(dados, ensure_ascii=False, sort_keys=True, default=str)
+    return RegrasAlertas(
+        versao=str(dados.get("versao", "")),
+        assinatura=hashlib.sha256(texto.encode("utf-8")).hexdigest()[:16],
+        limites=limites,
+        por_modulo=por_modulo,
+        consistencia={k: tuple(v or ()) for k, v in (dados.get("consistencia") or {}).items()},
+    )
+
+
+# ======================================================
+# 📂 Carregamento (compilado uma vez por versão do arquivo)
+# ======================================================
+_COMPILADAS: Dict[str, Tuple[Tuple[int, int], RegrasAlertas]] = {}
+_LOCK = threading.Lock()
+
+
+def carregar_regras(caminho: Path = REGRAS_PATH) -> RegrasAlertas:
+    """Conjunto compilado; só recompila quando o arquivo muda."""
+    caminho = Path(caminho)
+    try:
+        st = caminho.stat()
+        marca = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        marca = (0, 0)
+
+    with _LOCK:
+        atual = _COMPILADAS.get(str(caminho))
+        if atual and atual[0] == marca:
+            return atual[1]
+        dados = obter_registry().ler_yaml(caminho) if marca != (0, 0) else None
+        if not dados:
+            print(f"[regras_alertas] ⚠️ Regras não encontradas ou inválidas: {caminho}")
+        regras = compilar_regras(dados or {})
+        _COMPILADAS[str(caminho)] = (marca, regras)
+        return regras
@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+"""
+seletor_modelos.py – Seleção automática de modelo institucional por objeto
+==============================================================
+Os modelos institucionais são separados por categoria:
+- knowledge/contrato_models/  (energia, fornecimento, obras, serviços, STIC)
+- knowledge_base/TR/          (TR por categoria: obras, mão de obra, STIC...)
+- knowledge_base/ETP/         (ETP de obras e de STI)
+
+Em vez de concatenar todos os modelos no prompt (ou pedir à IA que
+escolha), este módulo mantém um índice TF-IDF local por catálogo e
+ranqueia os modelos pela similaridade de cosseno com o objeto do
+DFD/ETP. O índice é montado uma vez por processo e refeito apenas se
+algum arquivo do catálogo mudar; a consulta é um produto escalar
+sobre dicionários esparsos (< 1 ms para os catálogos atuais).
+
+A escolha pode ser forçada pelo usuário (modelo_manual), por nome de
+arquivo ou por categoria.
+
+Uso típico:
+    from utils.seletor_modelos import selecionar_modelos, contexto_modelo
+    melhor = selecionar_modelos(objeto, "CONTRATO")[0]
+    texto, selecao = contexto_modelo(objeto, "TR", orcamento_tokens=1500)
+
+Versão: v2025.1
+==============================================================
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import threading
+import unicodedata
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.kb_resumos import resumo_relevante, termos
+from utils.knowledge_registry import CONTRATO_MODELS_DIR, KB_ROOT, obter_registry
+
+# ======================================================
+# 🔧 Catálogos de modelos
+# ======================================================
+CATALOGOS: Dict[str, Tuple[Path, str]] = {
+    "CONTRATO": (CONTRATO_MODELS_DIR, "modelo_contrato_*.txt"),
+    "TR": (KB_ROOT / "TR", "Modelo de Termo de Referência*.txt"),
+    "ETP": (KB_ROOT / "ETP", "Modelo de Estudo Técnico Preliminar*.txt"),
+}
+
+# Vocabulário típico de cada categoria (casado com o nome do arquivo).
+# Compensa objetos curtos ("reforma do fórum") que quase não repetem
+# os termos do corpo do modelo.
+VOCABULARIO_CATEGORIA: Dict[str, List[str]] = {
+    "obras": ["obra", "obras", "reforma", "construcao", "engenharia", "fachada", "pintura",
+              "telhado", "cobertura", "alvenaria", "impermeabilizacao", "climatizacao", "predial"],
+    "engenharia": ["obra", "reforma", "construcao", "engenharia", "projeto", "executivo"],
+    "energia": ["energia", "eletrica", "concessionaria", "kwh", "tarifa", "fornecimento"],
+    "stic": ["software", "sistema", "sistemas", "licenca", "licencas", "informatica", "computadores",
+             "rede", "servidores", "tecnologia", "informacao", "nuvem", "suporte"],
+    "software": ["software", "licenca", "licencas", "subscricao", "aplicativo", "plataforma"],
+    "sti": ["software", "sistema", "informatica", "tecnologia", "informacao"],
+    "fornecimento": ["aquisicao", "compra", "fornecimento", "material", "materiais", "equipamento",
+                     "equipamentos", "bens", "entrega", "mobiliario"],
+    "registro de precos": ["registro", "precos", "ata", "arp", "aquisicao", "eventual"],
+    "servicos": ["servico", "servicos", "limpeza", "vigilancia", "conservacao", "manutencao",
+                 "continuado", "continuados", "portaria", "copeiragem"],
+    "mao de obra": ["mao", "obra", "dedicacao", "exclusiva", "postos", "limpeza", "vigilancia",
+                    "recepcao", "portaria", "terceirizados"],
+    "curso": ["curso", "capacitacao", "treinamento", "palestra", "palestrante", "notoria",
+              "especializacao", "instrutor"],
+    "credenciamento": ["credenciamento", "credenciados", "credenciar", "chamamento", "leiloeiro"],
+}
+
+# Peso do vocabulário de categoria e do nome do arquivo frente ao corpo do modelo
+PESO_VOCABULARIO = 3.0
+PESO_NOME = 4.0
+
+# Termos do corpo considerados por modelo (maiores pesos TF-IDF)
+TERMOS_POR_MODELO = 400
+
+
+def _normalizar(texto: str) -> str:
+    texto = "".join(
+        c for c in unicodedata.normalize("NFKD", texto.lower()) if not unicodedata.combining(c)
+    )
+    return re.sub(r"\s+", " ", texto).strip()
+
+
+def _categoria(tipo: str, arquivo: Path) -> str:
+    """'modelo_contrato_obras.txt' → 'obras'; 'Modelo de TR - STIC (1).txt' → 'STIC'."""
+    if tipo == "CONTRATO":
+        return arquivo.stem.replace("modelo_contrato_", "")
+    nome = re.sub(r"\s*\(\d+\)", "", arquivo.stem)
+    nome = re.sub(r"\s*-\s*(Versão|Copiar).*$", "", nome, flags=re.IGNORECASE)
+    partes = nome.split(" - ", 1)
+    return partes[1].strip() if len(partes) > 1 else nome.strip()
+
+
+# ======================================================
+# 📇 Índice TF-IDF
+# ======================================================
+class IndiceModelos:
+    """Índice TF-IDF esparso dos modelos de um catálogo."""
+
+    def __init__(self, tipo: str, pasta: Path, padrao: str):
+        self.tipo = tipo
+        self.modelos: List[Dict[str, Any]] = []
+        self.idf: Dict[str, float] = {}
+        self.assinatura = self._assinatura(pasta, padrao)
+
+        arquivos = sorted(p for p in pasta.glob(padrao) if p.is_file()) if pasta.is_dir() else []
+        reg = obter_registry()
+        contagens = []
+        for arq in arquivos:
+            texto = reg.ler_texto(arq)
+            if not texto.strip():
+                continue
+            contagens.append(Counter(termos(texto)))
+            self.modelos.append({
+                "nome": arq.name,
+                "categoria": _categoria(tipo, arq),
+                "caminho": str(arq),
+            })
+
+        n = len(contagens)
+        df = Counter(t for c in contagens for t in c)
+        self.idf = {t: math.log((1 + n) / (1 + f)) + 1.0 for t, f in df.items()}
+
+        for modelo, contagem in zip(self.modelos, contagens):
+            total = sum(contagem.values()) or 1
+            pesos = {t: (f / total) * self.idf[t] for t, f in contagem.items()}
+            vetor = dict(sorted(pesos.items(), key=lambda kv: kv[1], reverse=True)[:TERMOS_POR_MODELO])
+            # Escala o corpo para que o maior termo valha 1.0
+            maior = max(vetor.values(), default=1.0)
+            vetor = {t: p / maior for t, p in vetor.items()}
+
+            chave = _normalizar(modelo["categoria"])
+            for t in termos(modelo["categoria"]):
+                vetor[t] = vetor.get(t, 0.0) + PESO_NOME
+            for rotulo, vocab in VOCABULARIO_CATEGORIA.items():
+                if rotulo in chave:
+                    for t in vocab:
+                        vetor[t] = vetor.get(t, 0.0) + PESO_VOCABULARIO
+
+            modelo["vetor"] = vetor
+            modelo["norma"] = math.sqrt(sum(p * p for p in vetor.values())) or 1.0
+
+    @staticmethod
+    def _assinatura(pasta: Path, padrao: str) -> Tuple:
+        if not pasta.is_dir():
+            return ()
+        itens = []
+        for arq in sorted(pasta.glob(padrao)):
+            try:
+                st = arq.stat()
+            except OSError:
+                continue
+            itens.append((arq.name, st.st_mtime_ns, st.st_size))
+        return tuple(itens)
+
+    def ranquear(self, objeto: str) -> List[Dict[str, Any]]:
+        consulta = Counter(termos(objeto or ""))
+        norma_q = math.sqrt(sum(f * f for f in consulta.values()))
+        ranking = []
+        for modelo in self.modelos:
+            if norma_q:
+                vetor = modelo["vetor"]
+                produto = sum(f * vetor.get(t, 0.0) for t, f in consulta.items())
+                score = produto / (norma_q * modelo["norma"])
+            else:
+                score = 0.0
+            ranking.append({
+                "nome": modelo["nome"],
+                "categoria": modelo["categoria"],
+                "caminho": modelo["caminho"],
+                "score": round(score, 4),
+                "origem": "automatica",
+            })
+        ranking.sort(key=lambda m: m["score"], reverse=True)
+        return ranking
+
+
+_INDICES: Dict[str, IndiceModelos] = {}
+_LOCK = threading.Lock()
+
+
+def obter_indice(tipo: str) -> IndiceModelos:
+    """Índice do catálogo (CONTRATO, TR ou ETP), refeito se algum arquivo mudou."""
+    tipo = tipo.upper()
+    if tipo not in CATALOGOS:
+        raise ValueError(f"Catálogo de modelos desconhecido: {tipo}")
+    pasta, padrao = CATALOGOS[tipo]
+    with _LOCK:
+        indice = _INDICES.get(tipo)
+        if indice is None or indice.assinatura != IndiceModelos._assinatura(pasta, padrao):
+            indice = IndiceModelos(tipo, pasta, padrao)
+            _INDICES[tipo] = indice
+        return indice
+
+
+# ======================================================
+# 🎯 API pública
+# ======================================================
+def listar_modelos(tipo: str) -> List[Dict[str, str]]:
+    """Modelos disponíveis no catálogo (para seleção manual na interface)."""
+    return [
+        {"nome": m["nome"], "categoria": m["categoria"], "caminho": m["caminho"]}
+        for m in obter_indice(tipo).modelos
+    ]
+
+
+def selecionar_modelos(
+    objeto: str,
+    tipo: str = "CONTRATO",
+    k: int = 1,
+    modelo_manual: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Retorna os k modelos mais aderentes ao objeto, do mais para o menos
+    similar: [{nome, categoria, caminho, score, origem}].
+
+    modelo_manual (nome do arquivo ou categoria, sem distinção de caixa
+    e acentos) prevalece sobre a escolha automática.
+    """
+    indice = obter_indice(tipo)
+    if modelo_manual:
+        alvo = _normalizar(modelo_manual)
+        for m in indice.modelos:
+            if alvo in (_normalizar(m["nome"]), _normalizar(m["categoria"])):
+                return [{
+                    "nome": m["nome"],
+                    "categoria": m["categoria"],
+                    "caminho": m["caminho"],
+                    "score": None,
+                    "origem": "manual",
+                }]
+        print(f"[seletor_modelos] ⚠️ Modelo manual não encontrado em {tipo}: {modelo_manual}")
+    return indice.ranquear(objeto)[:max(1, k)]
+
+
+def contexto_modelo(
+    objeto: str,
+    tipo: str = "CONTRATO",
+    modelo_manual: Optional[str] = None,
+    orcamento_tokens: Optional[int] = None,
+) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """
+    Texto do modelo escolhido para injeção no prompt e a seleção feita.
+    Com orcamento_tokens, usa os resumos das seções relevantes ao objeto
+    (utils.kb_resumos) em vez do texto integral.
+    """
+    selecao = selecionar_modelos(objeto, tipo, k=1, modelo_manual=modelo_manual)
+    if not selecao:
+        return "", None
+    escolhido = selecao[0]
+    if orcamento_tokens:
+        texto = resumo_relevante(None, objeto, orcamento_tokens, arquivos=[escolhido["caminho"]])
+    else:
+        texto = obter_registry().ler_texto(escolhido["caminho"])
+    return texto, escolhido
@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+"""
+similaridade_textual.py – Similaridade escalável entre documentos
+==============================================================
+Substitui o difflib.SequenceMatcher (quadrático no pior caso) na
+coerência entre artefatos. Tudo aqui é linear no tamanho do texto
+e a comparação em si tem custo limitado, independente do tamanho:
+
+    - perfil(texto): termos → ids estáveis (crc32), frequências e
+      um esboço MinHash "bottom-k" dos shingles de 3 termos;
+    - semelhanca_shingles(a, b): Jaccard estimada dos shingles
+      (trechos em comum) a partir dos esboços – O(k);
+    - assinatura_minhash(texto): MinHash com k sementes, para índices
+      LSH (utils.demandas_similares);
+    - cosseno_tfidf(textos): matriz de cosseno TF-IDF (NumPy);
+    - alinhar_secoes(a, b): divide em seções (kb_resumos), casa cada
+      seção com a mais parecida do outro documento e devolve o
+      cosseno médio ponderado pelo tamanho das seções.
+
+Textos acima de LIMITE_CARACTERES são amostrados em blocos espaçados
+(amostrar), o que limita o tempo por comparação independentemente do
+tamanho do documento.
+
+Os perfis ficam num LRU em memória indexado pelo hash do conteúdo:
+comparar o mesmo snapshot com vários artefatos tokeniza uma vez só.
+
+Uso:
+    from utils.similaridade_textual import alinhar_secoes, semelhanca_shingles
+    estrutura = alinhar_secoes(etp, tr)["score"]
+
+Versão: v2025.1
+==============================================================
+"""
+
+from __future__ import annotations
+
+import threading
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+from utils.kb_resumos import dividir_secoes, hash_conteudo, termos
+
+# ======================================================
+# ⚙️ Parâmetros
+# ======================================================
+TAMANHO_SHINGLE = 3
+K_MINHASH = 256          # tamanho do esboço bottom-k (erro ~ 1/sqrt(k))
+MAX_SECOES = 120         # acima disso, seções vizinhas são agrupadas
+MAX_PERFIS_CACHE = 64
+LIMITE_CARACTERES = 1_000_000  # acima disso, amostra blocos espaçados do texto
+BLOCOS_AMOSTRA = 64
+
+PERMUTACOES_MINHASH = 128  # assinatura MinHash para índices LSH
+BLOCO_MINHASH = 4096     # shingles por bloco no cálculo da assinatura
+
+_PRIMO = np.uint64(0x9E3779B97F4A7C15)
+_MISTURA = (np.uint64(0xBF58476D1CE4E5B9), np.uint64(0x94D049BB133111EB))
+
+
+def _sementes(n: int) -> np.ndarray:
+    return np.random.default_rng(20251).integers(0, np.iinfo(np.uint64).max, size=n, dtype=np.uint64)
+
+
+_SEMENTES = _sementes(PERMUTACOES_MINHASH)
+
+
+# ======================================================
+# ✂️ Amostragem (tempo limitado para textos enormes)
+# ======================================================
+def amostrar(texto: str, limite: int = LIMITE_CARACTERES) -> str:
+    """
+    Até `limite` caracteres do texto: BLOCOS_AMOSTRA blocos igualmente
+    espaçados, cortados em quebras de linha (as seções continuam
+    reconhecíveis). Textos menores voltam inalterados.
+    """
+    if not texto or len(texto) <= limite:
+        return texto
+    bloco = limite // BLOCOS_AMOSTRA
+    passo = len(texto) / BLOCOS_AMOSTRA
+    partes = []
+    for i in range(BLOCOS_AMOSTRA):
+        ini = int(i * passo)
+        if ini:
+            quebra = texto.find("\n", ini, ini + bloco)
+            ini = quebra + 1 if quebra >= 0 else ini
+        fim = texto.rfind("\n", ini, ini + bloco)
+        partes.append(texto[ini:fim if fim > ini else ini + bloco])
+    return "\n".join(partes)
+
+
+# ======================================================
+# 🧬 Perfil do texto
+# ======================================================
+@dataclass(frozen=True)
+class PerfilTexto:
+    ids: np.ndarray          # ids dos termos distintos (uint32, ordenados)
+    frequencias: np.ndarray  # frequência de cada id (float32)
+    esboco: np.ndarray       # menores hashes de shingle (uint64, ordenados, ≤ K_MINHASH)
+    n_termos: int
+
+
+@lru_cache(maxsize=200_000)
+def _id_termo(termo: str) -> int:
+    return zlib.crc32(termo.encode("utf-8"))
+
+
+def _misturar(x: np.ndarray) -> np.ndarray:
+    """splitmix64 vetorizado: espalha os bits antes de escolher os menores."""
+    x = x ^ (x >> np.uint64(30))
+    x = x * _MISTURA[0]
+    x = x ^ (x >> np.uint64(27))
+    x = x * _MISTURA[1]
+    return x ^ (x >> np.uint64(31))
+
+
+def _shingles(ids: np.ndarray, tamanho: int = TAMANHO_SHINGLE) -> np.ndarray:
+    """Hash (uint64) de cada shingle de `tamanho` termos consecutivos."""
+    n = max(1, ids.size - tamanho + 1)
+    h = np.zeros(n, dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for i in range(min(tamanho, ids.size)):
+            h = h * _PRIMO + ids[i:i + n].astype(np.uint64)
+    return h
+
+
+def _esboco(ids: np.ndarray, k: int = K_MINHASH) -> np.ndarray:
+    if ids.size == 0:
+        return np.zeros(0, dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        h = np.unique(_misturar(_shingles(ids)))
+    return h[:k]
+
+
+def _calcular_perfil(texto: str) -> PerfilTexto:
+    ids = np.fromiter((_id_termo(t) for t in termos(texto)), dtype=np.uint32)
+    distintos, contagem = np.unique(ids, return_counts=True)
+    return PerfilTexto(distintos, contagem.astype(np.float32), _esboco(ids), int(ids.size))
+
+
+_PERFIS: "OrderedDict[str, PerfilTexto]" = OrderedDict()
+_PERFIS_LOCK = threading.Lock()
+
+
+def perfil(texto: str) -> PerfilTexto:
+    chave = hash_conteudo(texto or "")
+    with _PERFIS_LOCK:
+        if chave in _PERFIS:
+            _PERFIS.move_to_end(chave)
+            return _PERFIS[chave]
+    calculado = _calcular_perfil(texto or "")
+    with _PERFIS_LOCK:
+        _PERFIS[chave] = calculado
+        while len(_PERFIS) > MAX_PERFIS_CACHE:
+            _PERFIS.popitem(last=False)
+    return calculado
+
+
+# ======================================================
+# 🔁 MinHash (bottom-k) – trechos em comum
+# ======================================================
+def jaccard_esbocos(a: np.ndarray, b: np.ndarray, k: int = K_MINHASH) -> float:
+    """Jaccard estimada de dois esboços bottom-k (0–1)."""
+    if a.size == 0 or b.size == 0:
+        return 0.0
+    uniao = np.union1d(a, b)[:k]
+    comuns = np.intersect1d(np.intersect1d(a, b, assume_unique=True), uniao, assume_unique=True)
+    return float(comuns.size / uniao.size)
+
+
+def semelhanca_shingles(a: str, b: str) -> float:
+    """Fração (0–1) de shingles de 3 termos em comum entre os textos."""
+    return jaccard_esbocos(perfil(amostrar(a)).esboco, perfil(amostrar(b)).esboco)
+
+
+def assinatura_minhash(
+    texto: str, permutacoes: int = PERMUTACOES_MINHASH, tamanho: int = TAMANHO_SHINGLE
+) -> np.ndarray:
+    """
+    Assinatura MinHash clássica (uint64[permutacoes]): para cada semente,
+    o menor hash dos shingles. Posições iguais entre duas assinaturas
+    estimam a Jaccard – é o que permite indexar em bandas (LSH), ao
+    contrário do esboço bottom-k. Texto sem termos → assinatura vazia.
+    """
+    ids = np.fromiter((_id_termo(t) for t in termos(amostrar(texto or ""))), dtype=np.uint32)
+    if ids.size == 0:
+        return np.zeros(0, dtype=np.uint64)
+    h = np.unique(_shingles(ids, tamanho))
+    sementes = _SEMENTES[:permutacoes] if permutacoes <= _SEMENTES.size else _sementes(permutacoes)
+    assinatura = np.full(sementes.size, np.iinfo(np.uint64).max, dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for ini in range(0, h.size, BLOCO_MINHASH):
+            bloco = _misturar(h[ini:ini + BLOCO_MINHASH][None, :] ^ sementes[:, None])
+            np.minimum(assinatura, bloco.min(axis=1), out=assinatura)
+    return assinatura
+
+
+# ======================================================
+# 📐 TF-IDF + cosseno (NumPy)
+# ======================================================
+def _matriz_tfidf(perfis: Sequence[PerfilTexto]) -> np.ndarray:
+    """Linhas L2-normalizadas sobre o vocabulário conjunto dos perfis."""
+    if not perfis:
+        return np.zeros((0, 0), dtype=np.float32)
+    vocabulario = np.unique(np.concatenate([p.ids for p in perfis]))
+    matriz = np.zeros((len(perfis), vocabulario.size), dtype=np.float32)
+    for i, p in enumerate(perfis):
+        if p.ids.size:
+            matriz[i, np.searchsorted(vocabulario, p.ids)] = 1.0 + np.log(p.frequencias)
+    df = np.count_nonzero(matriz, axis=0)
+    matriz *= (np.log((1 + len(perfis)) / (1 + df)) + 1.0).astype(np.float32)
+    normas = np.linalg.norm(matriz, axis=1, keepdims=True)
+    return matriz / np.where(normas == 0, 1.0, normas)
+
+
+def cosseno_tfidf(textos: Sequence[str]) -> np.ndarray:
+    """Matriz n×n de cosseno TF-IDF (IDF calculado sobre os próprios textos)."""
+    m = _matriz_tfidf([perfil(amostrar(t)) for t in textos])
+    return m @ m.T
+
+
+# ======================================================
+# 🧩 Comparação por seções alinhadas
+# ======================================================
+def _secoes(texto: str) -> List[tuple]:
+    secoes = [(t, c) for t, c in dividir_secoes(texto) if c.strip()] or [("Documento", texto)]
+    if len(secoes) <= MAX_SECOES:
+        return secoes
+    passo = -(-len(secoes) // MAX_SECOES)
+    return [
+        (secoes[i][0], "\n".join(c for _, c in secoes[i:i + passo]))
+        for i in range(0, len(secoes), passo)
+    ]
+
+
+def alinhar_secoes(a: str, b: str, top: int = 5) -> Dict[str, Any]:
+    """
+    Casa cada seção de um documento com a seção mais parecida do outro
+    (cosseno TF-IDF) nos dois sentidos. O score (0–1) é a média dos
+    melhores casamentos ponderada pelo número de termos de cada seção.
+    """
+    secoes_a, secoes_b = _secoes(amostrar(a)), _secoes(amostrar(b))
+    perfis_a = [perfil(c) for _, c in secoes_a]
+    perfis_b = [perfil(c) for _, c in secoes_b]
+    m = _matriz_tfidf(perfis_a + perfis_b)
+    sim = m[:len(perfis_a)] @ m[len(perfis_a):].T
+
+    pesos_a = np.array([p.n_termos for p in perfis_a], dtype=np.float64)
+    pesos_b = np.array([p.n_termos for p in perfis_b], dtype=np.float64)
+    melhor_a, melhor_b = sim.max(axis=1), sim.max(axis=0)
+    total = pesos_a.sum() + pesos_b.sum()
+    score = float((melhor_a @ pesos_a + melhor_b @ pesos_b) / total) if total else 0.0
+
+    destino = sim.argmax(axis=1)
+    ordem = np.argsort(-melhor_a)[:top]
+    return {
+        "score": round(score, 4),
+        "secoes": [len(secoes_a), len(secoes_b)],
+        "alinhamento": [
+            {"de": secoes_a[i][0], "para": secoes_b[destino[i]][0], "cosseno": round(float(melhor_a[i]), 3)}
+            for i in ordem
+        ],
+    }
@@ -0,0 +1,546 @@
+# -*- coding: utf-8 -*-
+"""
+validacao_lote.py – Validação em lote de pastas de documentos
+==============================================================
+Valida centenas de editais/TRs/ETPs de uma vez (revisão anual de
+processos históricos), em vez de um documento por clique:
+
+- Validação rígida em um pool de processos (extração de texto +
+  ChecklistMatcher), um documento por tarefa;
+- Validação semântica opcional (LLM) em paralelo por threads, pois é
+  limitada por I/O de rede;
+- Resultados gravados à medida que chegam em JSONL e CSV (a execução
+  pode ser retomada: documentos já presentes no JSONL são pulados);
+- Relatório final (resumo.json e resumo.md) com distribuição de scores
+  por artefato e os itens de checklist que mais falharam.
+
+O artefato de cada documento é informado (--artefato TR) ou detectado
+pelo classificador local (--artefato AUTO, padrão).
+
+Com --por-processo, cada pasta é um processo (DFD + ETP + TR + Edital +
+Contrato...): os artefatos dela são validados juntos, em paralelo, por
+validator_engine.validate_process. Dois documentos do mesmo artefato
+(ex.: TR e TR retificado) são validados cada um por si.
+
+Uso (linha de comando):
+    python -m utils.validacao_lote pasta1 [pasta2 ...] [--artefato AUTO]
+        [--processos 4] [--semantico] [--threads 8] [--saida DIR] [--retomar]
+    python -m utils.validacao_lote processo1 [processo2 ...] --por-processo [--artefato AUTO]
+        [--semantico] [--saida DIR] [--sem-subpastas]
+
+Uso (API):
+    from utils.validacao_lote import validar_lote
+    resumo = validar_lote(["processos/2024"], artefato="EDITAL")
+    processo = validar_processo("processos/2024/0001234-56")
+
+Versão: v2025.1
+==============================================================
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import statistics
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from utils.knowledge_registry import BASE_DIR
+
+# ======================================================
+# 🔧 Configurações e Paths
+# ======================================================
+SAIDA_DIR = BASE_DIR / "exports" / "validacao_lote"
+
+EXTENSOES_DOCUMENTO = {".pdf", ".docx", ".txt", ".md"}
+
+# Faixas do histograma de scores (limite inferior de cada faixa)
+FAIXAS_SCORE = [0, 20, 40, 60, 80, 100]
+
+# Quantidade de itens listados em "mais falhados" por artefato
+TOP_ITENS_FALHADOS = 10
+
+CAMPOS_CSV = [
+    "arquivo", "artefato", "origem_artefato", "caracteres", "rigid_score",
+    "itens_total", "itens_ausentes", "obrigatorios_ausentes", "semantic_score",
+    "tempo_ms", "erro",
+]
+
+
+# ======================================================
+# 📄 Extração de texto
+# ======================================================
+def extrair_texto_arquivo(caminho: Path | str) -> str:
+    """Texto de um PDF, DOCX ou TXT/MD a partir do caminho."""
+    caminho = Path(caminho)
+    sufixo = caminho.suffix.lower()
+    if sufixo == ".pdf":
+        import fitz  # PyMuPDF
+        with fitz.open(str(caminho)) as pdf:
+            return "\n".join(p.get_text("text") for p in pdf).strip()
+    if sufixo == ".docx":
+        import docx2txt
+        return docx2txt.process(str(caminho)) or ""
+    return caminho.read_text(encoding="utf-8", errors="ignore")
+
+
+def descobrir_documentos(pastas: Iterable[Path | str], recursivo: bool = True) -> List[Path]:
+    """Arquivos suportados nas pastas (ou arquivos avulsos), em ordem de caminho."""
+    encontrados = set()
+    for pasta in pastas:
+        pasta = Path(pasta)
+        if pasta.is_file():
+            candidatos = [pasta]
+        elif pasta.is_dir():
+            candidatos = pasta.rglob("*") if recursivo else pasta.glob("*")
+        else:
+            print(f"[validacao_lote] ⚠️ Caminho inexistente: {pasta}")
+            continue
+        for arq in candidatos:
+            if arq.is_file() and arq.suffix.lower() in EXTENSOES_DOCUMENTO and not arq.name.startswith("~$"):
+                encontrados.add(arq.resolve())
+    return sorted(encontrados)
+
+
+# ======================================================
+# ⚙️ Tarefa por documento (executada nos processos do pool)
+# ======================================================
+def validar_rigido_arquivo(caminho: str, artefato: str = "AUTO", incluir_texto: bool = False) -> Dict[str, Any]:
+    """
+    Extrai o texto, define o artefato e roda a validação rígida.
+    Nunca levanta exceção: falhas ficam no campo "erro" do registro.
+    """
+    from knowledge.validators.validator_engine import _rigid_scan, rigid_evidence, rigid_validate
+
+    inicio = time.perf_counter()
+    registro: Dict[str, Any] = {
+        "arquivo": caminho,
+        "artefato": None,
+        "origem_artefato": None,
+        "caracteres": 0,
+        "rigid_score": None,
+        "rigid_result": [],
+        "semantic_score": None,
+        "semantic_result": None,
+        "erro": None,
+    }
+    try:
+        texto = extrair_texto_arquivo(caminho)
+        registro["caracteres"] = len(texto)
+        if not texto.strip():
+            raise ValueError("documento sem texto extraível")
+
+        artefato = (artefato or "AUTO").strip().upper()
+        if artefato == "AUTO":
+            from utils.classificador_documentos import classificar_documento
+            classe = classificar_documento(texto)
+            if not classe.get("tipo"):
+                raise ValueError("tipo de documento não identificado")
+            artefato = classe["tipo"]
+            registro["origem_artefato"] = classe.get("origem")
+        else:
+            registro["origem_artefato"] = "informado"
+        registro["artefato"] = artefato
+
+        varredura = _rigid_scan(texto, artefato)
+        registro["rigid_score"], registro["rigid_result"] = rigid_validate(texto, artefato, varredura)
+        if incluir_texto:
+            registro["texto"] = texto
+            # Spans do rígido (texto normalizado) reaproveitados pela etapa semântica
+            registro["evidencias"] = rigid_evidence(varredura)
+    except Exception as e:
+        registro["erro"] = f"{type(e).__name__}: {e}"
+    registro["tempo_ms"] = round((time.perf_counter() - inicio) * 1000, 1)
+    return registro
+
+
+def _validar_semantico(registro: Dict[str, Any], client: Any) -> Dict[str, Any]:
+    from knowledge.validators.validator_engine import load_checklist, semantic_validate
+
+    texto = registro.pop("texto", "")
+    evidencias = registro.pop("evidencias", None)
+    if registro.get("erro") or not texto:
+        return registro
+    inicio = time.perf_counter()
+    try:
+        checklist = load_checklist(registro["artefato"])
+        registro["semantic_score"], registro["semantic_result"] = semantic_validate(
+            texto, registro["artefato"], checklist, client, evidencias=evidencias
+        )
+    except Exception as e:
+        registro["erro"] = f"semântica – {type(e).__name__}: {e}"
+    registro["tempo_ms"] = round(registro["tempo_ms"] + (time.perf_counter() - inicio) * 1000, 1)
+    return registro
+
+
+def _executar(
+    arquivos: List[Path],
+    artefato: str,
+    processos: int,
+    client: Any,
+    threads: int,
+) -> Iterator[Dict[str, Any]]:
+    """Gera os registros na ordem em que ficam prontos."""
+    incluir_texto = client is not None
+    with ProcessPoolExecutor(max_workers=processos) as pool, \
+            ThreadPoolExecutor(max_workers=threads) as llm:
+        rigidos = {pool.submit(validar_rigido_arquivo, str(a), artefato, incluir_texto) for a in arquivos}
+        pendentes = set(rigidos)
+        while pendentes:
+            prontos, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+            for fut in prontos:
+                registro = fut.result()
+                if incluir_texto and fut in rigidos:
+                    # Cada resultado rígido dispara imediatamente a chamada semântica
+                    pendentes.add(llm.submit(_validar_semantico, registro, client))
+                else:
+                    yield registro
+
+
+# ======================================================
+# 💾 Gravação incremental
+# ======================================================
+def _linha_csv(registro: Dict[str, Any]) -> Dict[str, Any]:
+    itens = registro.get("rigid_result") or []
+    ausentes = [i for i in itens if not i.get("presente")]
+    return {
+        "arquivo": registro["arquivo"],
+        "artefato": registro.get("artefato") or "",
+        "origem_artefato": registro.get("origem_artefato") or "",
+        "caracteres": registro.get("caracteres", 0),
+        "rigid_score": "" if registro.get("rigid_score") is None else registro["rigid_score"],
+        "itens_total": len(itens),
+        "itens_ausentes": len(ausentes),
+        "obrigatorios_ausentes": sum(1 for i in ausentes if i.get("obrigatorio")),
+        "semantic_score": "" if registro.get("semantic_score") is None else registro["semantic_score"],
+        "tempo_ms": registro.get("tempo_ms", ""),
+        "erro": registro.get("erro") or "",
+    }
+
+
+def _ja_processados(jsonl: Path) -> List[Dict[str, Any]]:
+    if not jsonl.exists():
+        return []
+    registros = []
+    with jsonl.open("r", encoding="utf-8") as f:
+        for linha in f:
+            try:
+                registros.append(json.loads(linha))
+            except json.JSONDecodeError:
+                continue  # linha truncada por interrupção
+    return registros
+
+
+# ======================================================
+# 📊 Relatório
+# ======================================================
+def _percentil(valores: List[float], p: float) -> float:
+    ordenados = sorted(valores)
+    k = (len(ordenados) - 1) * p
+    baixo = int(k)
+    alto = min(baixo + 1, len(ordenados) - 1)
+    return round(ordenados[baixo] + (ordenados[alto] - ordenados[baixo]) * (k - baixo), 1)
+
+
+def _distribuicao(valores: List[float]) -> Dict[str, Any]:
+    if not valores:
+        return {"n": 0}
+    faixas = Counter(min(int(v // 20), len(FAIXAS_SCORE) - 2) for v in valores)
+    return {
+        "n": len(valores),
+        "media": round(statistics.mean(valores), 1),
+        "mediana": round(statistics.median(valores), 1),
+        "p10": _percentil(valores, 0.10),
+        "p90": _percentil(valores, 0.90),
+        "minimo": min(valores),
+        "maximo": max(valores),
+        "faixas": {
+            f"{inicio}-{fim}": faixas.get(i, 0)
+            for i, (inicio, fim) in enumerate(zip(FAIXAS_SCORE, FAIXAS_SCORE[1:]))
+        },
+    }
+
+
+def montar_resumo(registros: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Distribuição de scores e itens mais falhados, por artefato."""
+    por_artefato: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    erros = []
+    for r in registros:
+        if r.get("erro") and r.get("rigid_score") is None:
+            erros.append({"arquivo": r["arquivo"], "erro": r["erro"]})
+            continue
+        por_artefato[r.get("artefato") or "?"].append(r)
+
+    artefatos = {}
+    for artefato, regs in sorted(por_artefato.items()):
+        falhas: Counter = Counter()
+        descricoes: Dict[str, Dict[str, Any]] = {}
+        for r in regs:
+            for item in r.get("rigid_result") or []:
+                chave = str(item.get("id") or item.get("descricao"))
+                descricoes.setdefault(chave, item)
+                if not item.get("presente"):
+                    falhas[chave] += 1
+        semanticos = [r["semantic_score"] for r in regs if r.get("semantic_score") is not None]
+        artefatos[artefato] = {
+            "documentos": len(regs),
+            "rigid_score": _distribuicao([r["rigid_score"] for r in regs]),
+            "semantic_score": _distribuicao(semanticos) if semanticos else None,
+            "itens_mais_falhados": [
+                {
+                    "id": chave,
+                    "descricao": descricoes[chave].get("descricao", ""),
+                    "obrigatorio": bool(descricoes[chave].get("obrigatorio")),
+                    "falhas": n,
+                    "percentual": round(n / len(regs) * 100, 1),
+                }
+                for chave, n in falhas.most_common(TOP_ITENS_FALHADOS)
+            ],
+        }
+
+    return {
+        "gerado_em": datetime.now().isoformat(timespec="seconds"),
+        "documentos": len(registros),
+        "validados": sum(a["documentos"] for a in artefatos.values()),
+        "erros": erros,
+        "artefatos": artefatos,
+    }
+
+
+def resumo_markdown(resumo: Dict[str, Any]) -> str:
+    linhas = [
+        "# Validação em lote – Resumo",
+        "",
+        f"Gerado em {resumo['gerado_em']} · {resumo['documentos']} documentos · "
+        f"{resumo['validados']} validados · {len(resumo['erros'])} com erro",
+    ]
+    for artefato, dados in resumo["artefatos"].items():
+        dist = dados["rigid_score"]
+        linhas += [
+            "",
+            f"## {artefato} ({dados['documentos']} documento(s))",
+            "",
+            f"Score rígido – média {dist['media']} · mediana {dist['mediana']} · "
+            f"p10 {dist['p10']} · p90 {dist['p90']} · mín {dist['minimo']} · máx {dist['maximo']}",
+            "",
+            "| Faixa | Documentos |",
+            "|---|---|",
+        ]
+        linhas += [f"| {faixa} | {n} |" for faixa, n in dist["faixas"].items()]
+        if dados["semantic_score"]:
+            sem = dados["semantic_score"]
+            linhas += ["", f"Score semântico – média {sem['media']} · mediana {sem['mediana']}"]
+        if dados["itens_mais_falhados"]:
+            linhas += ["", "| Item | Descrição | Obrigatório | Falhas | % |", "|---|---|---|---|---|"]
+            linhas += [
+                f"| {i['id']} | {i['descricao']} | {'sim' if i['obrigatorio'] else 'não'} | "
+                f"{i['falhas']} | {i['percentual']} |"
+                for i in dados["itens_mais_falhados"]
+            ]
+    if resumo["erros"]:
+        linhas += ["", "## Erros", ""]
+        linhas += [f"- {e['arquivo']}: {e['erro']}" for e in resumo["erros"]]
+    return "\n".join(linhas) + "\n"
+
+
+# ======================================================
+# 🚀 API pública
+# ======================================================
+def validar_lote(
+    pastas: Iterable[Path | str],
+    artefato: str = "AUTO",
+    saida: Optional[Path | str] = None,
+    processos: Optional[int] = None,
+    semantico: bool = False,
+    client: Any = None,
+    threads: int = 8,
+    retomar: bool = False,
+    recursivo: bool = True,
+) -> Dict[str, Any]:
+    """
+    Valida todos os documentos das pastas e grava em `saida`:
+    resultados.jsonl, resultados.csv, resumo.json e resumo.md.
+    Retorna o resumo (com "saida" indicando a pasta usada).
+    """
+    saida = Path(saida) if saida else SAIDA_DIR / datetime.now().strftime("%Y%m%d_%H%M%S")
+    saida.mkdir(parents=True, exist_ok=True)
+    jsonl, csv_path = saida / "resultados.jsonl", saida / "resultados.csv"
+
+    if semantico and client is None:
+        from openai import OpenAI
+        client = OpenAI()
+    if not semantico:
+        client = None
+
+    arquivos = descobrir_documentos(pastas, recursivo=recursivo)
+    anteriores = _ja_processados(jsonl) if retomar else []
+    feitos = {r["arquivo"] for r in anteriores}
+    pendentes = [a for a in arquivos if str(a) not in feitos]
+    processos = max(1, processos or min(os.cpu_count() or 1, 8))
+    print(
+        f"[validacao_lote] {len(arquivos)} documentos ({len(pendentes)} pendentes) · "
+        f"{processos} processos · semântica {'ativa' if client else 'desativada'}"
+    )
+
+    registros = list(anteriores)
+    modo = "a" if retomar else "w"
+    novo_csv = not (retomar and csv_path.exists())
+    inicio = time.perf_counter()
+    with jsonl.open(modo, encoding="utf-8") as fj, csv_path.open(modo, encoding="utf-8", newline="") as fc:
+        escritor = csv.DictWriter(fc, fieldnames=CAMPOS_CSV)
+        if novo_csv:
+            escritor.writeheader()
+        if pendentes:
+            for n, registro in enumerate(_executar(pendentes, artefato, processos, client, threads), 1):
+                fj.write(json.dumps(registro, ensure_ascii=False) + "\n")
+                fj.flush()
+                escritor.writerow(_linha_csv(registro))
+                fc.flush()
+                registros.append(registro)
+                if n % 25 == 0 or n == len(pendentes):
+                    print(f"[validacao_lote] {n}/{len(pendentes)} documentos")
+
+    resumo = montar_resumo(registros)
+    resumo["tempo_total_s"] = round(time.perf_counter() - inicio, 2)
+    resumo["saida"] = str(saida)
+    (saida / "resumo.json").write_text(json.dumps(resumo, ensure_ascii=False, indent=2), encoding="utf-8")
+    (saida / "resumo.md").write_text(resumo_markdown(resumo), encoding="utf-8")
+    print(f"[validacao_lote] ✅ Concluído em {resumo['tempo_total_s']} s → {saida}")
+    return resumo
+
+
+def validar_processo(
+    pasta: Path | str,
+    client: Any = None,
+    artefato: str = "AUTO",
+    recursivo: bool = True,
+) -> Dict[str, Any]:
+    """
+    Valida os documentos de uma pasta como um único processo: agrupa por
+    artefato (classificador ou `artefato` informado) e valida os artefatos
+    em paralelo (validate_process). Documentos do mesmo artefato não são
+    concatenados: cada um entra numa rodada própria de validate_process.
+    Retorna {"processo", "artefatos": {artefato: [{"arquivo", **payload}]},
+    "erros", "tempo_ms"}.
+    """
+    from knowledge.validators.registry import normalizar_artefato
+    from knowledge.validators.validator_engine import validate_process
+
+    documentos: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
+    erros = []
+    for caminho in descobrir_documentos([pasta], recursivo=recursivo):
+        try:
+            texto = extrair_texto_arquivo(caminho)
+            if not texto.strip():
+                raise ValueError("documento sem texto extraível")
+            tipo = (artefato or "AUTO").strip().upper()
+            if tipo == "AUTO":
+                from utils.classificador_documentos import classificar_documento
+                tipo = classificar_documento(texto).get("tipo")
+                if not tipo:
+                    raise ValueError("tipo de documento não identificado")
+        except Exception as e:
+            erros.append({"arquivo": str(caminho), "erro": f"{type(e).__name__}: {e}"})
+            continue
+        documentos[normalizar_artefato(tipo)].append((str(caminho), texto))
+
+    inicio = time.perf_counter()
+    artefatos: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    # Rodada k: o k-ésimo documento de cada artefato
+    for k in range(max((len(d) for d in documentos.values()), default=0)):
+        rodada = {a: docs[k] for a, docs in documentos.items() if k < len(docs)}
+        resultados = validate_process({a: texto for a, (_, texto) in rodada.items()}, client)
+        for a, (arquivo, _) in rodada.items():
+            artefatos[a].append({"arquivo": arquivo, **resultados.get(a, {})})
+    return {
+        "processo": str(pasta),
+        "artefatos": dict(artefatos),
+        "erros": erros,
+        "tempo_ms": round((time.perf_counter() - inicio) * 1000, 1),
+    }
+
+
+def validar_processos(
+    pastas: Iterable[Path | str],
+    saida: Optional[Path | str] = None,
+    semantico: bool = False,
+    client: Any = None,
+    artefato: str = "AUTO",
+    recursivo: bool = True,
+) -> List[Dict[str, Any]]:
+    """validar_processo para cada pasta, gravando processos.jsonl em `saida`."""
+    saida = Path(saida) if saida else SAIDA_DIR / datetime.now().strftime("%Y%m%d_%H%M%S")
+    saida.mkdir(parents=True, exist_ok=True)
+    if semantico and client is None:
+        from openai import OpenAI
+        client = OpenAI()
+    if not semantico:
+        client = None
+
+    resultados = []
+    with (saida / "processos.jsonl").open("w", encoding="utf-8") as fj:
+        for pasta in pastas:
+            resultado = validar_processo(pasta, client, artefato=artefato, recursivo=recursivo)
+            fj.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+            fj.flush()
+            resultados.append(resultado)
+            scores = ", ".join(
+                f"{a} {d.get('rigid_score')}" for a, docs in resultado["artefatos"].items() for d in docs
+            )
+            print(f"[validacao_lote] {pasta}: {scores or 'nenhum artefato'}")
+    print(f"[validacao_lote] ✅ {len(resultados)} processo(s) → {saida}")
+    return resultados
+
+
+# ======================================================
+# 🧪 Execução direta
+# ======================================================
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Validação em lote de documentos (DFD/ETP/TR/Edital/Contrato)")
+    parser.add_argument("pastas", nargs="+", help="pastas ou arquivos a validar")
+    parser.add_argument("--artefato", default="AUTO", help="DFD, ETP, TR, EDITAL... ou AUTO (classificador)")
+    parser.add_argument("--processos", type=int, default=None, help="processos da validação rígida")
+    parser.add_argument("--semantico", action="store_true", help="inclui a validação semântica (OpenAI)")
+    parser.add_argument("--threads", type=int, default=8, help="chamadas semânticas simultâneas")
+    parser.add_argument("--saida", default=None, help=f"pasta de saída (padrão: {SAIDA_DIR}/<timestamp>)")
+    parser.add_argument("--retomar", action="store_true", help="pula documentos já presentes em resultados.jsonl")
+    parser.add_argument("--sem-subpastas", action="store_true", help="não percorre subpastas")
+    parser.add_argument("--por-processo", action="store_true",
+                        help="cada pasta é um processo; artefatos validados juntos (validate_process)")
+    args = parser.parse_args(argv)
+
+    if args.por_processo:
+        if args.retomar:
+            parser.error("--retomar não se aplica a --por-processo")
+        validar_processos(
+            args.pastas,
+            saida=args.saida,
+            semantico=args.semantico,
+            artefato=args.artefato,
+            recursivo=not args.sem_subpastas,
+        )
+        return
+
+    if args.retomar and not args.saida:
+        parser.error("--retomar exige --saida apontando para a execução anterior")
+
+    validar_lote(
+        args.pastas,
+        artefato=args.artefato,
+        saida=args.saida,
+        processos=args.processos,
+        semantico=args.semantico,
+        threads=args.threads,
+        retomar=args.retomar,
+        recursivo=not args.sem_subpastas,
+    )
+
+
+if __name__ == "__main__":
+    main()